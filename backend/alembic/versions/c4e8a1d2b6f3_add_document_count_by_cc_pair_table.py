@@ -0,0 +1,46 @@
+"""add document count by cc pair table
+
+Revision ID: c4e8a1d2b6f3
+Revises: 7b3c2f9e1d4a
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c4e8a1d2b6f3"
+down_revision = "7b3c2f9e1d4a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_count_by_connector_credential_pair",
+        sa.Column("connector_id", sa.Integer(), nullable=False),
+        sa.Column("credential_id", sa.Integer(), nullable=False),
+        sa.Column("document_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["connector_id"], ["connector.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["credential_id"], ["credential.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("connector_id", "credential_id"),
+    )
+
+    op.execute(
+        """
+        INSERT INTO document_count_by_connector_credential_pair
+            (connector_id, credential_id, document_count)
+        SELECT connector_id, credential_id, COUNT(*)
+        FROM document_by_connector_credential_pair
+        WHERE has_been_indexed IS TRUE
+        GROUP BY connector_id, credential_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("document_count_by_connector_credential_pair")
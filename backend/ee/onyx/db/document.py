@@ -1,9 +1,14 @@
+from collections.abc import Iterable
 from datetime import datetime
 from datetime import timezone
+from typing import NamedTuple
 
 from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
+from onyx.access.models import DocExternalAccess
 from onyx.access.models import ExternalAccess
 from onyx.access.utils import build_ext_group_name_for_onyx
 from onyx.configs.constants import DocumentSource
@@ -101,3 +106,130 @@ def upsert_document_external_perms(
         db_session.commit()
 
     return False
+
+
+class ExternalPermsBatchUpsertResult(NamedTuple):
+    # documents that did not exist yet and were created to hold the permissions
+    created_doc_ids: list[str]
+    # existing documents whose permissions actually changed
+    updated_doc_ids: list[str]
+
+
+# (external_user_emails, external_user_group_ids, is_public), sorted and deduplicated
+# so that stored and new permissions can be compared directly
+_NormalizedExternalAccess = tuple[tuple[str, ...], tuple[str, ...], bool]
+
+
+def _normalize_external_access(
+    external_user_emails: Iterable[str],
+    external_user_group_ids: Iterable[str],
+    is_public: bool,
+) -> _NormalizedExternalAccess:
+    return (
+        tuple(sorted(set(external_user_emails))),
+        tuple(sorted(set(external_user_group_ids))),
+        is_public,
+    )
+
+
+def upsert_document_external_perms_batch(
+    db_session: Session,
+    doc_external_accesses: list[DocExternalAccess],
+    source_type: DocumentSource,
+) -> ExternalPermsBatchUpsertResult:
+    """
+    Batched version of `upsert_document_external_perms`, all documents are written in
+    a single transaction with one multi-row insert and one bulk update.
+    Documents whose stored permissions are the same as the new ones are not touched,
+    so only documents whose ACL changed get a new `last_modified` and are picked up
+    by the next index metadata sync.
+    NOTE: this will replace any existing external access, it will not do a union
+    """
+    # a document can be yielded more than once during a sync, the last one wins
+    new_perms: dict[str, _NormalizedExternalAccess] = {}
+    for doc_external_access in doc_external_accesses:
+        external_access = doc_external_access.external_access
+        new_perms[doc_external_access.doc_id] = _normalize_external_access(
+            external_access.external_user_emails,
+            [
+                build_ext_group_name_for_onyx(
+                    ext_group_name=group_id,
+                    source=source_type,
+                )
+                for group_id in external_access.external_user_group_ids
+            ],
+            external_access.is_public,
+        )
+    if not new_perms:
+        return ExternalPermsBatchUpsertResult(created_doc_ids=[], updated_doc_ids=[])
+
+    stored_rows = db_session.execute(
+        select(
+            DbDocument.id,
+            DbDocument.external_user_emails,
+            DbDocument.external_user_group_ids,
+            DbDocument.is_public,
+        ).where(DbDocument.id.in_(new_perms.keys()))
+    ).all()
+    stored_perms = {
+        doc_id: _normalize_external_access(
+            emails or [], group_ids or [], bool(is_public)
+        )
+        for doc_id, emails, group_ids, is_public in stored_rows
+    }
+
+    updated_doc_ids = [
+        doc_id for doc_id, stored in stored_perms.items() if stored != new_perms[doc_id]
+    ]
+
+    # If the document does not exist, still store the external access
+    # So that if the document is added later, the external access is already stored
+    # The upsert function in the indexing pipeline does not overwrite the permissions fields
+    missing_doc_ids = [doc_id for doc_id in new_perms if doc_id not in stored_perms]
+    created_doc_ids: list[str] = []
+    if missing_doc_ids:
+        insert_stmt = (
+            insert(DbDocument)
+            .values(
+                [
+                    {
+                        "id": doc_id,
+                        "semantic_id": "",
+                        "external_user_emails": list(new_perms[doc_id][0]),
+                        "external_user_group_ids": list(new_perms[doc_id][1]),
+                        "is_public": new_perms[doc_id][2],
+                    }
+                    for doc_id in missing_doc_ids
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["id"])
+            .returning(DbDocument.id)
+        )
+        created_doc_ids = list(db_session.scalars(insert_stmt))
+
+        # created concurrently (e.g. by indexing) since the select, overwrite them
+        created = set(created_doc_ids)
+        updated_doc_ids.extend(
+            doc_id for doc_id in missing_doc_ids if doc_id not in created
+        )
+
+    if updated_doc_ids:
+        now = datetime.now(timezone.utc)
+        db_session.execute(
+            update(DbDocument),
+            [
+                {
+                    "id": doc_id,
+                    "external_user_emails": list(new_perms[doc_id][0]),
+                    "external_user_group_ids": list(new_perms[doc_id][1]),
+                    "is_public": new_perms[doc_id][2],
+                    "last_modified": now,
+                }
+                for doc_id in updated_doc_ids
+            ],
+        )
+
+    db_session.commit()
+    return ExternalPermsBatchUpsertResult(
+        created_doc_ids=created_doc_ids, updated_doc_ids=updated_doc_ids
+    )
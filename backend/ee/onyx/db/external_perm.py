@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy import update
 from sqlalchemy.orm import Session
 
+from onyx.access.acl_cache import invalidate_user_acl_cache
 from onyx.access.utils import build_ext_group_name_for_onyx
 from onyx.configs.constants import DocumentSource
 from onyx.db.models import PublicExternalUserGroup
@@ -174,6 +175,7 @@ def upsert_external_groups(
                 db_session.add(new_public_group)
 
     db_session.commit()
+    invalidate_user_acl_cache()
 
 
 def remove_stale_external_groups(
@@ -193,6 +195,7 @@ def remove_stale_external_groups(
         )
     )
     db_session.commit()
+    invalidate_user_acl_cache()
 
 
 def fetch_external_groups_for_user(
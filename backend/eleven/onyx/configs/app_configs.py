@@ -13,6 +13,15 @@ ELASTICSEARCH_API_KEY = os.environ.get("ELASTICSEARCH_API_KEY", None)
 ELASTICSEARCH_REQUEST_TIMEOUT = os.environ.get("ELASTICSEARCH_REQUEST_TIMEOUT", 120)
 MANAGED_ELASTICSEARCH = os.environ.get("MANAGED_ELASTICSEARCH", "").lower() == "true"
 ELASTIC_ENTERPRISE_LICENSE = os.environ.get("ELASTIC_ENTERPRISE_LICENSE", "").lower() == "true"
+# HTTP connections kept per Elasticsearch node by the client shared by all queries of a
+# process
+ELASTICSEARCH_CONNECTIONS_PER_NODE = int(
+    os.environ.get("ELASTICSEARCH_CONNECTIONS_PER_NODE") or 20
+)
+# Debugging only: makes Elasticsearch compute a score explanation for every hit
+ELASTICSEARCH_EXPLAIN_QUERIES = (
+    os.environ.get("ELASTICSEARCH_EXPLAIN_QUERIES", "").lower() == "true"
+)
 
 # Metadata keys to include during document indexing
 NOTION_METADATA_TO_INCLUDE = os.environ.get("NOTION_METADATA_TO_INCLUDE", "")
@@ -9,7 +9,10 @@ from typing import cast
 from elasticsearch import Elasticsearch
 from retry import retry
 
-from eleven.onyx.document_index.elasticsearch.utils import get_elasticsearch_client
+from eleven.onyx.configs.app_configs import ELASTICSEARCH_EXPLAIN_QUERIES
+from eleven.onyx.document_index.elasticsearch.utils import (
+    get_shared_elasticsearch_client,
+)
 from onyx.context.search.models import InferenceChunkUncleaned
 from onyx.document_index.interfaces import VespaChunkRequest
 from onyx.document_index.vespa_constants import BLURB
@@ -40,10 +43,10 @@ logger = setup_logger()
 
 
 @retry(tries=3, delay=1, backoff=2)
-def query_elasticsearch(
+def search_elasticsearch_hits(
     query_params: Mapping[str, Any],
-) -> list[InferenceChunkUncleaned]:
-    """Query Elasticsearch and convert results to InferenceChunkUncleaned objects.
+) -> list[dict[str, Any]]:
+    """Query Elasticsearch with the shared client and return the raw hits.
 
     Args:
         query_params: A mapping containing:
@@ -51,10 +54,10 @@ def query_elasticsearch(
             - size: The number of results to retrieve
             - from: The offset for pagination
             - _source: (optional) The _source parameter
-            - retriever: (optional) The retriever parameter with RRF configuration
+            - query / knn / retriever: The search to run
 
     Returns:
-        A list of InferenceChunkUncleaned objects representing the search results.
+        The hits of the response, in ranked order.
     """
     index_name = query_params["index"]
 
@@ -62,13 +65,12 @@ def query_elasticsearch(
     query_body = {k: v for k, v in query_params.items() if k != "index"}
 
     try:
-        with get_elasticsearch_client() as es_client:
-            response = es_client.search(
-                index=index_name,
-                body=query_body,
-                explain=True,
-            )
-            hits = response["hits"]["hits"]
+        response = get_shared_elasticsearch_client().search(
+            index=index_name,
+            body=query_body,
+            explain=ELASTICSEARCH_EXPLAIN_QUERIES,
+        )
+        hits = response["hits"]["hits"]
     except Exception as e:
         logger.error(f"Error querying Elasticsearch: {e}")
         # Try to get the response if it exists in the exception
@@ -83,6 +85,12 @@ def query_elasticsearch(
     if not hits:
         logger.warning(f"No hits found for query: {query_body}")
 
+    return hits
+
+
+def elasticsearch_hits_to_inference_chunks(
+    hits: list[dict[str, Any]],
+) -> list[InferenceChunkUncleaned]:
     for hit in hits:
         if hit["_source"].get(CONTENT) is None:
             identifier = hit["_source"].get("documentid") or hit["_id"]
@@ -99,6 +107,57 @@ def query_elasticsearch(
     return inference_chunks
 
 
+def query_elasticsearch(
+    query_params: Mapping[str, Any],
+) -> list[InferenceChunkUncleaned]:
+    """Query Elasticsearch and convert results to InferenceChunkUncleaned objects.
+
+    Args:
+        query_params: see `search_elasticsearch_hits`
+
+    Returns:
+        A list of InferenceChunkUncleaned objects representing the search results.
+    """
+    return elasticsearch_hits_to_inference_chunks(
+        search_elasticsearch_hits(query_params)
+    )
+
+
+def fuse_hits_with_weighted_rrf(
+    keyword_hits: list[dict[str, Any]],
+    vector_hits: list[dict[str, Any]],
+    hybrid_alpha: float,
+    rank_constant: int,
+) -> list[dict[str, Any]]:
+    """Client-side Reciprocal Rank Fusion of a keyword and a vector search.
+
+    Each hit scores `weight / (rank_constant + rank)` in every list it appears in, where
+    the weight of the vector list is `hybrid_alpha` and the weight of the keyword list
+    is `1 - hybrid_alpha` (so 1 is pure vector search, like in Vespa). The fused score
+    replaces `_score` on the returned hits, which are sorted best first.
+    """
+    fused_scores: dict[str, float] = {}
+    hits_by_id: dict[str, dict[str, Any]] = {}
+    for hits, weight in (
+        (keyword_hits, 1.0 - hybrid_alpha),
+        (vector_hits, hybrid_alpha),
+    ):
+        for rank, hit in enumerate(hits, start=1):
+            hit_id = hit["_id"]
+            hits_by_id.setdefault(hit_id, hit)
+            fused_scores[hit_id] = fused_scores.get(hit_id, 0.0) + weight / (
+                rank_constant + rank
+            )
+
+    # sorted is stable, ties keep the keyword ranking first
+    return [
+        {**hits_by_id[hit_id], "_score": score}
+        for hit_id, score in sorted(
+            fused_scores.items(), key=lambda item: item[1], reverse=True
+        )
+    ]
+
+
 def _process_dynamic_summary(
     dynamic_summary: str, max_summary_length: int = 400
 ) -> list[str]:
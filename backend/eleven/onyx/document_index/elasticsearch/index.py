@@ -4,11 +4,21 @@ from elasticsearch import Elasticsearch
 from elasticsearch.helpers import bulk
 from sqlalchemy.orm import Session
 
+from eleven.onyx.configs.app_configs import ELASTIC_ENTERPRISE_LICENSE
 from eleven.onyx.document_index.elasticsearch.chunk_retrieval import batch_id_retrieval
+from eleven.onyx.document_index.elasticsearch.chunk_retrieval import (
+    elasticsearch_hits_to_inference_chunks,
+)
+from eleven.onyx.document_index.elasticsearch.chunk_retrieval import (
+    fuse_hits_with_weighted_rrf,
+)
 from eleven.onyx.document_index.elasticsearch.chunk_retrieval import (
     individual_id_retrieval,
 )
 from eleven.onyx.document_index.elasticsearch.chunk_retrieval import query_elasticsearch
+from eleven.onyx.document_index.elasticsearch.chunk_retrieval import (
+    search_elasticsearch_hits,
+)
 from eleven.onyx.document_index.elasticsearch.chunk_utils import cleanup_chunks
 from eleven.onyx.document_index.elasticsearch.deletion import (
     delete_elasticsearch_chunks_bulk,
@@ -59,7 +69,7 @@ from eleven.onyx.document_index.elasticsearch.shared_utils.elasticsearch_request
     build_random_search_query,
 )
 from eleven.onyx.document_index.elasticsearch.utils import (
-    get_elasticsearch_client,
+    get_shared_elasticsearch_client,
 )
 from onyx.configs.chat_configs import TITLE_CONTENT_RATIO
 from onyx.context.search.models import IndexFilters
@@ -82,6 +92,7 @@ from onyx.document_index.interfaces import VespaDocumentUserFields
 from onyx.document_index.interfaces_new import TenantState
 from onyx.utils.batching import batch_generator
 from onyx.utils.logger import setup_logger
+from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 from shared_configs.model_server_models import Embedding
 
 logger = setup_logger()
@@ -129,7 +140,7 @@ class ElasticsearchIndex(OldDocumentIndex):
         if es_client:
             self.es_client = es_client
         else:
-            self.es_client = get_elasticsearch_client()
+            self.es_client = get_shared_elasticsearch_client()
 
         self.index_to_large_chunks_enabled: dict[str, bool] = {}
         self.index_to_large_chunks_enabled[index_name] = large_chunks_enabled
@@ -523,7 +534,7 @@ class ElasticsearchIndex(OldDocumentIndex):
         query_embedding: Embedding,
         final_keywords: list[str] | None,
         filters: IndexFilters,
-        hybrid_alpha: float,  # kept for API compatibility, NOT used by ES
+        hybrid_alpha: float,  # only used by the client-side fusion (basic license)
         time_decay_multiplier: float,  # not supported natively, ignored
         num_to_retrieve: int,
         ranking_profile_type: QueryExpansionType,
@@ -541,7 +552,10 @@ class ElasticsearchIndex(OldDocumentIndex):
 
         NOTE:
         - Elasticsearch does NOT support alpha-weighted hybrid (BM25 vs vector)
-        - hybrid_alpha is ignored by design
+        - hybrid_alpha is ignored by the native fusion
+        - retriever.rrf requires an enterprise license, on basic license clusters the
+          BM25 and KNN searches run concurrently and are fused client-side with an
+          RRF weighted by hybrid_alpha
         """
 
         # Filters
@@ -585,37 +599,16 @@ class ElasticsearchIndex(OldDocumentIndex):
         }
 
         if not ELASTIC_ENTERPRISE_LICENSE:
-            logger.info("Using rescoring instead of RRF due to license restrictions")
- 
-            params = {
-                "index": self.index_name,
-                "size": num_to_retrieve,
-                "from": offset,
-                "_source": {"excludes": ["vector"]},
-                "query": {
-                    "bool": {
-                        "must": [text_query],
-                        "filter": filter_clauses,
-                    }
-                }
-            }
- 
-            if query_embedding is not None and len(query_embedding) > 0:
-                params["rescore"] = {
-                    "window_size": num_to_retrieve * 2,
-                    "query": {
-                        "rescore_query": {
-                            "knn": {
-                                "field": EMBEDDINGS,
-                                "query_vector": query_embedding,
-                                "k": num_to_retrieve,
-                                "num_candidates": num_candidates,
-                            }
-                        },
-                        "query_weight": 1.0,
-                        "rescore_query_weight": 1.0,
-                    },
-                }
+            return self._client_side_hybrid_retrieval(
+                text_query=text_query,
+                query_embedding=query_embedding,
+                filter_clauses=filter_clauses,
+                hybrid_alpha=hybrid_alpha,
+                num_candidates=num_candidates,
+                rrf_rank_constant=rrf_rank_constant,
+                num_to_retrieve=num_to_retrieve,
+                offset=offset,
+            )
 
         standard_retriever = {
             "standard": {
@@ -662,6 +655,76 @@ class ElasticsearchIndex(OldDocumentIndex):
         raw_chunks = query_elasticsearch(params)
         return cleanup_chunks(raw_chunks)
 
+    def _client_side_hybrid_retrieval(
+        self,
+        text_query: dict,
+        query_embedding: Embedding,
+        filter_clauses: list,
+        hybrid_alpha: float,
+        num_candidates: int,
+        rrf_rank_constant: int,
+        num_to_retrieve: int,
+        offset: int,
+    ) -> list[InferenceChunk]:
+        """Hybrid search for clusters without the license needed by retriever.rrf.
+
+        The BM25 and KNN searches are sent concurrently and fused with a weighted RRF,
+        hybrid_alpha weighting the vector ranking like in Vespa. Both searches retrieve
+        the whole window up to offset + num_to_retrieve * 2 so pagination happens after
+        the fusion.
+        """
+        window_size = offset + num_to_retrieve * 2
+
+        keyword_params = {
+            "index": self.index_name,
+            "size": window_size,
+            "_source": {"excludes": ["vector"]},
+            "query": {
+                "bool": {
+                    "must": [text_query],
+                    "filter": filter_clauses,
+                }
+            },
+        }
+
+        if query_embedding is None or len(query_embedding) == 0:
+            keyword_hits = search_elasticsearch_hits(keyword_params)
+            raw_chunks = elasticsearch_hits_to_inference_chunks(
+                keyword_hits[offset : offset + num_to_retrieve]
+            )
+            return cleanup_chunks(raw_chunks)
+
+        vector_params = {
+            "index": self.index_name,
+            "size": window_size,
+            "_source": {"excludes": ["vector"]},
+            "knn": {
+                "field": EMBEDDINGS,
+                "query_vector": query_embedding,
+                "k": window_size,
+                # ES rejects num_candidates below k or above 10000
+                "num_candidates": min(max(num_candidates, window_size), 10000),
+                "filter": {"bool": {"must": filter_clauses}},
+            },
+        }
+
+        keyword_hits, vector_hits = run_functions_tuples_in_parallel(
+            [
+                (search_elasticsearch_hits, (keyword_params,)),
+                (search_elasticsearch_hits, (vector_params,)),
+            ]
+        )
+        fused_hits = fuse_hits_with_weighted_rrf(
+            keyword_hits,
+            vector_hits,
+            hybrid_alpha=hybrid_alpha,
+            rank_constant=rrf_rank_constant,
+        )
+        raw_chunks = elasticsearch_hits_to_inference_chunks(
+            fused_hits[offset : offset + num_to_retrieve]
+        )
+        return cleanup_chunks(raw_chunks)
+
     def admin_retrieval(
         self,
         query: str,
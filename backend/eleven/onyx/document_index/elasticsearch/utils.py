@@ -1,15 +1,20 @@
+import threading
 import time
 
 from elasticsearch import Elasticsearch
 
 from eleven.onyx.configs.app_configs import ELASTICSEARCH_API_KEY
 from eleven.onyx.configs.app_configs import ELASTICSEARCH_CLOUD_URL
+from eleven.onyx.configs.app_configs import ELASTICSEARCH_CONNECTIONS_PER_NODE
 from eleven.onyx.configs.app_configs import ELASTICSEARCH_REQUEST_TIMEOUT
 from eleven.onyx.configs.app_configs import MANAGED_ELASTICSEARCH
 from onyx.utils.logger import setup_logger
 
 logger = setup_logger()
 
+_shared_client: Elasticsearch | None = None
+_shared_client_lock = threading.Lock()
+
 
 def get_elasticsearch_client(no_timeout: bool = False) -> Elasticsearch:
     """
@@ -24,6 +29,28 @@ def get_elasticsearch_client(no_timeout: bool = False) -> Elasticsearch:
     )
 
 
+def get_shared_elasticsearch_client() -> Elasticsearch:
+    """
+    Return the Elasticsearch client shared by every query of the process.
+
+    The client is thread safe and pools its connections, so queries don't pay for a new
+    connection (and TLS handshake) each time. Callers must not close it.
+    """
+    global _shared_client
+
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = Elasticsearch(
+                    ELASTICSEARCH_CLOUD_URL,
+                    api_key=ELASTICSEARCH_API_KEY,
+                    verify_certs=False if not MANAGED_ELASTICSEARCH else True,
+                    timeout=ELASTICSEARCH_REQUEST_TIMEOUT,
+                    connections_per_node=ELASTICSEARCH_CONNECTIONS_PER_NODE,
+                )
+    return _shared_client
+
+
 # TODO check if we transform this in a more meta function
 def wait_for_elasticsearch_with_timeout(
     wait_interval: int = 5, wait_limit: int = 60, index_name: str = None
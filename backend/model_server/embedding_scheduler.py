@@ -0,0 +1,269 @@
+"""
+Request-coalescing scheduler for the local bi-encoder models.
+
+Concurrent `/encoder/bi-encoder-embed` requests for the same model / prefix / normalize
+setting are merged into a single `model.encode` call. Requests are bucketed by their
+(estimated) text length so that short queries are not padded up to the length of long
+passages, QUERY requests are always served before PASSAGE requests, and a single worker
+thread owns the models so that the tokenizers are never used concurrently (which is what
+used to cause the "Already borrowed" errors).
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import TYPE_CHECKING
+
+from prometheus_client import Gauge
+from prometheus_client import Histogram
+
+from onyx.utils.logger import setup_logger
+from shared_configs.configs import EMBEDDING_BATCH_MAX_TOKENS
+from shared_configs.configs import EMBEDDING_BATCH_MAX_WAIT_MS
+from shared_configs.enums import EmbedTextType
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+logger = setup_logger()
+
+# Rough chars-per-token ratio, only used for batching decisions so it doesn't
+# need to match the real tokenizer
+_CHARS_PER_TOKEN = 4
+
+_QUEUE_DEPTH = Gauge(
+    "onyx_model_server_embedding_queue_depth",
+    "Number of embedding requests waiting to be batched",
+    ["text_type"],
+)
+_BATCH_SIZE = Histogram(
+    "onyx_model_server_embedding_batch_size",
+    "Number of texts per coalesced embedding batch",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024),
+)
+_BATCH_REQUESTS = Histogram(
+    "onyx_model_server_embedding_batch_requests",
+    "Number of requests merged into a single embedding batch",
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16, 32, 64),
+)
+_WAIT_TIME = Histogram(
+    "onyx_model_server_embedding_wait_seconds",
+    "Time an embedding request spent queued before its batch started",
+    ["text_type"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+
+@dataclass(frozen=True)
+class BatchKey:
+    """Requests can only be merged if all of these match."""
+
+    model_name: str
+    max_context_length: int
+    normalize_embeddings: bool
+    prefix: str | None
+    text_type: EmbedTextType | None
+
+
+@dataclass
+class _PendingRequest:
+    key: BatchKey
+    texts: list[str]
+    num_tokens: int
+    length_bucket: int
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+def estimate_num_tokens(text: str, max_context_length: int) -> int:
+    # The model truncates anything above max_context_length
+    return min(len(text) // _CHARS_PER_TOKEN + 1, max_context_length)
+
+
+def _length_bucket(num_tokens: int) -> int:
+    # Power-of-two buckets: requests whose longest text is within 2x of each other
+    # are padded to similar lengths inside the model
+    return num_tokens.bit_length()
+
+
+def _text_type_label(text_type: EmbedTextType | None) -> str:
+    return text_type.value if text_type else "none"
+
+
+def _set_future_result(future: asyncio.Future, result: Any) -> None:
+    # the awaiting request may have been cancelled (e.g. client disconnected)
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_future_exception(future: asyncio.Future, exc: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exc)
+
+
+class EmbeddingScheduler:
+    def __init__(
+        self,
+        model_loader: Callable[[str, int], "SentenceTransformer"],
+        max_wait_seconds: float = EMBEDDING_BATCH_MAX_WAIT_MS / 1000,
+        max_batch_tokens: int = EMBEDDING_BATCH_MAX_TOKENS,
+    ) -> None:
+        self._model_loader = model_loader
+        self._max_wait_seconds = max_wait_seconds
+        self._max_batch_tokens = max_batch_tokens
+
+        self._cond = threading.Condition()
+        # QUERY requests are latency sensitive (a user is waiting on them),
+        # so they get their own queue which is always drained first
+        self._query_queue: deque[_PendingRequest] = deque()
+        self._passage_queue: deque[_PendingRequest] = deque()
+        self._worker: threading.Thread | None = None
+
+    async def embed(
+        self,
+        texts: list[str],
+        model_name: str,
+        max_context_length: int,
+        normalize_embeddings: bool,
+        prefix: str | None,
+        text_type: EmbedTextType | None,
+    ) -> Any:
+        """Returns one vector per text, in the same order as `texts`."""
+        key = BatchKey(
+            model_name=model_name,
+            max_context_length=max_context_length,
+            normalize_embeddings=normalize_embeddings,
+            prefix=prefix,
+            text_type=text_type,
+        )
+        token_counts = [estimate_num_tokens(t, max_context_length) for t in texts]
+        loop = asyncio.get_running_loop()
+        pending = _PendingRequest(
+            key=key,
+            texts=[f"{prefix}{text}" for text in texts] if prefix else texts,
+            num_tokens=sum(token_counts),
+            length_bucket=_length_bucket(max(token_counts)),
+            loop=loop,
+            future=loop.create_future(),
+        )
+
+        with self._cond:
+            self._ensure_worker_started()
+            self._queue_for(text_type).append(pending)
+            _QUEUE_DEPTH.labels(_text_type_label(text_type)).inc()
+            self._cond.notify()
+
+        return await pending.future
+
+    def _queue_for(self, text_type: EmbedTextType | None) -> deque[_PendingRequest]:
+        if text_type == EmbedTextType.QUERY:
+            return self._query_queue
+        return self._passage_queue
+
+    def _ensure_worker_started(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(
+            target=self._run, name="embedding-scheduler", daemon=True
+        )
+        self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                self._process_batch(batch)
+            except Exception:
+                # _process_batch already reports errors to the waiting requests,
+                # this is only here so the worker never dies
+                logger.exception("Unexpected error in embedding scheduler")
+
+    def _collect(
+        self, queue: deque[_PendingRequest]
+    ) -> tuple[list[_PendingRequest], int]:
+        """Picks the requests that can be merged with the head of the queue, in
+        FIFO order, without exceeding the token budget. The head is always included
+        so that oversized requests still make progress."""
+        head = queue[0]
+        batch = [head]
+        num_tokens = head.num_tokens
+        for pending in list(queue)[1:]:
+            if pending.key != head.key or pending.length_bucket != head.length_bucket:
+                continue
+            if num_tokens + pending.num_tokens > self._max_batch_tokens:
+                break
+            batch.append(pending)
+            num_tokens += pending.num_tokens
+        return batch, num_tokens
+
+    def _next_batch(self) -> list[_PendingRequest]:
+        with self._cond:
+            while True:
+                while not self._query_queue and not self._passage_queue:
+                    self._cond.wait()
+
+                queue = self._query_queue or self._passage_queue
+                batch, num_tokens = self._collect(queue)
+
+                # Dispatch once the batch is full or the oldest request has waited
+                # long enough. Otherwise wait for more requests (or for a query to
+                # arrive and jump the line) until the window closes.
+                remaining = (
+                    batch[0].enqueued_at + self._max_wait_seconds - time.monotonic()
+                )
+                if num_tokens >= self._max_batch_tokens or remaining <= 0:
+                    selected = {id(pending) for pending in batch}
+                    kept = [p for p in queue if id(p) not in selected]
+                    queue.clear()
+                    queue.extend(kept)
+                    _QUEUE_DEPTH.labels(_text_type_label(batch[0].key.text_type)).dec(
+                        len(batch)
+                    )
+                    return batch
+
+                self._cond.wait(remaining)
+
+    def _process_batch(self, batch: list[_PendingRequest]) -> None:
+        key = batch[0].key
+        start = time.monotonic()
+        for pending in batch:
+            _WAIT_TIME.labels(_text_type_label(key.text_type)).observe(
+                start - pending.enqueued_at
+            )
+
+        texts = [text for pending in batch for text in pending.texts]
+        _BATCH_SIZE.observe(len(texts))
+        _BATCH_REQUESTS.observe(len(batch))
+
+        try:
+            model = self._model_loader(key.model_name, key.max_context_length)
+            vectors = model.encode(texts, normalize_embeddings=key.normalize_embeddings)
+            if len(vectors) != len(texts):
+                raise RuntimeError(
+                    f"Model returned {len(vectors)} embeddings for {len(texts)} texts"
+                )
+        except Exception as e:
+            for pending in batch:
+                pending.loop.call_soon_threadsafe(
+                    _set_future_exception, pending.future, e
+                )
+            return
+
+        offset = 0
+        for pending in batch:
+            result = vectors[offset : offset + len(pending.texts)]
+            offset += len(pending.texts)
+            pending.loop.call_soon_threadsafe(
+                _set_future_result, pending.future, result
+            )
+
+        logger.debug(
+            f"Embedded batch of {len(texts)} texts from {len(batch)} requests "
+            f"with model {key.model_name} in {time.monotonic() - start:.3f}s"
+        )
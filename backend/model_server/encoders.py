@@ -1,14 +1,19 @@
-import asyncio
 import time
-from typing import Any
 from typing import TYPE_CHECKING
 
+import numpy as np
 from fastapi import APIRouter
 from fastapi import HTTPException
 from fastapi import Request
+from fastapi import Response
 
+from model_server.embedding_scheduler import EmbeddingScheduler
 from model_server.utils import simple_log_function_time
 from onyx.utils.logger import setup_logger
+from shared_configs.embedding_codec import EMBEDDING_BINARY_MEDIA_TYPE
+from shared_configs.embedding_codec import EmbeddingWireDtype
+from shared_configs.embedding_codec import encode_embeddings
+from shared_configs.embedding_codec import parse_binary_accept_header
 from shared_configs.enums import EmbedTextType
 from shared_configs.model_server_models import Embedding
 from shared_configs.model_server_models import EmbedRequest
@@ -78,36 +83,34 @@ def get_embedding_model(
     return _GLOBAL_MODELS_DICT[model_name]
 
 
-ENCODING_RETRIES = 3
-ENCODING_RETRY_DELAY = 0.1
+_EMBEDDING_SCHEDULER: EmbeddingScheduler | None = None
 
 
-def _concurrent_embedding(
-    texts: list[str], model: "SentenceTransformer", normalize_embeddings: bool
-) -> Any:
-    """Synchronous wrapper for concurrent_embedding to use with run_in_executor."""
-    for _ in range(ENCODING_RETRIES):
-        try:
-            return model.encode(texts, normalize_embeddings=normalize_embeddings)
-        except RuntimeError as e:
-            # There is a concurrency bug in the SentenceTransformer library that causes
-            # the model to fail to encode texts. It's pretty rare and we want to allow
-            # concurrent embedding, hence we retry (the specific error is
-            # "RuntimeError: Already borrowed" and occurs in the transformers library)
-            logger.warning(f"Error encoding texts, retrying: {e}")
-            time.sleep(ENCODING_RETRY_DELAY)
-    return model.encode(texts, normalize_embeddings=normalize_embeddings)
+def get_embedding_scheduler() -> EmbeddingScheduler:
+    global _EMBEDDING_SCHEDULER
+
+    if _EMBEDDING_SCHEDULER is None:
+        # resolved at call time so the loader can be swapped out (e.g. in tests)
+        _EMBEDDING_SCHEDULER = EmbeddingScheduler(
+            model_loader=lambda model_name, max_context_length: get_embedding_model(
+                model_name=model_name, max_context_length=max_context_length
+            )
+        )
+    return _EMBEDDING_SCHEDULER
 
 
 @simple_log_function_time()
-async def embed_text(
+async def embed_text_vectors(
     texts: list[str],
     model_name: str | None,
     max_context_length: int,
     normalize_embeddings: bool,
     prefix: str | None,
     gpu_type: str = "UNKNOWN",
-) -> list[Embedding]:
+    text_type: EmbedTextType | None = None,
+) -> np.ndarray:
+    """Returns the embeddings as a (len(texts), dim) array, use `embed_text` if
+    plain lists are needed."""
     if not all(texts):
         logger.error("Empty strings provided for embedding")
         raise ValueError("Empty strings are not allowed for embedding.")
@@ -130,22 +133,17 @@ async def embed_text(
             f"Embedding {len(texts)} texts with {total_chars} total characters with local model: {model_name}"
         )
 
-        prefixed_texts = [f"{prefix}{text}" for text in texts] if prefix else texts
-
-        local_model = get_embedding_model(
-            model_name=model_name, max_context_length=max_context_length
-        )
-        # Run CPU-bound embedding in a thread pool
-        embeddings_vectors = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: _concurrent_embedding(
-                prefixed_texts, local_model, normalize_embeddings
-            ),
+        # Concurrent requests are coalesced into shared batches, the model itself
+        # only ever runs on the scheduler's worker thread
+        embeddings_vectors = await get_embedding_scheduler().embed(
+            texts=texts,
+            model_name=model_name,
+            max_context_length=max_context_length,
+            normalize_embeddings=normalize_embeddings,
+            prefix=prefix,
+            text_type=text_type,
         )
-        embeddings = [
-            embedding if isinstance(embedding, list) else embedding.tolist()
-            for embedding in embeddings_vectors
-        ]
+        embeddings = np.asarray(embeddings_vectors)
 
         elapsed = time.monotonic() - start
         logger.info(
@@ -167,17 +165,45 @@ async def embed_text(
     return embeddings
 
 
-@router.post("/bi-encoder-embed")
+async def embed_text(
+    texts: list[str],
+    model_name: str | None,
+    max_context_length: int,
+    normalize_embeddings: bool,
+    prefix: str | None,
+    gpu_type: str = "UNKNOWN",
+    text_type: EmbedTextType | None = None,
+) -> list[Embedding]:
+    embeddings = await embed_text_vectors(
+        texts=texts,
+        model_name=model_name,
+        max_context_length=max_context_length,
+        normalize_embeddings=normalize_embeddings,
+        prefix=prefix,
+        gpu_type=gpu_type,
+        text_type=text_type,
+    )
+    return embeddings.tolist()
+
+
+@router.post("/bi-encoder-embed", response_model=EmbedResponse)
 async def route_bi_encoder_embed(
     request: Request,
     embed_request: EmbedRequest,
-) -> EmbedResponse:
-    return await process_embed_request(embed_request, request.app.state.gpu_type)
+) -> EmbedResponse | Response:
+    # Clients that understand the binary format ask for it via the Accept header,
+    # everyone else (including older clients) keeps getting JSON
+    wire_dtype = parse_binary_accept_header(request.headers.get("accept"))
+    return await process_embed_request(
+        embed_request, request.app.state.gpu_type, wire_dtype=wire_dtype
+    )
 
 
 async def process_embed_request(
-    embed_request: EmbedRequest, gpu_type: str = "UNKNOWN"
-) -> EmbedResponse:
+    embed_request: EmbedRequest,
+    gpu_type: str = "UNKNOWN",
+    wire_dtype: EmbeddingWireDtype | None = None,
+) -> EmbedResponse | Response:
     from litellm.exceptions import RateLimitError
 
     # Only local models should use this endpoint - API providers should make direct API calls
@@ -201,15 +227,21 @@ async def process_embed_request(
         else:
             prefix = None
 
-        embeddings = await embed_text(
+        embeddings = await embed_text_vectors(
             texts=embed_request.texts,
             model_name=embed_request.model_name,
             max_context_length=embed_request.max_context_length,
             normalize_embeddings=embed_request.normalize_embeddings,
             prefix=prefix,
             gpu_type=gpu_type,
+            text_type=embed_request.text_type,
         )
-        return EmbedResponse(embeddings=embeddings)
+        if wire_dtype is not None:
+            return Response(
+                content=encode_embeddings(embeddings, wire_dtype),
+                media_type=EMBEDDING_BINARY_MEDIA_TYPE,
+            )
+        return EmbedResponse(embeddings=embeddings.tolist())
     except RateLimitError as e:
         raise HTTPException(
             status_code=429,
@@ -4,6 +4,8 @@ from typing import cast
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import Session
 
+from onyx.access.acl_cache import get_user_acl_with_cache
+from onyx.access.acl_cache import user_acl_cache_enabled
 from onyx.access.models import DocumentAccess
 from onyx.access.utils import prefix_user_email
 from onyx.configs.constants import DocumentSource
@@ -115,7 +117,13 @@ def get_acl_for_user(user: User | None, db_session: Session | None = None) -> se
     versioned_acl_for_user_fn = fetch_versioned_implementation(
         "onyx.access.access", "_get_acl_for_user"
     )
-    return versioned_acl_for_user_fn(user, db_session)
+    if user is None or not user_acl_cache_enabled():
+        return versioned_acl_for_user_fn(user, db_session)
+
+    return get_user_acl_with_cache(
+        user_id=str(user.id),
+        compute_acl=lambda: versioned_acl_for_user_fn(user, db_session),
+    )
 
 
 def source_should_fetch_permissions_during_indexing(source: DocumentSource) -> bool:
@@ -0,0 +1,168 @@
+"""
+Two-tier cache for the ACL entries of each user.
+
+Building the ACL of a user joins the user groups and the synced external groups of the
+user, which is expensive for users in many external groups and runs on every search.
+Tier 1 is a small in-process LRU, tier 2 is Redis (shared by every api server / bot
+process of the tenant) with a TTL.
+
+Every entry is stamped with a per-tenant version counter stored in Redis. Anything that
+changes group membership bumps the counter (`invalidate_user_acl_cache`), which makes
+every cached entry of the tenant stale at once in every process. The counter and the
+Redis entry are read with a single `mget`, so a lookup costs one round trip instead of
+the group queries. If Redis is unavailable the ACL is always computed from Postgres.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from prometheus_client import Counter
+from redis import Redis
+
+from onyx.configs.chat_configs import USER_ACL_CACHE_LOCAL_SIZE
+from onyx.configs.chat_configs import USER_ACL_CACHE_TTL_SECONDS
+from onyx.redis.redis_pool import get_redis_client
+from onyx.utils.logger import setup_logger
+from shared_configs.contextvars import get_current_tenant_id
+
+logger = setup_logger()
+
+_REDIS_KEY_PREFIX = "user_acl"
+
+_CACHE_LOOKUPS = Counter(
+    "onyx_user_acl_cache_lookups_total",
+    "User ACL cache lookups by tier and result",
+    ["tier", "result"],
+)
+
+
+def _version_key(tenant_id: str) -> str:
+    # mget / pipelines don't automatically add the tenant_id prefix
+    return f"{tenant_id}:{_REDIS_KEY_PREFIX}_version"
+
+
+def _redis_key(tenant_id: str, user_id: str) -> str:
+    return f"{tenant_id}:{_REDIS_KEY_PREFIX}:{user_id}"
+
+
+class _LocalAclCache:
+    """Thread safe LRU with a per-entry expiry and version."""
+
+    def __init__(self, max_size: int, ttl_seconds: int) -> None:
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, str], tuple[float, int, set[str]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str], version: int) -> set[str] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, entry_version, acl = entry
+            if entry_version != version or expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return set(acl)
+
+    def set(self, key: tuple[str, str], version: int, acl: set[str]) -> None:
+        with self._lock:
+            self._entries[key] = (
+                time.monotonic() + self._ttl_seconds,
+                version,
+                set(acl),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: str) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == tenant_id:
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_local_cache = _LocalAclCache(
+    max_size=USER_ACL_CACHE_LOCAL_SIZE,
+    ttl_seconds=USER_ACL_CACHE_TTL_SECONDS,
+)
+
+
+def user_acl_cache_enabled() -> bool:
+    return USER_ACL_CACHE_TTL_SECONDS > 0
+
+
+def get_user_acl_with_cache(
+    user_id: str,
+    compute_acl: Callable[[], set[str]],
+    redis_client: Redis | None = None,
+) -> set[str]:
+    """Returns the cached ACL of the user, calling `compute_acl` on a miss."""
+    tenant_id = get_current_tenant_id()
+    local_key = (tenant_id, user_id)
+
+    try:
+        r = redis_client or get_redis_client(tenant_id=tenant_id)
+        raw_version, raw_entry = r.mget(
+            [_version_key(tenant_id), _redis_key(tenant_id, user_id)]
+        )
+    except Exception:
+        logger.warning("Failed to read user ACL from Redis", exc_info=True)
+        return compute_acl()
+
+    version = int(raw_version) if raw_version is not None else 0
+
+    acl = _local_cache.get(local_key, version)
+    if acl is not None:
+        _CACHE_LOOKUPS.labels("local", "hit").inc()
+        return acl
+    _CACHE_LOOKUPS.labels("local", "miss").inc()
+
+    if raw_entry is not None:
+        entry = json.loads(raw_entry)
+        if entry["version"] == version:
+            _CACHE_LOOKUPS.labels("redis", "hit").inc()
+            acl = set(entry["acl"])
+            _local_cache.set(local_key, version, acl)
+            return acl
+    _CACHE_LOOKUPS.labels("redis", "miss").inc()
+
+    # Stamped with the version read before computing, so a concurrent invalidation
+    # makes this entry stale rather than being lost
+    acl = compute_acl()
+    _local_cache.set(local_key, version, acl)
+    try:
+        r.set(
+            _redis_key(tenant_id, user_id),
+            json.dumps({"version": version, "acl": sorted(acl)}),
+            ex=USER_ACL_CACHE_TTL_SECONDS,
+        )
+    except Exception:
+        logger.warning("Failed to write user ACL to Redis", exc_info=True)
+    return acl
+
+
+def invalidate_user_acl_cache(redis_client: Redis | None = None) -> None:
+    """Marks every cached ACL of the current tenant as stale. Must be called after the
+    group membership change has been committed."""
+    if not user_acl_cache_enabled():
+        return
+
+    tenant_id = get_current_tenant_id()
+    _local_cache.invalidate(tenant_id)
+    try:
+        r = redis_client or get_redis_client(tenant_id=tenant_id)
+        r.incr(_version_key(tenant_id))
+    except Exception:
+        logger.warning("Failed to invalidate user ACLs in Redis", exc_info=True)
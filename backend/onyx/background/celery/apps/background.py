@@ -18,6 +18,7 @@ from onyx.configs.app_configs import VESPA_CLOUD_CERT_PATH
 from onyx.configs.app_configs import VESPA_CLOUD_KEY_PATH
 from onyx.configs.constants import POSTGRES_CELERY_WORKER_BACKGROUND_APP_NAME
 from onyx.db.engine.sql_engine import SqlEngine
+from onyx.document_index.vespa.shared_utils.utils import init_vespa_query_client
 from onyx.utils.logger import setup_logger
 from shared_configs.configs import MULTI_TENANT
 
@@ -79,6 +80,7 @@ def on_worker_init(sender: Worker, **kwargs: Any) -> None:
         )
     else:
         httpx_init_vespa_pool(sender.concurrency + EXTRA_CONCURRENCY)  # type: ignore
+    init_vespa_query_client()
 
     app_base.wait_for_redis(sender, **kwargs)
     app_base.wait_for_db(sender, **kwargs)
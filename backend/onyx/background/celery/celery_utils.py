@@ -38,18 +38,18 @@ def document_batch_to_ids(
         yield {doc.id for doc in doc_list}
 
 
-def extract_ids_from_runnable_connector(
+def iter_ids_from_runnable_connector(
     runnable_connector: BaseConnector,
     callback: IndexingHeartbeatInterface | None = None,
-) -> set[str]:
+) -> Generator[set[str], None, None]:
     """
+    Yields the document ids of the connector one batch at a time.
+
     If the given connector is neither a SlimConnector nor a SlimConnectorWithPermSync, just pull
     all docs using the load_from_state and grab out the IDs.
 
     Optionally, a callback can be passed to handle the length of each document batch.
     """
-    all_connector_doc_ids: set[str] = set()
-
     doc_batch_id_generator = None
     if isinstance(runnable_connector, SlimConnector):
         doc_batch_id_generator = document_batch_to_ids(
@@ -99,11 +99,21 @@ def extract_ids_from_runnable_connector(
                     "extract_ids_from_runnable_connector: Stop signal detected"
                 )
 
-        all_connector_doc_ids.update(doc_batch_processing_func(doc_batch_ids))
+        yield doc_batch_processing_func(doc_batch_ids)
 
         if callback:
             callback.progress("extract_ids_from_runnable_connector", len(doc_batch_ids))
 
+
+def extract_ids_from_runnable_connector(
+    runnable_connector: BaseConnector,
+    callback: IndexingHeartbeatInterface | None = None,
+) -> set[str]:
+    """Collects every document id of the connector into a single set."""
+    all_connector_doc_ids: set[str] = set()
+    for doc_batch_ids in iter_ids_from_runnable_connector(runnable_connector, callback):
+        all_connector_doc_ids.update(doc_batch_ids)
+
     return all_connector_doc_ids
 
 
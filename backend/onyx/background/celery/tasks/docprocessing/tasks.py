@@ -63,8 +63,10 @@ from onyx.db.connector_credential_pair import (
     fetch_indexable_standard_connector_credential_pair_ids,
 )
 from onyx.db.connector_credential_pair import get_connector_credential_pair_from_id
+from onyx.db.connector_credential_pair import get_connector_credential_pairs
 from onyx.db.connector_credential_pair import set_cc_pair_repeated_error_state
 from onyx.db.connector_credential_pair import update_connector_credential_pair_from_id
+from onyx.db.document import reconcile_document_count_for_cc_pair
 from onyx.db.engine.sql_engine import get_session_with_current_tenant
 from onyx.db.engine.time_utils import get_db_current_time
 from onyx.db.enums import ConnectorCredentialPairStatus
@@ -1154,6 +1156,72 @@ def check_for_index_attempt_cleanup(self: Task, *, tenant_id: str) -> None:
                 )
 
 
+# primary
+@shared_task(
+    name=OnyxCeleryTask.CHECK_FOR_DOCUMENT_COUNT_RECONCILIATION,
+    soft_time_limit=3600,
+    bind=True,
+)
+def check_for_document_count_reconciliation(self: Task, *, tenant_id: str) -> None:
+    """Recounts the indexed documents of every cc pair and fixes stored counts
+    that drifted, e.g. from writes by processes running older code."""
+    locked = False
+    redis_client = get_redis_client(tenant_id=tenant_id)
+    lock: RedisLock = redis_client.lock(
+        OnyxRedisLocks.CHECK_DOCUMENT_COUNT_RECONCILIATION_BEAT_LOCK,
+        timeout=CELERY_GENERIC_BEAT_LOCK_TIMEOUT,
+    )
+
+    # these tasks should never overlap
+    if not lock.acquire(blocking=False):
+        task_logger.info(
+            "check_for_document_count_reconciliation - Lock not acquired: "
+            f"tenant={tenant_id}"
+        )
+        return None
+
+    try:
+        locked = True
+        with get_session_with_current_tenant() as db_session:
+            cc_pair_keys = [
+                (cc_pair.id, cc_pair.connector_id, cc_pair.credential_id)
+                for cc_pair in get_connector_credential_pairs(db_session)
+            ]
+
+        num_drifted = 0
+        for cc_pair_id, connector_id, credential_id in cc_pair_keys:
+            lock.reacquire()
+            with get_session_with_current_tenant() as db_session:
+                drift = reconcile_document_count_for_cc_pair(
+                    db_session, connector_id, credential_id
+                )
+            if drift:
+                num_drifted += 1
+                task_logger.warning(
+                    "check_for_document_count_reconciliation - Fixed document count: "
+                    f"cc_pair={cc_pair_id} drift={drift}"
+                )
+
+        task_logger.info(
+            "check_for_document_count_reconciliation finished: "
+            f"cc_pairs={len(cc_pair_keys)} drifted={num_drifted}"
+        )
+    except Exception:
+        task_logger.exception(
+            "Unexpected exception during document count reconciliation"
+        )
+        return None
+    finally:
+        if locked:
+            if lock.owned():
+                lock.release()
+            else:
+                task_logger.error(
+                    "check_for_document_count_reconciliation - Lock not owned on "
+                    f"completion: tenant={tenant_id}"
+                )
+
+
 # light worker
 @shared_task(
     name=OnyxCeleryTask.CLEANUP_INDEX_ATTEMPT,
@@ -1593,6 +1661,7 @@ def _docprocessing_task(
             f"batch_num={batch_num} "
             f"docs={len(index_pipeline_result.failures) + index_pipeline_result.total_docs} "
             f"chunks={index_pipeline_result.total_chunks} "
+            f"reused_chunks={index_pipeline_result.reused_chunks} "
             f"failures={len(index_pipeline_result.failures)} "
             f"elapsed={elapsed_time:.2f}s"
         )
@@ -21,10 +21,12 @@ from onyx.background.celery.celery_redis import celery_get_queue_length
 from onyx.background.celery.celery_redis import celery_get_queued_task_ids
 from onyx.background.celery.celery_redis import celery_get_unacked_task_ids
 from onyx.background.celery.celery_utils import extract_ids_from_runnable_connector
+from onyx.background.celery.celery_utils import iter_ids_from_runnable_connector
 from onyx.background.celery.tasks.beat_schedule import CLOUD_BEAT_MULTIPLIER_DEFAULT
 from onyx.background.celery.tasks.docprocessing.utils import IndexingCallbackBase
 from onyx.configs.app_configs import ALLOW_SIMULTANEOUS_PRUNING
 from onyx.configs.app_configs import JOB_TIMEOUT
+from onyx.configs.app_configs import PRUNING_DIFF_IN_POSTGRES
 from onyx.configs.constants import CELERY_GENERIC_BEAT_LOCK_TIMEOUT
 from onyx.configs.constants import CELERY_PRUNING_LOCK_TIMEOUT
 from onyx.configs.constants import CELERY_TASK_WAIT_FOR_FENCE_TIMEOUT
@@ -47,6 +49,9 @@ from onyx.db.enums import ConnectorCredentialPairStatus
 from onyx.db.enums import SyncStatus
 from onyx.db.enums import SyncType
 from onyx.db.models import ConnectorCredentialPair
+from onyx.db.pruning import get_session_with_source_doc_id_table
+from onyx.db.pruning import iter_doc_ids_missing_from_source
+from onyx.db.pruning import load_source_doc_ids
 from onyx.db.sync_record import insert_sync_record
 from onyx.db.sync_record import update_sync_record_status
 from onyx.db.tag import delete_orphan_tags__no_commit
@@ -525,37 +530,69 @@ def connector_pruning_generator_task(
                 r,
             )
 
-            # a list of docs in the source
-            all_connector_doc_ids: set[str] = extract_ids_from_runnable_connector(
-                runnable_connector, callback
-            )
+            if PRUNING_DIFF_IN_POSTGRES:
+                # the source ids are spilled into a temp table and the docs to remove
+                # are streamed out of Postgres, so memory doesn't grow with the corpus
+                with get_session_with_source_doc_id_table(tenant_id) as diff_session:
+                    num_source_docs = load_source_doc_ids(
+                        diff_session,
+                        iter_ids_from_runnable_connector(runnable_connector, callback),
+                    )
+
+                    task_logger.info(
+                        "Pruning source ids loaded: "
+                        f"cc_pair={cc_pair_id} "
+                        f"connector_source={cc_pair.connector.source} "
+                        f"source_docs={num_source_docs}"
+                    )
 
-            # a list of docs in our local index
-            all_indexed_document_ids = {
-                doc.id
-                for doc in get_documents_for_connector_credential_pair(
-                    db_session=db_session,
-                    connector_id=connector_id,
-                    credential_id=credential_id,
+                    task_logger.info(
+                        "RedisConnector.prune.generate_tasks starting. "
+                        f"cc_pair={cc_pair_id}"
+                    )
+                    tasks_generated = redis_connector.prune.generate_tasks(
+                        iter_doc_ids_missing_from_source(
+                            diff_session, connector_id, credential_id
+                        ),
+                        self.app,
+                        db_session,
+                        None,
+                    )
+            else:
+                # a list of docs in the source
+                all_connector_doc_ids: set[str] = extract_ids_from_runnable_connector(
+                    runnable_connector, callback
                 )
-            }
 
-            # generate list of docs to remove (no longer in the source)
-            doc_ids_to_remove = list(all_indexed_document_ids - all_connector_doc_ids)
+                # a list of docs in our local index
+                all_indexed_document_ids = {
+                    doc.id
+                    for doc in get_documents_for_connector_credential_pair(
+                        db_session=db_session,
+                        connector_id=connector_id,
+                        credential_id=credential_id,
+                    )
+                }
 
-            task_logger.info(
-                "Pruning set collected: "
-                f"cc_pair={cc_pair_id} "
-                f"connector_source={cc_pair.connector.source} "
-                f"docs_to_remove={len(doc_ids_to_remove)}"
-            )
+                # generate list of docs to remove (no longer in the source)
+                doc_ids_to_remove = list(
+                    all_indexed_document_ids - all_connector_doc_ids
+                )
 
-            task_logger.info(
-                f"RedisConnector.prune.generate_tasks starting. cc_pair={cc_pair_id}"
-            )
-            tasks_generated = redis_connector.prune.generate_tasks(
-                set(doc_ids_to_remove), self.app, db_session, None
-            )
+                task_logger.info(
+                    "Pruning set collected: "
+                    f"cc_pair={cc_pair_id} "
+                    f"connector_source={cc_pair.connector.source} "
+                    f"docs_to_remove={len(doc_ids_to_remove)}"
+                )
+
+                task_logger.info(
+                    "RedisConnector.prune.generate_tasks starting. "
+                    f"cc_pair={cc_pair_id}"
+                )
+                tasks_generated = redis_connector.prune.generate_tasks(
+                    set(doc_ids_to_remove), self.app, db_session, None
+                )
             if tasks_generated is None:
                 return None
 
@@ -8,6 +8,7 @@ from redis.lock import Lock as RedisLock
 from sqlalchemy.orm import Session
 
 from onyx.configs.app_configs import DB_YIELD_PER_DEFAULT
+from onyx.configs.app_configs import VESPA_SYNC_BATCH_SIZE
 from onyx.configs.constants import CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT
 from onyx.configs.constants import OnyxCeleryPriority
 from onyx.configs.constants import OnyxCeleryQueues
@@ -15,6 +16,7 @@ from onyx.configs.constants import OnyxCeleryTask
 from onyx.configs.constants import OnyxRedisConstants
 from onyx.db.document import construct_document_id_select_by_needs_sync
 from onyx.db.document import count_documents_by_needs_sync
+from onyx.utils.batching import batch_generator
 from onyx.utils.logger import setup_logger
 
 # Redis keys for document sync tracking
@@ -33,7 +35,7 @@ def is_document_sync_fenced(r: Redis) -> bool:
 
 
 def get_document_sync_payload(r: Redis) -> int | None:
-    """Get the initial number of tasks that were created."""
+    """Get the initial number of (batch) tasks that were created."""
     bytes_result = r.get(DOCUMENT_SYNC_FENCE_KEY)
     if bytes_result is None:
         return None
@@ -80,7 +82,8 @@ def generate_document_sync_tasks(
 
     Args:
         r: Redis client
-        max_tasks: Maximum number of tasks to generate
+        max_tasks: Maximum number of tasks to generate, each task syncs a batch of
+            documents
         celery_app: Celery application instance
         db_session: Database session
         lock: Redis lock for coordination
@@ -95,9 +98,10 @@ def generate_document_sync_tasks(
 
     # Get all documents that need syncing
     stmt = construct_document_id_select_by_needs_sync()
+    doc_ids = db_session.scalars(stmt).yield_per(DB_YIELD_PER_DEFAULT)
 
-    for doc_id in db_session.scalars(stmt).yield_per(DB_YIELD_PER_DEFAULT):
-        doc_id = cast(str, doc_id)
+    # Each task syncs a page of documents, the taskset counts batches
+    for doc_id_batch in batch_generator(doc_ids, VESPA_SYNC_BATCH_SIZE):
         current_time = time.monotonic()
 
         # Reacquire lock periodically to prevent timeout
@@ -105,7 +109,7 @@ def generate_document_sync_tasks(
             lock.reacquire()
             last_lock_time = current_time
 
-        num_docs += 1
+        num_docs += len(doc_id_batch)
 
         # Create a unique task ID
         custom_task_id = f"{DOCUMENT_SYNC_PREFIX}_{uuid4()}"
@@ -116,8 +120,8 @@ def generate_document_sync_tasks(
 
         # Create the Celery task
         celery_app.send_task(
-            OnyxCeleryTask.VESPA_METADATA_SYNC_TASK,
-            kwargs=dict(document_id=doc_id, tenant_id=tenant_id),
+            OnyxCeleryTask.VESPA_METADATA_SYNC_BATCH_TASK,
+            kwargs=dict(document_ids=doc_id_batch, tenant_id=tenant_id),
             queue=OnyxCeleryQueues.VESPA_METADATA_SYNC,
             task_id=custom_task_id,
             priority=OnyxCeleryPriority.MEDIUM,
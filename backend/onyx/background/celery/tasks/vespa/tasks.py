@@ -15,6 +15,8 @@ from sqlalchemy.orm import Session
 from tenacity import RetryError
 
 from onyx.access.access import get_access_for_document
+from onyx.access.access import get_access_for_documents
+from onyx.access.access import get_null_document_access
 from onyx.background.celery.apps.app_base import task_logger
 from onyx.background.celery.tasks.shared.RetryDocumentIndex import RetryDocumentIndex
 from onyx.background.celery.tasks.shared.tasks import LIGHT_SOFT_TIME_LIMIT
@@ -34,10 +36,13 @@ from onyx.configs.constants import OnyxCeleryTask
 from onyx.configs.constants import OnyxRedisConstants
 from onyx.configs.constants import OnyxRedisLocks
 from onyx.db.document import get_document
+from onyx.db.document import get_documents_by_ids
 from onyx.db.document import mark_document_as_synced
+from onyx.db.document import mark_documents_as_synced
 from onyx.db.document_set import delete_document_set
 from onyx.db.document_set import fetch_document_sets
 from onyx.db.document_set import fetch_document_sets_for_document
+from onyx.db.document_set import fetch_document_sets_for_documents
 from onyx.db.document_set import get_document_set_by_id
 from onyx.db.document_set import mark_document_set_as_synced
 from onyx.db.engine.sql_engine import get_session_with_current_tenant
@@ -50,6 +55,9 @@ from onyx.db.sync_record import cleanup_sync_records
 from onyx.db.sync_record import insert_sync_record
 from onyx.db.sync_record import update_sync_record_status
 from onyx.document_index.factory import get_all_document_indices
+from onyx.document_index.interfaces import DocumentIndex
+from onyx.document_index.interfaces import MinimalDocumentIndexingInfo
+from onyx.document_index.interfaces import UpdateRequest
 from onyx.document_index.interfaces import VespaDocumentFields
 from onyx.httpx.httpx_pool import HttpxPool
 from onyx.redis.redis_document_set import RedisDocumentSet
@@ -67,6 +75,11 @@ from onyx.utils.variable_functionality import noop_fallback
 
 logger = setup_logger()
 
+# A batch makes a single retried update call per index, but that call covers every
+# chunk of every document in the batch
+VESPA_METADATA_SYNC_BATCH_SOFT_TIME_LIMIT = 5 * 60
+VESPA_METADATA_SYNC_BATCH_TIME_LIMIT = VESPA_METADATA_SYNC_BATCH_SOFT_TIME_LIMIT + 15
+
 
 # celery auto associates tasks created inside another task,
 # which bloats the result metadata considerably. trail=False prevents this.
@@ -581,3 +594,190 @@ def vespa_metadata_sync_task(self: Task, document_id: str, *, tenant_id: str) ->
         )
 
     return completion_status == OnyxCeleryTaskCompletionStatus.SUCCEEDED
+
+
+def _build_update_requests(
+    document_ids: list[str], db_session: Session
+) -> list[UpdateRequest]:
+    """Loads the index metadata of the documents with a few bulk queries. Documents
+    that no longer exist are skipped."""
+    docs = get_documents_by_ids(db_session, document_ids)
+    doc_id_to_doc_sets = dict(
+        fetch_document_sets_for_documents([doc.id for doc in docs], db_session)
+    )
+    doc_id_to_access = get_access_for_documents([doc.id for doc in docs], db_session)
+
+    return [
+        UpdateRequest(
+            minimal_document_indexing_info=[
+                MinimalDocumentIndexingInfo(doc_id=doc.id, chunk_start_index=0)
+            ],
+            access=doc_id_to_access.get(doc.id) or get_null_document_access(),
+            document_sets=set(doc_id_to_doc_sets.get(doc.id, [])),
+            boost=doc.boost,
+            hidden=doc.hidden,
+            doc_id_to_chunk_cnt=(
+                {doc.id: doc.chunk_count} if doc.chunk_count is not None else {}
+            ),
+        )
+        for doc in docs
+    ]
+
+
+def _update_document_index(
+    document_index: DocumentIndex,
+    update_requests: list[UpdateRequest],
+    tenant_id: str,
+) -> set[str]:
+    """Updates the documents with a single call. If that fails, they are updated one at
+    a time so that a single bad document doesn't keep the rest from being synced.
+
+    Returns the ids of the documents that could not be updated. Raises if none of them
+    could be updated, e.g. because the index is unavailable."""
+    retry_index = RetryDocumentIndex(document_index)
+    try:
+        retry_index.update(update_requests, tenant_id=tenant_id)
+        return set()
+    except SoftTimeLimitExceeded:
+        raise
+    except Exception:
+        if len(update_requests) == 1:
+            raise
+        task_logger.exception(
+            "Batch update failed, updating documents one at a time: "
+            f"num_docs={len(update_requests)}"
+        )
+
+    failed_doc_ids: set[str] = set()
+    last_error: Exception | None = None
+    for update_request in update_requests:
+        doc_ids = [
+            doc_info.doc_id
+            for doc_info in update_request.minimal_document_indexing_info
+        ]
+        try:
+            retry_index.update([update_request], tenant_id=tenant_id)
+        except SoftTimeLimitExceeded:
+            raise
+        except Exception as e:
+            task_logger.exception(f"Failed to update documents: docs={doc_ids}")
+            failed_doc_ids.update(doc_ids)
+            last_error = e
+
+    if last_error is not None and len(failed_doc_ids) == sum(
+        len(update_request.minimal_document_indexing_info)
+        for update_request in update_requests
+    ):
+        raise last_error
+
+    return failed_doc_ids
+
+
+@shared_task(
+    name=OnyxCeleryTask.VESPA_METADATA_SYNC_BATCH_TASK,
+    bind=True,
+    soft_time_limit=VESPA_METADATA_SYNC_BATCH_SOFT_TIME_LIMIT,
+    time_limit=VESPA_METADATA_SYNC_BATCH_TIME_LIMIT,
+    max_retries=3,
+)
+def vespa_metadata_sync_batch_task(
+    self: Task, document_ids: list[str], *, tenant_id: str
+) -> bool:
+    """Same as vespa_metadata_sync_task for a page of documents. The metadata of all the
+    documents is loaded in bulk and written with a single update call per index."""
+    start = time.monotonic()
+
+    completion_status = OnyxCeleryTaskCompletionStatus.UNDEFINED
+
+    try:
+        with get_session_with_current_tenant() as db_session:
+            active_search_settings = get_active_search_settings(db_session)
+            # This flow is for updates so we get all indices.
+            document_indices = get_all_document_indices(
+                search_settings=active_search_settings.primary,
+                secondary_search_settings=active_search_settings.secondary,
+                httpx_client=HttpxPool.get("vespa"),
+            )
+
+            update_requests = _build_update_requests(document_ids, db_session)
+            failed_doc_ids: set[str] = set()
+            synced_doc_ids: list[str] = []
+            if update_requests:
+                for document_index in document_indices:
+                    failed_doc_ids |= _update_document_index(
+                        document_index, update_requests, tenant_id
+                    )
+
+                # documents that failed stay out of sync and are picked up again
+                # by a later sync
+                synced_doc_ids = [
+                    doc_info.doc_id
+                    for update_request in update_requests
+                    for doc_info in update_request.minimal_document_indexing_info
+                    if doc_info.doc_id not in failed_doc_ids
+                ]
+
+                # update db last. Worst case = we crash right before this and
+                # the sync might repeat again later
+                if synced_doc_ids:
+                    mark_documents_as_synced(synced_doc_ids, db_session)
+
+            elapsed = time.monotonic() - start
+            task_logger.info(
+                f"num_docs={len(document_ids)} "
+                f"num_synced={len(synced_doc_ids)} "
+                f"num_failed={len(failed_doc_ids)} "
+                f"action=sync "
+                f"elapsed={elapsed:.2f}"
+            )
+            completion_status = OnyxCeleryTaskCompletionStatus.SUCCEEDED
+    except SoftTimeLimitExceeded:
+        task_logger.info(
+            f"SoftTimeLimitExceeded exception. num_docs={len(document_ids)}"
+        )
+        completion_status = OnyxCeleryTaskCompletionStatus.SOFT_TIME_LIMIT
+    except Exception as ex:
+        e: Exception | None = ex
+        if isinstance(ex, RetryError):
+            task_logger.warning(
+                f"Tenacity retry failed: num_attempts={ex.last_attempt.attempt_number}"
+            )
+            # only set the inner exception if it is of type Exception
+            e_temp = ex.last_attempt.exception()
+            e = e_temp if isinstance(e_temp, Exception) else None
+
+        if (
+            isinstance(e, httpx.HTTPStatusError)
+            and e.response.status_code == HTTPStatus.BAD_REQUEST
+        ):
+            task_logger.exception(
+                f"Non-retryable HTTPStatusError: "
+                f"num_docs={len(document_ids)} "
+                f"status={e.response.status_code}"
+            )
+            completion_status = OnyxCeleryTaskCompletionStatus.NON_RETRYABLE_EXCEPTION
+        else:
+            task_logger.exception(
+                f"vespa_metadata_sync_batch_task exceptioned: "
+                f"num_docs={len(document_ids)}"
+            )
+
+            completion_status = OnyxCeleryTaskCompletionStatus.RETRYABLE_EXCEPTION
+            if (
+                self.max_retries is not None
+                and self.request.retries >= self.max_retries
+            ):
+                completion_status = (
+                    OnyxCeleryTaskCompletionStatus.NON_RETRYABLE_EXCEPTION
+                )
+
+            # Exponential backoff from 2^4 to 2^6 ... i.e. 16, 32, 64
+            countdown = 2 ** (self.request.retries + 4)
+            self.retry(exc=e, countdown=countdown)  # this will raise a celery exception
+    finally:
+        task_logger.info(
+            f"vespa_metadata_sync_batch_task completed: "
+            f"status={completion_status.value} num_docs={len(document_ids)}"
+        )
+
+    return completion_status == OnyxCeleryTaskCompletionStatus.SUCCEEDED
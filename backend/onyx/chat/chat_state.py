@@ -164,7 +164,9 @@ def run_chat_loop_with_state_containers(
     with event streaming capabilities.
 
     The wrapped function should accept emitter as first arg and use it to emit
-    Packet objects. This wrapper polls every 300ms to check if stop signal is set.
+    Packet objects. This wrapper checks whether the stop signal is set every 300ms,
+    and immediately whenever a None "wake up" item is put on the emitter's bus (which
+    is what the stop signal subscription does when a stop is requested).
 
     Args:
         func: The function to wrap (should accept emitter and state_container as first and second args)
@@ -225,7 +227,16 @@ def run_chat_loop_with_state_containers(
                 last_cancel_check = time.monotonic()
                 continue
 
-            if pkt is not None:
+            if pkt is None:
+                # Woken up by a stop request
+                if not is_connected():
+                    yield Packet(
+                        placement=Placement(turn_index=last_turn_index + 1),
+                        obj=OverallStop(type="stop", stop_reason="user_cancelled"),
+                    )
+                    break
+                last_cancel_check = time.monotonic()
+            else:
                 # Track the highest turn_index for the stop packet
                 if pkt.placement and pkt.placement.turn_index > last_turn_index:
                     last_turn_index = pkt.placement.turn_index
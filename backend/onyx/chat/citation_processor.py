@@ -61,6 +61,50 @@ def in_code_block(llm_text: str) -> bool:
     return count % 2 != 0
 
 
+class _CodeFenceTracker:
+    """Incrementally computes `llm_text.count(TRIPLE_BACKTICK)` for a growing text.
+
+    str.count matches non-overlapping occurrences left to right, so every maximal
+    run of n backticks contributes n // 3. Only the length of the (possibly still
+    growing) run at the end of the text needs to be remembered.
+    """
+
+    def __init__(self) -> None:
+        self._closed_runs_count = 0
+        self._trailing_backticks = 0
+
+    def feed(self, text: str) -> None:
+        if "`" not in text:
+            if text:
+                self._closed_runs_count += self._trailing_backticks // 3
+                self._trailing_backticks = 0
+            return
+
+        without_trailing = text.rstrip("`")
+        if not without_trailing:
+            self._trailing_backticks += len(text)
+            return
+
+        without_leading = without_trailing.lstrip("`")
+        leading = len(without_trailing) - len(without_leading)
+        self._closed_runs_count += (
+            self._trailing_backticks + leading
+        ) // 3 + without_leading.count(TRIPLE_BACKTICK)
+        self._trailing_backticks = len(text) - len(without_trailing)
+
+    @property
+    def count(self) -> int:
+        return self._closed_runs_count + self._trailing_backticks // 3
+
+    def in_code_block(self) -> bool:
+        return self.count % 2 != 0
+
+
+# Characters that can start a citation or a code fence. Tokens without any of these
+# can't change the citation state and are streamed out as-is.
+_CITATION_OR_FENCE_CHARS = frozenset("[【［`")
+
+
 # ============================================================================
 # Main Citation Processor with Dynamic Mapping
 # ============================================================================
@@ -172,7 +216,10 @@ class DynamicCitationProcessor:
         self.seen_citations: CitationMapping = {}  # citation num -> SearchDoc
 
         # Token processing state
-        self.llm_out = ""  # entire output so far
+        # entire output so far, kept as parts to avoid quadratic string concatenation
+        self._llm_out_parts: list[str] = []
+        self._llm_out_len = 0
+        self._code_fences = _CodeFenceTracker()
         self.curr_segment = ""  # tokens held for citation processing
         self.hold = ""  # tokens held for stop token processing
         self.stop_stream = stop_stream
@@ -200,6 +247,30 @@ class DynamicCitationProcessor:
             r"([\[【［]{2}\d+[\]】］]{2})|([\[【［]\d+(?:, ?\d+)*[\]】］])"
         )
 
+    @property
+    def llm_out(self) -> str:
+        """The entire (raw) output so far."""
+        if len(self._llm_out_parts) > 1:
+            self._llm_out_parts = ["".join(self._llm_out_parts)]
+        return self._llm_out_parts[0] if self._llm_out_parts else ""
+
+    def _append_llm_out(self, token: str) -> None:
+        if not token:
+            return
+        self._llm_out_parts.append(token)
+        self._llm_out_len += len(token)
+        self._code_fences.feed(token)
+
+    def _llm_out_char_at(self, idx: int) -> str:
+        # the requested character is always close to the end of the output,
+        # so walk the parts backwards instead of joining them
+        offset = self._llm_out_len
+        for part in reversed(self._llm_out_parts):
+            offset -= len(part)
+            if idx >= offset:
+                return part[idx - offset]
+        raise IndexError(idx)
+
     def update_citation_mapping(
         self,
         citation_mapping: CitationMapping,
@@ -292,8 +363,17 @@ class DynamicCitationProcessor:
                 token = next_hold
                 self.hold = ""
 
+        # Fast path: nothing is held back and the token can't start a citation
+        # or a code fence
+        if not self.curr_segment and _CITATION_OR_FENCE_CHARS.isdisjoint(token):
+            self._append_llm_out(token)
+            if token:
+                self.non_citation_count += len(token)
+                yield token
+            return
+
         self.curr_segment += token
-        self.llm_out += token
+        self._append_llm_out(token)
 
         # Handle code blocks without language tags
         # If we see ``` followed by \n, add "plaintext" language specifier
@@ -304,7 +384,10 @@ class DynamicCitationProcessor:
                 parts = self.curr_segment.split("```")
                 if len(parts) > 1 and len(parts[1]) > 0:
                     piece_that_comes_after = parts[1][0]
-                    if piece_that_comes_after == "\n" and in_code_block(self.llm_out):
+                    if (
+                        piece_that_comes_after == "\n"
+                        and self._code_fences.in_code_block()
+                    ):
                         self.curr_segment = self.curr_segment.replace(
                             "```", "```plaintext"
                         )
@@ -312,11 +395,11 @@ class DynamicCitationProcessor:
         # Look for citations in current segment
         citation_matches = list(self.citation_pattern.finditer(self.curr_segment))
         possible_citation_found = bool(
-            re.search(self.possible_citation_pattern, self.curr_segment)
+            self.possible_citation_pattern.search(self.curr_segment)
         )
 
         result = ""
-        if citation_matches and not in_code_block(self.llm_out):
+        if citation_matches and not self._code_fences.in_code_block():
             match_idx = 0
             for match in citation_matches:
                 match_span = match.span()
@@ -337,11 +420,11 @@ class DynamicCitationProcessor:
                         has_leading_space = True
                     else:
                         # Citation at start of segment - check if previous output has space
-                        segment_start_idx = len(self.llm_out) - len(self.curr_segment)
+                        segment_start_idx = self._llm_out_len - len(self.curr_segment)
                         if segment_start_idx > 0:
-                            has_leading_space = self.llm_out[
+                            has_leading_space = self._llm_out_char_at(
                                 segment_start_idx - 1
-                            ].isspace()
+                            ).isspace()
                         else:
                             has_leading_space = False
 
@@ -35,8 +35,9 @@ from onyx.chat.models import StreamingError
 from onyx.chat.models import ToolCallResponse
 from onyx.chat.prompt_utils import calculate_reserved_tokens
 from onyx.chat.save_chat import save_chat_turn
-from onyx.chat.stop_signal_checker import is_connected as check_stop_signal
 from onyx.chat.stop_signal_checker import reset_cancel_status
+from onyx.chat.stop_signal_checker import StopSignalSubscription
+from onyx.chat.stop_signal_checker import subscribe_to_stop_signal
 from onyx.configs.constants import DEFAULT_PERSONA_ID
 from onyx.configs.constants import DocumentSource
 from onyx.configs.constants import MessageType
@@ -312,6 +313,7 @@ def handle_stream_message_objects(
     llm: LLM | None = None
     chat_session: ChatSession | None = None
     redis_client: Redis | None = None
+    stop_signal: StopSignalSubscription | None = None
 
     user_id = user.id if user is not None else None
     llm_user_identifier = (
@@ -575,8 +577,16 @@ def handle_stream_message_objects(
             redis_client,
         )
 
+        # Stop requests are pushed to us; the None packet wakes up the stream loop
+        # so that it notices the stop right away
+        stop_signal = subscribe_to_stop_signal(
+            chat_session.id,
+            redis_client,
+            on_stop=lambda: emitter.bus.put(None),
+        )
+
         def check_is_connected() -> bool:
-            return check_stop_signal(chat_session.id, redis_client)
+            return stop_signal.is_connected()
 
         set_processing_status(
             chat_session_id=chat_session.id,
@@ -600,8 +610,8 @@ def handle_stream_message_objects(
             )
 
         # Run the LLM loop with explicit wrapper for stop signal handling
-        # The wrapper runs run_llm_loop in a background thread and polls every 300ms
-        # for stop signals. run_llm_loop itself doesn't know about stopping.
+        # The wrapper runs run_llm_loop in a background thread and checks for stop
+        # signals while streaming. run_llm_loop itself doesn't know about stopping.
         # Note: DB session is not thread safe but nothing else uses it and the
         # reference is passed directly so it's ok.
         if new_msg_req.deep_research:
@@ -700,6 +710,8 @@ def handle_stream_message_objects(
 
         db_session.rollback()
     finally:
+        if stop_signal is not None:
+            stop_signal.close()
         try:
             if redis_client is not None and chat_session is not None:
                 set_processing_status(
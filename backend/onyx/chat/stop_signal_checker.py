@@ -1,11 +1,25 @@
+import os
+import threading
+import time
+from collections.abc import Callable
 from uuid import UUID
 
 from redis.client import Redis
 
+from onyx.configs.chat_configs import CHAT_STOP_SIGNAL_PUBSUB_ENABLED
+from onyx.redis.redis_pool import get_raw_redis_client
+from onyx.utils.logger import setup_logger
+
+logger = setup_logger()
+
 # Redis key prefixes for chat session stop signals
 PREFIX = "chatsessionstop"
 FENCE_PREFIX = f"{PREFIX}_fence"
 FENCE_TTL = 10 * 60  # 10 minutes - defensive TTL to prevent memory leaks
+# Pub/sub channel the stop requests are broadcast on. Not tenant prefixed: chat session
+# ids are globally unique and every api server process listens to the same channel.
+STOP_CHANNEL = f"{PREFIX}_channel"
+LISTENER_RECONNECT_DELAY = 5  # seconds
 
 
 def _get_fence_key(chat_session_id: UUID) -> str:
@@ -36,6 +50,9 @@ def set_fence(chat_session_id: UUID, redis_client: Redis, value: bool) -> None:
         return
 
     redis_client.set(fence_key, 0, ex=FENCE_TTL)
+    if CHAT_STOP_SIGNAL_PUBSUB_ENABLED:
+        # wake up the stream right away, whichever api server process it runs on
+        redis_client.publish(STOP_CHANNEL, str(chat_session_id))
 
 
 def is_connected(chat_session_id: UUID, redis_client: Redis) -> bool:
@@ -63,3 +80,183 @@ def reset_cancel_status(chat_session_id: UUID, redis_client: Redis) -> None:
     """
     fence_key = _get_fence_key(chat_session_id)
     redis_client.delete(fence_key)
+
+
+class StopSignalSubscription:
+    """Stop signal state of a single streaming chat session.
+
+    While the process-wide listener is subscribed, checking the signal is a local
+    lookup. If the listener is (re)connecting and may miss messages, it falls back to
+    checking the fence in Redis.
+    """
+
+    def __init__(
+        self,
+        listener: "StopSignalListener",
+        chat_session_id: UUID,
+        redis_client: Redis,
+        on_stop: Callable[[], None] | None,
+    ) -> None:
+        self._listener = listener
+        self.chat_session_id = chat_session_id
+        self.redis_client = redis_client
+        self._on_stop = on_stop
+        self._stopped = threading.Event()
+
+    def mark_stopped(self) -> None:
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        if self._on_stop:
+            try:
+                self._on_stop()
+            except Exception:
+                logger.exception("Error in chat stop signal callback")
+
+    def check_fence(self) -> bool:
+        connected = is_connected(self.chat_session_id, self.redis_client)
+        if not connected:
+            self.mark_stopped()
+        return connected
+
+    def is_connected(self) -> bool:
+        if self._stopped.is_set():
+            return False
+        if self._listener.healthy:
+            return True
+        return self.check_fence()
+
+    def close(self) -> None:
+        self._listener.unsubscribe(self)
+
+
+class StopSignalListener:
+    """Single per-process Redis pub/sub subscriber for chat stop signals, so that
+    streams don't each have to poll their stop fence."""
+
+    def __init__(
+        self, redis_client_factory: Callable[[], Redis] = get_raw_redis_client
+    ) -> None:
+        self._redis_client_factory = redis_client_factory
+        self._lock = threading.Lock()
+        self._subscriptions: dict[str, set[StopSignalSubscription]] = {}
+        self._thread: threading.Thread | None = None
+        self._healthy = False
+
+    @property
+    def healthy(self) -> bool:
+        return self._healthy
+
+    def subscribe(
+        self,
+        chat_session_id: UUID,
+        redis_client: Redis,
+        on_stop: Callable[[], None] | None = None,
+    ) -> StopSignalSubscription:
+        """`on_stop` is called (from the listener thread) when a stop is requested."""
+        subscription = StopSignalSubscription(
+            self, chat_session_id, redis_client, on_stop
+        )
+        with self._lock:
+            self._subscriptions.setdefault(str(chat_session_id), set()).add(
+                subscription
+            )
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="chat-stop-signal-listener", daemon=True
+                )
+                self._thread.start()
+
+        # A stop published before we were registered would be missed otherwise
+        subscription.check_fence()
+        return subscription
+
+    def unsubscribe(self, subscription: StopSignalSubscription) -> None:
+        key = str(subscription.chat_session_id)
+        with self._lock:
+            subscriptions = self._subscriptions.get(key)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[key]
+
+    def handle_message(self, data: bytes | str) -> None:
+        key = data.decode() if isinstance(data, bytes) else data
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(key, ()))
+        for subscription in subscriptions:
+            subscription.mark_stopped()
+
+    def _recheck_all(self) -> None:
+        with self._lock:
+            subscriptions = [
+                subscription
+                for session_subscriptions in self._subscriptions.values()
+                for subscription in session_subscriptions
+            ]
+        for subscription in subscriptions:
+            try:
+                subscription.check_fence()
+            except Exception:
+                logger.warning("Failed to check chat stop fence", exc_info=True)
+
+    def _run(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._redis_client_factory().pubsub(
+                    ignore_subscribe_messages=True
+                )
+                pubsub.subscribe(STOP_CHANNEL)
+                self._healthy = True
+                # stops sent while we were disconnected were missed
+                self._recheck_all()
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.handle_message(message["data"])
+            except Exception:
+                logger.warning(
+                    "Chat stop signal listener disconnected, reconnecting",
+                    exc_info=True,
+                )
+            finally:
+                self._healthy = False
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            time.sleep(LISTENER_RECONNECT_DELAY)
+
+
+_listener: StopSignalListener | None = None
+_listener_pid: int | None = None
+_listener_lock = threading.Lock()
+# never started, so it is never healthy and subscriptions always check the fence
+_POLLING_ONLY_LISTENER = StopSignalListener()
+
+
+def get_stop_signal_listener() -> StopSignalListener:
+    global _listener, _listener_pid
+
+    with _listener_lock:
+        # the listener thread does not survive a fork
+        if _listener is None or _listener_pid != os.getpid():
+            _listener = StopSignalListener()
+            _listener_pid = os.getpid()
+        return _listener
+
+
+def subscribe_to_stop_signal(
+    chat_session_id: UUID,
+    redis_client: Redis,
+    on_stop: Callable[[], None] | None = None,
+) -> StopSignalSubscription:
+    """Returns the stop signal subscription for a streaming chat session. Call
+    `close()` on it once the stream is done."""
+    if not CHAT_STOP_SIGNAL_PUBSUB_ENABLED:
+        return StopSignalSubscription(
+            _POLLING_ONLY_LISTENER, chat_session_id, redis_client, on_stop
+        )
+    return get_stop_signal_listener().subscribe(chat_session_id, redis_client, on_stop)
@@ -207,6 +207,10 @@ OPENSEARCH_HOST = os.environ.get("OPENSEARCH_HOST") or "localhost"
 OPENSEARCH_REST_API_PORT = int(os.environ.get("OPENSEARCH_REST_API_PORT") or 9200)
 OPENSEARCH_ADMIN_USERNAME = os.environ.get("OPENSEARCH_ADMIN_USERNAME", "admin")
 OPENSEARCH_ADMIN_PASSWORD = os.environ.get("OPENSEARCH_ADMIN_PASSWORD", "")
+# Max size of the body of a single _bulk request when writing chunks to OpenSearch
+OPENSEARCH_BULK_MAX_BYTES = int(
+    os.environ.get("OPENSEARCH_BULK_MAX_BYTES") or 10 * 1024 * 1024
+)
 
 # This is the "base" config for now, the idea is that at least for our dev
 # environments we always want to be dual indexing into both OpenSearch and Vespa
@@ -437,8 +441,16 @@ CELERY_WORKER_USER_FILE_PROCESSING_CONCURRENCY = int(
 # The maximum number of tasks that can be queued up to sync to Vespa in a single pass
 VESPA_SYNC_MAX_TASKS = 8192
 
+# The number of documents synced to the document index by a single metadata sync task
+VESPA_SYNC_BATCH_SIZE = int(os.environ.get("VESPA_SYNC_BATCH_SIZE") or 32)
+
 DB_YIELD_PER_DEFAULT = 64
 
+# Number of documents whose synced permissions are written to Postgres in one transaction
+DOC_PERMISSION_SYNC_DB_BATCH_SIZE = int(
+    os.environ.get("DOC_PERMISSION_SYNC_DB_BATCH_SIZE") or 200
+)
+
 #####
 # Connector Configs
 #####
@@ -473,6 +485,33 @@ WEB_CONNECTOR_OAUTH_CLIENT_ID = os.environ.get("WEB_CONNECTOR_OAUTH_CLIENT_ID")
 WEB_CONNECTOR_OAUTH_CLIENT_SECRET = os.environ.get("WEB_CONNECTOR_OAUTH_CLIENT_SECRET")
 WEB_CONNECTOR_OAUTH_TOKEN_URL = os.environ.get("WEB_CONNECTOR_OAUTH_TOKEN_URL")
 WEB_CONNECTOR_VALIDATE_URLS = os.environ.get("WEB_CONNECTOR_VALIDATE_URLS")
+# Crawl several pages at once: static pages are fetched with plain HTTP requests and
+# only pages that need JavaScript are rendered in a pool of Playwright browsers
+WEB_CONNECTOR_CONCURRENT_CRAWL = (
+    os.environ.get("WEB_CONNECTOR_CONCURRENT_CRAWL", "true").lower() == "true"
+)
+WEB_CONNECTOR_MAX_CONCURRENCY = int(
+    os.environ.get("WEB_CONNECTOR_MAX_CONCURRENCY") or 8
+)
+WEB_CONNECTOR_MAX_CONCURRENCY_PER_HOST = int(
+    os.environ.get("WEB_CONNECTOR_MAX_CONCURRENCY_PER_HOST") or 4
+)
+# Minimum delay between two requests to the same host
+WEB_CONNECTOR_HOST_DELAY_SECONDS = float(
+    os.environ.get("WEB_CONNECTOR_HOST_DELAY_SECONDS") or 0
+)
+WEB_CONNECTOR_PLAYWRIGHT_POOL_SIZE = int(
+    os.environ.get("WEB_CONNECTOR_PLAYWRIGHT_POOL_SIZE") or 2
+)
+# Remember ETag / Last-Modified / content hash per page so that recrawls send
+# conditional requests and skip pages that did not change since the last success
+WEB_CONNECTOR_CONDITIONAL_RECRAWL = (
+    os.environ.get("WEB_CONNECTOR_CONDITIONAL_RECRAWL", "true").lower() == "true"
+)
+# Pages are downloaded in full at least this often, even if they seem unchanged
+WEB_CONNECTOR_VALIDATOR_MAX_AGE_DAYS = int(
+    os.environ.get("WEB_CONNECTOR_VALIDATOR_MAX_AGE_DAYS") or 7
+)
 
 HTML_BASED_CONNECTOR_TRANSFORM_LINKS_STRATEGY = os.environ.get(
     "HTML_BASED_CONNECTOR_TRANSFORM_LINKS_STRATEGY",
@@ -484,6 +523,16 @@ NOTION_CONNECTOR_DISABLE_RECURSIVE_PAGE_LOOKUP = (
     == "true"
 )
 
+# Share connector rate limits, and back offs requested by the source via Retry-After,
+# between all workers through Redis instead of limiting each process on its own
+CONNECTOR_DISTRIBUTED_RATE_LIMIT = (
+    os.environ.get("CONNECTOR_DISTRIBUTED_RATE_LIMIT", "true").lower() == "true"
+)
+# Longest a single call waits on the shared rate limit before giving up
+CONNECTOR_RATE_LIMIT_MAX_WAIT_SECONDS = int(
+    os.environ.get("CONNECTOR_RATE_LIMIT_MAX_WAIT_SECONDS") or 600
+)
+
 
 #####
 # Confluence Connector Configs
@@ -497,6 +546,12 @@ CONFLUENCE_CONNECTOR_LABELS_TO_SKIP = [
     if ignored_tag
 ]
 
+# Maximum Confluence API calls per minute shared by all workers indexing the same
+# Confluence instance. 0 only shares the back off when Confluence rate limits us.
+CONFLUENCE_CONNECTOR_MAX_CALLS_PER_MINUTE = int(
+    os.environ.get("CONFLUENCE_CONNECTOR_MAX_CALLS_PER_MINUTE") or 0
+)
+
 # Attachments exceeding this size will not be retrieved (in bytes)
 CONFLUENCE_CONNECTOR_ATTACHMENT_SIZE_THRESHOLD = int(
     os.environ.get("CONFLUENCE_CONNECTOR_ATTACHMENT_SIZE_THRESHOLD", 10 * 1024 * 1024)
@@ -643,6 +698,16 @@ MAX_PRUNING_DOCUMENT_RETRIEVAL_PER_MINUTE = int(
     os.environ.get("MAX_PRUNING_DOCUMENT_RETRIEVAL_PER_MINUTE", 0)
 )
 
+# Diff the source document ids against the indexed ones in Postgres (the source ids are
+# spilled into a temp table) instead of holding both sets in worker memory
+PRUNING_DIFF_IN_POSTGRES = (
+    os.environ.get("PRUNING_DIFF_IN_POSTGRES", "true").lower() == "true"
+)
+# Number of document ids copied into / read back from Postgres at once when diffing there
+PRUNING_DIFF_COPY_BATCH_SIZE = int(
+    os.environ.get("PRUNING_DIFF_COPY_BATCH_SIZE", 10_000)
+)
+
 # comma delimited list of zendesk article labels to skip indexing for
 ZENDESK_CONNECTOR_SKIP_ARTICLE_LABELS = os.environ.get(
     "ZENDESK_CONNECTOR_SKIP_ARTICLE_LABELS", ""
@@ -684,6 +749,12 @@ LARGE_CHUNK_RATIO = 4
 # We don't want the metadata to overwhelm the actual contents of the chunk
 SKIP_METADATA_IN_CHUNK = os.environ.get("SKIP_METADATA_IN_CHUNK", "").lower() == "true"
 
+# When a document is reindexed, chunks whose embedded text and embedding model are unchanged
+# reuse the embeddings already stored in the document index instead of being re-embedded
+DISABLE_CHUNK_EMBEDDING_REUSE = (
+    os.environ.get("DISABLE_CHUNK_EMBEDDING_REUSE", "").lower() == "true"
+)
+
 # The indexer will warn in the logs whenver a document exceeds this threshold (in bytes)
 INDEXING_SIZE_WARNING_THRESHOLD = int(
     os.environ.get("INDEXING_SIZE_WARNING_THRESHOLD") or 100 * 1024 * 1024
@@ -693,11 +764,26 @@ INDEXING_SIZE_WARNING_THRESHOLD = int(
 # 0 disables this behavior and is the default.
 INDEXING_TRACER_INTERVAL = int(os.environ.get("INDEXING_TRACER_INTERVAL") or 0)
 
+# Docfetching hands batches over to docprocessing as zstd compressed msgpack. Set this to
+# keep writing the old JSON batches, e.g. while docprocessing workers from a version
+# that can't read the compressed format are still running. Both are always readable.
+DOCUMENT_BATCH_STORAGE_LEGACY_FORMAT = (
+    os.environ.get("DOCUMENT_BATCH_STORAGE_LEGACY_FORMAT", "").lower() == "true"
+)
+
 # Enable multi-threaded embedding model calls for parallel processing
 # Note: only applies for API-based embedding models
 INDEXING_EMBEDDING_MODEL_NUM_THREADS = int(
     os.environ.get("INDEXING_EMBEDDING_MODEL_NUM_THREADS") or 8
 )
+# Max number of batches in flight at once to a local (model server hosted) embedding
+# model. Anything above 1 lets the next batch be serialized / sent while the model server
+# is still running the previous one. Capped by INDEXING_EMBEDDING_MODEL_NUM_THREADS.
+LOCAL_EMBEDDING_MAX_IN_FLIGHT_BATCHES = int(
+    os.environ.get("LOCAL_EMBEDDING_MAX_IN_FLIGHT_BATCHES") or 2
+)
+# Size of the per-process keep-alive connection pool used to talk to the model server
+MODEL_SERVER_HTTP_POOL_SIZE = int(os.environ.get("MODEL_SERVER_HTTP_POOL_SIZE") or 16)
 
 # Maximum file size in a document to be indexed
 MAX_DOCUMENT_CHARS = int(os.environ.get("MAX_DOCUMENT_CHARS") or 5_000_000)
@@ -810,6 +896,11 @@ CUSTOM_ANSWER_VALIDITY_CONDITIONS = json.loads(
 )
 
 VESPA_REQUEST_TIMEOUT = int(os.environ.get("VESPA_REQUEST_TIMEOUT") or "15")
+# Connection limit of the per-process pooled client used for Vespa queries / visits.
+# With HTTP/2 many concurrent requests are multiplexed over each connection.
+VESPA_QUERY_POOL_MAX_CONNECTIONS = int(
+    os.environ.get("VESPA_QUERY_POOL_MAX_CONNECTIONS") or 20
+)
 
 SYSTEM_RECURSION_LIMIT = int(os.environ.get("SYSTEM_RECURSION_LIMIT") or "1000")
 
@@ -987,6 +1078,21 @@ IMAGE_SUMMARIZATION_USER_PROMPT = os.environ.get(
     DEFAULT_IMAGE_SUMMARIZATION_USER_PROMPT,
 )
 
+# Number of images of an indexing batch that are summarized concurrently
+IMAGE_SUMMARIZATION_NUM_THREADS = int(
+    os.environ.get("IMAGE_SUMMARIZATION_NUM_THREADS") or 8
+)
+# Max number of image summarization calls per minute to each LLM provider (per process),
+# 0 disables the limit
+IMAGE_SUMMARIZATION_MAX_REQUESTS_PER_MINUTE = int(
+    os.environ.get("IMAGE_SUMMARIZATION_MAX_REQUESTS_PER_MINUTE") or 0
+)
+# Image summaries are cached in Postgres keyed on the image contents and the model,
+# so duplicate images and reindexing never summarize the same image twice
+DISABLE_IMAGE_SUMMARY_CACHE = (
+    os.environ.get("DISABLE_IMAGE_SUMMARY_CACHE", "").lower() == "true"
+)
+
 # Knowledge Graph Read Only User Configuration
 DB_READONLY_USER: str = os.environ.get("DB_READONLY_USER", "db_readonly_user")
 DB_READONLY_PASSWORD: str = urllib.parse.quote_plus(
@@ -40,6 +40,15 @@ TITLE_CONTENT_RATIO = max(
 # Stops streaming answers back to the UI if this pattern is seen:
 STOP_STREAM_PAT = os.environ.get("STOP_STREAM_PAT") or None
 
+# Stop signals for streaming chats are pushed to every api server process over Redis
+# pub/sub. Set to "false" to fall back to polling the stop fence in Redis per stream.
+CHAT_STOP_SIGNAL_PUBSUB_ENABLED = (
+    os.environ.get("CHAT_STOP_SIGNAL_PUBSUB_ENABLED", "true").lower() == "true"
+)
+# Stream chat responses from an asyncio queue instead of iterating the (blocking)
+# packet generator on the web server's threadpool
+CHAT_ASYNC_STREAMING = os.environ.get("CHAT_ASYNC_STREAMING", "").lower() == "true"
+
 # Set this to "true" to hard delete chats
 # This will make chats unviewable by admins after a user deletes them
 # As opposed to soft deleting them, which just hides them from non-admin users
@@ -49,6 +58,23 @@ HARD_DELETE_CHATS = os.environ.get("HARD_DELETE_CHATS", "").lower() == "true"
 NUM_INTERNET_SEARCH_RESULTS = int(os.environ.get("NUM_INTERNET_SEARCH_RESULTS") or 10)
 NUM_INTERNET_SEARCH_CHUNKS = int(os.environ.get("NUM_INTERNET_SEARCH_CHUNKS") or 50)
 
+# Query embedding cache, repeated questions (e.g. Slack bot channels, chat reruns) skip the
+# model server round trip. Set the TTL to 0 to disable the cache entirely.
+QUERY_EMBEDDING_CACHE_TTL_SECONDS = int(
+    os.environ.get("QUERY_EMBEDDING_CACHE_TTL_SECONDS") or 24 * 60 * 60
+)
+QUERY_EMBEDDING_CACHE_LOCAL_SIZE = int(
+    os.environ.get("QUERY_EMBEDDING_CACHE_LOCAL_SIZE") or 2048
+)
+
+# Cache of the ACL entries of each user, used to build the access filters of every search.
+# Entries are dropped whenever user groups or synced external groups change, the TTL only
+# bounds how long an entry is kept around. Set the TTL to 0 to disable the cache.
+USER_ACL_CACHE_TTL_SECONDS = int(
+    os.environ.get("USER_ACL_CACHE_TTL_SECONDS") or 10 * 60
+)
+USER_ACL_CACHE_LOCAL_SIZE = int(os.environ.get("USER_ACL_CACHE_LOCAL_SIZE") or 1024)
+
 VESPA_SEARCHER_THREADS = int(os.environ.get("VESPA_SEARCHER_THREADS") or 2)
 
 # Whether or not to use the semantic & keyword search expansions for Basic Search
@@ -135,6 +135,14 @@ KG_CLUSTERING_THRESHOLD: float = float(
     os.environ.get("KG_CLUSTERING_THRESHOLD", "0.96")
 )
 
+# Cluster a page of staged entities per transaction (one similarity query for the
+# whole page) instead of one entity at a time
+KG_CLUSTERING_BATCH_MODE: bool = (
+    os.environ.get("KG_CLUSTERING_BATCH_MODE", "true").lower() == "true"
+)
+
+KG_CLUSTERING_BATCH_SIZE: int = int(os.environ.get("KG_CLUSTERING_BATCH_SIZE", "256"))
+
 KG_MAX_SEARCH_DOCUMENTS: int = int(os.environ.get("KG_MAX_SEARCH_DOCUMENTS", "15"))
 
 KG_MAX_DECOMPOSITION_SEGMENTS: int = int(
@@ -6,6 +6,25 @@ IMAGE_GENERATION_OUTPUT_FORMAT = os.environ.get(
     "IMAGE_GENERATION_OUTPUT_FORMAT", "b64_json"
 )
 
+# Built-in web crawler used by open_url and web search when no external content
+# provider is configured. In concurrent mode the URLs of a call are fetched in parallel
+# over a shared connection pool and bodies are streamed, aborting at the size limits
+ONYX_WEB_CRAWLER_CONCURRENT_FETCH = (
+    os.environ.get("ONYX_WEB_CRAWLER_CONCURRENT_FETCH", "true").lower() == "true"
+)
+ONYX_WEB_CRAWLER_MAX_CONCURRENCY = int(
+    os.environ.get("ONYX_WEB_CRAWLER_MAX_CONCURRENCY") or 8
+)
+ONYX_WEB_CRAWLER_MAX_CONCURRENCY_PER_HOST = int(
+    os.environ.get("ONYX_WEB_CRAWLER_MAX_CONCURRENCY_PER_HOST") or 2
+)
+# Fetched pages are reused for this long, then revalidated with their ETag /
+# Last-Modified if they had one. 0 disables the cache
+ONYX_WEB_CRAWLER_CACHE_TTL_SECONDS = int(
+    os.environ.get("ONYX_WEB_CRAWLER_CACHE_TTL_SECONDS") or 300
+)
+ONYX_WEB_CRAWLER_CACHE_SIZE = int(os.environ.get("ONYX_WEB_CRAWLER_CACHE_SIZE") or 128)
+
 # if specified, will pass through request headers to the call to API calls made by custom tools
 CUSTOM_TOOL_PASS_THROUGH_HEADERS: list[str] | None = None
 _CUSTOM_TOOL_PASS_THROUGH_HEADERS_RAW = os.environ.get(
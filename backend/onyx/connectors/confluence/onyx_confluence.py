@@ -30,9 +30,12 @@ from atlassian import Confluence  # type:ignore
 from redis import Redis
 from requests import HTTPError
 
+from onyx.configs.app_configs import CONFLUENCE_CONNECTOR_MAX_CALLS_PER_MINUTE
 from onyx.configs.app_configs import CONFLUENCE_CONNECTOR_USER_PROFILES_OVERRIDE
+from onyx.configs.app_configs import CONNECTOR_DISTRIBUTED_RATE_LIMIT
 from onyx.configs.app_configs import OAUTH_CONFLUENCE_CLOUD_CLIENT_ID
 from onyx.configs.app_configs import OAUTH_CONFLUENCE_CLOUD_CLIENT_SECRET
+from onyx.configs.constants import DocumentSource
 from onyx.connectors.confluence.models import ConfluenceUser
 from onyx.connectors.confluence.user_profile_override import (
     process_confluence_user_profiles_override,
@@ -42,6 +45,7 @@ from onyx.connectors.confluence.utils import confluence_refresh_tokens
 from onyx.connectors.confluence.utils import get_start_param_from_url
 from onyx.connectors.confluence.utils import update_param_in_path
 from onyx.connectors.cross_connector_utils.miscellaneous_utils import scoped_url
+from onyx.connectors.cross_connector_utils.redis_rate_limit import RedisRateLimiter
 from onyx.connectors.interfaces import CredentialsProviderInterface
 from onyx.file_processing.html_utils import format_document_soup
 from onyx.redis.redis_pool import get_redis_client
@@ -113,6 +117,17 @@ class OnyxConfluence:
         else:
             self.static_credentials = self._credentials_provider.get_credentials()
 
+        # shared by every worker talking to this Confluence instance
+        self._rate_limiter: RedisRateLimiter | None = None
+        if CONNECTOR_DISTRIBUTED_RATE_LIMIT:
+            self._rate_limiter = RedisRateLimiter(
+                source=DocumentSource.CONFLUENCE,
+                scope=self._url,
+                max_calls=CONFLUENCE_CONNECTOR_MAX_CALLS_PER_MINUTE or None,
+                period=60,
+                tenant_id=credentials_provider.get_tenant_id(),
+            )
+
         self._confluence = Confluence(url)
         self.credential_key: str = (
             self.CREDENTIAL_PREFIX
@@ -430,6 +445,9 @@ class OnyxConfluence:
                         f"Confluence call attempts took longer than {TIMEOUT} seconds."
                     )
 
+                if self._rate_limiter:
+                    self._rate_limiter.wait()
+
                 # we're relying more on the client to rate limit itself
                 # and applying our own retries in a more specific set of circumstances
                 try:
@@ -460,6 +478,13 @@ class OnyxConfluence:
 
                 except HTTPError as e:
                     delay_until = _handle_http_error(e, attempt)
+                    if (
+                        self._rate_limiter
+                        and e.response is not None
+                        and e.response.status_code == 429
+                    ):
+                        # make the other workers back off as well
+                        self._rate_limiter.block(delay_until - time.monotonic())
                     logger.warning(
                         f"HTTPError in confluence call. "
                         f"Retrying in {delay_until} seconds..."
@@ -0,0 +1,208 @@
+import hashlib
+import time
+from collections.abc import Callable
+from datetime import datetime
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from functools import wraps
+from typing import Any
+from typing import cast
+from typing import TypeVar
+
+import requests
+from redis.exceptions import RedisError
+
+from onyx.configs.app_configs import CONNECTOR_RATE_LIMIT_MAX_WAIT_SECONDS
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.cross_connector_utils.rate_limit_wrapper import (
+    RateLimitTriedTooManyTimesError,
+)
+from onyx.redis.redis_pool import get_redis_client
+from onyx.utils.logger import setup_logger
+from shared_configs.contextvars import get_current_tenant_id
+
+logger = setup_logger()
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_REDIS_KEY_PREFIX = "connector_rate_limit"
+
+# GCRA: KEYS[1] holds the theoretical arrival time (TAT) of the next call in ms,
+# KEYS[2] exists while the source asked us to back off (Retry-After).
+# Returns 0 if the call may go ahead, otherwise how many ms to wait before asking again.
+_ACQUIRE_SCRIPT = """
+local blocked_ms = redis.call("PTTL", KEYS[2])
+if blocked_ms > 0 then
+    return blocked_ms
+end
+
+local interval = tonumber(ARGV[1])
+if interval <= 0 then
+    return 0
+end
+local tolerance = tonumber(ARGV[2])
+
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local tat = tonumber(redis.call("GET", KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+
+local wait_ms = tat - tolerance - now
+if wait_ms > 0 then
+    return wait_ms
+end
+
+tat = tat + interval
+redis.call("SET", KEYS[1], tat, "PX", tat - now)
+return 0
+"""
+
+# only ever extends the back off, a shorter Retry-After must not cut it short
+_BLOCK_SCRIPT = """
+local block_ms = tonumber(ARGV[1])
+if redis.call("PTTL", KEYS[1]) < block_ms then
+    redis.call("SET", KEYS[1], 1, "PX", block_ms)
+end
+return 0
+"""
+
+
+def parse_retry_after(response: requests.Response) -> float | None:
+    """Returns the seconds to wait from the `Retry-After` header, which is either a
+    number of seconds or an HTTP date."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is None:
+        return None
+
+    try:
+        return max(float(retry_after), 0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+class RedisRateLimiter:
+    """Rate limits calls to an external API across all workers and processes.
+
+    State is kept in Redis, keyed by the source and a scope (e.g. the base URL or
+    credential that the API rate limits by). Calls are spaced out with GCRA, which
+    allows bursts of up to `max_calls` within `period`. When the API responds with a
+    429, every caller sharing the key backs off for the `Retry-After` duration.
+
+    `max_calls=None` only shares the back off. If Redis can't be reached, calls are
+    let through rather than failing the connector.
+    """
+
+    def __init__(
+        self,
+        source: DocumentSource,
+        scope: str,
+        max_calls: int | None,
+        period: float,  # in seconds
+        max_wait: float = CONNECTOR_RATE_LIMIT_MAX_WAIT_SECONDS,
+        default_retry_after: float = 30,  # in seconds
+        tenant_id: str | None = None,
+    ) -> None:
+        if tenant_id is None:
+            tenant_id = get_current_tenant_id()
+
+        # don't leak credentials into key names
+        scope_hash = hashlib.sha256(scope.encode()).hexdigest()[:32]
+        # scripts don't get the tenant prefix added automatically
+        key = f"{tenant_id}:{_REDIS_KEY_PREFIX}:{source.value}:{scope_hash}"
+        self._tat_key = f"{key}:tat"
+        self._block_key = f"{key}:block"
+
+        # GCRA works in whole ms
+        if max_calls:
+            self._interval_ms = max(int(period * 1000 / max_calls), 1)
+            self._tolerance_ms = self._interval_ms * (max_calls - 1)
+        else:
+            self._interval_ms = 0
+            self._tolerance_ms = 0
+
+        self.max_wait = max_wait
+        self.default_retry_after = default_retry_after
+
+        redis_client = get_redis_client(tenant_id=tenant_id)
+        self._acquire_script = redis_client.register_script(_ACQUIRE_SCRIPT)
+        self._block_script = redis_client.register_script(_BLOCK_SCRIPT)
+
+    def wait(self) -> None:
+        """Blocks until a call is allowed."""
+        waited = 0.0
+        while True:
+            try:
+                wait_ms = int(
+                    self._acquire_script(
+                        keys=[self._tat_key, self._block_key],
+                        args=[self._interval_ms, self._tolerance_ms],
+                    )
+                )
+            except RedisError as e:
+                logger.warning(f"Rate limit state unavailable, not rate limiting: {e}")
+                return
+
+            if wait_ms <= 0:
+                return
+
+            wait_time = wait_ms / 1000
+            if waited + wait_time > self.max_wait:
+                raise RateLimitTriedTooManyTimesError(
+                    f"Waited more than {self.max_wait} seconds for the rate limit"
+                )
+
+            logger.debug(f"Rate limited, waiting {wait_time:.2f} seconds")
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def block(self, seconds: float) -> None:
+        """Makes everyone sharing this limiter wait `seconds` before the next call."""
+        block_ms = int(seconds * 1000)
+        if block_ms <= 0:
+            return
+
+        logger.warning(f"Rate limited by the source, backing off {seconds} seconds")
+        try:
+            self._block_script(keys=[self._block_key], args=[block_ms])
+        except RedisError as e:
+            logger.warning(f"Rate limit state unavailable, backing off locally: {e}")
+            time.sleep(seconds)
+
+    def block_for_response(self, response: requests.Response) -> None:
+        """Backs off if the response says we've been rate limited."""
+        if response.status_code != 429:
+            return
+
+        retry_after = parse_retry_after(response)
+        self.block(self.default_retry_after if retry_after is None else retry_after)
+
+    def __call__(self, func: F) -> F:
+        @wraps(func)
+        def wrapped_func(*args: Any, **kwargs: Any) -> Any:
+            self.wait()
+            try:
+                result = func(*args, **kwargs)
+            except requests.HTTPError as e:
+                if e.response is not None:
+                    self.block_for_response(e.response)
+                raise
+
+            if isinstance(result, requests.Response):
+                self.block_for_response(result)
+            return result
+
+        return cast(F, wrapped_func)
+
+
+distributed_rate_limit_builder = RedisRateLimiter
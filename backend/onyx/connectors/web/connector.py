@@ -1,13 +1,28 @@
 import ipaddress
+import json
+import queue
 import random
 import socket
+import threading
 import time
+from collections.abc import Callable
+from collections.abc import Iterator
+from concurrent.futures import CancelledError
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
 from datetime import datetime
 from datetime import timezone
 from enum import Enum
+from functools import partial
 from typing import Any
 from typing import cast
 from typing import Tuple
+from typing import TypeVar
 from urllib.parse import urljoin
 from urllib.parse import urlparse
 
@@ -18,13 +33,20 @@ from playwright.sync_api import BrowserContext
 from playwright.sync_api import Playwright
 from playwright.sync_api import sync_playwright
 from playwright.sync_api import TimeoutError
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth2Session  # type:ignore
 from urllib3.exceptions import MaxRetryError
 
 from onyx.configs.app_configs import INDEX_BATCH_SIZE
+from onyx.configs.app_configs import WEB_CONNECTOR_CONCURRENT_CRAWL
+from onyx.configs.app_configs import WEB_CONNECTOR_CONDITIONAL_RECRAWL
+from onyx.configs.app_configs import WEB_CONNECTOR_HOST_DELAY_SECONDS
+from onyx.configs.app_configs import WEB_CONNECTOR_MAX_CONCURRENCY
+from onyx.configs.app_configs import WEB_CONNECTOR_MAX_CONCURRENCY_PER_HOST
 from onyx.configs.app_configs import WEB_CONNECTOR_OAUTH_CLIENT_ID
 from onyx.configs.app_configs import WEB_CONNECTOR_OAUTH_CLIENT_SECRET
 from onyx.configs.app_configs import WEB_CONNECTOR_OAUTH_TOKEN_URL
+from onyx.configs.app_configs import WEB_CONNECTOR_PLAYWRIGHT_POOL_SIZE
 from onyx.configs.app_configs import WEB_CONNECTOR_VALIDATE_URLS
 from onyx.configs.constants import DocumentSource
 from onyx.connectors.exceptions import ConnectorValidationError
@@ -32,9 +54,18 @@ from onyx.connectors.exceptions import CredentialExpiredError
 from onyx.connectors.exceptions import InsufficientPermissionsError
 from onyx.connectors.exceptions import UnexpectedValidationError
 from onyx.connectors.interfaces import GenerateDocumentsOutput
+from onyx.connectors.interfaces import GenerateSlimDocumentOutput
 from onyx.connectors.interfaces import LoadConnector
+from onyx.connectors.interfaces import PollConnector
+from onyx.connectors.interfaces import SecondsSinceUnixEpoch
+from onyx.connectors.interfaces import SlimConnector
 from onyx.connectors.models import Document
+from onyx.connectors.models import SlimDocument
 from onyx.connectors.models import TextSection
+from onyx.connectors.web.validator_store import hash_page_content
+from onyx.connectors.web.validator_store import PageValidators
+from onyx.connectors.web.validator_store import PollWindow
+from onyx.connectors.web.validator_store import ValidatorStore
 from onyx.file_processing.html_utils import web_html_cleanup
 from onyx.utils.logger import setup_logger
 from onyx.utils.sitemap import list_pages_for_site
@@ -89,6 +120,11 @@ IFRAME_TEXT_LENGTH_THRESHOLD = 700
 JAVASCRIPT_DISABLED_MESSAGE = "You have JavaScript disabled in your browser"
 # Grace period after page navigation to allow bot-detection challenges to complete
 BOT_DETECTION_GRACE_PERIOD_MS = 5000
+# Static pages with less text than this are assumed to be rendered by JavaScript
+STATIC_PAGE_MIN_TEXT_LENGTH = 200
+# Browsers of the concurrent crawl are restarted after this many pages to release memory
+PLAYWRIGHT_PAGES_BEFORE_RESTART = 100
+_SLIM_BATCH_SIZE = 1000
 
 # Define common headers that mimic a real browser
 DEFAULT_USER_AGENT = (
@@ -318,23 +354,31 @@ def start_playwright() -> Tuple[Playwright, BrowserContext]:
     """
     )
 
-    if (
+    authorization_header = _oauth_authorization_header()
+    if authorization_header:
+        context.set_extra_http_headers(authorization_header)
+
+    return playwright, context
+
+
+def _oauth_authorization_header() -> dict[str, str]:
+    """The bearer token header of the configured OAuth client, empty if there is
+    none."""
+    if not (
         WEB_CONNECTOR_OAUTH_CLIENT_ID
         and WEB_CONNECTOR_OAUTH_CLIENT_SECRET
         and WEB_CONNECTOR_OAUTH_TOKEN_URL
     ):
-        client = BackendApplicationClient(client_id=WEB_CONNECTOR_OAUTH_CLIENT_ID)
-        oauth = OAuth2Session(client=client)
-        token = oauth.fetch_token(
-            token_url=WEB_CONNECTOR_OAUTH_TOKEN_URL,
-            client_id=WEB_CONNECTOR_OAUTH_CLIENT_ID,
-            client_secret=WEB_CONNECTOR_OAUTH_CLIENT_SECRET,
-        )
-        context.set_extra_http_headers(
-            {"Authorization": "Bearer {}".format(token["access_token"])}
-        )
-
-    return playwright, context
+        return {}
+
+    client = BackendApplicationClient(client_id=WEB_CONNECTOR_OAUTH_CLIENT_ID)
+    oauth = OAuth2Session(client=client)
+    token = oauth.fetch_token(
+        token_url=WEB_CONNECTOR_OAUTH_TOKEN_URL,
+        client_id=WEB_CONNECTOR_OAUTH_CLIENT_ID,
+        client_secret=WEB_CONNECTOR_OAUTH_CLIENT_SECRET,
+    )
+    return {"Authorization": "Bearer {}".format(token["access_token"])}
 
 
 def extract_urls_from_sitemap(sitemap_url: str) -> list[str]:
@@ -439,7 +483,346 @@ def _handle_cookies(context: BrowserContext, url: str) -> None:
         )
 
 
-class WebConnector(LoadConnector):
+@dataclass
+class _FetchedPage:
+    # the url the page was served from after redirects
+    url: str
+    status: int | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    title: str | None = None
+    text: str = ""
+    links: set[str] = field(default_factory=set)
+    metadata: dict[str, Any] = field(default_factory=dict)
+    is_pdf: bool = False
+    # the server confirmed the stored validators, so nothing was downloaded
+    not_modified: bool = False
+
+
+def _build_document(page: _FetchedPage) -> Document:
+    if page.is_pdf:
+        semantic_identifier = page.url.rstrip("/").split("/")[-1] or page.url
+    else:
+        semantic_identifier = page.title or page.url
+
+    return Document(
+        id=page.url,
+        sections=[TextSection(link=page.url, text=page.text)],
+        source=DocumentSource.WEB,
+        semantic_identifier=semantic_identifier,
+        metadata=page.metadata,
+        doc_updated_at=(
+            _get_datetime_from_last_modified_header(page.last_modified)
+            if page.last_modified
+            else None
+        ),
+    )
+
+
+def _pdf_page(url: str, response: requests.Response) -> _FetchedPage:
+    # PDF files are not checked for links
+    page_text, metadata = extract_pdf_text(response.content)
+    return _FetchedPage(
+        url=url,
+        status=response.status_code,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        text=page_text,
+        metadata=metadata,
+        is_pdf=True,
+    )
+
+
+def _render_page(
+    context: BrowserContext,
+    url: str,
+    base_url: str,
+    mintlify_cleanup: bool,
+    scroll_before_scraping: bool,
+    collect_links: bool,
+) -> _FetchedPage:
+    """Loads the page in the browser and extracts its text and internal links."""
+    _handle_cookies(context, url)
+
+    page = context.new_page()
+    try:
+        # Use "commit" instead of "domcontentloaded" to avoid hanging on bot-detection pages
+        # that may never fire domcontentloaded. "commit" waits only for navigation to be
+        # committed (response received), then we add a short wait for initial rendering.
+        page_response = page.goto(
+            url,
+            timeout=30000,  # 30 seconds
+            wait_until="commit",  # Wait for navigation to commit
+        )
+        # Give the page a moment to start rendering after navigation commits.
+        # Allows CloudFlare and other bot-detection challenges to complete.
+        page.wait_for_timeout(BOT_DETECTION_GRACE_PERIOD_MS)
+
+        final_url = page.url
+        if final_url != url:
+            protected_url_check(final_url)
+
+        if scroll_before_scraping:
+            scroll_attempts = 0
+            previous_height = page.evaluate("document.body.scrollHeight")
+            while scroll_attempts < WEB_CONNECTOR_MAX_SCROLL_ATTEMPTS:
+                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                # Wait for content to load, but catch timeout if page never reaches networkidle
+                # (e.g., CloudFlare protection keeps making requests)
+                try:
+                    page.wait_for_load_state(
+                        "networkidle", timeout=BOT_DETECTION_GRACE_PERIOD_MS
+                    )
+                except TimeoutError:
+                    # If networkidle times out, just give it a moment for content to render
+                    time.sleep(1)
+                time.sleep(0.5)  # let javascript run
+
+                new_height = page.evaluate("document.body.scrollHeight")
+                if new_height == previous_height:
+                    break  # Stop scrolling when no more content is loaded
+                previous_height = new_height
+                scroll_attempts += 1
+
+        content = page.content()
+        soup = BeautifulSoup(content, "html.parser")
+
+        fetched = _FetchedPage(
+            url=final_url,
+            status=page_response.status if page_response else None,
+            etag=page_response.header_value("ETag") if page_response else None,
+            last_modified=(
+                page_response.header_value("Last-Modified") if page_response else None
+            ),
+            links=(
+                get_internal_links(base_url, final_url, soup)
+                if collect_links
+                else set()
+            ),
+        )
+        if fetched.status is not None and fetched.status >= 400:
+            return fetched
+
+        parsed_html = web_html_cleanup(soup, mintlify_cleanup)
+
+        """For websites containing iframes that need to be scraped,
+        the code below can extract text from within these iframes.
+        """
+        logger.debug(f"Length of cleaned text {len(parsed_html.cleaned_text)}")
+        if JAVASCRIPT_DISABLED_MESSAGE in parsed_html.cleaned_text:
+            iframe_count = page.frame_locator("iframe").locator("html").count()
+            if iframe_count > 0:
+                iframe_texts = (
+                    page.frame_locator("iframe").locator("html").all_inner_texts()
+                )
+                document_text = "\n".join(iframe_texts)
+                """ 700 is the threshold value for the length of the text extracted
+                from the iframe based on the issue faced """
+                if len(parsed_html.cleaned_text) < IFRAME_TEXT_LENGTH_THRESHOLD:
+                    parsed_html.cleaned_text = document_text
+                else:
+                    parsed_html.cleaned_text += "\n" + document_text
+
+        fetched.title = parsed_html.title
+        fetched.text = parsed_html.cleaned_text
+        return fetched
+    finally:
+        page.close()
+
+
+def _fetch_static_page(
+    session: requests.Session,
+    url: str,
+    validators: PageValidators | None,
+    base_url: str,
+    mintlify_cleanup: bool,
+    collect_links: bool,
+    allow_static_html: bool,
+) -> _FetchedPage | None:
+    """Fetches the page without a browser, as a conditional request if validators of
+    a previous crawl are given. Returns None if the page needs to be rendered."""
+    headers = dict(DEFAULT_HEADERS)
+    if validators and validators.etag:
+        headers["If-None-Match"] = validators.etag
+    if validators and validators.last_modified:
+        headers["If-Modified-Since"] = validators.last_modified
+
+    response = session.get(url, headers=headers, timeout=30, allow_redirects=False)
+    # a redirect is often a login or consent page, the browser handles the cookies
+    # and reports where it ended up
+    if response.is_redirect:
+        return None
+    final_url = response.url
+
+    if response.status_code == 304 and validators:
+        return _FetchedPage(
+            url=validators.url,
+            status=response.status_code,
+            etag=response.headers.get("ETag") or validators.etag,
+            last_modified=(
+                response.headers.get("Last-Modified") or validators.last_modified
+            ),
+            links=set(validators.links),
+            not_modified=True,
+        )
+
+    content_type = response.headers.get("content-type")
+    if response.ok and is_pdf_resource(url, content_type):
+        return _pdf_page(url, response)
+
+    # 403s are usually bot detection and 401s a missing login, both of which the
+    # browser may get around. Anything that isn't HTML is left to the browser as well.
+    if response.status_code in (401, 403) or "html" not in (content_type or "").lower():
+        return None
+
+    if response.status_code >= 400:
+        return _FetchedPage(url=final_url, status=response.status_code)
+
+    if not allow_static_html:
+        return None
+
+    soup = BeautifulSoup(response.content, "html.parser")
+    links = get_internal_links(base_url, final_url, soup) if collect_links else set()
+    parsed_html = web_html_cleanup(soup, mintlify_cleanup)
+    if (
+        JAVASCRIPT_DISABLED_MESSAGE in parsed_html.cleaned_text
+        or len(parsed_html.cleaned_text) < STATIC_PAGE_MIN_TEXT_LENGTH
+    ):
+        return None
+
+    return _FetchedPage(
+        url=final_url,
+        status=response.status_code,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        title=parsed_html.title,
+        text=parsed_html.cleaned_text,
+        links=links,
+    )
+
+
+class _HostThrottle:
+    """Limits how many requests go to a single host at once and how quickly they
+    follow each other."""
+
+    def __init__(self, max_concurrency: int, delay_seconds: float) -> None:
+        self._max_concurrency = max_concurrency
+        self._delay_seconds = delay_seconds
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.setdefault(
+                host, threading.BoundedSemaphore(self._max_concurrency)
+            )
+
+        with semaphore:
+            if self._delay_seconds > 0:
+                with self._lock:
+                    now = time.monotonic()
+                    start = max(now, self._next_start.get(host, now))
+                    self._next_start[host] = start + self._delay_seconds
+                time.sleep(start - now)
+            yield
+
+
+R = TypeVar("R")
+
+
+class _PlaywrightPoolStoppedError(RuntimeError):
+    pass
+
+
+class _PlaywrightPool:
+    """Renders pages in a fixed number of threads. Playwright's sync API is bound to the
+    thread that started it, so every thread owns its own browser."""
+
+    def __init__(self, size: int) -> None:
+        self._jobs: queue.Queue[
+            tuple[Callable[[BrowserContext], Any], Future[Any]] | None
+        ] = queue.Queue()
+        # no jobs may be queued once stopped, nothing would ever pick them up
+        self._stopped = False
+        self._stopped_lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"web-playwright-{i}", daemon=True)
+            for i in range(size)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _work(self) -> None:
+        playwright: Playwright | None = None
+        context: BrowserContext | None = None
+        rendered = 0
+
+        def _stop() -> None:
+            nonlocal playwright, context
+            if context:
+                context.close()
+                context = None
+            if playwright:
+                playwright.stop()
+                playwright = None
+
+        try:
+            while (job := self._jobs.get()) is not None:
+                render, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    if context is None or rendered >= PLAYWRIGHT_PAGES_BEFORE_RESTART:
+                        _stop()
+                        playwright, context = start_playwright()
+                        rendered = 0
+                    rendered += 1
+                    future.set_result(render(context))
+                except BaseException as e:
+                    future.set_exception(e)
+                    # the browser may be in a bad state, start a fresh one next time
+                    _stop()
+        finally:
+            _stop()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
+    def render(self, render: Callable[[BrowserContext], R]) -> R:
+        """Raises _PlaywrightPoolStoppedError once the pool is stopped and
+        CancelledError if the pool was stopped before the render started."""
+        future: Future[R] = Future()
+        with self._stopped_lock:
+            if self._stopped:
+                raise _PlaywrightPoolStoppedError("The browser pool was stopped")
+            self._jobs.put((render, future))
+        return future.result()
+
+    def stop(self) -> None:
+        with self._stopped_lock:
+            self._stopped = True
+
+        # cancel renders that haven't started, then let the threads exit
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job[1].cancel()
+
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+class WebConnector(LoadConnector, PollConnector, SlimConnector):
     MAX_RETRIES = 3
 
     def __init__(
@@ -456,6 +839,7 @@ class WebConnector(LoadConnector):
         self.recursive = False
         self.scroll_before_scraping = scroll_before_scraping
         self.web_connector_type = web_connector_type
+        self.base_url = base_url
         if web_connector_type == WEB_CONNECTOR_VALID_SETTINGS.RECURSIVE.value:
             self.recursive = True
             self.to_visit_list = [_ensure_valid_url(base_url)]
@@ -506,9 +890,6 @@ class WebConnector(LoadConnector):
 
         result = ScrapeResult()
 
-        # Handle cookies for the URL
-        _handle_cookies(session_ctx.playwright_context, initial_url)
-
         # First do a HEAD request to check content type without downloading the entire content
         head_response = requests.head(
             initial_url, headers=DEFAULT_HEADERS, allow_redirects=True
@@ -517,153 +898,322 @@ class WebConnector(LoadConnector):
         is_pdf = is_pdf_resource(initial_url, content_type)
 
         if is_pdf:
-            # PDF files are not checked for links
             response = requests.get(initial_url, headers=DEFAULT_HEADERS)
-            page_text, metadata = extract_pdf_text(response.content)
-            last_modified = response.headers.get("Last-Modified")
-
-            result.doc = Document(
-                id=initial_url,
-                sections=[TextSection(link=initial_url, text=page_text)],
-                source=DocumentSource.WEB,
-                semantic_identifier=initial_url.rstrip("/").split("/")[-1]
-                or initial_url,
-                metadata=metadata,
-                doc_updated_at=(
-                    _get_datetime_from_last_modified_header(last_modified)
-                    if last_modified
-                    else None
-                ),
+            result.doc = _build_document(_pdf_page(initial_url, response))
+            return result
+
+        page = _render_page(
+            session_ctx.playwright_context,
+            initial_url,
+            base_url=session_ctx.base_url,
+            mintlify_cleanup=self.mintlify_cleanup,
+            scroll_before_scraping=self.scroll_before_scraping,
+            collect_links=self.recursive,
+        )
+        if page.url != initial_url:
+            if page.url in session_ctx.visited_links:
+                logger.info(
+                    f"{index}: {initial_url} redirected to {page.url} - already indexed"
+                )
+                return result
+
+            logger.info(f"{index}: {initial_url} redirected to {page.url}")
+            session_ctx.visited_links.add(page.url)
+
+        for link in page.links:
+            if link not in session_ctx.visited_links:
+                session_ctx.to_visit.append(link)
+
+        if page.status is not None and page.status >= 400:
+            session_ctx.last_error = (
+                f"Skipped indexing {page.url} due to HTTP {page.status} response"
             )
+            logger.info(session_ctx.last_error)
+            result.retry = True
+            return result
 
+        # Sometimes pages with #! will serve duplicate content
+        # There are also just other ways this can happen
+        hashed_text = hash((page.title, page.text))
+        if hashed_text in session_ctx.content_hashes:
+            logger.info(f"{index}: Skipping duplicate title + content for {page.url}")
             return result
 
-        page = session_ctx.playwright_context.new_page()
-        try:
-            # Use "commit" instead of "domcontentloaded" to avoid hanging on bot-detection pages
-            # that may never fire domcontentloaded. "commit" waits only for navigation to be
-            # committed (response received), then we add a short wait for initial rendering.
-            page_response = page.goto(
-                initial_url,
-                timeout=30000,  # 30 seconds
-                wait_until="commit",  # Wait for navigation to commit
-            )
-            # Give the page a moment to start rendering after navigation commits.
-            # Allows CloudFlare and other bot-detection challenges to complete.
-            page.wait_for_timeout(BOT_DETECTION_GRACE_PERIOD_MS)
+        session_ctx.content_hashes.add(hashed_text)
 
-            last_modified = (
-                page_response.header_value("Last-Modified") if page_response else None
-            )
-            final_url = page.url
-            if final_url != initial_url:
-                protected_url_check(final_url)
-                initial_url = final_url
-                if initial_url in session_ctx.visited_links:
-                    logger.info(
-                        f"{index}: {initial_url} redirected to {final_url} - already indexed"
+        result.doc = _build_document(page)
+        return result
+
+    def _fetch_page(
+        self,
+        url: str,
+        validators: PageValidators | None,
+        session: requests.Session,
+        throttle: _HostThrottle,
+        browsers: _PlaywrightPool,
+    ) -> _FetchedPage:
+        """Fetches a page for the concurrent crawl, retrying like the sequential one.
+        Static pages are read with a plain request, everything else is rendered by one
+        of the browsers."""
+        last_error = f"Failed to fetch '{url}'"
+        for retry_count in range(self.MAX_RETRIES):
+            if retry_count > 0:
+                # Add a random delay between retries (exponential backoff)
+                delay = min(2**retry_count + random.uniform(0, 1), 10)
+                logger.info(
+                    f"Retry {retry_count}/{self.MAX_RETRIES} for {url} after {delay:.2f}s delay"
+                )
+                time.sleep(delay)
+
+            if browsers.stopped:
+                # the crawl was closed, don't bother with what's left
+                raise _PlaywrightPoolStoppedError(last_error)
+
+            try:
+                with throttle.slot(url):
+                    page = _fetch_static_page(
+                        session,
+                        url,
+                        validators,
+                        base_url=self.to_visit_list[0],
+                        mintlify_cleanup=self.mintlify_cleanup,
+                        collect_links=self.recursive,
+                        allow_static_html=not self.scroll_before_scraping,
                     )
-                    page.close()
-                    return result
-
-                logger.info(f"{index}: {initial_url} redirected to {final_url}")
-                session_ctx.visited_links.add(initial_url)
-
-            # If we got here, the request was successful
-            if self.scroll_before_scraping:
-                scroll_attempts = 0
-                previous_height = page.evaluate("document.body.scrollHeight")
-                while scroll_attempts < WEB_CONNECTOR_MAX_SCROLL_ATTEMPTS:
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    # Wait for content to load, but catch timeout if page never reaches networkidle
-                    # (e.g., CloudFlare protection keeps making requests)
-                    try:
-                        page.wait_for_load_state(
-                            "networkidle", timeout=BOT_DETECTION_GRACE_PERIOD_MS
+                    if page is None:
+                        page = browsers.render(
+                            partial(
+                                _render_page,
+                                url=url,
+                                base_url=self.to_visit_list[0],
+                                mintlify_cleanup=self.mintlify_cleanup,
+                                scroll_before_scraping=self.scroll_before_scraping,
+                                collect_links=self.recursive,
+                            )
                         )
-                    except TimeoutError:
-                        # If networkidle times out, just give it a moment for content to render
-                        time.sleep(1)
-                    time.sleep(0.5)  # let javascript run
-
-                    new_height = page.evaluate("document.body.scrollHeight")
-                    if new_height == previous_height:
-                        break  # Stop scrolling when no more content is loaded
-                    previous_height = new_height
-                    scroll_attempts += 1
-
-            content = page.content()
-            soup = BeautifulSoup(content, "html.parser")
-
-            if self.recursive:
-                internal_links = get_internal_links(
-                    session_ctx.base_url, initial_url, soup
+            except (CancelledError, _PlaywrightPoolStoppedError):
+                raise
+            except Exception as e:
+                last_error = f"Failed to fetch '{url}': {e}"
+                logger.warning(last_error)
+                continue
+
+            if page.status is not None and page.status >= 400:
+                last_error = (
+                    f"Skipped indexing {url} due to HTTP {page.status} response"
                 )
-                for link in internal_links:
-                    if link not in session_ctx.visited_links:
-                        session_ctx.to_visit.append(link)
-
-            if page_response and str(page_response.status)[0] in ("4", "5"):
-                session_ctx.last_error = f"Skipped indexing {initial_url} due to HTTP {page_response.status} response"
-                logger.info(session_ctx.last_error)
-                result.retry = True
-                return result
+                logger.info(last_error)
+                continue
 
-            # after this point, we don't need the caller to retry
-            parsed_html = web_html_cleanup(soup, self.mintlify_cleanup)
+            return page
 
-            """For websites containing iframes that need to be scraped,
-            the code below can extract text from within these iframes.
-            """
-            logger.debug(
-                f"{index}: Length of cleaned text {len(parsed_html.cleaned_text)}"
-            )
-            if JAVASCRIPT_DISABLED_MESSAGE in parsed_html.cleaned_text:
-                iframe_count = page.frame_locator("iframe").locator("html").count()
-                if iframe_count > 0:
-                    iframe_texts = (
-                        page.frame_locator("iframe").locator("html").all_inner_texts()
+        raise RuntimeError(last_error)
+
+    def _crawl_concurrently(
+        self,
+        store: ValidatorStore | None = None,
+        window: PollWindow | None = None,
+    ) -> Iterator[tuple[str, Document | None]]:
+        """Crawls with up to WEB_CONNECTOR_MAX_CONCURRENCY pages in flight and yields
+        the id of every page found along with its document.
+
+        With a validator store, pages are requested conditionally. During indexing
+        (`window` is given) only validators of the last successful run are used, pages
+        that did not change since then are yielded without a document and the store is
+        updated. Without a window (pruning) any stored validators are used, since only
+        the ids matter, and the store is left as is."""
+        if not self.to_visit_list:
+            raise ValueError("No URLs to visit")
+
+        base_url = self.to_visit_list[0]  # For the recursive case
+        check_internet_connection(base_url)  # make sure we can connect to the base url
+
+        trusted_window = (
+            store.trusted_window(window.start) if store and window else None
+        )
+
+        to_visit = list(self.to_visit_list)
+        visited_links: set[str] = set()
+        content_hashes: set[str] = set()
+        last_error: str | None = None
+        at_least_one_page = False
+        complete = False
+
+        session = requests.Session()
+        # the same bearer token the browsers send, fetched once for the whole crawl
+        session.headers.update(_oauth_authorization_header())
+        adapter = HTTPAdapter(
+            pool_connections=WEB_CONNECTOR_MAX_CONCURRENCY,
+            pool_maxsize=WEB_CONNECTOR_MAX_CONCURRENCY,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        throttle = _HostThrottle(
+            WEB_CONNECTOR_MAX_CONCURRENCY_PER_HOST, WEB_CONNECTOR_HOST_DELAY_SECONDS
+        )
+        browsers = _PlaywrightPool(WEB_CONNECTOR_PLAYWRIGHT_POOL_SIZE)
+        executor = ThreadPoolExecutor(
+            max_workers=WEB_CONNECTOR_MAX_CONCURRENCY, thread_name_prefix="web-crawl"
+        )
+        in_flight: dict[Future[_FetchedPage], tuple[str, PageValidators | None]] = {}
+        try:
+            while to_visit or in_flight:
+                while to_visit and len(in_flight) < WEB_CONNECTOR_MAX_CONCURRENCY:
+                    initial_url = to_visit.pop()
+                    if initial_url in visited_links:
+                        continue
+                    visited_links.add(initial_url)
+
+                    try:
+                        protected_url_check(initial_url)
+                    except Exception as e:
+                        last_error = f"Invalid URL {initial_url} due to {e}"
+                        logger.warning(last_error)
+                        continue
+
+                    logger.info(f"{len(visited_links)}: Visiting {initial_url}")
+                    validators = store.get(initial_url) if store else None
+                    if (
+                        validators
+                        and window
+                        and not ValidatorStore.is_trusted(validators, trusted_window)
+                    ):
+                        validators = None
+                    future = executor.submit(
+                        self._fetch_page,
+                        initial_url,
+                        validators,
+                        session,
+                        throttle,
+                        browsers,
                     )
-                    document_text = "\n".join(iframe_texts)
-                    """ 700 is the threshold value for the length of the text extracted
-                    from the iframe based on the issue faced """
-                    if len(parsed_html.cleaned_text) < IFRAME_TEXT_LENGTH_THRESHOLD:
-                        parsed_html.cleaned_text = document_text
+                    in_flight[future] = (initial_url, validators)
+
+                if not in_flight:
+                    continue
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    initial_url, validators = in_flight.pop(future)
+                    try:
+                        page = future.result()
+                    except Exception as e:
+                        last_error = str(e)
+                        logger.warning(last_error)
+                        continue
+
+                    if page.url != initial_url:
+                        if page.url in visited_links:
+                            logger.info(
+                                f"{initial_url} redirected to {page.url} - already indexed"
+                            )
+                            continue
+
+                        logger.info(f"{initial_url} redirected to {page.url}")
+                        visited_links.add(page.url)
+
+                    at_least_one_page = True
+                    to_visit.extend(
+                        link for link in page.links if link not in visited_links
+                    )
+
+                    if page.not_modified and validators:
+                        content_hash = validators.content_hash
                     else:
-                        parsed_html.cleaned_text += "\n" + document_text
+                        content_hash = hash_page_content(page.title, page.text)
 
-            # Sometimes pages with #! will serve duplicate content
-            # There are also just other ways this can happen
-            hashed_text = hash((parsed_html.title, parsed_html.cleaned_text))
-            if hashed_text in session_ctx.content_hashes:
-                logger.info(
-                    f"{index}: Skipping duplicate title + content for {initial_url}"
-                )
-                return result
+                    # Sometimes pages with #! will serve duplicate content
+                    # There are also just other ways this can happen
+                    if content_hash in content_hashes:
+                        logger.info(
+                            f"Skipping duplicate title + content for {page.url}"
+                        )
+                        continue
+                    if content_hash:
+                        content_hashes.add(content_hash)
 
-            session_ctx.content_hashes.add(hashed_text)
-
-            result.doc = Document(
-                id=initial_url,
-                sections=[TextSection(link=initial_url, text=parsed_html.cleaned_text)],
-                source=DocumentSource.WEB,
-                semantic_identifier=parsed_html.title or initial_url,
-                metadata={},
-                doc_updated_at=(
-                    _get_datetime_from_last_modified_header(last_modified)
-                    if last_modified
-                    else None
-                ),
-            )
+                    unchanged = page.not_modified or (
+                        validators is not None
+                        and validators.content_hash == content_hash
+                    )
+
+                    if store and window:
+                        if unchanged and validators:
+                            # the content was indexed before, only the validators
+                            # and the links may have changed
+                            store.set(
+                                initial_url,
+                                validators.model_copy(
+                                    update={
+                                        "url": page.url,
+                                        "etag": page.etag,
+                                        "last_modified": page.last_modified,
+                                        "links": sorted(page.links),
+                                        "window": window,
+                                    }
+                                ),
+                            )
+                        else:
+                            store.set(
+                                initial_url,
+                                PageValidators(
+                                    url=page.url,
+                                    etag=page.etag,
+                                    last_modified=page.last_modified,
+                                    content_hash=content_hash,
+                                    links=sorted(page.links),
+                                    window=window,
+                                    fetched_at=time.time(),
+                                ),
+                            )
+
+                    if unchanged:
+                        logger.debug(f"Skipping unchanged page {page.url}")
+                        yield page.url, None
+                    else:
+                        yield page.url, _build_document(page)
+
+            if not at_least_one_page:
+                if last_error:
+                    raise RuntimeError(last_error)
+                raise RuntimeError("No valid pages found.")
+
+            complete = True
         finally:
-            page.close()
+            executor.shutdown(wait=False, cancel_futures=True)
+            browsers.stop()
+            executor.shutdown(wait=True)
+            session.close()
+            if store and window:
+                store.save(window, complete=complete)
+
+    def _validator_store_key(self) -> str:
+        return json.dumps([self.web_connector_type, self.base_url])
+
+    def _batch_documents(
+        self, pages: Iterator[tuple[str, Document | None]]
+    ) -> GenerateDocumentsOutput:
+        doc_batch: list[Document] = []
+        for _, doc in pages:
+            if doc is None:
+                continue
 
-        return result
+            doc_batch.append(doc)
+            if len(doc_batch) >= self.batch_size:
+                yield doc_batch
+                doc_batch = []
+
+        if doc_batch:
+            yield doc_batch
 
     def load_from_state(self) -> GenerateDocumentsOutput:
         """Traverses through all pages found on the website
         and converts them into documents"""
 
+        if WEB_CONNECTOR_CONCURRENT_CRAWL:
+            yield from self._batch_documents(self._crawl_concurrently())
+            return
+
         if not self.to_visit_list:
             raise ValueError("No URLs to visit")
 
@@ -736,6 +1286,44 @@ class WebConnector(LoadConnector):
 
         session_ctx.stop()
 
+    def poll_source(
+        self, start: SecondsSinceUnixEpoch, end: SecondsSinceUnixEpoch
+    ) -> GenerateDocumentsOutput:
+        """Crawls the whole site like `load_from_state`, but pages that did not change
+        since the last successful run are not fetched again or not sent for indexing.
+        The window only identifies the run, web pages can't be listed by time."""
+        if not (WEB_CONNECTOR_CONCURRENT_CRAWL and WEB_CONNECTOR_CONDITIONAL_RECRAWL):
+            yield from self.load_from_state()
+            return
+
+        store = ValidatorStore.load(self._validator_store_key())
+        yield from self._batch_documents(
+            self._crawl_concurrently(store, PollWindow(start=start, end=end))
+        )
+
+    def retrieve_all_slim_docs(self) -> GenerateSlimDocumentOutput:
+        """Lists every page of the site for pruning, including unchanged pages that
+        indexing skipped."""
+        if not WEB_CONNECTOR_CONCURRENT_CRAWL:
+            for doc_batch in self.load_from_state():
+                yield [SlimDocument(id=doc.id) for doc in doc_batch]
+            return
+
+        store = (
+            ValidatorStore.load(self._validator_store_key())
+            if WEB_CONNECTOR_CONDITIONAL_RECRAWL
+            else None
+        )
+        slim_batch: list[SlimDocument] = []
+        for doc_id, _ in self._crawl_concurrently(store):
+            slim_batch.append(SlimDocument(id=doc_id))
+            if len(slim_batch) >= _SLIM_BATCH_SIZE:
+                yield slim_batch
+                slim_batch = []
+
+        if slim_batch:
+            yield slim_batch
+
     def validate_connector_settings(self) -> None:
         # Make sure we have at least one valid URL to check
         if not self.to_visit_list:
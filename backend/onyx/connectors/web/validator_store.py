@@ -0,0 +1,146 @@
+"""
+Per-page HTTP validators (ETag / Last-Modified) and content hashes remembered between
+runs of a web connector, so recrawls can send conditional requests and skip pages that
+did not change.
+
+A page may only be skipped if the run that last saw it was indexed successfully, which
+the connector itself can't observe. Every entry is therefore stamped with the poll
+window of the run that wrote it, and the store remembers the windows of recent runs.
+The next poll window starts where the last successful attempt of the same index ended,
+so only entries stamped with the window ending there are trusted. Everything else
+(entries of failed runs, of a re-index from the beginning or of another index during a
+model swap) is simply fetched again.
+"""
+
+import gzip
+import hashlib
+import json
+import time
+from io import BytesIO
+
+from pydantic import BaseModel
+
+from onyx.configs.app_configs import POLL_CONNECTOR_OFFSET
+from onyx.configs.app_configs import WEB_CONNECTOR_VALIDATOR_MAX_AGE_DAYS
+from onyx.configs.constants import FileOrigin
+from onyx.file_store.file_store import get_default_file_store
+from onyx.utils.logger import setup_logger
+
+logger = setup_logger()
+
+_STORE_FILE_TYPE = "application/gzip"
+_MAX_REMEMBERED_WINDOWS = 20
+
+
+class PollWindow(BaseModel):
+    start: float
+    end: float
+
+
+class PageValidators(BaseModel):
+    # the url the page was served from after redirects, i.e. the document id
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+    # internal links found on the page, needed to keep crawling past skipped pages
+    links: list[str] = []
+    window: PollWindow
+    # when the page content was last downloaded in full
+    fetched_at: float
+
+
+def hash_page_content(title: str | None, text: str) -> str:
+    # the builtin hash is salted per process, so it can't be persisted
+    return hashlib.sha256(f"{title or ''}\n{text}".encode()).hexdigest()
+
+
+class ValidatorStore:
+    """Validators of one web connector configuration, keyed by the requested url."""
+
+    def __init__(
+        self,
+        file_id: str,
+        windows: list[PollWindow],
+        pages: dict[str, PageValidators],
+    ) -> None:
+        self.file_id = file_id
+        self._windows = windows
+        self._pages = pages
+        self._seen: set[str] = set()
+
+    @classmethod
+    def load(cls, connector_key: str) -> "ValidatorStore":
+        digest = hashlib.sha256(connector_key.encode()).hexdigest()[:32]
+        file_id = f"web_connector_validators_{digest}.json.gz"
+        windows: list[PollWindow] = []
+        pages: dict[str, PageValidators] = {}
+        try:
+            file_store = get_default_file_store()
+            if file_store.has_file(file_id, FileOrigin.CONNECTOR, _STORE_FILE_TYPE):
+                raw = gzip.decompress(file_store.read_file(file_id, mode="b").read())
+                stored = json.loads(raw)
+                windows = [PollWindow.model_validate(w) for w in stored["windows"]]
+                pages = {
+                    url: PageValidators.model_validate(page)
+                    for url, page in stored["pages"].items()
+                }
+        except Exception:
+            # losing the validators only means refetching every page once
+            logger.exception(f"Failed to load web connector validators {file_id}")
+            windows, pages = [], {}
+        return cls(file_id, windows, pages)
+
+    def trusted_window(self, window_start: float) -> PollWindow | None:
+        """The window of the last successful run, if this store has seen it."""
+        expected_end = window_start + POLL_CONNECTOR_OFFSET * 60
+        for window in reversed(self._windows):
+            if abs(window.end - expected_end) < 1:
+                return window
+        return None
+
+    @staticmethod
+    def is_trusted(page: PageValidators, trusted_window: PollWindow | None) -> bool:
+        max_age_seconds = WEB_CONNECTOR_VALIDATOR_MAX_AGE_DAYS * 24 * 60 * 60
+        return (
+            page.window == trusted_window
+            and time.time() - page.fetched_at < max_age_seconds
+        )
+
+    def get(self, url: str) -> PageValidators | None:
+        return self._pages.get(url)
+
+    def set(self, url: str, page: PageValidators) -> None:
+        self._pages[url] = page
+        self._seen.add(url)
+
+    def save(self, window: PollWindow, complete: bool) -> None:
+        """Persists the validators written during the run in `window`. After a complete
+        crawl, pages that were not seen any more are dropped."""
+        if complete:
+            self._pages = {
+                url: page for url, page in self._pages.items() if url in self._seen
+            }
+        windows = [w for w in self._windows if w != window] + [window]
+        self._windows = windows[-_MAX_REMEMBERED_WINDOWS:]
+
+        content = gzip.compress(
+            json.dumps(
+                {
+                    "windows": [w.model_dump() for w in self._windows],
+                    "pages": {
+                        url: page.model_dump() for url, page in self._pages.items()
+                    },
+                }
+            ).encode()
+        )
+        try:
+            get_default_file_store().save_file(
+                content=BytesIO(content),
+                display_name=self.file_id,
+                file_origin=FileOrigin.CONNECTOR,
+                file_type=_STORE_FILE_TYPE,
+                file_id=self.file_id,
+            )
+        except Exception:
+            logger.exception(f"Failed to save web connector validators {self.file_id}")
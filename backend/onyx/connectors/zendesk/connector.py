@@ -10,6 +10,7 @@ from pydantic import BaseModel
 from requests.exceptions import HTTPError
 from typing_extensions import override
 
+from onyx.configs.app_configs import CONNECTOR_DISTRIBUTED_RATE_LIMIT
 from onyx.configs.app_configs import ZENDESK_CONNECTOR_SKIP_ARTICLE_LABELS
 from onyx.configs.constants import DocumentSource
 from onyx.connectors.cross_connector_utils.miscellaneous_utils import (
@@ -18,6 +19,9 @@ from onyx.connectors.cross_connector_utils.miscellaneous_utils import (
 from onyx.connectors.cross_connector_utils.rate_limit_wrapper import (
     rate_limit_builder,
 )
+from onyx.connectors.cross_connector_utils.redis_rate_limit import (
+    distributed_rate_limit_builder,
+)
 from onyx.connectors.exceptions import ConnectorValidationError
 from onyx.connectors.exceptions import CredentialExpiredError
 from onyx.connectors.exceptions import InsufficientPermissionsError
@@ -68,9 +72,20 @@ def request_with_rate_limit(
 ) -> Callable[[str, dict[str, Any]], dict[str, Any]]:
     @retry_builder()
     @(
-        rate_limit_builder(max_calls=max_calls_per_minute, period=60)
-        if max_calls_per_minute
-        else lambda x: x
+        # Zendesk rate limits per account, so share the limit with every worker
+        # talking to the same subdomain
+        distributed_rate_limit_builder(
+            source=DocumentSource.ZENDESK,
+            scope=client.base_url,
+            max_calls=max_calls_per_minute,
+            period=60,
+        )
+        if CONNECTOR_DISTRIBUTED_RATE_LIMIT
+        else (
+            rate_limit_builder(max_calls=max_calls_per_minute, period=60)
+            if max_calls_per_minute
+            else lambda x: x
+        )
     )
     def make_request(endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
         response = requests.get(
@@ -79,7 +94,8 @@ def request_with_rate_limit(
 
         if response.status_code == 429:
             retry_after = response.headers.get("Retry-After")
-            if retry_after is not None:
+            # the distributed rate limiter backs off all workers before the retry
+            if retry_after is not None and not CONNECTOR_DISTRIBUTED_RATE_LIMIT:
                 # Sleep for the duration indicated by the Retry-After header
                 time.sleep(int(retry_after))
 
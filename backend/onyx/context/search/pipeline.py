@@ -14,6 +14,7 @@ from onyx.context.search.preprocessing.access_filters import (
     build_access_filters_for_user,
 )
 from onyx.context.search.retrieval.search_runner import search_chunks
+from onyx.context.search.retrieval.search_runner import search_chunks_batch
 from onyx.context.search.utils import inference_section_from_chunks
 from onyx.db.models import Persona
 from onyx.db.models import User
@@ -235,23 +236,15 @@ def merge_individual_chunks(
     return result
 
 
-@log_function_time(print_only=True, debug_only=True)
-def search_pipeline(
-    # Query and settings
+def _build_filters_for_persona(
     chunk_search_request: ChunkSearchRequest,
-    # Document index to search over
-    # Note that federated sources will also be used (not related to this arg)
-    document_index: DocumentIndex,
-    # Used for ACLs and federated search
     user: User | None,
-    # Used for default filters and settings
     persona: Persona | None,
     db_session: Session,
     auto_detect_filters: bool = False,
     llm: LLM | None = None,
-    # If a project ID is provided, it will be exclusively scoped to that project
     project_id: int | None = None,
-) -> list[InferenceChunk]:
+) -> IndexFilters:
     user_uploaded_persona_files: list[UUID] | None = (
         [user_file.id for user_file in persona.user_files] if persona else None
     )
@@ -265,7 +258,7 @@ def search_pipeline(
         persona.search_start_date if persona else None
     )
 
-    filters = _build_index_filters(
+    return _build_index_filters(
         user_provided_filters=chunk_search_request.user_selected_filters,
         user=user,
         project_id=project_id,
@@ -279,34 +272,144 @@ def search_pipeline(
         bypass_acl=chunk_search_request.bypass_acl,
     )
 
-    query_keywords = strip_stopwords(chunk_search_request.query)
 
-    query_request = ChunkIndexRequest(
+def _build_chunk_index_request(
+    chunk_search_request: ChunkSearchRequest, filters: IndexFilters
+) -> ChunkIndexRequest:
+    return ChunkIndexRequest(
         query=chunk_search_request.query,
         hybrid_alpha=chunk_search_request.hybrid_alpha,
         recency_bias_multiplier=chunk_search_request.recency_bias_multiplier,
-        query_keywords=query_keywords,
+        query_keywords=strip_stopwords(chunk_search_request.query),
         filters=filters,
         limit=chunk_search_request.limit,
         offset=chunk_search_request.offset,
     )
 
-    retrieved_chunks = search_chunks(
-        query_request=query_request,
-        user_id=user.id if user else None,
-        document_index=document_index,
-        db_session=db_session,
-    )
 
+def _censor_chunks(
+    chunks: list[InferenceChunk], user: User | None
+) -> list[InferenceChunk]:
     # For some specific connectors like Salesforce, a user that has access to an object doesn't mean
     # that they have access to all of the fields of the object.
-    censored_chunks: list[InferenceChunk] = fetch_ee_implementation_or_noop(
+    return fetch_ee_implementation_or_noop(
         "onyx.external_permissions.post_query_censoring",
         "_post_query_chunk_censoring",
-        retrieved_chunks,
+        chunks,
     )(
-        chunks=retrieved_chunks,
+        chunks=chunks,
         user=user,
     )
 
-    return censored_chunks
+
+@log_function_time(print_only=True, debug_only=True)
+def search_pipeline(
+    # Query and settings
+    chunk_search_request: ChunkSearchRequest,
+    # Document index to search over
+    # Note that federated sources will also be used (not related to this arg)
+    document_index: DocumentIndex,
+    # Used for ACLs and federated search
+    user: User | None,
+    # Used for default filters and settings
+    persona: Persona | None,
+    db_session: Session,
+    auto_detect_filters: bool = False,
+    llm: LLM | None = None,
+    # If a project ID is provided, it will be exclusively scoped to that project
+    project_id: int | None = None,
+) -> list[InferenceChunk]:
+    filters = _build_filters_for_persona(
+        chunk_search_request=chunk_search_request,
+        user=user,
+        persona=persona,
+        db_session=db_session,
+        auto_detect_filters=auto_detect_filters,
+        llm=llm,
+        project_id=project_id,
+    )
+
+    retrieved_chunks = search_chunks(
+        query_request=_build_chunk_index_request(chunk_search_request, filters),
+        user_id=user.id if user else None,
+        document_index=document_index,
+        db_session=db_session,
+    )
+
+    return _censor_chunks(retrieved_chunks, user)
+
+
+@log_function_time(print_only=True, debug_only=True)
+def batch_search_pipeline(
+    # Queries and their settings, the filter related fields (user_selected_filters,
+    # bypass_acl) must be the same for all of them
+    chunk_search_requests: list[ChunkSearchRequest],
+    document_index: DocumentIndex,
+    user: User | None,
+    persona: Persona | None,
+    db_session: Session,
+    project_id: int | None = None,
+) -> list[list[InferenceChunk]]:
+    """Equivalent to running `search_pipeline` for each request, but the filters
+    (including the ACL lookup) are only built once, all queries are embedded in a
+    single model call and the index queries run concurrently.
+
+    Returns one result list per request, in the same order."""
+    if not chunk_search_requests:
+        return []
+
+    first_request = chunk_search_requests[0]
+    for chunk_search_request in chunk_search_requests[1:]:
+        if (
+            chunk_search_request.user_selected_filters
+            != first_request.user_selected_filters
+            or chunk_search_request.bypass_acl != first_request.bypass_acl
+        ):
+            raise ValueError("Batched search requests must share the same filters")
+
+    filters = _build_filters_for_persona(
+        chunk_search_request=first_request,
+        user=user,
+        persona=persona,
+        db_session=db_session,
+        project_id=project_id,
+    )
+
+    retrieved_chunk_lists = search_chunks_batch(
+        query_requests=[
+            _build_chunk_index_request(chunk_search_request, filters)
+            for chunk_search_request in chunk_search_requests
+        ],
+        user_id=user.id if user else None,
+        document_index=document_index,
+        db_session=db_session,
+    )
+
+    # Censor every unique chunk once rather than once per query, the queries
+    # usually return heavily overlapping results
+    unique_chunks: dict[tuple[str, int], InferenceChunk] = {}
+    for chunks in retrieved_chunk_lists:
+        for chunk in chunks:
+            unique_chunks.setdefault((chunk.document_id, chunk.chunk_id), chunk)
+    censored_by_id = {
+        (chunk.document_id, chunk.chunk_id): chunk
+        for chunk in _censor_chunks(list(unique_chunks.values()), user)
+    }
+
+    results: list[list[InferenceChunk]] = []
+    for chunks in retrieved_chunk_lists:
+        query_results: list[InferenceChunk] = []
+        for chunk in chunks:
+            chunk_key = (chunk.document_id, chunk.chunk_id)
+            censored_chunk = censored_by_id.get(chunk_key)
+            if censored_chunk is None:
+                # the user is not allowed to see this chunk
+                continue
+            # Keep this query's own chunk (and thus its score) unless the
+            # censoring actually changed the content
+            query_results.append(
+                chunk if censored_chunk is unique_chunks[chunk_key] else censored_chunk
+            )
+        results.append(query_results)
+
+    return results
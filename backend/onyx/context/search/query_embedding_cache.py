@@ -0,0 +1,209 @@
+"""
+Two-tier cache for query embeddings.
+
+Tier 1 is a small in-process LRU, tier 2 is Redis (shared by every api server / bot
+process of the tenant) with a TTL. Entries are keyed on the search settings id as well
+as the model name and query prefix, so a search settings swap can never serve embeddings
+from the old model; `invalidate_query_embedding_cache` additionally drops the stale
+entries eagerly when the swap happens.
+"""
+
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+from prometheus_client import Counter
+from redis import Redis
+
+from onyx.configs.chat_configs import QUERY_EMBEDDING_CACHE_LOCAL_SIZE
+from onyx.configs.chat_configs import QUERY_EMBEDDING_CACHE_TTL_SECONDS
+from onyx.redis.redis_pool import get_redis_client
+from onyx.utils.logger import setup_logger
+from shared_configs.contextvars import get_current_tenant_id
+from shared_configs.model_server_models import Embedding
+
+logger = setup_logger()
+
+_REDIS_KEY_PREFIX = "query_embedding"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_CACHE_LOOKUPS = Counter(
+    "onyx_query_embedding_cache_lookups_total",
+    "Query embedding cache lookups by tier and result",
+    ["tier", "result"],
+)
+
+
+def normalize_query_for_cache(query: str) -> str:
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", query)).strip()
+
+
+def _query_hash(model_name: str | None, prefix: str | None, query: str) -> str:
+    raw = "\x1f".join(
+        [model_name or "", prefix or "", normalize_query_for_cache(query)]
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _redis_key(tenant_id: str, search_settings_id: int, query_hash: str) -> str:
+    # mget / pipelines don't automatically add the tenant_id prefix
+    return f"{tenant_id}:{_REDIS_KEY_PREFIX}:{search_settings_id}:{query_hash}"
+
+
+class _LocalEmbeddingCache:
+    """Thread safe LRU with a per-entry expiry."""
+
+    def __init__(self, max_size: int, ttl_seconds: int) -> None:
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, int, str], tuple[float, Embedding]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, int, str]) -> Embedding | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, embedding = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return embedding
+
+    def set(self, key: tuple[str, int, str], embedding: Embedding) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl_seconds, embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: str, search_settings_id: int | None) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == tenant_id and (
+                    search_settings_id is None or key[1] == search_settings_id
+                ):
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_local_cache = _LocalEmbeddingCache(
+    max_size=QUERY_EMBEDDING_CACHE_LOCAL_SIZE,
+    ttl_seconds=QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+)
+
+
+def query_embedding_cache_enabled() -> bool:
+    return QUERY_EMBEDDING_CACHE_TTL_SECONDS > 0
+
+
+def get_cached_query_embeddings(
+    queries: list[str],
+    search_settings_id: int,
+    model_name: str | None,
+    prefix: str | None,
+    redis_client: Redis | None = None,
+) -> list[Embedding | None]:
+    """Returns the cached embedding for each query, None for misses."""
+    tenant_id = get_current_tenant_id()
+    query_hashes = [_query_hash(model_name, prefix, query) for query in queries]
+
+    results: list[Embedding | None] = []
+    redis_misses: list[int] = []
+    for idx, query_hash in enumerate(query_hashes):
+        embedding = _local_cache.get((tenant_id, search_settings_id, query_hash))
+        if embedding is not None:
+            _CACHE_LOOKUPS.labels("local", "hit").inc()
+        else:
+            _CACHE_LOOKUPS.labels("local", "miss").inc()
+            redis_misses.append(idx)
+        results.append(embedding)
+
+    if not redis_misses:
+        return results
+
+    try:
+        r = redis_client or get_redis_client(tenant_id=tenant_id)
+        raw_values = r.mget(
+            [
+                _redis_key(tenant_id, search_settings_id, query_hashes[idx])
+                for idx in redis_misses
+            ]
+        )
+    except Exception:
+        logger.warning("Failed to read query embeddings from Redis", exc_info=True)
+        return results
+
+    for idx, raw in zip(redis_misses, raw_values):
+        if raw is None:
+            _CACHE_LOOKUPS.labels("redis", "miss").inc()
+            continue
+
+        _CACHE_LOOKUPS.labels("redis", "hit").inc()
+        embedding = np.frombuffer(raw, dtype="<f4").tolist()
+        _local_cache.set((tenant_id, search_settings_id, query_hashes[idx]), embedding)
+        results[idx] = embedding
+
+    return results
+
+
+def cache_query_embeddings(
+    queries: list[str],
+    embeddings: list[Embedding],
+    search_settings_id: int,
+    model_name: str | None,
+    prefix: str | None,
+    redis_client: Redis | None = None,
+) -> None:
+    tenant_id = get_current_tenant_id()
+    query_hashes = [_query_hash(model_name, prefix, query) for query in queries]
+
+    for query_hash, embedding in zip(query_hashes, embeddings):
+        _local_cache.set((tenant_id, search_settings_id, query_hash), embedding)
+
+    try:
+        r = redis_client or get_redis_client(tenant_id=tenant_id)
+        pipe = r.pipeline(transaction=False)
+        for query_hash, embedding in zip(query_hashes, embeddings):
+            pipe.set(
+                _redis_key(tenant_id, search_settings_id, query_hash),
+                np.asarray(embedding, dtype="<f4").tobytes(),
+                ex=QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+            )
+        pipe.execute()
+    except Exception:
+        logger.warning("Failed to write query embeddings to Redis", exc_info=True)
+
+
+def invalidate_query_embedding_cache(
+    search_settings_id: int | None = None,
+    redis_client: Redis | None = None,
+) -> None:
+    """Drops cached embeddings for the given search settings (all of them if None)
+    for the current tenant. Other processes' in-memory tiers are not reached, but their
+    entries are keyed on the old search settings id and can never be served again."""
+    tenant_id = get_current_tenant_id()
+    _local_cache.invalidate(tenant_id, search_settings_id)
+
+    pattern = (
+        _redis_key(tenant_id, search_settings_id, "*")
+        if search_settings_id is not None
+        else f"{tenant_id}:{_REDIS_KEY_PREFIX}:*"
+    )
+    try:
+        r = redis_client or get_redis_client(tenant_id=tenant_id)
+        for key in r.scan_iter(pattern, count=1000):
+            r.delete(key)
+    except Exception:
+        logger.warning("Failed to invalidate query embeddings in Redis", exc_info=True)
@@ -11,6 +11,7 @@ from onyx.context.search.models import InferenceChunk
 from onyx.context.search.models import InferenceSection
 from onyx.context.search.models import QueryExpansionType
 from onyx.context.search.utils import get_query_embedding
+from onyx.context.search.utils import get_query_embeddings
 from onyx.context.search.utils import inference_section_from_chunks
 from onyx.document_index.interfaces import DocumentIndex
 from onyx.document_index.interfaces import VespaChunkRequest
@@ -19,6 +20,7 @@ from onyx.federated_connectors.federated_retrieval import (
 )
 from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
+from shared_configs.model_server_models import Embedding
 
 logger = setup_logger()
 
@@ -47,13 +49,11 @@ def combine_retrieval_results(
     return sorted_chunks
 
 
-def _embed_and_search(
+def _search_with_embedding(
     query_request: ChunkIndexRequest,
+    query_embedding: Embedding,
     document_index: DocumentIndex,
-    db_session: Session,
 ) -> list[InferenceChunk]:
-    query_embedding = get_query_embedding(query_request.query, db_session)
-
     hybrid_alpha = query_request.hybrid_alpha or HYBRID_ALPHA
 
     top_chunks = document_index.hybrid_retrieval(
@@ -75,6 +75,15 @@ def _embed_and_search(
     return top_chunks
 
 
+def _embed_and_search(
+    query_request: ChunkIndexRequest,
+    document_index: DocumentIndex,
+    db_session: Session,
+) -> list[InferenceChunk]:
+    query_embedding = get_query_embedding(query_request.query, db_session)
+    return _search_with_embedding(query_request, query_embedding, document_index)
+
+
 def search_chunks(
     query_request: ChunkIndexRequest,
     user_id: UUID | None,
@@ -131,6 +140,81 @@ def search_chunks(
     return top_chunks
 
 
+def search_chunks_batch(
+    query_requests: list[ChunkIndexRequest],
+    user_id: UUID | None,
+    document_index: DocumentIndex,
+    db_session: Session,
+) -> list[list[InferenceChunk]]:
+    """Same as calling `search_chunks` for each request, but all of the queries are
+    embedded in a single model call and every index / federated query is issued
+    concurrently. All requests must share the same filters.
+
+    Returns one result list per request, in the same order."""
+    if not query_requests:
+        return []
+
+    filters = query_requests[0].filters
+    source_filters = set(filters.source_type) if filters.source_type else None
+
+    # Federated retrieval, the connectors to use only depend on the shared filters
+    federated_retrieval_infos = get_federated_retrieval_functions(
+        db_session=db_session,
+        user_id=user_id,
+        source_types=list(source_filters) if source_filters else None,
+        document_set_names=filters.document_set,
+        user_file_ids=filters.user_file_ids,
+    )
+
+    federated_sources = set(
+        federated_retrieval_info.source.to_non_federated_source()
+        for federated_retrieval_info in federated_retrieval_infos
+    )
+
+    # Don't run normal hybrid search if there are no indexed sources to
+    # search over
+    normal_search_enabled = (source_filters is None) or (
+        len(set(source_filters) - federated_sources) > 0
+    )
+
+    query_embeddings = (
+        get_query_embeddings([request.query for request in query_requests], db_session)
+        if normal_search_enabled
+        else []
+    )
+
+    run_queries: list[tuple[Callable, tuple]] = []
+    # index of the request each entry of run_queries belongs to
+    request_indices: list[int] = []
+    for idx, query_request in enumerate(query_requests):
+        for federated_retrieval_info in federated_retrieval_infos:
+            run_queries.append(
+                (federated_retrieval_info.retrieval_function, (query_request,))
+            )
+            request_indices.append(idx)
+
+        if normal_search_enabled:
+            run_queries.append(
+                (
+                    _search_with_embedding,
+                    (query_request, query_embeddings[idx], document_index),
+                )
+            )
+            request_indices.append(idx)
+
+    parallel_search_results = run_functions_tuples_in_parallel(run_queries)
+
+    chunk_sets_by_request: list[list[list[InferenceChunk]]] = [
+        [] for _ in query_requests
+    ]
+    for idx, chunk_set in zip(request_indices, parallel_search_results):
+        chunk_sets_by_request[idx].append(chunk_set)
+
+    return [
+        combine_retrieval_results(chunk_sets) for chunk_sets in chunk_sets_by_request
+    ]
+
+
 # TODO: This is unused code.
 def inference_sections_from_ids(
     doc_identifiers: list[tuple[str, int]],
@@ -1,3 +1,4 @@
+from typing import cast
 from typing import TypeVar
 
 from sqlalchemy.orm import Session
@@ -7,6 +8,11 @@ from onyx.context.search.models import InferenceSection
 from onyx.context.search.models import SavedSearchDoc
 from onyx.context.search.models import SavedSearchDocWithContent
 from onyx.context.search.models import SearchDoc
+from onyx.context.search.query_embedding_cache import cache_query_embeddings
+from onyx.context.search.query_embedding_cache import get_cached_query_embeddings
+from onyx.context.search.query_embedding_cache import (
+    query_embedding_cache_enabled,
+)
 from onyx.db.search_settings import get_current_search_settings
 from onyx.natural_language_processing.search_nlp_models import EmbeddingModel
 from onyx.utils.logger import setup_logger
@@ -67,6 +73,20 @@ def inference_section_from_single_chunk(
 def get_query_embeddings(queries: list[str], db_session: Session) -> list[Embedding]:
     search_settings = get_current_search_settings(db_session)
 
+    if not query_embedding_cache_enabled():
+        cached: list[Embedding | None] = [None] * len(queries)
+    else:
+        cached = get_cached_query_embeddings(
+            queries=queries,
+            search_settings_id=search_settings.id,
+            model_name=search_settings.model_name,
+            prefix=search_settings.query_prefix,
+        )
+
+    missing_queries = [query for query, emb in zip(queries, cached) if emb is None]
+    if not missing_queries:
+        return cast(list[Embedding], cached)
+
     model = EmbeddingModel.from_db_model(
         search_settings=search_settings,
         # The below are globally set, this flow always uses the indexing one
@@ -74,8 +94,18 @@ def get_query_embeddings(queries: list[str], db_session: Session) -> list[Embedd
         server_port=MODEL_SERVER_PORT,
     )
 
-    query_embedding = model.encode(queries, text_type=EmbedTextType.QUERY)
-    return query_embedding
+    new_embeddings = model.encode(missing_queries, text_type=EmbedTextType.QUERY)
+    if query_embedding_cache_enabled():
+        cache_query_embeddings(
+            queries=missing_queries,
+            embeddings=new_embeddings,
+            search_settings_id=search_settings.id,
+            model_name=search_settings.model_name,
+            prefix=search_settings.query_prefix,
+        )
+
+    new_embeddings_iter = iter(new_embeddings)
+    return [emb if emb is not None else next(new_embeddings_iter) for emb in cached]
 
 
 @log_function_time(print_only=True, debug_only=True)
@@ -14,6 +14,7 @@ from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import selectinload
 from sqlalchemy.orm import Session
 
+from onyx.access.acl_cache import invalidate_user_acl_cache
 from onyx.configs.app_configs import DISABLE_AUTH
 from onyx.configs.constants import DocumentSource
 from onyx.db.connector import fetch_connector_by_id
@@ -627,6 +628,8 @@ def remove_credential_from_connector(
         )
         db_session.delete(association)
         db_session.commit()
+        # the users lost their external groups of the cc pair
+        invalidate_user_acl_cache()
         return StatusResponse(
             success=True,
             message=f"Credential {credential_id} removed from Connector",
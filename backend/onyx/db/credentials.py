@@ -19,6 +19,7 @@ from onyx.db.models import ConnectorCredentialPair
 from onyx.db.models import Credential
 from onyx.db.models import Credential__UserGroup
 from onyx.db.models import DocumentByConnectorCredentialPair
+from onyx.db.models import DocumentCountByConnectorCredentialPair
 from onyx.db.models import User
 from onyx.db.models import User__UserGroup
 from onyx.server.documents.models import CredentialBase
@@ -241,6 +242,17 @@ def swap_credentials_connector(
         )
         .values(credential_id=new_credential_id)
     )
+    db_session.execute(
+        update(DocumentCountByConnectorCredentialPair)
+        .where(
+            and_(
+                DocumentCountByConnectorCredentialPair.connector_id == connector_id,
+                DocumentCountByConnectorCredentialPair.credential_id
+                == existing_pair.credential_id,
+            )
+        )
+        .values(credential_id=new_credential_id)
+    )
 
     # Update the existing pair with the new credential
     existing_pair.credential_id = new_credential_id
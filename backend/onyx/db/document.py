@@ -1,5 +1,6 @@
 import contextlib
 import time
+from collections import Counter
 from collections.abc import Generator
 from collections.abc import Iterable
 from collections.abc import Sequence
@@ -37,6 +38,7 @@ from onyx.db.models import ConnectorCredentialPair
 from onyx.db.models import Credential
 from onyx.db.models import Document as DbDocument
 from onyx.db.models import DocumentByConnectorCredentialPair
+from onyx.db.models import DocumentCountByConnectorCredentialPair
 from onyx.db.models import KGEntity
 from onyx.db.models import KGRelationship
 from onyx.db.models import User
@@ -296,40 +298,30 @@ def get_document_counts_for_cc_pairs(
 
     # Batch to avoid generating extremely large IN clauses that can blow Postgres stack depth
     batch_size = 1000
-    aggregated_counts: dict[tuple[int, int], int] = {}
+    counts: list[tuple[int, int, int]] = []
 
     for start_idx in range(0, len(cc_ids), batch_size):
         batch = cc_ids[start_idx : start_idx + batch_size]
 
-        stmt = (
-            select(
-                DocumentByConnectorCredentialPair.connector_id,
-                DocumentByConnectorCredentialPair.credential_id,
-                func.count(),
-            )
-            .where(
-                and_(
-                    tuple_(
-                        DocumentByConnectorCredentialPair.connector_id,
-                        DocumentByConnectorCredentialPair.credential_id,
-                    ).in_(batch),
-                    DocumentByConnectorCredentialPair.has_been_indexed.is_(True),
-                )
-            )
-            .group_by(
-                DocumentByConnectorCredentialPair.connector_id,
-                DocumentByConnectorCredentialPair.credential_id,
+        stmt = select(
+            DocumentCountByConnectorCredentialPair.connector_id,
+            DocumentCountByConnectorCredentialPair.credential_id,
+            DocumentCountByConnectorCredentialPair.document_count,
+        ).where(
+            and_(
+                tuple_(
+                    DocumentCountByConnectorCredentialPair.connector_id,
+                    DocumentCountByConnectorCredentialPair.credential_id,
+                ).in_(batch),
+                DocumentCountByConnectorCredentialPair.document_count > 0,
             )
         )
+        counts.extend(
+            (connector_id, credential_id, cnt)
+            for connector_id, credential_id, cnt in db_session.execute(stmt).all()
+        )
 
-        for connector_id, credential_id, cnt in db_session.execute(stmt).all():
-            aggregated_counts[(connector_id, credential_id)] = cnt
-
-    # Convert aggregated results back to the expected sequence of tuples
-    return [
-        (connector_id, credential_id, cnt)
-        for (connector_id, credential_id), cnt in aggregated_counts.items()
-    ]
+    return counts
 
 
 def get_document_counts_for_all_cc_pairs(
@@ -337,22 +329,96 @@ def get_document_counts_for_all_cc_pairs(
 ) -> Sequence[tuple[int, int, int]]:
     """Return (connector_id, credential_id, count) for ALL CC pairs with indexed docs.
 
-    Executes a single grouped query so Postgres can fully leverage indexes,
-    avoiding large batched IN-lists.
+    Reads the counts maintained in DocumentCountByConnectorCredentialPair rather than
+    aggregating over DocumentByConnectorCredentialPair, which can have tens of millions
+    of rows.
     """
-    stmt = (
-        select(
-            DocumentByConnectorCredentialPair.connector_id,
-            DocumentByConnectorCredentialPair.credential_id,
-            func.count(),
+    stmt = select(
+        DocumentCountByConnectorCredentialPair.connector_id,
+        DocumentCountByConnectorCredentialPair.credential_id,
+        DocumentCountByConnectorCredentialPair.document_count,
+    ).where(DocumentCountByConnectorCredentialPair.document_count > 0)
+    return db_session.execute(stmt).all()  # type: ignore
+
+
+def _apply_document_count_deltas__no_commit(
+    db_session: Session, deltas: dict[tuple[int, int], int]
+) -> None:
+    """Adds the given deltas to the document counts of the (connector_id, credential_id)
+    pairs. The count rows stay locked until the transaction ends, so they are updated
+    in a fixed order to avoid deadlocks."""
+    for (connector_id, credential_id), delta in sorted(deltas.items()):
+        if delta == 0:
+            continue
+
+        insert_stmt = insert(DocumentCountByConnectorCredentialPair).values(
+            connector_id=connector_id,
+            credential_id=credential_id,
+            document_count=delta,
         )
-        .where(DocumentByConnectorCredentialPair.has_been_indexed.is_(True))
-        .group_by(
-            DocumentByConnectorCredentialPair.connector_id,
-            DocumentByConnectorCredentialPair.credential_id,
+        db_session.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=["connector_id", "credential_id"],
+                set_={
+                    "document_count": (
+                        DocumentCountByConnectorCredentialPair.document_count
+                        + insert_stmt.excluded.document_count
+                    )
+                },
+            )
         )
+
+
+def _count_indexed_documents_for_cc_pair(
+    db_session: Session, connector_id: int, credential_id: int
+) -> int:
+    stmt = select(func.count()).where(
+        DocumentByConnectorCredentialPair.connector_id == connector_id,
+        DocumentByConnectorCredentialPair.credential_id == credential_id,
+        DocumentByConnectorCredentialPair.has_been_indexed.is_(True),
     )
-    return db_session.execute(stmt).all()  # type: ignore
+    return db_session.scalar(stmt) or 0
+
+
+def reconcile_document_count_for_cc_pair(
+    db_session: Session, connector_id: int, credential_id: int
+) -> int:
+    """Recounts the indexed documents of a cc pair and fixes the stored count.
+    Returns how far off the stored count was.
+
+    The count row is locked before counting. Writers update the document rows first
+    and the count row last, so any change that isn't visible to the count below is
+    only applied to the count row after this transaction commits."""
+    db_session.execute(
+        insert(DocumentCountByConnectorCredentialPair)
+        .values(
+            connector_id=connector_id, credential_id=credential_id, document_count=0
+        )
+        .on_conflict_do_nothing()
+    )
+    stored_count = db_session.scalar(
+        select(DocumentCountByConnectorCredentialPair.document_count)
+        .where(
+            DocumentCountByConnectorCredentialPair.connector_id == connector_id,
+            DocumentCountByConnectorCredentialPair.credential_id == credential_id,
+        )
+        .with_for_update()
+    )
+    actual_count = _count_indexed_documents_for_cc_pair(
+        db_session, connector_id, credential_id
+    )
+    drift = actual_count - (stored_count or 0)
+    if drift:
+        db_session.execute(
+            update(DocumentCountByConnectorCredentialPair)
+            .where(
+                DocumentCountByConnectorCredentialPair.connector_id == connector_id,
+                DocumentCountByConnectorCredentialPair.credential_id == credential_id,
+            )
+            .values(document_count=actual_count)
+        )
+    db_session.commit()
+    return drift
 
 
 def get_access_info_for_document(
@@ -554,16 +620,21 @@ def mark_document_as_indexed_for_cc_pair__no_commit(
     document_ids: Iterable[str],
 ) -> None:
     """Should be called only after a successful index operation for a batch."""
-    db_session.execute(
+    newly_indexed = db_session.execute(
         update(DocumentByConnectorCredentialPair)
         .where(
             and_(
                 DocumentByConnectorCredentialPair.connector_id == connector_id,
                 DocumentByConnectorCredentialPair.credential_id == credential_id,
                 DocumentByConnectorCredentialPair.id.in_(document_ids),
+                DocumentByConnectorCredentialPair.has_been_indexed.is_not(True),
             )
         )
         .values(has_been_indexed=True)
+        .returning(DocumentByConnectorCredentialPair.id)
+    ).all()
+    _apply_document_count_deltas__no_commit(
+        db_session, {(connector_id, credential_id): len(newly_indexed)}
     )
 
 
@@ -630,6 +701,15 @@ def mark_document_as_synced(document_id: str, db_session: Session) -> None:
     db_session.commit()
 
 
+def mark_documents_as_synced(document_ids: list[str], db_session: Session) -> None:
+    db_session.execute(
+        update(DbDocument)
+        .where(DbDocument.id.in_(document_ids))
+        .values(last_synced=datetime.now(timezone.utc))
+    )
+    db_session.commit()
+
+
 def delete_document_by_connector_credential_pair__no_commit(
     db_session: Session,
     document_id: str,
@@ -673,7 +753,24 @@ def delete_documents_by_connector_credential_pair__no_commit(
                 == connector_credential_pair_identifier.credential_id,
             )
         )
-    db_session.execute(stmt)
+    deleted = db_session.execute(
+        stmt.returning(
+            DocumentByConnectorCredentialPair.connector_id,
+            DocumentByConnectorCredentialPair.credential_id,
+            DocumentByConnectorCredentialPair.has_been_indexed,
+        )
+    ).all()
+    _apply_document_count_deltas__no_commit(
+        db_session,
+        {
+            cc_pair: -count
+            for cc_pair, count in Counter(
+                (connector_id, credential_id)
+                for connector_id, credential_id, has_been_indexed in deleted
+                if has_been_indexed
+            ).items()
+        },
+    )
 
 
 def delete_all_documents_by_connector_credential_pair__no_commit(
@@ -696,6 +793,12 @@ def delete_all_documents_by_connector_credential_pair__no_commit(
         )
     )
     db_session.execute(stmt)
+    db_session.execute(
+        delete(DocumentCountByConnectorCredentialPair).where(
+            DocumentCountByConnectorCredentialPair.connector_id == connector_id,
+            DocumentCountByConnectorCredentialPair.credential_id == credential_id,
+        )
+    )
 
 
 def delete_documents__no_commit(db_session: Session, document_ids: list[str]) -> None:
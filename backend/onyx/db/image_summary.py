@@ -0,0 +1,39 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from onyx.db.models import ImageSummary
+
+
+def get_image_summaries(
+    cache_keys: list[str],
+    db_session: Session,
+) -> dict[str, str]:
+    if not cache_keys:
+        return {}
+
+    rows = db_session.execute(
+        select(ImageSummary.cache_key, ImageSummary.summary).where(
+            ImageSummary.cache_key.in_(cache_keys)
+        )
+    ).all()
+    return {cache_key: summary for cache_key, summary in rows}
+
+
+def store_image_summaries(
+    cache_key_to_summary: dict[str, str],
+    db_session: Session,
+) -> None:
+    if not cache_key_to_summary:
+        return
+
+    # Another worker may have summarized the same image in the meantime, the
+    # summaries are interchangeable so the first one wins
+    insert_stmt = pg_insert(ImageSummary).values(
+        [
+            {"cache_key": cache_key, "summary": summary}
+            for cache_key, summary in cache_key_to_summary.items()
+        ]
+    )
+    db_session.execute(insert_stmt.on_conflict_do_nothing(index_elements=["cache_key"]))
+    db_session.commit()
@@ -2032,6 +2032,22 @@ class DocumentByConnectorCredentialPair(Base):
     )
 
 
+class DocumentCountByConnectorCredentialPair(Base):
+    """Number of indexed documents (`has_been_indexed`) per connector / credential pair.
+    Kept up to date by the functions in onyx.db.document that modify
+    DocumentByConnectorCredentialPair and periodically reconciled against it."""
+
+    __tablename__ = "document_count_by_connector_credential_pair"
+
+    connector_id: Mapped[int] = mapped_column(
+        ForeignKey("connector.id", ondelete="CASCADE"), primary_key=True
+    )
+    credential_id: Mapped[int] = mapped_column(
+        ForeignKey("credential.id", ondelete="CASCADE"), primary_key=True
+    )
+    document_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
 """
 Messages Tables
 """
@@ -3233,6 +3249,20 @@ class FileRecord(Base):
     )
 
 
+class ImageSummary(Base):
+    """Cache of vision LLM summaries of images, keyed on a hash of the image bytes and
+    the model / prompts used. Shared by every document containing the same image."""
+
+    __tablename__ = "image_summary"
+
+    cache_key: Mapped[str] = mapped_column(String, primary_key=True)
+    summary: Mapped[str] = mapped_column(Text, nullable=False)
+
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
 """
 ************************************************************************
 Enterprise Edition Models
@@ -0,0 +1,141 @@
+"""
+Diffs the documents a connector currently returns against the documents indexed for
+its cc pair inside Postgres, so pruning memory stays constant in the size of the corpus.
+
+The source document ids are streamed into a temp table with COPY and the documents to
+prune are streamed back out of an anti-join against the
+document_by_connector_credential_pair table.
+Temp tables are private to the connection that created them, so everything runs on a
+session pinned to one connection (see `get_session_with_source_doc_id_table`).
+"""
+
+import csv
+import io
+from collections.abc import Generator
+from collections.abc import Iterable
+from contextlib import contextmanager
+
+from sqlalchemy import and_
+from sqlalchemy import column
+from sqlalchemy import exists
+from sqlalchemy import select
+from sqlalchemy import table
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from onyx.configs.app_configs import PRUNING_DIFF_COPY_BATCH_SIZE
+from onyx.db.engine.sql_engine import get_sqlalchemy_engine
+from onyx.db.engine.sql_engine import is_valid_schema_name
+from onyx.db.models import DocumentByConnectorCredentialPair
+from onyx.utils.logger import setup_logger
+
+logger = setup_logger()
+
+_SOURCE_DOC_ID_TABLE = "pruning_source_document_id"
+
+# pg_temp always resolves to the temp schema of the session, and an explicit schema
+# keeps the tenant schema_translate_map from rewriting the table into the tenant schema
+_source_doc_ids = table(_SOURCE_DOC_ID_TABLE, column("id"), schema="pg_temp")
+
+
+def _drop_source_doc_id_table(db_session: Session) -> None:
+    db_session.execute(text(f"DROP TABLE IF EXISTS pg_temp.{_SOURCE_DOC_ID_TABLE}"))
+    db_session.commit()
+
+
+@contextmanager
+def get_session_with_source_doc_id_table(
+    tenant_id: str,
+) -> Generator[Session, None, None]:
+    """Session pinned to a single connection which owns an empty temp table for the
+    source document ids. The session can be committed freely, the connection (and the
+    table) is kept until the context exits. The connection goes back to the pool
+    afterwards, so the table is always dropped on exit."""
+    if not is_valid_schema_name(tenant_id):
+        raise ValueError(f"Invalid tenant ID: {tenant_id}")
+
+    engine = get_sqlalchemy_engine()
+    with engine.connect().execution_options(
+        schema_translate_map={None: tenant_id}
+    ) as connection:
+        with Session(bind=connection, expire_on_commit=False) as db_session:
+            # a previous run on this pooled connection may not have cleaned up
+            _drop_source_doc_id_table(db_session)
+            db_session.execute(
+                text(f"CREATE TEMP TABLE {_SOURCE_DOC_ID_TABLE} (id VARCHAR NOT NULL)")
+            )
+            db_session.commit()
+
+            try:
+                yield db_session
+            finally:
+                try:
+                    db_session.rollback()
+                    _drop_source_doc_id_table(db_session)
+                except Exception:
+                    logger.exception("Failed to drop the pruning source id table")
+
+
+def _copy_source_doc_ids(db_session: Session, doc_ids: list[str]) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([doc_id] for doc_id in doc_ids)
+    buffer.seek(0)
+
+    dbapi_connection = db_session.connection().connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY pg_temp.{_SOURCE_DOC_ID_TABLE} (id) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    # committed per batch so no transaction is held open while the connector is running
+    db_session.commit()
+
+
+def load_source_doc_ids(
+    db_session: Session,
+    doc_id_batches: Iterable[Iterable[str]],
+    batch_size: int = PRUNING_DIFF_COPY_BATCH_SIZE,
+) -> int:
+    """Copies the source document ids into the temp table of the session and indexes it.
+    Connector batches are usually small, they are regrouped into COPYs of `batch_size`.
+    Returns the number of ids loaded (duplicates included)."""
+    num_loaded = 0
+    pending: list[str] = []
+    for doc_id_batch in doc_id_batches:
+        pending.extend(doc_id_batch)
+        if len(pending) >= batch_size:
+            _copy_source_doc_ids(db_session, pending)
+            num_loaded += len(pending)
+            pending = []
+
+    if pending:
+        _copy_source_doc_ids(db_session, pending)
+        num_loaded += len(pending)
+
+    # built after loading, which is much cheaper than maintaining it during the COPYs
+    db_session.execute(text(f"CREATE INDEX ON pg_temp.{_SOURCE_DOC_ID_TABLE} (id)"))
+    # autovacuum never analyzes temp tables, without stats the planner guesses badly
+    db_session.execute(text(f"ANALYZE pg_temp.{_SOURCE_DOC_ID_TABLE}"))
+    db_session.commit()
+    return num_loaded
+
+
+def iter_doc_ids_missing_from_source(
+    db_session: Session,
+    connector_id: int,
+    credential_id: int,
+    batch_size: int = PRUNING_DIFF_COPY_BATCH_SIZE,
+) -> Generator[str, None, None]:
+    """Streams the ids of the documents indexed for the cc pair which are not in the
+    temp table of the session, i.e. the documents to prune."""
+    stmt = select(DocumentByConnectorCredentialPair.id).where(
+        and_(
+            DocumentByConnectorCredentialPair.connector_id == connector_id,
+            DocumentByConnectorCredentialPair.credential_id == credential_id,
+            ~exists().where(
+                _source_doc_ids.c.id == DocumentByConnectorCredentialPair.id
+            ),
+        )
+    )
+    yield from db_session.scalars(stmt.execution_options(yield_per=batch_size))
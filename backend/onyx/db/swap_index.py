@@ -4,6 +4,9 @@ from sqlalchemy.orm import Session
 
 from onyx.configs.app_configs import VESPA_NUM_ATTEMPTS_ON_STARTUP
 from onyx.configs.constants import KV_REINDEX_KEY
+from onyx.context.search.query_embedding_cache import (
+    invalidate_query_embedding_cache,
+)
 from onyx.db.connector_credential_pair import get_connector_credential_pairs
 from onyx.db.connector_credential_pair import resync_cc_pair
 from onyx.db.document import delete_all_documents_for_connector_credential_pair
@@ -79,6 +82,9 @@ def _perform_index_swap(
         new_status=IndexModelStatus.PRESENT,
         db_session=db_session,
     )
+    # the old model's query embeddings can never be served again, drop them now
+    # rather than waiting for them to expire
+    invalidate_query_embedding_cache(search_settings_id=current_search_settings.id)
 
     # This flow is for checking and possibly creating an index so we get all
     # indices.
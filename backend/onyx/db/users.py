@@ -12,6 +12,7 @@ from sqlalchemy.sql import expression
 from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.sql.elements import KeyedColumnElement
 
+from onyx.access.acl_cache import invalidate_user_acl_cache
 from onyx.auth.invited_users import remove_user_from_invited_users
 from onyx.auth.schemas import UserRole
 from onyx.db.api_key import DANSWER_API_KEY_DUMMY_EMAIL_DOMAIN
@@ -349,6 +350,7 @@ def delete_user_from_db(
     ).delete()
     db_session.delete(user_to_delete)
     db_session.commit()
+    invalidate_user_acl_cache()
 
     # NOTE: edge case may exist with race conditions
     # with this `invited user` scheme generally.
@@ -9,6 +9,8 @@ from onyx.db.models import SearchSettings
 from onyx.db.search_settings import get_current_search_settings
 from onyx.db.search_settings import get_secondary_search_settings
 from onyx.document_index.interfaces import EnrichedDocumentIndexingInfo
+from onyx.document_index.interfaces import UpdateRequest
+from onyx.document_index.interfaces_new import MetadataUpdateRequest
 from onyx.indexing.models import DocMetadataAwareIndexChunk
 from onyx.indexing.models import MultipassConfig
 from shared_configs.configs import MULTI_TENANT
@@ -76,6 +78,25 @@ def translate_boost_count_to_multiplier(boost: int) -> float:
     return 2 / (1 + math.exp(-1 * boost / 3))
 
 
+def to_metadata_update_request(update_request: UpdateRequest) -> MetadataUpdateRequest:
+    """Converts a legacy `UpdateRequest` to the request of the new document index
+    interface. Unknown chunk counts are passed on as -1."""
+    document_ids = [
+        doc_info.doc_id for doc_info in update_request.minimal_document_indexing_info
+    ]
+    return MetadataUpdateRequest(
+        document_ids=document_ids,
+        doc_id_to_chunk_cnt={
+            doc_id: update_request.doc_id_to_chunk_cnt.get(doc_id, -1)
+            for doc_id in document_ids
+        },
+        access=update_request.access,
+        document_sets=update_request.document_sets,
+        boost=update_request.boost,
+        hidden=update_request.hidden,
+    )
+
+
 # Assembles a list of Vespa chunk IDs for a document
 # given the required context. This can be used to directly query
 # Vespa's Document API.
@@ -1,5 +1,6 @@
 import abc
 from dataclasses import dataclass
+from dataclasses import field
 from datetime import datetime
 from typing import Any
 
@@ -10,6 +11,8 @@ from onyx.context.search.models import IndexFilters
 from onyx.context.search.models import InferenceChunk
 from onyx.context.search.models import QueryExpansionType
 from onyx.db.enums import EmbeddingPrecision
+from onyx.indexing.models import ChunkEmbedding
+from onyx.indexing.models import DocAwareChunk
 from onyx.indexing.models import DocMetadataAwareIndexChunk
 from shared_configs.model_server_models import Embedding
 
@@ -132,6 +135,21 @@ class UpdateRequest:
     document_sets: set[str] | None = None
     boost: float | None = None
     hidden: bool | None = None
+    # chunk counts of the documents, missing or negative values mean the chunk count is
+    # unknown (legacy chunk ID system)
+    doc_id_to_chunk_cnt: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class StoredChunkEmbedding:
+    """
+    The embeddings of an already indexed chunk along with the fingerprint of the content
+    they were computed from
+    """
+
+    content_hash: str | None
+    embeddings: ChunkEmbedding
+    title_embedding: Embedding | None
 
 
 class Verifiable(abc.ABC):
@@ -340,6 +358,62 @@ class IdRetrievalCapable(abc.ABC):
         """
         raise NotImplementedError
 
+    def chunk_window_retrieval(
+        self,
+        chunk_windows: list[VespaChunkRequest],
+        filters: IndexFilters,
+    ) -> list[list[InferenceChunk]]:
+        """
+        Fetch several chunk ranges (e.g. the context around every section of a search
+        result) with a single batched `id_based_retrieval` call instead of one call per
+        range.
+
+        Parameters:
+        - chunk_windows: requests with a document id and a capped chunk range
+        - filters: Filters to apply to retrieval
+
+        Returns:
+            for each window, in the same order, the chunks that fall inside of it sorted
+            by chunk id. Overlapping windows each get their own copy of the shared chunks.
+        """
+        if not chunk_windows:
+            return []
+
+        retrieved_chunks = self.id_based_retrieval(
+            chunk_requests=chunk_windows,
+            filters=filters,
+            batch_retrieval=True,
+        )
+
+        chunks_by_doc: dict[str, list[InferenceChunk]] = {}
+        for chunk in retrieved_chunks:
+            chunks_by_doc.setdefault(
+                self._chunk_window_document_id(chunk.document_id), []
+            ).append(chunk)
+        for doc_chunks in chunks_by_doc.values():
+            doc_chunks.sort(key=lambda chunk: chunk.chunk_id)
+
+        results: list[list[InferenceChunk]] = []
+        for window in chunk_windows:
+            min_chunk_ind = window.min_chunk_ind or 0
+            max_chunk_ind = window.max_chunk_ind
+            results.append(
+                [
+                    chunk
+                    for chunk in chunks_by_doc.get(
+                        self._chunk_window_document_id(window.document_id), []
+                    )
+                    if chunk.chunk_id >= min_chunk_ind
+                    and (max_chunk_ind is None or chunk.chunk_id <= max_chunk_ind)
+                ]
+            )
+        return results
+
+    def _chunk_window_document_id(self, document_id: str) -> str:
+        """The id that retrieved chunks and chunk windows are matched on. Indices that
+        normalize document ids should apply the same normalization here."""
+        return document_id
+
 
 class HybridCapable(abc.ABC):
     """
@@ -439,6 +513,33 @@ class RandomCapable(abc.ABC):
         raise NotImplementedError
 
 
+class StoredEmbeddingRetrievalCapable(abc.ABC):
+    """
+    Class must implement fetching the embeddings stored with already indexed chunks, this
+    lets reindexing skip the embedding of chunks whose content did not change
+    """
+
+    @abc.abstractmethod
+    def get_stored_chunk_embeddings(
+        self,
+        chunks: list[DocAwareChunk],
+        tenant_id: str,
+    ) -> list[StoredChunkEmbedding | None]:
+        """
+        Fetch the stored embeddings of the indexed chunks with the same identity (document id,
+        chunk id and large chunk id) as the given chunks
+
+        Parameters:
+        - chunks: freshly chunked chunks whose previously indexed version should be fetched
+        - tenant_id: tenant the chunks belong to
+
+        Returns:
+            for each chunk, in the same order, the stored embeddings or None if the chunk is
+            not indexed yet
+        """
+        raise NotImplementedError
+
+
 class BaseIndex(
     Verifiable,
     Indexable,
@@ -29,6 +29,8 @@ __all__ = [
     "DocumentSectionRequest",
     "IndexingMetadata",
     "MetadataUpdateRequest",
+    # Errors
+    "PartialIndexingError",
     # Capability mixins - for custom compositions or type checking
     "SchemaVerifiable",
     "Indexable",
@@ -70,6 +72,27 @@ class DocumentInsertionRecord(BaseModel):
     already_existed: bool
 
 
+class PartialIndexingError(RuntimeError):
+    """
+    Raised when indexing a batch succeeded for some of its documents but not for
+    others. Documents with an insertion record were fully indexed and do not
+    need to be retried.
+    """
+
+    def __init__(
+        self,
+        insertion_records: list[DocumentInsertionRecord],
+        failed_document_id_to_error: dict[str, str],
+    ) -> None:
+        self.insertion_records = insertion_records
+        self.failed_document_id_to_error = failed_document_id_to_error
+        super().__init__(
+            f"Failed to index {len(failed_document_id_to_error)} of "
+            f"{len(insertion_records) + len(failed_document_id_to_error)} documents: "
+            f"{failed_document_id_to_error}"
+        )
+
+
 class DocumentSectionRequest(BaseModel):
     """Request for a document section or whole document.
 
@@ -226,6 +249,11 @@ class Indexable(abc.ABC):
             indexing_metadata: Information about chunk counts for efficient
                 cleaning / updating.
 
+        Raises:
+            PartialIndexingError: Only some of the documents could be indexed.
+                Implementations which write the batch in one go should raise
+                this rather than failing the whole batch.
+
         Returns:
             List of document IDs which map to unique documents as well as if the
                 document is newly indexed or had already existed and was just
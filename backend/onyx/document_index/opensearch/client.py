@@ -10,6 +10,7 @@ from pydantic import BaseModel
 
 from onyx.configs.app_configs import OPENSEARCH_ADMIN_PASSWORD
 from onyx.configs.app_configs import OPENSEARCH_ADMIN_USERNAME
+from onyx.configs.app_configs import OPENSEARCH_BULK_MAX_BYTES
 from onyx.configs.app_configs import OPENSEARCH_HOST
 from onyx.configs.app_configs import OPENSEARCH_REST_API_PORT
 from onyx.document_index.opensearch.schema import DocumentChunk
@@ -273,6 +274,114 @@ class OpenSearchClient:
                     f'Unknown OpenSearch indexing result: "{result_string}".'
                 )
 
+    def bulk_index_documents(
+        self,
+        documents: list[DocumentChunk],
+        max_request_bytes: int = OPENSEARCH_BULK_MAX_BYTES,
+    ) -> dict[str, str]:
+        """Indexes documents using as few _bulk requests as possible.
+
+        As with index_document, indexing a document fails if a document with
+        the same ID already exists. Unlike index_document, a failure to index
+        one document does not fail the others; the failures are returned
+        instead.
+
+        Does not refresh the index.
+
+        Args:
+            documents: The documents to index. In Onyx these are chunks of
+                documents, OpenSearch simply refers to these as documents as
+                well.
+            max_request_bytes: Maximum size of the body of a single _bulk
+                request. A document larger than this is sent in a request of its
+                own.
+
+        Raises:
+            Exception: There was an error sending a _bulk request, in which case
+                any number of the documents may have been indexed.
+
+        Returns:
+            A map of the OpenSearch ID of every document chunk which failed to be
+                indexed to the reason it failed. Empty if every document was
+                indexed.
+        """
+        serializer = self._client.transport.serializer
+        failures: dict[str, str] = {}
+
+        request_chunk_ids: list[str] = []
+        request_lines: list[str] = []
+        request_bytes = 0
+        for document in documents:
+            document_chunk_id: str = get_opensearch_doc_chunk_id(
+                document_id=document.document_id,
+                chunk_index=document.chunk_index,
+                max_chunk_size=document.max_chunk_size,
+            )
+            # "create" rather than "index" so that existing documents fail
+            # instead of being overwritten.
+            action_line = serializer.dumps(
+                {"create": {"_index": self._index_name, "_id": document_chunk_id}}
+            )
+            source_line = serializer.dumps(document.model_dump(exclude_none=True))
+            num_bytes = len(action_line.encode()) + len(source_line.encode()) + 2
+
+            if request_chunk_ids and request_bytes + num_bytes > max_request_bytes:
+                failures.update(self._send_bulk(request_chunk_ids, request_lines))
+                request_chunk_ids, request_lines, request_bytes = [], [], 0
+
+            request_chunk_ids.append(document_chunk_id)
+            request_lines.extend((action_line, source_line))
+            request_bytes += num_bytes
+
+        if request_chunk_ids:
+            failures.update(self._send_bulk(request_chunk_ids, request_lines))
+        return failures
+
+    def _send_bulk(
+        self, document_chunk_ids: list[str], lines: list[str]
+    ) -> dict[str, str]:
+        """Sends a single _bulk request of create actions.
+
+        Args:
+            document_chunk_ids: The OpenSearch IDs of the documents in the
+                request, in order.
+            lines: The newline delimited action and source lines of the request.
+
+        Raises:
+            Exception: There was an error sending the request.
+
+        Returns:
+            A map of the OpenSearch ID of every document chunk which failed to be
+                indexed to the reason it failed.
+        """
+        result = self._client.bulk(body="\n".join(lines) + "\n")
+        items: list[dict[str, Any]] = result.get("items", [])
+        if len(items) != len(document_chunk_ids):
+            raise RuntimeError(
+                f"OpenSearch responded with {len(items)} items to a bulk request of "
+                f"{len(document_chunk_ids)} documents for index {self._index_name}."
+            )
+        if not result.get("errors", False):
+            return {}
+
+        failures: dict[str, str] = {}
+        # Items are returned in the order of the actions in the request.
+        for document_chunk_id, item in zip(document_chunk_ids, items):
+            item_result: dict[str, Any] = item.get("create", {})
+            error = item_result.get("error")
+            if error is None and item_result.get("result") == "created":
+                continue
+            if isinstance(error, dict):
+                reason = (
+                    f'{error.get("type", "unknown_error")}: {error.get("reason", "")}'
+                )
+            else:
+                reason = str(error or item_result.get("result"))
+            failures[document_chunk_id] = (
+                f"OpenSearch returned status {item_result.get('status')}, {reason}"
+            )
+        return failures
+
     def delete_document(self, document_chunk_id: str) -> bool:
         """Deletes a document.
 
@@ -337,6 +446,38 @@ class OpenSearchClient:
 
         return num_deleted
 
+    def get_aggregation_bucket_counts(
+        self, body: dict[str, Any], aggregation_name: str
+    ) -> dict[str, int]:
+        """Runs a search with a terms aggregation and returns its buckets.
+
+        Args:
+            body: The body of the search, containing a terms aggregation named
+                aggregation_name.
+            aggregation_name: The name of the terms aggregation.
+
+        Raises:
+            Exception: There was an error running the search. This includes the
+                case where the aggregation is missing from the response.
+
+        Returns:
+            A map of the key of each bucket to the number of documents in it.
+        """
+        result = self._client.search(index=self._index_name, body=body)
+        if result.get("timed_out", False):
+            raise RuntimeError(f"Search timed out for index {self._index_name}.")
+        aggregation: dict[str, Any] | None = result.get("aggregations", {}).get(
+            aggregation_name
+        )
+        if aggregation is None:
+            raise RuntimeError(
+                f'Aggregation "{aggregation_name}" missing from response when trying to search index {self._index_name}.'
+            )
+        return {
+            bucket["key"]: bucket["doc_count"]
+            for bucket in aggregation.get("buckets", [])
+        }
+
     def update_document(
         self, document_chunk_id: str, properties_to_update: dict[str, Any]
     ) -> None:
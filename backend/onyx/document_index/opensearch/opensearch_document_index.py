@@ -21,6 +21,7 @@ from onyx.document_index.chunk_content_enrichment import cleanup_content_for_chu
 from onyx.document_index.chunk_content_enrichment import (
     generate_enriched_content_for_chunk_text,
 )
+from onyx.document_index.document_index_utils import to_metadata_update_request
 from onyx.document_index.interfaces import DocumentIndex as OldDocumentIndex
 from onyx.document_index.interfaces import (
     DocumentInsertionRecord as OldDocumentInsertionRecord,
@@ -35,6 +36,7 @@ from onyx.document_index.interfaces_new import DocumentInsertionRecord
 from onyx.document_index.interfaces_new import DocumentSectionRequest
 from onyx.document_index.interfaces_new import IndexingMetadata
 from onyx.document_index.interfaces_new import MetadataUpdateRequest
+from onyx.document_index.interfaces_new import PartialIndexingError
 from onyx.document_index.interfaces_new import TenantState
 from onyx.document_index.opensearch.client import OpenSearchClient
 from onyx.document_index.opensearch.client import SearchHit
@@ -47,6 +49,7 @@ from onyx.document_index.opensearch.schema import get_opensearch_doc_chunk_id
 from onyx.document_index.opensearch.schema import GLOBAL_BOOST_FIELD_NAME
 from onyx.document_index.opensearch.schema import HIDDEN_FIELD_NAME
 from onyx.document_index.opensearch.schema import USER_PROJECTS_FIELD_NAME
+from onyx.document_index.opensearch.search import CHUNK_COUNTS_AGGREGATION_NAME
 from onyx.document_index.opensearch.search import DocumentQuery
 from onyx.document_index.opensearch.search import (
     MIN_MAX_NORMALIZATION_PIPELINE_CONFIG,
@@ -61,7 +64,6 @@ from onyx.document_index.opensearch.search import (
     ZSCORE_NORMALIZATION_PIPELINE_NAME,
 )
 from onyx.indexing.models import DocMetadataAwareIndexChunk
-from onyx.indexing.models import Document
 from onyx.utils.logger import setup_logger
 from shared_configs.configs import MULTI_TENANT
 from shared_configs.model_server_models import Embedding
@@ -337,7 +339,12 @@ class OpenSearchOldDocumentIndex(OldDocumentIndex):
         *,
         tenant_id: str,
     ) -> None:
-        raise NotImplementedError("[ANDREI]: Update is not implemented for OpenSearch.")
+        self._real_index.update(
+            [
+                to_metadata_update_request(update_request)
+                for update_request in update_requests
+            ]
+        )
 
     def id_based_retrieval(
         self,
@@ -487,44 +494,82 @@ class OpenSearchDocumentIndex(DocumentIndex):
         logger.debug(
             f"[OpenSearchDocumentIndex] Indexing {len(chunks)} chunks for index {self._index_name}."
         )
-        # Set of doc IDs.
-        unique_docs_to_be_indexed: set[str] = set()
-        document_indexing_results: list[DocumentInsertionRecord] = []
+        # Unique doc IDs, in the order they are first seen.
+        document_ids: list[str] = list(
+            dict.fromkeys(chunk.source_document.id for chunk in chunks)
+        )
+        if not document_ids:
+            return []
+
+        opensearch_document_chunks: list[DocumentChunk] = []
+        document_chunk_id_to_document_id: dict[str, str] = {}
         for chunk in chunks:
-            document_insertion_record: DocumentInsertionRecord | None = None
-            onyx_document: Document = chunk.source_document
-            if onyx_document.id not in unique_docs_to_be_indexed:
-                # If this is the first time we see this doc in this indexing
-                # operation, first delete the doc's chunks from the index. This
-                # is so that there are no dangling chunks in the index, in the
-                # event that the new document's content contains fewer chunks
-                # than the previous content.
-                # TODO(andrei): This can possibly be made more efficient by
-                # checking if the chunk count has actually decreased. This
-                # assumes that overlapping chunks are perfectly overwritten. If
-                # we can't guarantee that then we need the code as-is.
-                unique_docs_to_be_indexed.add(onyx_document.id)
-                num_chunks_deleted = self.delete(
-                    onyx_document.id, onyx_document.chunk_count
+            opensearch_document_chunk = _convert_onyx_chunk_to_opensearch_document(
+                chunk
+            )
+            opensearch_document_chunks.append(opensearch_document_chunk)
+            document_chunk_id_to_document_id[
+                get_opensearch_doc_chunk_id(
+                    document_id=opensearch_document_chunk.document_id,
+                    chunk_index=opensearch_document_chunk.chunk_index,
+                    max_chunk_size=opensearch_document_chunk.max_chunk_size,
                 )
-                # If we see that chunks were deleted we assume the doc already
-                # existed.
-                document_insertion_record = DocumentInsertionRecord(
-                    document_id=onyx_document.id,
-                    already_existed=num_chunks_deleted > 0,
+            ] = chunk.source_document.id
+
+        # If chunks are found for a doc we assume the doc already existed.
+        existing_chunk_counts = self._os_client.get_aggregation_bucket_counts(
+            body=DocumentQuery.get_chunk_counts_for_document_ids_query(
+                document_ids=document_ids,
+                tenant_state=self._tenant_state,
+            ),
+            aggregation_name=CHUNK_COUNTS_AGGREGATION_NAME,
+        )
+
+        # First delete the docs' chunks from the index. This is so that there
+        # are no dangling chunks in the index, in the event that the new
+        # document's content contains fewer chunks than the previous content.
+        # TODO(andrei): This can possibly be made more efficient by checking if
+        # the chunk count has actually decreased. This assumes that overlapping
+        # chunks are perfectly overwritten. If we can't guarantee that then we
+        # need the code as-is.
+        if existing_chunk_counts:
+            self._os_client.delete_by_query(
+                DocumentQuery.delete_from_document_ids_query(
+                    document_ids=list(existing_chunk_counts),
+                    tenant_state=self._tenant_state,
                 )
+            )
 
-            opensearch_document_chunk = _convert_onyx_chunk_to_opensearch_document(
-                chunk
+        failed_document_chunk_id_to_error = self._os_client.bulk_index_documents(
+            opensearch_document_chunks
+        )
+        # Make the batch searchable once it is written rather than per chunk.
+        self._os_client.refresh_index()
+
+        failed_document_id_to_error: dict[str, str] = {}
+        for (
+            document_chunk_id,
+            error,
+        ) in failed_document_chunk_id_to_error.items():
+            # Report the first failed chunk of each doc.
+            failed_document_id_to_error.setdefault(
+                document_chunk_id_to_document_id[document_chunk_id],
+                f'Failed to index chunk "{document_chunk_id}": {error}',
+            )
+
+        document_indexing_results: list[DocumentInsertionRecord] = [
+            DocumentInsertionRecord(
+                document_id=document_id,
+                already_existed=existing_chunk_counts.get(document_id, 0) > 0,
+            )
+            for document_id in document_ids
+            if document_id not in failed_document_id_to_error
+        ]
+        if failed_document_id_to_error:
+            raise PartialIndexingError(
+                insertion_records=document_indexing_results,
+                failed_document_id_to_error=failed_document_id_to_error,
             )
-            # TODO(andrei): After our client supports batch indexing, use that
-            # here.
-            self._os_client.index_document(opensearch_document_chunk)
-
-            if document_insertion_record is not None:
-                # Only add records once per doc. This object is not None only if
-                # we've seen this doc for the first time in this for-loop.
-                document_indexing_results.append(document_insertion_record)
 
         return document_indexing_results
 
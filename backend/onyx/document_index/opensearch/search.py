@@ -111,6 +111,9 @@ DEFAULT_OPENSEARCH_MAX_RESULT_WINDOW = 10_000
 # cutoff filtering during retrieval.
 ASSUMED_DOCUMENT_AGE_DAYS = 90
 
+# Name of the terms aggregation which counts the chunks of each document.
+CHUNK_COUNTS_AGGREGATION_NAME = "chunk_counts_by_document_id"
+
 
 class DocumentQuery:
     """
@@ -234,6 +237,110 @@ class DocumentQuery:
 
         return final_delete_query
 
+    @staticmethod
+    def delete_from_document_ids_query(
+        document_ids: list[str],
+        tenant_state: TenantState,
+    ) -> dict[str, Any]:
+        """
+        Returns a final search query which deletes chunks from any of the given
+        document IDs.
+
+        This query can be directly supplied to the OpenSearch client.
+
+        Intended to be supplied to the OpenSearch client's delete_by_query
+        method, to delete the chunks of a whole batch of documents in one
+        request.
+
+        Args:
+            document_ids: Onyx document IDs. Notably not OpenSearch document
+                IDs, which point to what Onyx would refer to as chunks.
+            tenant_state: Tenant state containing the tenant ID.
+
+        Returns:
+            A dictionary representing the final delete query.
+        """
+        final_delete_query: dict[str, Any] = {
+            "query": {
+                "bool": {
+                    "filter": DocumentQuery._get_document_ids_filters(
+                        document_ids=document_ids,
+                        tenant_state=tenant_state,
+                    )
+                }
+            },
+        }
+
+        return final_delete_query
+
+    @staticmethod
+    def get_chunk_counts_for_document_ids_query(
+        document_ids: list[str],
+        tenant_state: TenantState,
+    ) -> dict[str, Any]:
+        """
+        Returns a final search query which counts the chunks in the index for
+        each of the given document IDs.
+
+        This query can be directly supplied to the OpenSearch client. The counts
+        are in the CHUNK_COUNTS_AGGREGATION_NAME terms aggregation, documents
+        without any chunks have no bucket.
+
+        Args:
+            document_ids: Onyx document IDs. Notably not OpenSearch document
+                IDs, which point to what Onyx would refer to as chunks.
+            tenant_state: Tenant state containing the tenant ID.
+
+        Returns:
+            A dictionary representing the final count query.
+        """
+        final_count_query: dict[str, Any] = {
+            "query": {
+                "bool": {
+                    "filter": DocumentQuery._get_document_ids_filters(
+                        document_ids=document_ids,
+                        tenant_state=tenant_state,
+                    )
+                }
+            },
+            # We only want the aggregation, not the hits.
+            "size": 0,
+            "aggs": {
+                CHUNK_COUNTS_AGGREGATION_NAME: {
+                    "terms": {
+                        "field": DOCUMENT_ID_FIELD_NAME,
+                        "size": max(len(document_ids), 1),
+                    }
+                }
+            },
+        }
+
+        return final_count_query
+
+    @staticmethod
+    def _get_document_ids_filters(
+        document_ids: list[str],
+        tenant_state: TenantState,
+    ) -> list[dict[str, Any]]:
+        """Returns filters matching every chunk, including hidden ones, of any of
+        the given documents."""
+        filter_clauses = DocumentQuery._get_search_filters(
+            tenant_state=tenant_state,
+            include_hidden=True,
+            access_control_list=None,
+            source_types=[],
+            tags=[],
+            document_sets=[],
+            user_file_ids=[],
+            project_id=None,
+            time_cutoff=None,
+            min_chunk_index=None,
+            max_chunk_index=None,
+            max_chunk_size=None,
+        )
+        filter_clauses.append({"terms": {DOCUMENT_ID_FIELD_NAME: document_ids}})
+        return filter_clauses
+
     @staticmethod
     def get_hybrid_search_query(
         query_text: str,
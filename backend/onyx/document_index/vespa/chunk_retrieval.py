@@ -4,6 +4,7 @@ from collections.abc import Callable
 from collections.abc import Mapping
 from datetime import datetime
 from datetime import timezone
+from http import HTTPStatus
 from typing import Any
 from typing import cast
 
@@ -14,8 +15,9 @@ from onyx.configs.app_configs import LOG_VESPA_TIMING_INFORMATION
 from onyx.configs.app_configs import VESPA_LANGUAGE_OVERRIDE
 from onyx.context.search.models import IndexFilters
 from onyx.context.search.models import InferenceChunkUncleaned
+from onyx.document_index.interfaces import StoredChunkEmbedding
 from onyx.document_index.interfaces import VespaChunkRequest
-from onyx.document_index.vespa.shared_utils.utils import get_vespa_http_client
+from onyx.document_index.vespa.shared_utils.utils import get_vespa_query_client
 from onyx.document_index.vespa.shared_utils.vespa_request_builders import (
     build_vespa_filters,
 )
@@ -28,11 +30,13 @@ from onyx.document_index.vespa_constants import BOOST
 from onyx.document_index.vespa_constants import CHUNK_CONTEXT
 from onyx.document_index.vespa_constants import CHUNK_ID
 from onyx.document_index.vespa_constants import CONTENT
+from onyx.document_index.vespa_constants import CONTENT_HASH
 from onyx.document_index.vespa_constants import CONTENT_SUMMARY
 from onyx.document_index.vespa_constants import DOC_SUMMARY
 from onyx.document_index.vespa_constants import DOC_UPDATED_AT
 from onyx.document_index.vespa_constants import DOCUMENT_ID
 from onyx.document_index.vespa_constants import DOCUMENT_ID_ENDPOINT
+from onyx.document_index.vespa_constants import EMBEDDINGS
 from onyx.document_index.vespa_constants import HIDDEN
 from onyx.document_index.vespa_constants import IMAGE_FILE_NAME
 from onyx.document_index.vespa_constants import LARGE_CHUNK_REFERENCE_IDS
@@ -40,6 +44,7 @@ from onyx.document_index.vespa_constants import MAX_ID_SEARCH_QUERY_SIZE
 from onyx.document_index.vespa_constants import MAX_OR_CONDITIONS
 from onyx.document_index.vespa_constants import METADATA
 from onyx.document_index.vespa_constants import METADATA_SUFFIX
+from onyx.document_index.vespa_constants import NUM_THREADS
 from onyx.document_index.vespa_constants import PRIMARY_OWNERS
 from onyx.document_index.vespa_constants import SEARCH_ENDPOINT
 from onyx.document_index.vespa_constants import SECONDARY_OWNERS
@@ -49,10 +54,13 @@ from onyx.document_index.vespa_constants import SOURCE_LINKS
 from onyx.document_index.vespa_constants import SOURCE_TYPE
 from onyx.document_index.vespa_constants import TENANT_ID
 from onyx.document_index.vespa_constants import TITLE
+from onyx.document_index.vespa_constants import TITLE_EMBEDDING
 from onyx.document_index.vespa_constants import YQL_BASE
+from onyx.indexing.models import ChunkEmbedding
 from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 from shared_configs.configs import MULTI_TENANT
+from shared_configs.model_server_models import Embedding
 
 logger = setup_logger()
 
@@ -218,9 +226,8 @@ def get_chunks_via_visit_api(
     while True:
         try:
             filtered_params = {k: v for k, v in params.items() if v is not None}
-            with get_vespa_http_client() as http_client:
-                response = http_client.get(url, params=filtered_params)
-                response.raise_for_status()
+            response = get_vespa_query_client().get(url, params=filtered_params)
+            response.raise_for_status()
         except httpx.HTTPError as e:
             error_base = "Failed to query Vespa"
             logger.error(
@@ -286,6 +293,72 @@ def get_chunks_via_visit_api(
 #     return [chunk["id"].split("::", 1)[-1] for chunk in document_chunks]
 
 
+def _stored_embedding_from_vespa_fields(
+    fields: dict[str, Any],
+) -> StoredChunkEmbedding | None:
+    # With format.tensors=short-value the mixed embeddings tensor comes back as a map
+    # from label ("full_chunk", "mini_chunk_<i>") to vector and the dense title
+    # embedding as a plain vector
+    embeddings = fields.get(EMBEDDINGS)
+    if isinstance(embeddings, dict) and "blocks" in embeddings:
+        embeddings = embeddings["blocks"]
+    if not isinstance(embeddings, dict) or "full_chunk" not in embeddings:
+        return None
+
+    mini_chunk_embeddings: list[Embedding] = []
+    for ind in range(len(embeddings) - 1):
+        mini_chunk_embedding = embeddings.get(f"mini_chunk_{ind}")
+        if mini_chunk_embedding is None:
+            return None
+        mini_chunk_embeddings.append(mini_chunk_embedding)
+
+    title_embedding = fields.get(TITLE_EMBEDDING)
+    if isinstance(title_embedding, dict):
+        title_embedding = title_embedding.get("values")
+
+    return StoredChunkEmbedding(
+        content_hash=fields.get(CONTENT_HASH),
+        embeddings=ChunkEmbedding(
+            full_embedding=embeddings["full_chunk"],
+            mini_chunk_embeddings=mini_chunk_embeddings,
+        ),
+        title_embedding=title_embedding,
+    )
+
+
+def get_stored_chunk_embeddings(
+    index_name: str,
+    vespa_chunk_ids: list[str],
+    http_client: httpx.Client,
+) -> list[StoredChunkEmbedding | None]:
+    """Fetches the stored embeddings of the given chunks via the document API, which
+    (unlike search) can return the embedding tensors. None for chunks that don't exist
+    or couldn't be fetched."""
+    url = DOCUMENT_ID_ENDPOINT.format(index_name=index_name)
+    params = {
+        "fieldSet": f"{index_name}:{CONTENT_HASH},{EMBEDDINGS},{TITLE_EMBEDDING}",
+        "format.tensors": "short-value",
+    }
+
+    def _get_stored_chunk_embedding(
+        vespa_chunk_id: str,
+    ) -> StoredChunkEmbedding | None:
+        response = http_client.get(f"{url}/{vespa_chunk_id}", params=params)
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            return None
+        response.raise_for_status()
+        return _stored_embedding_from_vespa_fields(response.json().get("fields", {}))
+
+    return run_functions_tuples_in_parallel(
+        [
+            (_get_stored_chunk_embedding, (vespa_chunk_id,))
+            for vespa_chunk_id in vespa_chunk_ids
+        ],
+        allow_failures=True,
+        max_workers=NUM_THREADS,
+    )
+
+
 def parallel_visit_api_retrieval(
     index_name: str,
     chunk_requests: list[VespaChunkRequest],
@@ -341,9 +414,8 @@ def query_vespa(
         params["language"] = VESPA_LANGUAGE_OVERRIDE
 
     try:
-        with get_vespa_http_client() as http_client:
-            response = http_client.post(SEARCH_ENDPOINT, json=params)
-            response.raise_for_status()
+        response = get_vespa_query_client().post(SEARCH_ENDPOINT, json=params)
+        response.raise_for_status()
     except httpx.HTTPError as e:
         error_base = "Failed to query Vespa"
         logger.error(
@@ -32,6 +32,7 @@ from onyx.context.search.models import InferenceChunkUncleaned
 from onyx.context.search.models import QueryExpansionType
 from onyx.db.enums import EmbeddingPrecision
 from onyx.document_index.document_index_utils import get_uuid_from_chunk_info
+from onyx.document_index.document_index_utils import to_metadata_update_request
 from onyx.document_index.interfaces import DocumentIndex
 from onyx.document_index.interfaces import (
     DocumentInsertionRecord as OldDocumentInsertionRecord,
@@ -39,6 +40,8 @@ from onyx.document_index.interfaces import (
 from onyx.document_index.interfaces import EnrichedDocumentIndexingInfo
 from onyx.document_index.interfaces import IndexBatchParams
 from onyx.document_index.interfaces import MinimalDocumentIndexingInfo
+from onyx.document_index.interfaces import StoredChunkEmbedding
+from onyx.document_index.interfaces import StoredEmbeddingRetrievalCapable
 from onyx.document_index.interfaces import UpdateRequest
 from onyx.document_index.interfaces import VespaChunkRequest
 from onyx.document_index.interfaces import VespaDocumentFields
@@ -46,12 +49,17 @@ from onyx.document_index.interfaces import VespaDocumentUserFields
 from onyx.document_index.interfaces_new import DocumentSectionRequest
 from onyx.document_index.interfaces_new import IndexingMetadata
 from onyx.document_index.interfaces_new import MetadataUpdateRequest
+from onyx.document_index.vespa.chunk_retrieval import get_stored_chunk_embeddings
 from onyx.document_index.vespa.chunk_retrieval import query_vespa
 from onyx.document_index.vespa.indexing_utils import BaseHTTPXClientContext
 from onyx.document_index.vespa.indexing_utils import check_for_final_chunk_existence
 from onyx.document_index.vespa.indexing_utils import GlobalHTTPXClientContext
 from onyx.document_index.vespa.indexing_utils import TemporaryHTTPXClientContext
 from onyx.document_index.vespa.shared_utils.utils import get_vespa_http_client
+from onyx.document_index.vespa.shared_utils.utils import get_vespa_query_client
+from onyx.document_index.vespa.shared_utils.utils import (
+    replace_invalid_doc_id_characters,
+)
 from onyx.document_index.vespa.shared_utils.vespa_request_builders import (
     build_vespa_filters,
 )
@@ -64,6 +72,7 @@ from onyx.document_index.vespa_constants import NUM_THREADS
 from onyx.document_index.vespa_constants import VESPA_APPLICATION_ENDPOINT
 from onyx.document_index.vespa_constants import VESPA_TIMEOUT
 from onyx.document_index.vespa_constants import YQL_BASE
+from onyx.indexing.models import DocAwareChunk
 from onyx.indexing.models import DocMetadataAwareIndexChunk
 from onyx.key_value_store.factory import get_shared_kv_store
 from onyx.kg.utils.formatting_utils import split_relationship_id
@@ -220,7 +229,7 @@ def cleanup_chunks(chunks: list[InferenceChunkUncleaned]) -> list[InferenceChunk
     return [chunk.to_inference_chunk() for chunk in chunks]
 
 
-class VespaIndex(DocumentIndex):
+class VespaIndex(DocumentIndex, StoredEmbeddingRetrievalCapable):
 
     VESPA_SCHEMA_JINJA_FILENAME = "danswer_chunk.sd.jinja"
 
@@ -649,7 +658,31 @@ class VespaIndex(DocumentIndex):
         )
 
     def update(self, update_requests: list[UpdateRequest], *, tenant_id: str) -> None:
-        raise NotImplementedError
+        tenant_state = TenantState(
+            tenant_id=get_current_tenant_id(),
+            multitenant=MULTI_TENANT,
+        )
+        if tenant_state.multitenant != self.multitenant:
+            raise ValueError(
+                f"Bug: Multitenant mismatch. Expected {tenant_state.multitenant}, got {self.multitenant}."
+            )
+        if tenant_state.multitenant and tenant_state.tenant_id != tenant_id:
+            raise ValueError(
+                f"Bug: Tenant ID mismatch. Expected {tenant_state.tenant_id}, got {tenant_id}."
+            )
+
+        vespa_document_index = VespaDocumentIndex(
+            index_name=self.index_name,
+            tenant_state=tenant_state,
+            large_chunks_enabled=self.large_chunks_enabled,
+            httpx_client=self.httpx_client,
+        )
+        vespa_document_index.update(
+            [
+                to_metadata_update_request(update_request)
+                for update_request in update_requests
+            ]
+        )
 
     def update_single(
         self,
@@ -765,6 +798,65 @@ class VespaIndex(DocumentIndex):
             batch_retrieval=batch_retrieval,
         )
 
+    def _chunk_window_document_id(self, document_id: str) -> str:
+        # windows are requested with the sanitized id while retrieved chunks carry
+        # the original one
+        return replace_invalid_doc_id_characters(document_id)
+
+    def get_stored_chunk_embeddings(
+        self,
+        chunks: list[DocAwareChunk],
+        tenant_id: str,
+    ) -> list[StoredChunkEmbedding | None]:
+        vespa_chunk_ids = [
+            str(
+                get_uuid_from_chunk_info(
+                    document_id=chunk.source_document.id,
+                    chunk_id=chunk.chunk_id,
+                    tenant_id=tenant_id,
+                    large_chunk_id=chunk.large_chunk_id,
+                )
+            )
+            for chunk in chunks
+        ]
+
+        # Probe the first chunk of every document first so that documents which were
+        # never indexed only cost a single lookup instead of one per chunk
+        first_chunk_inds: dict[str, int] = {}
+        for ind, chunk in enumerate(chunks):
+            first_chunk_inds.setdefault(chunk.source_document.id, ind)
+
+        results: list[StoredChunkEmbedding | None] = [None] * len(chunks)
+        with self.httpx_client_context as httpx_client:
+            probe_inds = list(first_chunk_inds.values())
+            for ind, stored in zip(
+                probe_inds,
+                get_stored_chunk_embeddings(
+                    self.index_name,
+                    [vespa_chunk_ids[ind] for ind in probe_inds],
+                    httpx_client,
+                ),
+            ):
+                results[ind] = stored
+
+            remaining_inds = [
+                ind
+                for ind, chunk in enumerate(chunks)
+                if ind != first_chunk_inds[chunk.source_document.id]
+                and results[first_chunk_inds[chunk.source_document.id]] is not None
+            ]
+            for ind, stored in zip(
+                remaining_inds,
+                get_stored_chunk_embeddings(
+                    self.index_name,
+                    [vespa_chunk_ids[ind] for ind in remaining_inds],
+                    httpx_client,
+                ),
+            ):
+                results[ind] = stored
+
+        return results
+
     @log_function_time(print_only=True, debug_only=True)
     def hybrid_retrieval(
         self,
@@ -961,22 +1053,23 @@ class VespaIndex(DocumentIndex):
                 f"Querying for document IDs with tenant_id: {tenant_id}, offset: {offset}"
             )
 
-            with get_vespa_http_client() as http_client:
-                response = http_client.get(url, params=query_params, timeout=None)
-                response.raise_for_status()
+            response = get_vespa_query_client().get(
+                url, params=query_params, timeout=None
+            )
+            response.raise_for_status()
 
-                search_result = response.json()
-                hits = search_result.get("root", {}).get("children", [])
+            search_result = response.json()
+            hits = search_result.get("root", {}).get("children", [])
 
-                if not hits:
-                    break
+            if not hits:
+                break
 
-                for hit in hits:
-                    doc_id = hit.get("id")
-                    if doc_id:
-                        document_ids.append(doc_id)
+            for hit in hits:
+                doc_id = hit.get("id")
+                if doc_id:
+                    document_ids.append(doc_id)
 
-                offset += limit  # Move to the next page
+            offset += limit  # Move to the next page
 
         logger.debug(
             f"Retrieved {len(document_ids)} document IDs for tenant_id: {tenant_id}"
@@ -6,8 +6,10 @@ import httpx
 from onyx.configs.app_configs import MANAGED_VESPA
 from onyx.configs.app_configs import VESPA_CLOUD_CERT_PATH
 from onyx.configs.app_configs import VESPA_CLOUD_KEY_PATH
+from onyx.configs.app_configs import VESPA_QUERY_POOL_MAX_CONNECTIONS
 from onyx.configs.app_configs import VESPA_REQUEST_TIMEOUT
 from onyx.document_index.vespa_constants import VESPA_APP_CONTAINER_URL
+from onyx.httpx.httpx_pool import HttpxPool
 from onyx.utils.logger import setup_logger
 
 logger = setup_logger()
@@ -69,6 +71,36 @@ def get_vespa_http_client(no_timeout: bool = False, http2: bool = True) -> httpx
     )
 
 
+VESPA_QUERY_CLIENT_NAME = "vespa_query"
+
+
+def init_vespa_query_client() -> None:
+    """Creates the process-wide pooled client used for Vespa reads (search queries
+    and visits). No-op if it already exists."""
+    HttpxPool.init_client(
+        name=VESPA_QUERY_CLIENT_NAME,
+        cert=(
+            cast(tuple[str, str], (VESPA_CLOUD_CERT_PATH, VESPA_CLOUD_KEY_PATH))
+            if MANAGED_VESPA
+            else None
+        ),
+        verify=False if not MANAGED_VESPA else True,
+        timeout=VESPA_REQUEST_TIMEOUT,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=VESPA_QUERY_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=VESPA_QUERY_POOL_MAX_CONNECTIONS,
+        ),
+    )
+
+
+def get_vespa_query_client() -> httpx.Client:
+    """Returns the pooled Vespa read client, creating it on first use.
+    The client is shared across threads and must NOT be closed by the caller."""
+    init_vespa_query_client()
+    return HttpxPool.get(VESPA_QUERY_CLIENT_NAME)
+
+
 def wait_for_vespa_with_timeout(wait_interval: int = 5, wait_limit: int = 60) -> bool:
     """Waits for Vespa to become ready subject to a timeout.
     Returns True if Vespa is ready, False otherwise."""
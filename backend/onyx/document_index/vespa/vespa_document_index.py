@@ -461,7 +461,15 @@ class VespaDocumentIndex(DocumentIndex):
         # on connectors that are still indexing, and therefore do not yet have a
         # chunk count because update_docs_chunk_count__no_commit has not been
         # run yet.
-        with self._httpx_client_context as httpx_client:
+        # the executor is exited first, so every chunk update has finished before the
+        # client is closed, even if one of them raised
+        with (
+            self._httpx_client_context as httpx_client,
+            concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS) as executor,
+        ):
+            # Chunk updates are independent partial updates, so the chunks of every
+            # document in the batch are sent concurrently.
+            doc_id_to_futures: dict[str, list[concurrent.futures.Future[None]]] = {}
             # Each invocation of this method can contain multiple update requests.
             for update_request in update_requests:
                 # Each update request can correspond to multiple documents.
@@ -483,8 +491,9 @@ class VespaDocumentIndex(DocumentIndex):
                         large_chunks_enabled=self._large_chunks_enabled,
                     )
 
-                    for doc_chunk_id in doc_chunk_ids:
-                        _update_single_chunk(
+                    doc_id_to_futures.setdefault(doc_id, []).extend(
+                        executor.submit(
+                            _update_single_chunk,
                             doc_chunk_id,
                             self._index_name,
                             # NOTE: Used only for logging, raw ID is ok here.
@@ -492,11 +501,14 @@ class VespaDocumentIndex(DocumentIndex):
                             httpx_client,
                             update_request,
                         )
-
-                    logger.info(
-                        f"Updated {len(doc_chunk_ids)} chunks for document {doc_id}."
+                        for doc_chunk_id in doc_chunk_ids
                     )
 
+            for doc_id, futures in doc_id_to_futures.items():
+                for future in futures:
+                    future.result()
+                logger.info(f"Updated {len(futures)} chunks for document {doc_id}.")
+
     def id_based_retrieval(
         self,
         chunk_requests: list[DocumentSectionRequest],
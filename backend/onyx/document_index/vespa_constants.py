@@ -77,6 +77,10 @@ IMAGE_FILE_NAME = "image_file_name"
 # Specific to Vespa, needed for highlighting matching keywords / section
 CONTENT_SUMMARY = "content_summary"
 
+# Fingerprint of everything that went into the chunk's embeddings, lets reindexing
+# reuse the stored embeddings of chunks that didn't change
+CONTENT_HASH = "content_hash"
+
 
 YQL_BASE = (
     f"select "
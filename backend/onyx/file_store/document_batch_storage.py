@@ -2,13 +2,16 @@ import json
 from abc import ABC
 from abc import abstractmethod
 from enum import Enum
-from io import StringIO
+from io import BytesIO
 from typing import List
 from typing import Optional
 from typing import TypeAlias
 
+import msgpack
+import zstandard
 from pydantic import BaseModel
 
+from onyx.configs.app_configs import DOCUMENT_BATCH_STORAGE_LEGACY_FORMAT
 from onyx.configs.constants import FileOrigin
 from onyx.connectors.models import DocExtractionContext
 from onyx.connectors.models import DocIndexingContext
@@ -19,6 +22,19 @@ from onyx.utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Batches are stored as a short header (magic + format version) followed by a single
+# zstd frame containing the msgpack encoded documents back to back
+_BATCH_MAGIC = b"OXDB"
+_BATCH_FORMAT_VERSION = 1
+_BATCH_HEADER = _BATCH_MAGIC + bytes([_BATCH_FORMAT_VERSION])
+_BATCH_ZSTD_LEVEL = 3
+
+BATCH_FILE_EXTENSION = ".batch"
+BATCH_FILE_TYPE = "application/vnd.onyx.document-batch"
+# Format used before the compact one, still read so in-flight batches survive upgrades
+LEGACY_BATCH_FILE_EXTENSION = ".json"
+LEGACY_BATCH_FILE_TYPE = "application/json"
+
 
 class DocumentBatchStorageStateType(str, Enum):
     EXTRACTION = "extraction"
@@ -83,15 +99,41 @@ class DocumentBatchStorage(ABC):
     def extract_path_info(self, path: str) -> BatchStoragePathInfo | None:
         """Extract path info from a path."""
 
-    def _serialize_documents(self, documents: list[Document]) -> str:
-        """Serialize documents to JSON string."""
-        # Use mode='json' to properly serialize datetime and other complex types
-        return json.dumps([doc.model_dump(mode="json") for doc in documents], indent=2)
-
-    def _deserialize_documents(self, data: str) -> list[Document]:
-        """Deserialize documents from JSON string."""
-        doc_dicts = json.loads(data)
-        return [Document.model_validate(doc_dict) for doc_dict in doc_dicts]
+    def _serialize_documents(self, documents: list[Document]) -> bytes:
+        """Serialize documents to the compressed batch format."""
+        output = BytesIO()
+        output.write(_BATCH_HEADER)
+        packer = msgpack.Packer()
+        compressor = zstandard.ZstdCompressor(level=_BATCH_ZSTD_LEVEL)
+        with compressor.stream_writer(output, closefd=False) as writer:
+            for doc in documents:
+                # Use mode='json' to properly serialize datetime and other complex types
+                writer.write(packer.pack(doc.model_dump(mode="json")))
+        return output.getvalue()
+
+    def _serialize_documents_legacy(self, documents: list[Document]) -> bytes:
+        """Serialize documents to the legacy JSON format."""
+        return json.dumps(
+            [doc.model_dump(mode="json") for doc in documents], indent=2
+        ).encode("utf-8")
+
+    def _deserialize_documents(self, data: bytes | str) -> list[Document]:
+        """Deserialize documents from either the compressed or the legacy JSON format."""
+        if isinstance(data, str) or not data.startswith(_BATCH_MAGIC):
+            doc_dicts = json.loads(data)
+            return [Document.model_validate(doc_dict) for doc_dict in doc_dicts]
+
+        version = data[len(_BATCH_MAGIC)]
+        if version != _BATCH_FORMAT_VERSION:
+            raise ValueError(f"Unsupported document batch format version: {version}")
+
+        # Decompress while unpacking so the whole decompressed batch is never in memory
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            memoryview(data)[len(_BATCH_HEADER) :]
+        )
+        # batches are written by us, so don't cap the size of a single document
+        unpacker = msgpack.Unpacker(reader, raw=False, max_buffer_size=0)
+        return [Document.model_validate(doc_dict) for doc_dict in unpacker]
 
     def _per_cc_pair_base_path(self) -> str:
         """Get the base path for the cc pair."""
@@ -105,23 +147,51 @@ class FileStoreDocumentBatchStorage(DocumentBatchStorage):
         super().__init__(cc_pair_id, index_attempt_id)
         self.file_store = file_store
 
-    def _get_batch_file_name(self, batch_num: int) -> str:
+    def _get_batch_file_name(
+        self, batch_num: int, extension: str = BATCH_FILE_EXTENSION
+    ) -> str:
         """Generate file name for a document batch."""
-        return f"{self.base_path}/{batch_num}.json"
+        return f"{self.base_path}/{batch_num}{extension}"
+
+    def _find_batch_file_name(self, batch_num: int) -> str | None:
+        """Get the name of the stored batch, which may be in either format."""
+        for extension, file_type in (
+            (BATCH_FILE_EXTENSION, BATCH_FILE_TYPE),
+            (LEGACY_BATCH_FILE_EXTENSION, LEGACY_BATCH_FILE_TYPE),
+        ):
+            file_name = self._get_batch_file_name(batch_num, extension)
+            if self.file_store.has_file(
+                file_id=file_name,
+                file_origin=FileOrigin.OTHER,
+                file_type=file_type,
+            ):
+                return file_name
+        return None
 
     def store_batch(self, batch_num: int, documents: list[Document]) -> None:
         """Store a batch of documents using FileStore."""
-        file_name = self._get_batch_file_name(batch_num)
+        if DOCUMENT_BATCH_STORAGE_LEGACY_FORMAT:
+            file_name = self._get_batch_file_name(
+                batch_num, LEGACY_BATCH_FILE_EXTENSION
+            )
+            file_type = LEGACY_BATCH_FILE_TYPE
+        else:
+            file_name = self._get_batch_file_name(batch_num)
+            file_type = BATCH_FILE_TYPE
+
         try:
-            data = self._serialize_documents(documents)
-            content = StringIO(data)
+            if DOCUMENT_BATCH_STORAGE_LEGACY_FORMAT:
+                data = self._serialize_documents_legacy(documents)
+            else:
+                data = self._serialize_documents(documents)
+            content = BytesIO(data)
 
             self.file_store.save_file(
                 file_id=file_name,
                 content=content,
                 display_name=f"Document Batch {batch_num}",
                 file_origin=FileOrigin.OTHER,
-                file_type="application/json",
+                file_type=file_type,
                 file_metadata={
                     "batch_num": batch_num,
                     "document_count": str(len(documents)),
@@ -129,7 +199,8 @@ class FileStoreDocumentBatchStorage(DocumentBatchStorage):
             )
 
             logger.debug(
-                f"Stored batch {batch_num} with {len(documents)} documents to FileStore as {file_name}"
+                f"Stored batch {batch_num} with {len(documents)} documents "
+                f"({len(data)} bytes) to FileStore as {file_name}"
             )
         except Exception as e:
             logger.error(f"Failed to store batch {batch_num}: {e}")
@@ -137,21 +208,16 @@ class FileStoreDocumentBatchStorage(DocumentBatchStorage):
 
     def get_batch(self, batch_num: int) -> list[Document] | None:
         """Retrieve a batch of documents from FileStore."""
-        file_name = self._get_batch_file_name(batch_num)
         try:
-            # Check if file exists
-            if not self.file_store.has_file(
-                file_id=file_name,
-                file_origin=FileOrigin.OTHER,
-                file_type="application/json",
-            ):
+            file_name = self._find_batch_file_name(batch_num)
+            if file_name is None:
                 logger.warning(
-                    f"Batch {batch_num} not found in FileStore with name {file_name}"
+                    f"Batch {batch_num} not found in FileStore under {self.base_path}"
                 )
                 return None
 
             content_io = self.file_store.read_file(file_name)
-            data = content_io.read().decode("utf-8")
+            data = content_io.read()
 
             documents = self._deserialize_documents(data)
             logger.debug(
@@ -169,7 +235,9 @@ class FileStoreDocumentBatchStorage(DocumentBatchStorage):
 
     def delete_batch_by_num(self, batch_num: int) -> None:
         """Delete a specific batch from FileStore."""
-        batch_file_name = self._get_batch_file_name(batch_num)
+        batch_file_name = self._find_batch_file_name(
+            batch_num
+        ) or self._get_batch_file_name(batch_num)
         self.delete_batch_by_name(batch_file_name)
         logger.debug(f"Deleted batch num {batch_num} {batch_file_name} from FileStore")
 
@@ -200,7 +268,15 @@ class FileStoreDocumentBatchStorage(DocumentBatchStorage):
                     f"Could not extract path info from batch file: {batch_file_name}"
                 )
                 continue
-            new_batch_file_name = self._get_batch_file_name(path_info.batch_num)
+            # keep the extension, it tells which format the batch is stored in
+            extension = (
+                LEGACY_BATCH_FILE_EXTENSION
+                if batch_file_name.endswith(LEGACY_BATCH_FILE_EXTENSION)
+                else BATCH_FILE_EXTENSION
+            )
+            new_batch_file_name = self._get_batch_file_name(
+                path_info.batch_num, extension
+            )
             self.file_store.change_file_id(batch_file_name, new_batch_file_name)
 
     def extract_path_info(self, path: str) -> BatchStoragePathInfo | None:
@@ -214,7 +290,7 @@ class FileStoreDocumentBatchStorage(DocumentBatchStorage):
             return BatchStoragePathInfo(
                 cc_pair_id=int(cc_pair_id),
                 index_attempt_id=int(index_attempt_id),
-                batch_num=int(batch_num.split(".")[0]),  # remove .json
+                batch_num=int(batch_num.split(".")[0]),  # remove the extension
             )
         except Exception as e:
             logger.error(f"Failed to extract path info from {path}: {e}")
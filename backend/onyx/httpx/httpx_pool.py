@@ -1,7 +1,12 @@
+import os
 import threading
+from collections.abc import Iterator
 from typing import Any
 
 import httpx
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.core import REGISTRY
+from prometheus_client.registry import Collector
 
 
 def make_default_kwargs() -> dict[str, Any]:
@@ -15,6 +20,8 @@ class HttpxPool:
     """Class to manage a global httpx Client instance"""
 
     _clients: dict[str, httpx.Client] = {}
+    # the params each named client was created with, to rebuild it after a fork
+    _client_kwargs: dict[str, dict[str, Any]] = {}
     _lock: threading.Lock = threading.Lock()
 
     # Default parameters for creation
@@ -34,12 +41,14 @@ class HttpxPool:
         with cls._lock:
             if name not in cls._clients:
                 cls._clients[name] = cls._init_client(**kwargs)
+                cls._client_kwargs[name] = kwargs
 
     @classmethod
     def close_client(cls, name: str) -> None:
         """Allow the caller to close the client."""
         with cls._lock:
             client = cls._clients.pop(name, None)
+            cls._client_kwargs.pop(name, None)
             if client:
                 client.close()
 
@@ -50,11 +59,76 @@ class HttpxPool:
             for client in cls._clients.values():
                 client.close()
             cls._clients.clear()
+            cls._client_kwargs.clear()
 
     @classmethod
     def get(cls, name: str) -> httpx.Client:
-        """Gets the httpx.Client. Will init to default settings if not init'd."""
+        """Gets the httpx.Client. Will init to default settings if not init'd, or
+        with the params it was init'd with if it was dropped after a fork."""
         with cls._lock:
             if name not in cls._clients:
-                cls._clients[name] = cls._init_client()
+                cls._clients[name] = cls._init_client(
+                    **cls._client_kwargs.get(name, {})
+                )
             return cls._clients[name]
+
+    @classmethod
+    def client_names(cls) -> list[str]:
+        with cls._lock:
+            return list(cls._clients)
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        """Runs in the child after a fork. The inherited clients share their sockets
+        with the parent, so they are dropped without being closed (closing would
+        tear down the parent's connections) and rebuilt with their params on the next
+        `get`. The lock may have been held by another thread at fork time, so it is
+        replaced as well."""
+        cls._lock = threading.Lock()
+        cls._clients = {}
+
+
+os.register_at_fork(after_in_child=HttpxPool._reset_after_fork)
+
+
+def _get_pool_connections(client: httpx.Client) -> list[Any]:
+    # httpx doesn't expose its connection pool publicly
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    return list(getattr(pool, "connections", []))
+
+
+class HttpxPoolCollector(Collector):
+    """Exposes the state of the connection pools of every registered client."""
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        connections = GaugeMetricFamily(
+            "onyx_httpx_pool_connections",
+            "Number of open connections in the httpx pool by state",
+            labels=["client", "state"],
+        )
+        with HttpxPool._lock:
+            clients = list(HttpxPool._clients.items())
+
+        for name, client in clients:
+            num_idle = 0
+            num_active = 0
+            for connection in _get_pool_connections(client):
+                try:
+                    if connection.is_closed():
+                        continue
+                    if connection.is_idle():
+                        num_idle += 1
+                    else:
+                        num_active += 1
+                except Exception:
+                    continue
+            connections.add_metric([name, "idle"], num_idle)
+            connections.add_metric([name, "active"], num_active)
+
+        yield connections
+
+    def describe(self) -> list[GaugeMetricFamily]:
+        return []
+
+
+REGISTRY.register(HttpxPoolCollector())
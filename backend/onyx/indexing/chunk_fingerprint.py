@@ -0,0 +1,154 @@
+"""
+Content fingerprints for incremental reindexing.
+
+A chunk's fingerprint covers everything its embeddings are computed from: the embedding
+model and its settings, the embedded text (title prefix, contextual RAG additions, content
+and semantic metadata suffix), the mini chunk texts and the document title. It is stored
+with the chunk in the document index, so when a document is reindexed (e.g. after a one
+paragraph edit) the chunks whose fingerprint matches the stored one reuse the stored
+embeddings instead of going through the embedding model again.
+
+Every chunk is still written to the document index, since document level fields such as
+the update time, metadata and permissions are stored on each chunk.
+"""
+
+import hashlib
+import json
+
+from onyx.configs.app_configs import DISABLE_CHUNK_EMBEDDING_REUSE
+from onyx.connectors.models import ConnectorFailure
+from onyx.document_index.chunk_content_enrichment import (
+    generate_enriched_content_for_chunk_embedding,
+)
+from onyx.document_index.interfaces import DocumentIndex
+from onyx.document_index.interfaces import StoredChunkEmbedding
+from onyx.document_index.interfaces import StoredEmbeddingRetrievalCapable
+from onyx.indexing.embedder import embed_chunks_with_failure_handling
+from onyx.indexing.embedder import IndexingEmbedder
+from onyx.indexing.models import DocAwareChunk
+from onyx.indexing.models import IndexChunk
+from onyx.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+def compute_chunk_fingerprint(chunk: DocAwareChunk, embedder: IndexingEmbedder) -> str:
+    embedding_model = embedder.embedding_model
+    fingerprint_parts = [
+        embedding_model.model_name,
+        embedding_model.deployment_name,
+        str(embedding_model.provider_type),
+        embedding_model.passage_prefix,
+        embedding_model.normalize,
+        embedding_model.reduced_dimension,
+        generate_enriched_content_for_chunk_embedding(chunk),
+        chunk.mini_chunk_texts,
+        chunk.source_document.get_title_for_document_index(),
+    ]
+    return hashlib.sha256(
+        json.dumps(fingerprint_parts, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def _can_reuse(chunk: DocAwareChunk, stored: StoredChunkEmbedding | None) -> bool:
+    if stored is None or stored.content_hash != chunk.content_hash:
+        return False
+
+    # The fingerprint already covers these, but a chunk with missing vectors must
+    # never be written back
+    if len(stored.embeddings.mini_chunk_embeddings) != len(
+        chunk.mini_chunk_texts or []
+    ):
+        return False
+    if chunk.source_document.get_title_for_document_index() and (
+        stored.title_embedding is None
+    ):
+        return False
+    return True
+
+
+def _chunk_key(chunk: DocAwareChunk) -> tuple[str, int, int | None]:
+    return chunk.source_document.id, chunk.chunk_id, chunk.large_chunk_id
+
+
+def embed_chunks_with_reuse(
+    chunks: list[DocAwareChunk],
+    embedder: IndexingEmbedder,
+    document_index: DocumentIndex | None,
+    tenant_id: str,
+    request_id: str | None = None,
+) -> tuple[list[IndexChunk], list[ConnectorFailure], int]:
+    """Fingerprints the chunks and embeds only the ones whose fingerprint differs from
+    the one stored in the document index, the others get the stored embeddings.
+
+    Returns the embedded chunks (in the original order), the embedding failures and the
+    number of chunks which reused their stored embeddings."""
+    for chunk in chunks:
+        chunk.content_hash = compute_chunk_fingerprint(chunk, embedder)
+
+    stored_embeddings: list[StoredChunkEmbedding | None] = [None] * len(chunks)
+    if (
+        chunks
+        and not DISABLE_CHUNK_EMBEDDING_REUSE
+        and isinstance(document_index, StoredEmbeddingRetrievalCapable)
+    ):
+        try:
+            stored_embeddings = document_index.get_stored_chunk_embeddings(
+                chunks, tenant_id
+            )
+        except Exception:
+            logger.exception(
+                "Failed to fetch stored chunk embeddings, embedding all chunks"
+            )
+
+    reused_chunks: list[IndexChunk] = []
+    chunks_to_embed: list[DocAwareChunk] = []
+    for chunk, stored in zip(chunks, stored_embeddings):
+        if stored is None or not _can_reuse(chunk, stored):
+            chunks_to_embed.append(chunk)
+            continue
+
+        reused_chunks.append(
+            IndexChunk(
+                **chunk.model_dump(),
+                embeddings=stored.embeddings,
+                title_embedding=stored.title_embedding,
+            )
+        )
+
+    embedded_chunks, embedding_failures = (
+        embed_chunks_with_failure_handling(
+            chunks=chunks_to_embed,
+            embedder=embedder,
+            tenant_id=tenant_id,
+            request_id=request_id,
+        )
+        if chunks_to_embed
+        else ([], [])
+    )
+
+    # A document whose other chunks failed to embed is reported as failed as a whole,
+    # so its reused chunks must not be indexed either
+    failed_doc_ids = {
+        failure.failed_document.document_id
+        for failure in embedding_failures
+        if failure.failed_document
+    }
+    reused_chunks = [
+        chunk
+        for chunk in reused_chunks
+        if chunk.source_document.id not in failed_doc_ids
+    ]
+
+    chunk_order = {_chunk_key(chunk): ind for ind, chunk in enumerate(chunks)}
+    chunks_with_embeddings = sorted(
+        reused_chunks + embedded_chunks,
+        key=lambda chunk: chunk_order[_chunk_key(chunk)],
+    )
+
+    if reused_chunks:
+        logger.info(
+            f"Reused stored embeddings for {len(reused_chunks)} out of "
+            f"{len(chunks)} chunks"
+        )
+    return chunks_with_embeddings, embedding_failures, len(reused_chunks)
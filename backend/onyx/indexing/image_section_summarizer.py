@@ -0,0 +1,186 @@
+"""
+Concurrent summarization of the image sections of an indexing batch.
+
+Images are summarized by a bounded pool of threads, with an optional per LLM provider
+rate limit. Summaries are cached in Postgres keyed on a hash of the image bytes and of
+the model / prompts, so logos and screenshots shared between documents (and every image
+on a reindexing run) are only sent to the vision LLM once. Identical images within a
+batch are deduplicated in flight as well.
+
+NOTE: the file name of the image is part of the prompt but not of the cache key, the
+same image under another name reuses the existing summary.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+from onyx.configs.app_configs import DISABLE_IMAGE_SUMMARY_CACHE
+from onyx.configs.app_configs import IMAGE_SUMMARIZATION_MAX_REQUESTS_PER_MINUTE
+from onyx.configs.app_configs import IMAGE_SUMMARIZATION_NUM_THREADS
+from onyx.configs.app_configs import IMAGE_SUMMARIZATION_SYSTEM_PROMPT
+from onyx.configs.app_configs import IMAGE_SUMMARIZATION_USER_PROMPT
+from onyx.connectors.models import Document
+from onyx.connectors.models import ImageSection
+from onyx.db.engine.sql_engine import get_session_with_current_tenant
+from onyx.db.image_summary import get_image_summaries
+from onyx.db.image_summary import store_image_summaries
+from onyx.file_processing.image_summarization import summarize_image_with_error_handling
+from onyx.file_store.file_store import get_default_file_store
+from onyx.llm.interfaces import LLM
+from onyx.utils.logger import setup_logger
+from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
+
+logger = setup_logger()
+
+IMAGE_NOT_FOUND_TEXT = "[Image could not be processed]"
+IMAGE_NOT_SUMMARIZED_TEXT = "[Image could not be summarized]"
+IMAGE_ERROR_TEXT = "[Error processing image]"
+
+
+class _ProviderRateLimiter:
+    """Thread safe limiter that spaces out calls so that at most `max_per_minute`
+    start in any minute."""
+
+    def __init__(self, max_per_minute: int) -> None:
+        self._interval = 60 / max_per_minute
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_rate_limiters: dict[str, _ProviderRateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _get_rate_limiter(provider: str) -> _ProviderRateLimiter | None:
+    if IMAGE_SUMMARIZATION_MAX_REQUESTS_PER_MINUTE <= 0:
+        return None
+
+    with _rate_limiters_lock:
+        if provider not in _rate_limiters:
+            _rate_limiters[provider] = _ProviderRateLimiter(
+                IMAGE_SUMMARIZATION_MAX_REQUESTS_PER_MINUTE
+            )
+        return _rate_limiters[provider]
+
+
+def get_image_summary_cache_key(image_data: bytes, llm: LLM) -> str:
+    key_parts = [
+        hashlib.sha256(image_data).hexdigest(),
+        llm.config.model_provider,
+        llm.config.model_name,
+        IMAGE_SUMMARIZATION_SYSTEM_PROMPT,
+        IMAGE_SUMMARIZATION_USER_PROMPT,
+    ]
+    return hashlib.sha256(json.dumps(key_parts).encode("utf-8")).hexdigest()
+
+
+class _BatchImageSummarizer:
+    def __init__(self, llm: LLM) -> None:
+        self._llm = llm
+        self._file_store = get_default_file_store()
+        self._rate_limiter = _get_rate_limiter(llm.config.model_provider)
+        self._in_flight: dict[str, Future[str | None]] = {}
+        self._lock = threading.Lock()
+
+    def get_section_text(self, image_file_id: str) -> str:
+        try:
+            file_record = self._file_store.read_file_record(file_id=image_file_id)
+            if not file_record:
+                logger.warning(f"Image file {image_file_id} not found in FileStore")
+                return IMAGE_NOT_FOUND_TEXT
+
+            image_data = self._file_store.read_file(file_id=image_file_id).read()
+            summary = self._summarize(
+                image_data, context_name=file_record.display_name or "Image"
+            )
+        except Exception as e:
+            logger.error(f"Error processing image section: {e}")
+            return IMAGE_ERROR_TEXT
+
+        return summary or IMAGE_NOT_SUMMARIZED_TEXT
+
+    def _summarize(self, image_data: bytes, context_name: str) -> str | None:
+        cache_key = get_image_summary_cache_key(image_data, self._llm)
+
+        # Identical images in the batch wait for the first one to be summarized
+        with self._lock:
+            future = self._in_flight.get(cache_key)
+            is_owner = future is None
+            if future is None:
+                future = Future()
+                self._in_flight[cache_key] = future
+        if not is_owner:
+            return future.result()
+
+        try:
+            summary = self._load_or_summarize(cache_key, image_data, context_name)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        future.set_result(summary)
+        return summary
+
+    def _load_or_summarize(
+        self, cache_key: str, image_data: bytes, context_name: str
+    ) -> str | None:
+        if not DISABLE_IMAGE_SUMMARY_CACHE:
+            with get_session_with_current_tenant() as db_session:
+                cached = get_image_summaries([cache_key], db_session)
+            if cache_key in cached:
+                return cached[cache_key]
+
+        if self._rate_limiter:
+            self._rate_limiter.wait()
+        summary = summarize_image_with_error_handling(
+            llm=self._llm,
+            image_data=image_data,
+            context_name=context_name,
+        )
+
+        if summary and not DISABLE_IMAGE_SUMMARY_CACHE:
+            try:
+                with get_session_with_current_tenant() as db_session:
+                    store_image_summaries({cache_key: summary}, db_session)
+            except Exception:
+                logger.exception("Failed to cache image summary")
+        return summary
+
+
+def summarize_image_sections(documents: list[Document], llm: LLM) -> dict[str, str]:
+    """Returns the text to index for every image section of the documents, keyed on the
+    image file id."""
+    image_file_ids = list(
+        dict.fromkeys(
+            section.image_file_id
+            for document in documents
+            for section in document.sections
+            if isinstance(section, ImageSection)
+        )
+    )
+    if not image_file_ids:
+        return {}
+
+    summarizer = _BatchImageSummarizer(llm)
+    section_texts = run_functions_tuples_in_parallel(
+        [
+            (summarizer.get_section_text, (image_file_id,))
+            for image_file_id in image_file_ids
+        ],
+        allow_failures=True,
+        max_workers=IMAGE_SUMMARIZATION_NUM_THREADS,
+    )
+    return {
+        image_file_id: section_text or IMAGE_ERROR_TEXT
+        for image_file_id, section_text in zip(image_file_ids, section_texts)
+    }
@@ -40,10 +40,9 @@ from onyx.document_index.interfaces import DocumentIndex
 from onyx.document_index.interfaces import DocumentInsertionRecord
 from onyx.document_index.interfaces import DocumentMetadata
 from onyx.document_index.interfaces import IndexBatchParams
-from onyx.file_processing.image_summarization import summarize_image_with_error_handling
-from onyx.file_store.file_store import get_default_file_store
-from onyx.indexing.embedder import embed_chunks_with_failure_handling
+from onyx.indexing.chunk_fingerprint import embed_chunks_with_reuse
 from onyx.indexing.embedder import IndexingEmbedder
+from onyx.indexing.image_section_summarizer import summarize_image_sections
 from onyx.indexing.models import DocAwareChunk
 from onyx.indexing.models import IndexingBatchAdapter
 from onyx.indexing.models import UpdatableChunkData
@@ -89,6 +88,10 @@ class IndexingPipelineResult(BaseModel):
     total_docs: int
     # number of chunks that were inserted into Vespa
     total_chunks: int
+    # of those, the chunks that were unchanged since the last indexing and reused
+    # their stored embeddings vs. the ones that had to be (re-)embedded
+    reused_chunks: int = 0
+    embedded_chunks: int = 0
 
     failures: list[ConnectorFailure]
 
@@ -403,55 +406,23 @@ def process_image_sections(documents: list[Document]) -> list[IndexingDocument]:
             for document in documents
         ]
 
+    image_section_texts = summarize_image_sections(documents, llm)
+
     indexed_documents: list[IndexingDocument] = []
 
     for document in documents:
         processed_sections: list[Section] = []
 
         for section in document.sections:
-            # For ImageSection, process and create base Section with both text and image_file_id
+            # For ImageSection, create base Section with both the summary and image_file_id
             if isinstance(section, ImageSection):
-                # Default section with image path preserved - ensure text is always a string
-                processed_section = Section(
-                    link=section.link,
-                    image_file_id=section.image_file_id,
-                    text="",  # Initialize with empty string
-                )
-
-                # Try to get image summary
-                try:
-                    file_store = get_default_file_store()
-
-                    file_record = file_store.read_file_record(
-                        file_id=section.image_file_id
+                processed_sections.append(
+                    Section(
+                        link=section.link,
+                        image_file_id=section.image_file_id,
+                        text=image_section_texts[section.image_file_id],
                     )
-                    if not file_record:
-                        logger.warning(
-                            f"Image file {section.image_file_id} not found in FileStore"
-                        )
-
-                        processed_section.text = "[Image could not be processed]"
-                    else:
-                        # Get the image data
-                        image_data_io = file_store.read_file(
-                            file_id=section.image_file_id
-                        )
-                        image_data = image_data_io.read()
-                        summary = summarize_image_with_error_handling(
-                            llm=llm,
-                            image_data=image_data,
-                            context_name=file_record.display_name or "Image",
-                        )
-
-                        if summary:
-                            processed_section.text = summary
-                        else:
-                            processed_section.text = "[Image could not be summarized]"
-                except Exception as e:
-                    logger.error(f"Error processing image section: {e}")
-                    processed_section.text = "[Error processing image]"
-
-                processed_sections.append(processed_section)
+                )
 
             # For TextSection, create a base Section with text and link
             elif isinstance(section, TextSection):
@@ -704,15 +675,16 @@ def index_doc_batch(
         )
 
     logger.debug("Starting embedding")
-    chunks_with_embeddings, embedding_failures = (
-        embed_chunks_with_failure_handling(
+    # The first document index is the primary one, which holds the embeddings of
+    # the embedder's model
+    chunks_with_embeddings, embedding_failures, num_reused_chunks = (
+        embed_chunks_with_reuse(
             chunks=chunks,
             embedder=embedder,
+            document_index=document_indices[0] if document_indices else None,
             tenant_id=tenant_id,
             request_id=request_id,
         )
-        if chunks
-        else ([], [])
     )
 
     chunk_content_scores = [1.0] * len(chunks_with_embeddings)
@@ -814,6 +786,8 @@ def index_doc_batch(
         ),
         total_docs=len(filtered_documents),
         total_chunks=len(chunks_with_embeddings),
+        reused_chunks=num_reused_chunks,
+        embedded_chunks=len(chunks_with_embeddings) - num_reused_chunks,
         failures=primary_doc_idx_vector_db_write_failures + embedding_failures,
     )
 
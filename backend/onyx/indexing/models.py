@@ -75,6 +75,10 @@ class DocAwareChunk(BaseChunk):
 
     large_chunk_reference_ids: list[int] = Field(default_factory=list)
 
+    # Fingerprint of the embedded text and the embedding model, stored with the chunk
+    # so that reindexing can reuse the embeddings of chunks which did not change
+    content_hash: str | None = None
+
     def to_short_descriptor(self) -> str:
         """Used when logging the identity of a chunk"""
         return f"{self.source_document.to_short_descriptor()} Chunk ID: {self.chunk_id}"
@@ -9,6 +9,7 @@ from onyx.connectors.models import DocumentFailure
 from onyx.document_index.interfaces import DocumentIndex
 from onyx.document_index.interfaces import DocumentInsertionRecord
 from onyx.document_index.interfaces import IndexBatchParams
+from onyx.document_index.interfaces_new import PartialIndexingError
 from onyx.indexing.models import DocMetadataAwareIndexChunk
 from onyx.utils.logger import setup_logger
 
@@ -32,12 +33,15 @@ def write_chunks_to_vector_db_with_backoff(
     index_batch_params: IndexBatchParams,
 ) -> tuple[list[DocumentInsertionRecord], list[ConnectorFailure]]:
     """Tries to insert all chunks in one large batch. If that batch fails for any reason,
-    goes document by document to isolate the failure(s).
+    goes document by document to isolate the failure(s). If the document index reports
+    which documents failed, only those are retried.
 
     IMPORTANT: must pass in whole documents at a time not individual chunks, since the
     vector DB interface assumes that all chunks for a single document are present.
     """
 
+    insertion_records: list[DocumentInsertionRecord] = []
+
     # first try to write the chunks to the vector db
     try:
         return (
@@ -49,6 +53,27 @@ def write_chunks_to_vector_db_with_backoff(
             ),
             [],
         )
+    except PartialIndexingError as e:
+        logger.warning(
+            f"Failed to write {len(e.failed_document_id_to_error)} documents of the "
+            f"chunk batch to vector db. Retrying them individually: "
+            f"{e.failed_document_id_to_error}"
+        )
+        insertion_records = [
+            DocumentInsertionRecord(
+                document_id=record.document_id,
+                already_existed=record.already_existed,
+            )
+            for record in e.insertion_records
+        ]
+        chunks = [
+            chunk
+            for chunk in chunks
+            if chunk.source_document.id in e.failed_document_id_to_error
+        ]
+
+        # wait a couple seconds just to give the vector db a chance to recover
+        time.sleep(2)
     except Exception as e:
         logger.exception(
             "Failed to write chunk batch to vector db. Trying individual docs."
@@ -65,7 +90,6 @@ def write_chunks_to_vector_db_with_backoff(
     for chunk in chunks:
         chunks_for_docs[chunk.source_document.id].append(chunk)
 
-    insertion_records: list[DocumentInsertionRecord] = []
     failures: list[ConnectorFailure] = []
     for doc_id, chunks_for_doc in chunks_for_docs.items():
         try:
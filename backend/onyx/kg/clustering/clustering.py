@@ -3,12 +3,25 @@ from collections.abc import Generator
 from typing import cast
 
 from rapidfuzz.fuzz import ratio
+from rapidfuzz.process import cpdist
 from redis.lock import Lock as RedisLock
+from sqlalchemy import Boolean
+from sqlalchemy import column
 from sqlalchemy import func
+from sqlalchemy import Integer
+from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy import String
 from sqlalchemy import text
+from sqlalchemy import true
+from sqlalchemy import values
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm import Session
 
 from onyx.background.celery.tasks.kg_processing.utils import extend_lock
 from onyx.configs.constants import CELERY_GENERIC_BEAT_LOCK_TIMEOUT
+from onyx.configs.kg_configs import KG_CLUSTERING_BATCH_MODE
+from onyx.configs.kg_configs import KG_CLUSTERING_BATCH_SIZE
 from onyx.configs.kg_configs import KG_CLUSTERING_RETRIEVE_THRESHOLD
 from onyx.configs.kg_configs import KG_CLUSTERING_THRESHOLD
 from onyx.db.engine.sql_engine import get_session_with_current_tenant
@@ -218,6 +231,175 @@ def _cluster_one_grounded_entity(
     return transferred_entity, update_vespa
 
 
+def _has_digit(name: str) -> bool:
+    # we don't cluster names with numbers so version1 and version2 etc. stay apart
+    return any(char.isdigit() for char in name)
+
+
+def _can_merge_into(entity: KGEntityExtractionStaging, candidate: KGEntity) -> bool:
+    return (
+        candidate.entity_type_id_name == entity.entity_type_id_name
+        # a document entity can only be merged into an entity without a document
+        and (entity.document_id is None or candidate.document_id is None)
+        and not _has_digit(candidate.name)
+    )
+
+
+def _get_similar_entities_for_batch(
+    db_session: Session,
+    entities: list[KGEntityExtractionStaging],
+    entity_names: list[str],
+) -> dict[int, list[KGEntity]]:
+    """
+    Runs the trigram similarity search of every entity of the batch in a single query
+    (a lateral join over the batch). Returns the similar entities keyed on the position
+    of the entity in the batch.
+    """
+    batch_rows = [
+        (i, entity_name, entity.entity_type_id_name, entity.document_id is not None)
+        for i, (entity, entity_name) in enumerate(zip(entities, entity_names))
+        if not _has_digit(entity_name)
+    ]
+    if not batch_rows:
+        return {}
+
+    batch = values(
+        column("idx", Integer),
+        column("name", String),
+        column("entity_type_id_name", String),
+        column("without_document_only", Boolean),
+        name="clustering_batch",
+    ).data(batch_rows)
+
+    # find entities of the same type with a similar name, uses GIN index
+    similar = (
+        select(KGEntity)
+        .where(
+            KGEntity.entity_type_id_name == batch.c.entity_type_id_name,
+            or_(
+                batch.c.without_document_only.is_(False),
+                KGEntity.document_id.is_(None),
+            ),
+            getattr(func, POSTGRES_DEFAULT_SCHEMA).similarity_op(
+                KGEntity.name, batch.c.name
+            ),
+        )
+        .lateral("similar_entity")
+    )
+    similar_entity = aliased(KGEntity, similar)
+    stmt = select(batch.c.idx, similar_entity).select_from(batch).join(similar, true())
+
+    similar_entities: dict[int, list[KGEntity]] = {}
+    for idx, entity in db_session.execute(stmt):
+        similar_entities.setdefault(idx, []).append(entity)
+    return similar_entities
+
+
+def _score_similar_entities(
+    entity_names: list[str], similar_entities: dict[int, list[KGEntity]]
+) -> dict[tuple[int, str], float]:
+    """Scores every (entity, similar entity) pair of the batch in one pass."""
+    pairs = [
+        (idx, similar)
+        for idx, similars in similar_entities.items()
+        for similar in similars
+        if not _has_digit(similar.name)
+    ]
+    if not pairs:
+        return {}
+
+    scores = cpdist(
+        [entity_names[idx] for idx, _ in pairs],
+        [similar.name for _, similar in pairs],
+        scorer=ratio,
+    )
+    return {
+        (idx, similar.id_name): float(score)
+        for (idx, similar), score in zip(pairs, scores)
+    }
+
+
+def _cluster_grounded_entity_batch(
+    entities: list[KGEntityExtractionStaging],
+) -> None:
+    """
+    Batch version of _cluster_one_grounded_entity: clusters a page of staged entities in
+    a single transaction, with one query for the document names and one similarity
+    query for the whole page. Gives the same result as clustering them one at a time.
+    """
+    with get_session_with_current_tenant() as db_session:
+        # get entity names
+        document_ids = {
+            entity.document_id for entity in entities if entity.document_id is not None
+        }
+        semantic_ids: dict[str, str] = {}
+        if document_ids:
+            semantic_ids = {
+                document_id: semantic_id
+                for document_id, semantic_id in db_session.execute(
+                    select(Document.id, Document.semantic_id).where(
+                        Document.id.in_(document_ids)
+                    )
+                )
+            }
+        entity_names = [
+            (
+                cast(str, semantic_ids.get(entity.document_id))
+                if entity.document_id is not None
+                else entity.name
+            ).lower()
+            for entity in entities
+        ]
+
+        db_session.execute(
+            text(
+                "SET pg_trgm.similarity_threshold = "
+                + str(KG_CLUSTERING_RETRIEVE_THRESHOLD)
+            )
+        )
+        similar_entities = _get_similar_entities_for_batch(
+            db_session, entities, entity_names
+        )
+        scores = _score_similar_entities(entity_names, similar_entities)
+
+        # entities created earlier in this batch aren't visible to the similarity
+        # search, but clustering one at a time would have considered them
+        created_in_batch: list[KGEntity] = []
+
+        for idx, (entity, entity_name) in enumerate(zip(entities, entity_names)):
+            # find best match. Merges earlier in the batch update the entities in the
+            # session, so eligibility is checked against their current state
+            best_score = -1.0
+            best_entity = None
+            for similar in similar_entities.get(idx, []):
+                if not _can_merge_into(entity, similar):
+                    continue
+                score = scores[(idx, similar.id_name)]
+                if score >= KG_CLUSTERING_THRESHOLD * 100 and score > best_score:
+                    best_score = score
+                    best_entity = similar
+
+            if not _has_digit(entity_name):
+                for created in created_in_batch:
+                    if not _can_merge_into(entity, created):
+                        continue
+                    score = ratio(created.name, entity_name)
+                    if score >= KG_CLUSTERING_THRESHOLD * 100 and score > best_score:
+                        best_score = score
+                        best_entity = created
+
+            # if there is a match, update the entity, otherwise create a new one
+            if best_entity:
+                logger.debug(f"Merged {entity.name} with {best_entity.name}")
+                merge_entities(db_session=db_session, parent=best_entity, child=entity)
+            else:
+                created_in_batch.append(
+                    transfer_entity(db_session=db_session, entity=entity)
+                )
+
+        db_session.commit()
+
+
 def _create_one_parent_child_relationship(entity: KGEntityExtractionStaging) -> None:
     """
     Creates a relationship between the entity and its parent, if it exists.
@@ -319,16 +501,23 @@ def kg_clustering(
 
     last_lock_time = time.monotonic()
 
-    # Cluster and transfer grounded entities sequentially
+    # Cluster and transfer grounded entities, a page at a time in batch mode
     start_time = time.monotonic()
     i_batch = 0
     for i_batch, untransferred_grounded_entities in enumerate(
         _get_batch_untransferred_grounded_entities(
-            batch_size=processing_chunk_batch_size
+            batch_size=(
+                KG_CLUSTERING_BATCH_SIZE
+                if KG_CLUSTERING_BATCH_MODE
+                else processing_chunk_batch_size
+            )
         )
     ):
-        for entity in untransferred_grounded_entities:
-            _cluster_one_grounded_entity(entity)
+        if KG_CLUSTERING_BATCH_MODE:
+            _cluster_grounded_entity_batch(untransferred_grounded_entities)
+        else:
+            for entity in untransferred_grounded_entities:
+                _cluster_one_grounded_entity(entity)
         last_lock_time = extend_lock(
             lock, CELERY_GENERIC_BEAT_LOCK_TIMEOUT, last_lock_time
         )
@@ -1,17 +1,21 @@
 import re
 from collections import defaultdict
-from typing import cast
 
 import numpy as np
 from rapidfuzz.distance.DamerauLevenshtein import normalized_similarity
+from sqlalchemy import column
 from sqlalchemy import desc
 from sqlalchemy import Float
 from sqlalchemy import func
+from sqlalchemy import Integer
 from sqlalchemy import MetaData
 from sqlalchemy import select
 from sqlalchemy import String
 from sqlalchemy import Table
+from sqlalchemy import true
+from sqlalchemy import values
 from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
 
 from onyx.configs.kg_configs import KG_NORMALIZATION_RERANK_LEVENSHTEIN_WEIGHT
 from onyx.configs.kg_configs import KG_NORMALIZATION_RERANK_NGRAM_WEIGHTS
@@ -31,7 +35,6 @@ from onyx.kg.utils.formatting_utils import make_relationship_id
 from onyx.kg.utils.formatting_utils import split_entity_id
 from onyx.kg.utils.formatting_utils import split_relationship_id
 from onyx.utils.logger import setup_logger
-from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 from shared_configs.configs import POSTGRES_DEFAULT_SCHEMA
 
 logger = setup_logger()
@@ -58,56 +61,132 @@ def _clean_name(entity_name: str) -> str:
     )
 
 
-def _normalize_one_entity(
-    entity: str,
-    attributes: dict[str, str],
-    allowed_docs_temp_view_name: str | None = None,
+def _reflect_allowed_docs_temp_view(
+    db_session: Session, allowed_docs_temp_view_name: str | None
+) -> Table:
+    if allowed_docs_temp_view_name is None:
+        raise ValueError("allowed_docs_temp_view_name is not available")
+
+    effective_schema_view_name = allowed_docs_temp_view_name.split(".")[-1]
+
+    return Table(
+        effective_schema_view_name,
+        MetaData(),
+        autoload_with=db_session.get_bind(),
+    )
+
+
+def _rerank_candidates(
+    cleaned_entity: str, candidates: list[tuple[str, str, float]]
 ) -> str | None:
     """
-    Matches a single entity to the best matching entity of the same type.
+    Reranks the candidates retrieved for an entity and returns the id_name of the best
+    one, if any scores above the threshold.
     """
-    entity_type, entity_name = split_entity_id(entity)
-    if entity_name == "*":
-        return entity
+    if not candidates:
+        return None
 
-    cleaned_entity = _clean_name(entity_name)
+    # step 2: do a weighted ngram analysis and damerau levenshtein distance to rerank
+    n1, n2, n3 = (
+        set(_ngrams(cleaned_entity, 1)),
+        set(_ngrams(cleaned_entity, 2)),
+        set(_ngrams(cleaned_entity, 3)),
+    )
+    for i, (candidate_id_name, candidate_name, _) in enumerate(candidates):
+        cleaned_candidate = _clean_name(candidate_name)
+        h_n1, h_n2, h_n3 = (
+            set(_ngrams(cleaned_candidate, 1)),
+            set(_ngrams(cleaned_candidate, 2)),
+            set(_ngrams(cleaned_candidate, 3)),
+        )
 
-    # narrow filter to subtype if requested
-    type_filters = [KGEntity.entity_type_id_name == entity_type]
-    if "subtype" in attributes:
-        type_filters.append(
-            KGEntity.attributes.op("@>")({"subtype": attributes["subtype"]})
+        # compute ngram overlap, renormalize scores if the names are too short for larger ngrams
+        grams_used = min(2, len(cleaned_entity) - 1, len(cleaned_candidate) - 1)
+        W_n1, W_n2, W_n3 = KG_NORMALIZATION_RERANK_NGRAM_WEIGHTS
+        ngram_score = (
+            # compute | Q ∩ E | / min(|Q|, |E|) for unigrams and bigrams (trigrams already computed)
+            W_n1 * len(n1 & h_n1) / max(1, min(len(n1), len(h_n1)))
+            + W_n2 * len(n2 & h_n2) / max(1, min(len(n2), len(h_n2)))
+            + W_n3 * len(n3 & h_n3) / max(1, min(len(n3), len(h_n3)))
+        ) / (W_n1, W_n1 + W_n2, 1.0)[grams_used]
+
+        # compute damerau levenshtein distance to fuzzy match against typos
+        W_leven = KG_NORMALIZATION_RERANK_LEVENSHTEIN_WEIGHT
+        leven_score = normalized_similarity(cleaned_entity, cleaned_candidate)
+
+        # combine scores
+        score = (1.0 - W_leven) * ngram_score + W_leven * leven_score
+        candidates[i] = (candidate_id_name, candidate_name, score)
+    candidates = list(
+        sorted(
+            filter(lambda x: x[2] > KG_NORMALIZATION_RERANK_THRESHOLD, candidates),
+            key=lambda x: x[2],
+            reverse=True,
         )
+    )
+    if not candidates:
+        return None
 
-    # step 1: find entities containing the entity_name or something similar
-    with get_session_with_current_tenant() as db_session:
+    return candidates[0][0]
 
-        # get allowed documents
-        metadata = MetaData()
-        if allowed_docs_temp_view_name is None:
-            raise ValueError("allowed_docs_temp_view_name is not available")
 
-        effective_schema_allowed_docs_temp_view_name = (
-            allowed_docs_temp_view_name.split(".")[-1]
+def _normalize_entity_batch(
+    entities: list[str],
+    entity_attributes: list[dict[str, str]],
+    allowed_docs_temp_view_name: str | None = None,
+) -> list[str | None]:
+    """
+    Matches each entity to the best matching entity of the same type. Reflects the
+    allowed docs view once and retrieves the candidates of every entity with a single
+    query.
+    """
+    normalized_entities: list[str | None] = [None] * len(entities)
+    cleaned_entities: dict[int, str] = {}
+    batch_rows: list[tuple[int, str, str, str | None]] = []
+    for idx, (entity, attributes) in enumerate(zip(entities, entity_attributes)):
+        entity_type, entity_name = split_entity_id(entity)
+        if entity_name == "*":
+            normalized_entities[idx] = entity
+            continue
+
+        cleaned_entities[idx] = _clean_name(entity_name)
+        batch_rows.append(
+            (idx, cleaned_entities[idx], entity_type, attributes.get("subtype"))
         )
 
-        allowed_docs_temp_view = Table(
-            effective_schema_allowed_docs_temp_view_name,
-            metadata,
-            autoload_with=db_session.get_bind(),
+    if not batch_rows:
+        return normalized_entities
+
+    # step 1: find entities containing the entity_name or something similar
+    with get_session_with_current_tenant() as db_session:
+
+        # get allowed documents
+        allowed_docs_temp_view = _reflect_allowed_docs_temp_view(
+            db_session, allowed_docs_temp_view_name
         )
 
-        # generate trigrams of the queried entity Q
-        query_trigrams = db_session.query(
+        batch = values(
+            column("idx", Integer),
+            column("name", String),
+            column("entity_type_id_name", String),
+            column("subtype", String),
+            name="normalization_batch",
+        ).data(batch_rows)
+
+        # generate trigrams of each queried entity Q
+        query_trigrams = select(
+            batch.c.idx,
+            batch.c.entity_type_id_name,
+            batch.c.subtype,
             getattr(func, POSTGRES_DEFAULT_SCHEMA)
-            .show_trgm(cleaned_entity)
+            .show_trgm(batch.c.name)
             .cast(ARRAY(String(3)))
-            .label("trigrams")
-        ).cte("query")
+            .label("trigrams"),
+        ).subquery("query")
 
-        candidates = cast(
-            list[tuple[str, str, float]],
-            db_session.query(
+        # the candidates of each queried entity
+        candidates = (
+            select(
                 KGEntity.id_name,
                 KGEntity.name,
                 (
@@ -130,15 +209,20 @@ def _normalize_one_entity(
                     )
                 ).label("score"),
             )
-            .select_from(KGEntity, query_trigrams)
+            .select_from(KGEntity)
             .outerjoin(
                 allowed_docs_temp_view,
                 KGEntity.document_id == allowed_docs_temp_view.c.allowed_doc_id,
             )
-            .filter(
-                *type_filters,
+            .where(
+                KGEntity.entity_type_id_name == query_trigrams.c.entity_type_id_name,
+                # narrow filter to subtype if requested
+                query_trigrams.c.subtype.is_(None)
+                | KGEntity.attributes.op("@>")(
+                    func.jsonb_build_object("subtype", query_trigrams.c.subtype)
+                ),
                 KGEntity.name_trigrams.overlap(query_trigrams.c.trigrams),
-                # Add filter for allowed docs - either document_id is NULL or it's in allowed_docs
+                # either document_id is NULL or it's in allowed_docs
                 (
                     KGEntity.document_id.is_(None)
                     | allowed_docs_temp_view.c.allowed_doc_id.isnot(None)
@@ -146,53 +230,27 @@ def _normalize_one_entity(
             )
             .order_by(desc("score"))
             .limit(KG_NORMALIZATION_RETRIEVE_ENTITIES_LIMIT)
-            .all(),
+            .lateral("candidate")
         )
-    if not candidates:
-        return None
 
-    # step 2: do a weighted ngram analysis and damerau levenshtein distance to rerank
-    n1, n2, n3 = (
-        set(_ngrams(cleaned_entity, 1)),
-        set(_ngrams(cleaned_entity, 2)),
-        set(_ngrams(cleaned_entity, 3)),
-    )
-    for i, (candidate_id_name, candidate_name, _) in enumerate(candidates):
-        cleaned_candidate = _clean_name(candidate_name)
-        h_n1, h_n2, h_n3 = (
-            set(_ngrams(cleaned_candidate, 1)),
-            set(_ngrams(cleaned_candidate, 2)),
-            set(_ngrams(cleaned_candidate, 3)),
-        )
-
-        # compute ngram overlap, renormalize scores if the names are too short for larger ngrams
-        grams_used = min(2, len(cleaned_entity) - 1, len(cleaned_candidate) - 1)
-        W_n1, W_n2, W_n3 = KG_NORMALIZATION_RERANK_NGRAM_WEIGHTS
-        ngram_score = (
-            # compute | Q ∩ E | / min(|Q|, |E|) for unigrams and bigrams (trigrams already computed)
-            W_n1 * len(n1 & h_n1) / max(1, min(len(n1), len(h_n1)))
-            + W_n2 * len(n2 & h_n2) / max(1, min(len(n2), len(h_n2)))
-            + W_n3 * len(n3 & h_n3) / max(1, min(len(n3), len(h_n3)))
-        ) / (W_n1, W_n1 + W_n2, 1.0)[grams_used]
-
-        # compute damerau levenshtein distance to fuzzy match against typos
-        W_leven = KG_NORMALIZATION_RERANK_LEVENSHTEIN_WEIGHT
-        leven_score = normalized_similarity(cleaned_entity, cleaned_candidate)
+        candidates_by_idx: dict[int, list[tuple[str, str, float]]] = defaultdict(list)
+        for idx, id_name, name, score in db_session.execute(
+            select(
+                query_trigrams.c.idx,
+                candidates.c.id_name,
+                candidates.c.name,
+                candidates.c.score,
+            )
+            .select_from(query_trigrams)
+            .join(candidates, true())
+        ):
+            candidates_by_idx[idx].append((id_name, name, score))
 
-        # combine scores
-        score = (1.0 - W_leven) * ngram_score + W_leven * leven_score
-        candidates[i] = (candidate_id_name, candidate_name, score)
-    candidates = list(
-        sorted(
-            filter(lambda x: x[2] > KG_NORMALIZATION_RERANK_THRESHOLD, candidates),
-            key=lambda x: x[2],
-            reverse=True,
+    for idx, cleaned_entity in cleaned_entities.items():
+        normalized_entities[idx] = _rerank_candidates(
+            cleaned_entity, candidates_by_idx[idx]
         )
-    )
-    if not candidates:
-        return None
-
-    return candidates[0][0]
+    return normalized_entities
 
 
 def _get_existing_normalized_relationships(
@@ -240,6 +298,7 @@ def normalize_entities(
     Args:
         raw_entities: list of entity strings to normalize, w/o attributes
         raw_entities_w_attributes: list of entity strings to normalize, w/ attributes
+        allowed_docs_temp_view_name: view of the documents the user can access
 
     Returns:
         list of normalized entity strings
@@ -252,12 +311,10 @@ def normalize_entities(
         get_attributes(attr_entity) for attr_entity in raw_entities_w_attributes
     ]
 
-    mapping: list[str | None] = run_functions_tuples_in_parallel(
-        [
-            (_normalize_one_entity, (entity, attributes, allowed_docs_temp_view_name))
-            for entity, attributes in zip(raw_entities, entity_attributes)
-        ]
+    mapping = _normalize_entity_batch(
+        raw_entities, entity_attributes, allowed_docs_temp_view_name
     )
+
     for entity, attributes, normalized_entity in zip(
         raw_entities, entity_attributes, mapping
     ):
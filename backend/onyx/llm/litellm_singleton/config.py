@@ -149,6 +149,14 @@ def load_model_metadata_enrichments() -> None:
             parse_litellm_model_name.cache_clear()
         except ImportError:
             pass  # Parser not yet imported, no cache to clear
+
+        # Same for the model capabilities, which are resolved from litellm.model_cost
+        try:
+            from onyx.llm.utils import clear_model_capabilities_cache
+
+            clear_model_capabilities_cache()
+        except ImportError:
+            pass
     except Exception as e:
         logger.error(f"Failed to load model metadata enrichments: {e}")
 
@@ -1,6 +1,7 @@
 import copy
 import re
 from collections.abc import Callable
+from dataclasses import dataclass
 from functools import lru_cache
 from typing import Any
 from typing import cast
@@ -515,6 +516,14 @@ def llm_max_input_tokens(
         logger.info(f"Using override GEN_AI_MAX_TOKENS: {GEN_AI_MAX_TOKENS}")
         return GEN_AI_MAX_TOKENS
 
+    return _model_map_max_input_tokens(model_map, model_name, model_provider)
+
+
+def _model_map_max_input_tokens(
+    model_map: dict,
+    model_name: str,
+    model_provider: str,
+) -> int:
     model_obj = find_model_obj(
         model_map,
         model_provider,
@@ -584,16 +593,11 @@ def get_max_input_tokens(
     # `model_cost` dict is a named public interface:
     # https://litellm.vercel.app/docs/completion/token_usage#7-model_cost
     # model_map is  litellm.model_cost
-    litellm_model_map = get_model_map()
-
-    input_toks = (
-        llm_max_input_tokens(
-            model_name=model_name,
-            model_provider=model_provider,
-            model_map=litellm_model_map,
-        )
-        - output_tokens
+    max_input_tokens = (
+        GEN_AI_MAX_TOKENS
+        or get_model_capabilities(model_provider, model_name).max_input_tokens
     )
+    input_toks = max_input_tokens - output_tokens
 
     if input_toks <= 0:
         return GEN_AI_MODEL_FALLBACK_MAX_TOKENS
@@ -712,8 +716,14 @@ def litellm_thinks_model_supports_image_input(
     """Generally should call `model_supports_image_input` unless you already know that
     `model_supports_image_input` from the DB is not set OR you need to avoid the performance
     hit of querying the DB."""
+    return get_model_capabilities(model_provider, model_name).supports_vision
+
+
+def _litellm_thinks_model_supports_image_input(
+    model_map: dict, model_name: str, model_provider: str
+) -> bool:
     try:
-        model_obj = find_model_obj(get_model_map(), model_provider, model_name)
+        model_obj = find_model_obj(model_map, model_provider, model_name)
         if not model_obj:
             logger.warning(
                 f"No litellm entry found for {model_provider}/{model_name}, "
@@ -730,9 +740,14 @@ def litellm_thinks_model_supports_image_input(
 
 
 def model_is_reasoning_model(model_name: str, model_provider: str) -> bool:
+    return get_model_capabilities(model_provider, model_name).supports_reasoning
+
+
+def _model_is_reasoning_model(
+    model_map: dict, model_name: str, model_provider: str
+) -> bool:
     import litellm
 
-    model_map = get_model_map()
     try:
         model_obj = find_model_obj(
             model_map,
@@ -774,7 +789,12 @@ def is_true_openai_model(model_provider: str, model_name: str) -> bool:
     This function is used primarily to determine if we should use the responses API.
     OpenAI models from OpenAI and Azure should use responses.
     """
+    return get_model_capabilities(model_provider, model_name).uses_responses_api
+
 
+def _is_true_openai_model(
+    model_map: dict, model_provider: str, model_name: str
+) -> bool:
     if model_provider not in {
         LlmProviderNames.OPENAI,
         LlmProviderNames.LITELLM_PROXY,
@@ -782,8 +802,6 @@ def is_true_openai_model(model_provider: str, model_name: str) -> bool:
     }:
         return False
 
-    model_map = get_model_map()
-
     def _check_if_model_name_is_openai_provider(model_name: str) -> bool:
         if model_name not in model_map:
             return False
@@ -812,6 +830,66 @@ def is_true_openai_model(model_provider: str, model_name: str) -> bool:
         return False
 
 
+@dataclass(frozen=True)
+class ModelCapabilities:
+    """What the litellm model map says about a model, see `get_model_capabilities`."""
+
+    # without the GEN_AI_MAX_TOKENS override
+    max_input_tokens: int
+    supports_reasoning: bool
+    supports_vision: bool
+    supports_function_calling: bool
+    litellm_provider: str | None
+    # whether this is a true OpenAI model, which goes through the responses API
+    uses_responses_api: bool
+
+
+@lru_cache(maxsize=2048)
+def get_model_capabilities(model_provider: str, model_name: str) -> ModelCapabilities:
+    """Capabilities of a model, resolved once per (provider, model name).
+
+    Resolving a model takes several lookups in the model map for every name variant,
+    plus a `litellm.supports_reasoning` call for models the map doesn't know, and the
+    LLM call path needs several capabilities per call. The result only depends on the
+    model map, call `clear_model_capabilities_cache` when that changes.
+    """
+    if not model_name:
+        return ModelCapabilities(
+            max_input_tokens=GEN_AI_MODEL_FALLBACK_MAX_TOKENS,
+            supports_reasoning=False,
+            supports_vision=False,
+            supports_function_calling=False,
+            litellm_provider=None,
+            uses_responses_api=False,
+        )
+
+    model_map = get_model_map()
+    model_obj = find_model_obj(model_map, model_provider, model_name)
+    return ModelCapabilities(
+        max_input_tokens=_model_map_max_input_tokens(
+            model_map, model_name, model_provider
+        ),
+        supports_reasoning=bool(
+            _model_is_reasoning_model(model_map, model_name, model_provider)
+        ),
+        supports_vision=_litellm_thinks_model_supports_image_input(
+            model_map, model_name, model_provider
+        ),
+        supports_function_calling=bool(
+            model_obj and model_obj.get("supports_function_calling")
+        ),
+        litellm_provider=model_obj.get("litellm_provider") if model_obj else None,
+        uses_responses_api=_is_true_openai_model(model_map, model_provider, model_name),
+    )
+
+
+def clear_model_capabilities_cache() -> None:
+    """Rebuild the model map and the capabilities from `litellm.model_cost` on the next
+    lookup."""
+    get_model_map.cache_clear()
+    get_model_capabilities.cache_clear()
+
+
 def model_needs_formatting_reenabled(model_name: str) -> bool:
     # See https://simonwillison.net/tags/markdown/ for context on why this is needed
     # for OpenAI reasoning models to have correct markdown generation
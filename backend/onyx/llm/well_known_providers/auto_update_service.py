@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 from onyx.configs.app_configs import AUTO_LLM_CONFIG_URL
 from onyx.db.llm import fetch_auto_mode_providers
 from onyx.db.llm import sync_auto_mode_models
+from onyx.llm.utils import clear_model_capabilities_cache
 from onyx.llm.well_known_providers.auto_update_models import LLMRecommendations
 from onyx.redis.redis_pool import get_redis_client
 from onyx.utils.logger import setup_logger
@@ -143,6 +144,10 @@ def sync_llm_models_from_github(
                 f"Applied {changes} model changes to provider '{provider.name}'"
             )
 
+    if results:
+        # models may have been added or renamed, resolve their capabilities again
+        clear_model_capabilities_cache()
+
     _set_cached_last_updated_at(config.updated_at)
     return results
 
@@ -55,7 +55,9 @@ from onyx.configs.constants import POSTGRES_WEB_APP_NAME
 from onyx.db.engine.connection_warmup import warm_up_connections
 from onyx.db.engine.sql_engine import get_session_with_current_tenant
 from onyx.db.engine.sql_engine import SqlEngine
+from onyx.document_index.vespa.shared_utils.utils import init_vespa_query_client
 from onyx.file_store.file_store import get_default_file_store
+from onyx.httpx.httpx_pool import HttpxPool
 from onyx.server.api_key.api import router as api_key_router
 from onyx.server.auth_check import check_router_auth
 from onyx.server.documents.cc_pair import router as cc_pair_router
@@ -304,9 +306,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if AUTH_RATE_LIMITING_ENABLED:
         await setup_auth_limiter()
 
+    # one pooled HTTP/2 client per worker process for all Vespa reads
+    init_vespa_query_client()
+
     yield
 
     SqlEngine.reset_engine()
+    HttpxPool.close_all()
 
     if AUTH_RATE_LIMITING_ENABLED:
         await close_auth_limiter()
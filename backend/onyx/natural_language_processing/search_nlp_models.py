@@ -23,14 +23,19 @@ from httpx import HTTPError
 from requests import JSONDecodeError
 from requests import RequestException
 from requests import Response
+from requests.adapters import HTTPAdapter
 from retry import retry
 
 from onyx.configs.app_configs import INDEXING_EMBEDDING_MODEL_NUM_THREADS
 from onyx.configs.app_configs import LARGE_CHUNK_RATIO
+from onyx.configs.app_configs import LOCAL_EMBEDDING_MAX_IN_FLIGHT_BATCHES
+from onyx.configs.app_configs import MODEL_SERVER_HTTP_POOL_SIZE
 from onyx.configs.model_configs import BATCH_SIZE_ENCODE_CHUNKS
 from onyx.configs.model_configs import (
     BATCH_SIZE_ENCODE_CHUNKS_FOR_API_EMBEDDING_SERVICES,
 )
+from onyx.configs.model_configs import MODEL_SERVER_BINARY_EMBEDDINGS
+from onyx.configs.model_configs import MODEL_SERVER_EMBEDDING_WIRE_DTYPE
 from onyx.connectors.models import ConnectorStopSignal
 from onyx.db.models import SearchSettings
 from onyx.indexing.indexing_heartbeat import IndexingHeartbeatInterface
@@ -55,6 +60,10 @@ from shared_configs.configs import MODEL_SERVER_PORT
 from shared_configs.configs import OPENAI_EMBEDDING_TIMEOUT
 from shared_configs.configs import SKIP_WARM_UP
 from shared_configs.configs import VERTEXAI_EMBEDDING_LOCAL_BATCH_SIZE
+from shared_configs.embedding_codec import build_binary_accept_header
+from shared_configs.embedding_codec import decode_embeddings_to_lists
+from shared_configs.embedding_codec import EmbeddingWireDtype
+from shared_configs.embedding_codec import is_binary_embedding_response
 from shared_configs.enums import EmbeddingProvider
 from shared_configs.enums import EmbedTextType
 from shared_configs.enums import RerankerProvider
@@ -90,6 +99,32 @@ _AUTH_ERROR_PERMISSION = "permission"
 _thread_local = threading.local()
 
 
+# Per-process keep-alive session for model server calls, so that every batch doesn't
+# pay for a new TCP connection. Keyed by pid since sockets must not be shared with
+# forked (e.g. Celery) children.
+_model_server_session: requests.Session | None = None
+_model_server_session_pid: int | None = None
+_model_server_session_lock = threading.Lock()
+
+
+def get_model_server_session() -> requests.Session:
+    global _model_server_session, _model_server_session_pid
+
+    pid = os.getpid()
+    with _model_server_session_lock:
+        if _model_server_session is None or _model_server_session_pid != pid:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=MODEL_SERVER_HTTP_POOL_SIZE,
+                pool_maxsize=MODEL_SERVER_HTTP_POOL_SIZE,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _model_server_session = session
+            _model_server_session_pid = pid
+        return _model_server_session
+
+
 def _get_or_create_event_loop() -> asyncio.AbstractEventLoop:
     """Get or create a thread-local event loop for API embedding calls.
 
@@ -673,6 +708,7 @@ class EmbeddingModel:
         api_version: str | None = None,
         deployment_name: str | None = None,
         reduced_dimension: int | None = None,
+        binary_transport: bool = MODEL_SERVER_BINARY_EMBEDDINGS,
     ) -> None:
         self.api_key = api_key
         self.provider_type = provider_type
@@ -689,6 +725,7 @@ class EmbeddingModel:
             model_name=model_name, provider_type=provider_type
         )
         self.callback = callback
+        self.binary_transport = binary_transport
 
         # Only build model server endpoint for local models
         if self.provider_type is None:
@@ -788,7 +825,12 @@ class EmbeddingModel:
             if request_id:
                 headers["X-Onyx-Request-ID"] = request_id
 
-            response = requests.post(
+            if self.binary_transport:
+                headers["Accept"] = build_binary_accept_header(
+                    EmbeddingWireDtype(MODEL_SERVER_EMBEDDING_WIRE_DTYPE)
+                )
+
+            response = get_model_server_session().post(
                 endpoint,
                 headers=headers,
                 json=embed_request.model_dump(),
@@ -819,6 +861,12 @@ class EmbeddingModel:
 
         try:
             response = final_make_request_func()
+            # older model servers ignore the Accept header and always reply with JSON
+            if is_binary_embedding_response(response.headers.get("Content-Type")):
+                # skip pydantic validation, the decoded payload is already well-typed
+                return EmbedResponse.model_construct(
+                    embeddings=decode_embeddings_to_lists(response.content)
+                )
             return EmbedResponse(**response.json())
         except requests.HTTPError as e:
             if not response:
@@ -906,12 +954,20 @@ class EmbeddingModel:
 
             return batch_idx, response.embeddings
 
+        # API-based models can take many concurrent batches. For local models the
+        # model server does the actual work, so we only keep a few batches in flight
+        # to overlap request/response handling with the previous batch's forward pass
+        max_workers = (
+            num_threads
+            if self.provider_type
+            else min(num_threads, LOCAL_EMBEDDING_MAX_IN_FLIGHT_BATCHES)
+        )
+
         # only multi thread if:
-        #   1. num_threads is greater than 1
-        #   2. we are using an API-based embedding model (provider_type is not None)
-        #   3. there are more than 1 batch (no point in threading if only 1)
-        if num_threads >= 1 and self.provider_type and len(text_batches) > 1:
-            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        #   1. more than 1 worker is allowed
+        #   2. there are more than 1 batch (no point in threading if only 1)
+        if max_workers > 1 and len(text_batches) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 future_to_batch = {
                     executor.submit(
                         partial(
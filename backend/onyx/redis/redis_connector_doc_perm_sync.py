@@ -23,10 +23,12 @@ class PermissionSyncResult(NamedTuple):
     Attributes:
         num_updated: Number of documents successfully updated
         num_errors: Number of documents that failed to update
+        num_changed: Number of updated documents whose permissions actually changed
     """
 
     num_updated: int
     num_errors: int
+    num_changed: int = 0
 
 
 class RedisConnectorPermissionSyncPayload(BaseModel):
@@ -174,29 +176,23 @@ class RedisConnectorPermissionSync:
         credential_id: int,
         task_logger: Logger | None = None,
     ) -> PermissionSyncResult:
-        """Update permissions for documents.
+        """Update permissions for documents. All documents are written in a single
+        transaction, if that fails they are retried one at a time so that a single bad
+        document doesn't fail the whole batch.
 
         Returns:
             PermissionSyncResult containing counts of successful updates and errors
         """
-        last_lock_time = time.monotonic()
+        if lock:
+            lock.reacquire()
 
-        document_update_permissions_fn = fetch_versioned_implementation(
+        document_update_permissions_batch_fn = fetch_versioned_implementation(
             "onyx.background.celery.tasks.doc_permission_syncing.tasks",
-            "document_update_permissions",
+            "document_update_permissions_batch",
         )
 
-        num_permissions = 0
-        num_errors = 0
-        # Create a task for each document permission sync
+        valid_permissions: list[DocExternalAccess] = []
         for permissions in new_permissions:
-            current_time = time.monotonic()
-            if lock and current_time - last_lock_time >= (
-                CELERY_GENERIC_BEAT_LOCK_TIMEOUT / 4
-            ):
-                lock.reacquire()
-                last_lock_time = current_time
-
             if (
                 permissions.external_access.num_entries
                 > permissions.external_access.MAX_NUM_ENTRIES
@@ -213,12 +209,70 @@ class RedisConnectorPermissionSync:
                         f"{permissions.external_access.MAX_NUM_ENTRIES=}"
                     )
                 continue
+            valid_permissions.append(permissions)
+
+        if not valid_permissions:
+            return PermissionSyncResult(num_updated=0, num_errors=0)
+
+        # NOTE(rkuo): this used to fire a task instead of directly writing to the DB,
+        # but the permissions can be excessively large if sent over the wire.
+        # On the other hand, the downside of doing db updates here is that we can
+        # block and fail if we can't make the calls to the DB ... but that's probably
+        # a rare enough case to be acceptable.
+        try:
+            num_changed = document_update_permissions_batch_fn(
+                self.tenant_id,
+                valid_permissions,
+                source_string,
+                connector_id,
+                credential_id,
+            )
+            return PermissionSyncResult(
+                num_updated=len(valid_permissions),
+                num_errors=0,
+                num_changed=num_changed,
+            )
+        except Exception:
+            if task_logger:
+                task_logger.exception(
+                    f"Failed to update permissions for a batch of "
+                    f"{len(valid_permissions)} documents, retrying one at a time"
+                )
 
-            # NOTE(rkuo): this used to fire a task instead of directly writing to the DB,
-            # but the permissions can be excessively large if sent over the wire.
-            # On the other hand, the downside of doing db updates here is that we can
-            # block and fail if we can't make the calls to the DB ... but that's probably
-            # a rare enough case to be acceptable.
+        return self._update_db_one_at_a_time(
+            lock,
+            valid_permissions,
+            source_string,
+            connector_id,
+            credential_id,
+            task_logger,
+        )
+
+    def _update_db_one_at_a_time(
+        self,
+        lock: RedisLock | None,
+        new_permissions: list[DocExternalAccess],
+        source_string: str,
+        connector_id: int,
+        credential_id: int,
+        task_logger: Logger | None,
+    ) -> PermissionSyncResult:
+        last_lock_time = time.monotonic()
+
+        document_update_permissions_fn = fetch_versioned_implementation(
+            "onyx.background.celery.tasks.doc_permission_syncing.tasks",
+            "document_update_permissions",
+        )
+
+        num_permissions = 0
+        num_errors = 0
+        for permissions in new_permissions:
+            current_time = time.monotonic()
+            if lock and current_time - last_lock_time >= (
+                CELERY_GENERIC_BEAT_LOCK_TIMEOUT / 4
+            ):
+                lock.reacquire()
+                last_lock_time = current_time
 
             # This can internally exception due to db issues but still continue
             # Catch exceptions per-document to avoid breaking the entire sync
@@ -239,7 +293,12 @@ class RedisConnectorPermissionSync:
                     )
                 # Continue processing other documents
 
-        return PermissionSyncResult(num_updated=num_permissions, num_errors=num_errors)
+        # the per document path doesn't report whether the permissions changed
+        return PermissionSyncResult(
+            num_updated=num_permissions,
+            num_errors=num_errors,
+            num_changed=num_permissions,
+        )
 
     def reset(self) -> None:
         self.redis.srem(OnyxRedisConstants.ACTIVE_FENCES, self.fence_key)
@@ -34,6 +34,7 @@ from onyx.chat.process_message import stream_chat_message_objects
 from onyx.chat.prompt_utils import get_default_base_system_prompt
 from onyx.chat.stop_signal_checker import set_fence
 from onyx.configs.app_configs import WEB_DOMAIN
+from onyx.configs.chat_configs import CHAT_ASYNC_STREAMING
 from onyx.configs.chat_configs import HARD_DELETE_CHATS
 from onyx.configs.constants import MessageType
 from onyx.configs.constants import MilestoneRecordType
@@ -106,6 +107,7 @@ from onyx.server.utils import get_json_line
 from onyx.utils.headers import get_custom_tool_additional_request_headers
 from onyx.utils.logger import setup_logger
 from onyx.utils.telemetry import mt_cloud_telemetry
+from onyx.utils.threadpool_concurrency import iterate_in_background_thread
 from shared_configs.contextvars import get_current_tenant_id
 
 logger = setup_logger()
@@ -556,6 +558,11 @@ def handle_new_chat_message(
         finally:
             logger.debug("Stream generator finished")
 
+    if CHAT_ASYNC_STREAMING:
+        return StreamingResponse(
+            iterate_in_background_thread(stream_generator),
+            media_type="text/event-stream",
+        )
     return StreamingResponse(stream_generator(), media_type="text/event-stream")
 
 
@@ -682,6 +689,11 @@ def handle_send_chat_message(
         finally:
             logger.debug("Stream generator finished")
 
+    if CHAT_ASYNC_STREAMING:
+        return StreamingResponse(
+            iterate_in_background_thread(stream_generator),
+            media_type="text/event-stream",
+        )
     return StreamingResponse(stream_generator(), media_type="text/event-stream")
 
 
@@ -1,7 +1,24 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+from urllib.parse import urlunparse
 
+import chardet
+import requests
+from requests.adapters import HTTPAdapter
+
+from onyx.configs.tool_configs import ONYX_WEB_CRAWLER_CACHE_SIZE
+from onyx.configs.tool_configs import ONYX_WEB_CRAWLER_CACHE_TTL_SECONDS
+from onyx.configs.tool_configs import ONYX_WEB_CRAWLER_CONCURRENT_FETCH
+from onyx.configs.tool_configs import ONYX_WEB_CRAWLER_MAX_CONCURRENCY
+from onyx.configs.tool_configs import ONYX_WEB_CRAWLER_MAX_CONCURRENCY_PER_HOST
 from onyx.file_processing.html_utils import ParsedHTML
 from onyx.file_processing.html_utils import web_html_cleanup
 from onyx.tools.tool_implementations.open_url.models import (
@@ -26,6 +43,127 @@ DEFAULT_USER_AGENT = "OnyxWebCrawler/1.0 (+https://www.onyx.app)"
 DEFAULT_MAX_PDF_SIZE_BYTES = 50 * 1024 * 1024  # 50 MB
 DEFAULT_MAX_HTML_SIZE_BYTES = 20 * 1024 * 1024  # 20 MB
 
+_STREAM_CHUNK_SIZE = 64 * 1024
+_CONTENT_SNIFF_SIZE = 1024
+
+
+@dataclass
+class _CachedPage:
+    content: WebContent
+    etag: str | None
+    last_modified: str | None
+    expires_at: float
+
+
+class _PageCache:
+    """Thread safe LRU of crawled pages. Pages are served as is until they expire, after
+    which the ones with an ETag / Last-Modified are kept around to be revalidated."""
+
+    def __init__(self, max_size: int, ttl_seconds: int) -> None:
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._pages: OrderedDict[str, _CachedPage] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds > 0 and self._max_size > 0
+
+    def get(self, key: str) -> _CachedPage | None:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None:
+                return None
+            if page.expires_at < time.monotonic() and not (
+                page.etag or page.last_modified
+            ):
+                del self._pages[key]
+                return None
+            self._pages.move_to_end(key)
+            return page
+
+    def set(
+        self,
+        key: str,
+        content: WebContent,
+        etag: str | None,
+        last_modified: str | None,
+    ) -> None:
+        with self._lock:
+            self._pages[key] = _CachedPage(
+                content=content,
+                etag=etag,
+                last_modified=last_modified,
+                expires_at=time.monotonic() + self._ttl_seconds,
+            )
+            self._pages.move_to_end(key)
+            while len(self._pages) > self._max_size:
+                self._pages.popitem(last=False)
+
+    def refresh(self, key: str) -> None:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                page.expires_at = time.monotonic() + self._ttl_seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+
+_page_cache = _PageCache(
+    max_size=ONYX_WEB_CRAWLER_CACHE_SIZE,
+    ttl_seconds=ONYX_WEB_CRAWLER_CACHE_TTL_SECONDS,
+)
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Session shared by every crawler of the process so connections are kept alive
+    between fetches. Cookies are never stored, pages are fetched anonymously."""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                adapter = HTTPAdapter(
+                    pool_connections=ONYX_WEB_CRAWLER_MAX_CONCURRENCY,
+                    pool_maxsize=ONYX_WEB_CRAWLER_MAX_CONCURRENCY,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def _page_cache_key(url: str) -> str:
+    """Scheme and host are case insensitive, the fragment never reaches the server."""
+    parsed = urlparse(url)
+    return urlunparse(
+        (
+            parsed.scheme.lower(),
+            parsed.netloc.lower(),
+            parsed.path or "/",
+            parsed.params,
+            parsed.query,
+            "",
+        )
+    )
+
+
+def _failed_content(url: str) -> WebContent:
+    return WebContent(
+        title="",
+        link=url,
+        full_content="",
+        published_date=None,
+        scrape_successful=False,
+    )
+
 
 class OnyxWebCrawler(WebContentProvider):
     """
@@ -51,16 +189,48 @@ class OnyxWebCrawler(WebContentProvider):
         }
 
     def contents(self, urls: Sequence[str]) -> list[WebContent]:
-        results: list[WebContent] = []
+        if not ONYX_WEB_CRAWLER_CONCURRENT_FETCH or len(urls) <= 1:
+            return [self._fetch_url(url) for url in urls]
+
+        # bounds the fetches to the same host, the pool bounds the total
+        host_semaphores: dict[str, threading.BoundedSemaphore] = {}
         for url in urls:
-            results.append(self._fetch_url(url))
-        return results
+            host = urlparse(url).netloc.lower()
+            if host not in host_semaphores:
+                host_semaphores[host] = threading.BoundedSemaphore(
+                    ONYX_WEB_CRAWLER_MAX_CONCURRENCY_PER_HOST
+                )
+
+        def _fetch_politely(url: str) -> WebContent:
+            with host_semaphores[urlparse(url).netloc.lower()]:
+                return self._fetch_url(url)
+
+        max_workers = min(ONYX_WEB_CRAWLER_MAX_CONCURRENCY, len(urls))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_fetch_politely, urls))
 
     def _fetch_url(self, url: str) -> WebContent:
+        cache_key = _page_cache_key(url)
+        cached_page = _page_cache.get(cache_key) if _page_cache.enabled else None
+        if cached_page is not None and cached_page.expires_at >= time.monotonic():
+            return cached_page.content.model_copy()
+
+        headers = self._headers
+        if cached_page is not None:
+            headers = dict(self._headers)
+            if cached_page.etag:
+                headers["If-None-Match"] = cached_page.etag
+            if cached_page.last_modified:
+                headers["If-Modified-Since"] = cached_page.last_modified
+
         try:
             # Use SSRF-safe request to prevent DNS rebinding attacks
             response = ssrf_safe_get(
-                url, headers=self._headers, timeout=self._timeout_seconds
+                url,
+                headers=headers,
+                timeout=self._timeout_seconds,
+                stream=ONYX_WEB_CRAWLER_CONCURRENT_FETCH,
+                session=_get_session() if ONYX_WEB_CRAWLER_CONCURRENT_FETCH else None,
             )
         except SSRFException as exc:
             logger.error(
@@ -68,58 +238,90 @@ class OnyxWebCrawler(WebContentProvider):
                 url,
                 str(exc),
             )
-            return WebContent(
-                title="",
-                link=url,
-                full_content="",
-                published_date=None,
-                scrape_successful=False,
-            )
+            return _failed_content(url)
         except Exception as exc:  # pragma: no cover - network failures vary
             logger.warning(
                 "Onyx crawler failed to fetch %s (%s)",
                 url,
                 exc.__class__.__name__,
             )
-            return WebContent(
-                title="",
-                link=url,
-                full_content="",
-                published_date=None,
-                scrape_successful=False,
+            return _failed_content(url)
+
+        try:
+            if response.status_code == 304 and cached_page is not None:
+                _page_cache.refresh(cache_key)
+                return cached_page.content.model_copy()
+            web_content = self._process_response(url, response)
+        finally:
+            response.close()
+
+        if (
+            _page_cache.enabled
+            and response.status_code == 200
+            and web_content.scrape_successful
+        ):
+            _page_cache.set(
+                cache_key,
+                web_content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
             )
+        return web_content
+
+    def _read_body(
+        self, url: str, response: requests.Response, content_type: str
+    ) -> tuple[bytes, bool] | None:
+        """Reads the body, giving up as soon as it goes over the size limit of its type
+        (a streamed body is never fully downloaded then). Returns the body and whether
+        it is a PDF, or None if it is too large."""
+        body = bytearray()
+        is_pdf: bool | None = None
+        max_size: int | None = None
+        content_length = response.headers.get("Content-Length", "")
+        declared_size = int(content_length) if content_length.isdigit() else 0
+
+        for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+            body.extend(chunk)
+            if is_pdf is None and len(body) >= _CONTENT_SNIFF_SIZE:
+                is_pdf = is_pdf_resource(
+                    url, content_type, bytes(body[:_CONTENT_SNIFF_SIZE])
+                )
+                max_size = self._max_size_bytes(is_pdf)
+            if max_size is not None and max(len(body), declared_size) > max_size:
+                break
+
+        if is_pdf is None:
+            is_pdf = is_pdf_resource(url, content_type, bytes(body) or None)
+            max_size = self._max_size_bytes(is_pdf)
+
+        size = max(len(body), declared_size)
+        if max_size is not None and size > max_size:
+            logger.warning(
+                "%s content too large (%d bytes) for %s, max is %d",
+                "PDF" if is_pdf else "HTML",
+                size,
+                url,
+                max_size,
+            )
+            return None
+        return bytes(body), is_pdf
+
+    def _max_size_bytes(self, is_pdf: bool) -> int | None:
+        return self._max_pdf_size_bytes if is_pdf else self._max_html_size_bytes
 
+    def _process_response(self, url: str, response: requests.Response) -> WebContent:
         if response.status_code >= 400:
             logger.warning("Onyx crawler received %s for %s", response.status_code, url)
-            return WebContent(
-                title="",
-                link=url,
-                full_content="",
-                published_date=None,
-                scrape_successful=False,
-            )
+            return _failed_content(url)
 
         content_type = response.headers.get("Content-Type", "")
-        content_sniff = response.content[:1024] if response.content else None
-        if is_pdf_resource(url, content_type, content_sniff):
-            if (
-                self._max_pdf_size_bytes is not None
-                and len(response.content) > self._max_pdf_size_bytes
-            ):
-                logger.warning(
-                    "PDF content too large (%d bytes) for %s, max is %d",
-                    len(response.content),
-                    url,
-                    self._max_pdf_size_bytes,
-                )
-                return WebContent(
-                    title="",
-                    link=url,
-                    full_content="",
-                    published_date=None,
-                    scrape_successful=False,
-                )
-            text_content, metadata = extract_pdf_text(response.content)
+        body = self._read_body(url, response, content_type)
+        if body is None:
+            return _failed_content(url)
+        content, is_pdf = body
+
+        if is_pdf:
+            text_content, metadata = extract_pdf_text(content)
             title = title_from_pdf_metadata(metadata) or title_from_url(url)
             return WebContent(
                 title=title,
@@ -129,29 +331,14 @@ class OnyxWebCrawler(WebContentProvider):
                 scrape_successful=bool(text_content.strip()),
             )
 
-        if (
-            self._max_html_size_bytes is not None
-            and len(response.content) > self._max_html_size_bytes
-        ):
-            logger.warning(
-                "HTML content too large (%d bytes) for %s, max is %d",
-                len(response.content),
-                url,
-                self._max_html_size_bytes,
-            )
-            return WebContent(
-                title="",
-                link=url,
-                full_content="",
-                published_date=None,
-                scrape_successful=False,
-            )
-
         try:
             decoded_html = decode_html_bytes(
-                response.content,
+                content,
                 content_type=content_type,
-                fallback_encoding=response.apparent_encoding or response.encoding,
+                # what requests' apparent_encoding computes, which needs the whole
+                # body buffered on the response
+                fallback_encoding=chardet.detect(content).get("encoding")
+                or response.encoding,
             )
             parsed: ParsedHTML = web_html_cleanup(decoded_html)
             text_content = parsed.cleaned_text or ""
@@ -53,8 +53,8 @@ from onyx.context.search.models import IndexFilters
 from onyx.context.search.models import InferenceChunk
 from onyx.context.search.models import InferenceSection
 from onyx.context.search.models import SearchDocsResponse
+from onyx.context.search.pipeline import batch_search_pipeline
 from onyx.context.search.pipeline import merge_individual_chunks
-from onyx.context.search.pipeline import search_pipeline
 from onyx.context.search.utils import convert_inference_sections_to_search_docs
 from onyx.db.connector import check_connectors_exist
 from onyx.db.connector import check_federated_connectors_exist
@@ -81,6 +81,9 @@ from onyx.server.query_and_chat.streaming_models import SearchToolStart
 from onyx.tools.interface import Tool
 from onyx.tools.models import SearchToolOverrideKwargs
 from onyx.tools.models import ToolResponse
+from onyx.tools.tool_implementations.search.constants import (
+    FULL_DOC_NUM_CHUNKS_AROUND,
+)
 from onyx.tools.tool_implementations.search.constants import (
     KEYWORD_QUERY_HYBRID_ALPHA,
 )
@@ -103,6 +106,9 @@ from onyx.tools.tool_implementations.search.search_utils import (
 from onyx.tools.tool_implementations.search.search_utils import (
     merge_overlapping_sections,
 )
+from onyx.tools.tool_implementations.search.search_utils import (
+    retrieve_adjacent_chunks_batch,
+)
 from onyx.tools.tool_implementations.search.search_utils import (
     weighted_reciprocal_rank_fusion,
 )
@@ -410,37 +416,42 @@ class SearchTool(Tool[SearchToolOverrideKwargs]):
         finally:
             db_session.close()
 
-    def _run_search_for_query(
+    def _run_batched_search(
         self,
-        query: str,
-        hybrid_alpha: float | None,
+        queries_with_alphas: list[tuple[str, float | None]],
         num_hits: int,
-    ) -> list[InferenceChunk]:
-        """Run search pipeline for a single query.
+    ) -> list[list[InferenceChunk]]:
+        """Run the search pipeline for all queries at once. Filters and ACLs are
+        computed once, the queries are embedded together and the index queries
+        run concurrently.
 
         Args:
-            query: The search query string
-            hybrid_alpha: Hybrid search alpha parameter (None for default)
-            num_hits: Maximum number of hits to return
+            queries_with_alphas: The search queries with their hybrid search alpha
+                (None for default)
+            num_hits: Maximum number of hits to return per query
 
         Returns:
-            List of InferenceChunk results
+            One list of InferenceChunk results per query, in the same order
         """
-        # Create a thread-safe session for this search
         search_db_session = self._get_thread_safe_session()
         try:
-            return search_pipeline(
+            return batch_search_pipeline(
                 db_session=search_db_session,
-                chunk_search_request=ChunkSearchRequest(
-                    query=query,
-                    hybrid_alpha=hybrid_alpha,
-                    # For projects, the search scope is the project and has no other limits
-                    user_selected_filters=(
-                        self.user_selected_filters if self.project_id is None else None
-                    ),
-                    bypass_acl=self.bypass_acl,
-                    limit=num_hits,
-                ),
+                chunk_search_requests=[
+                    ChunkSearchRequest(
+                        query=query,
+                        hybrid_alpha=hybrid_alpha,
+                        # For projects, the search scope is the project and has no other limits
+                        user_selected_filters=(
+                            self.user_selected_filters
+                            if self.project_id is None
+                            else None
+                        ),
+                        bypass_acl=self.bypass_acl,
+                        limit=num_hits,
+                    )
+                    for query, hybrid_alpha in queries_with_alphas
+                ],
                 project_id=self.project_id,
                 document_index=self.document_index,
                 user=self.user,
@@ -642,41 +653,39 @@ class SearchTool(Tool[SearchToolOverrideKwargs]):
                 )
             )
 
-            # Run all searches in parallel with appropriate hybrid_alpha values
+            # Run all index searches as one batch with appropriate hybrid_alpha values
             # Keyword queries use hybrid_alpha=0.2 (favor keyword search)
             # Other queries use default hybrid_alpha (balanced semantic/keyword)
-            search_functions: list[tuple[Callable, tuple]] = []
+            queries_with_alphas: list[tuple[str, float | None]] = []
             search_weights: list[float] = []
 
             # Add deduplicated semantic queries (use hybrid_alpha=None)
             for query, weight in deduplicated_semantic_queries:
-                search_functions.append(
-                    (
-                        self._run_search_for_query,
-                        (query, None, override_kwargs.num_hits),
-                    )
-                )
+                queries_with_alphas.append((query, None))
                 search_weights.append(weight)
 
             # Add deduplicated keyword queries (use hybrid_alpha=0.2)
             for query, weight in deduplicated_keyword_queries:
-                search_functions.append(
-                    (
-                        self._run_search_for_query,
-                        (query, KEYWORD_QUERY_HYBRID_ALPHA, override_kwargs.num_hits),
-                    )
-                )
+                queries_with_alphas.append((query, KEYWORD_QUERY_HYBRID_ALPHA))
                 search_weights.append(weight)
 
-            # Add Slack federated search (runs once in parallel with all Vespa queries)
+            search_functions: list[tuple[Callable, tuple]] = [
+                (
+                    self._run_batched_search,
+                    (queries_with_alphas, override_kwargs.num_hits),
+                )
+            ]
+
+            # Add Slack federated search (runs once in parallel with the batched queries)
             # This avoids the query multiplication problem where each Vespa query
             # would trigger a separate Slack search
             # Run if we have slack_context (bot) or user (might have OAuth token)
-            if (
+            run_slack_search = bool(
                 (self.enable_slack_search or self.slack_context)
                 and (self.slack_context or self.user)
                 and override_kwargs.original_query
-            ):
+            )
+            if run_slack_search:
                 search_functions.append(
                     (
                         self._run_slack_search,
@@ -686,8 +695,11 @@ class SearchTool(Tool[SearchToolOverrideKwargs]):
                 # Use same weight as original query for Slack results
                 search_weights.append(ORIGINAL_QUERY_WEIGHT)
 
-            # Run all searches in parallel (Vespa queries + Slack)
-            all_search_results = run_functions_tuples_in_parallel(search_functions)
+            # Run the batched index search and Slack search in parallel
+            parallel_results = run_functions_tuples_in_parallel(search_functions)
+            all_search_results: list[list[InferenceChunk]] = list(parallel_results[0])
+            if run_slack_search:
+                all_search_results.append(parallel_results[1])
 
             # Merge results using weighted Reciprocal Rank Fusion
             # This intelligently combines rankings from different queries
@@ -775,6 +787,7 @@ class SearchTool(Tool[SearchToolOverrideKwargs]):
                 llm: LLM,
                 document_index: DocumentIndex,
                 expand_override: bool,
+                adjacent_chunks: tuple[list[InferenceChunk], list[InferenceChunk]],
             ) -> InferenceSection:
                 """Wrapper that handles exceptions and returns original section on error."""
                 try:
@@ -784,6 +797,7 @@ class SearchTool(Tool[SearchToolOverrideKwargs]):
                         llm=llm,
                         document_index=document_index,
                         expand_override=expand_override,
+                        adjacent_chunks=adjacent_chunks,
                     )
                     # Return expanded section if not None, otherwise original
                     return expanded_section if expanded_section is not None else section
@@ -793,6 +807,19 @@ class SearchTool(Tool[SearchToolOverrideKwargs]):
                     )
                     return section
 
+            # Start timing for document expansion
+            document_expansion_start_time = time.time()
+
+            # Fetch the widest context any classification can need for all sections
+            # in a single document index request, the per-section expansions then
+            # only slice it
+            adjacent_chunks_per_section = retrieve_adjacent_chunks_batch(
+                sections=selected_sections,
+                document_index=self.document_index,
+                num_chunks_above=FULL_DOC_NUM_CHUNKS_AROUND,
+                num_chunks_below=FULL_DOC_NUM_CHUNKS_AROUND,
+            )
+
             # Build parallel function calls for all sections
             expansion_functions: list[tuple[Callable, tuple]] = [
                 (
@@ -803,14 +830,14 @@ class SearchTool(Tool[SearchToolOverrideKwargs]):
                         self.llm,
                         self.document_index,
                         section.center_chunk.document_id in best_doc_ids_set,
+                        adjacent_chunks,
                     ),
                 )
-                for section in selected_sections
+                for section, adjacent_chunks in zip(
+                    selected_sections, adjacent_chunks_per_section
+                )
             ]
 
-            # Start timing for document expansion
-            document_expansion_start_time = time.time()
-
             # Run all expansions in parallel
             expanded_sections = run_functions_tuples_in_parallel(expansion_functions)
 
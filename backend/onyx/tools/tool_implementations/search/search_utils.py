@@ -129,83 +129,123 @@ def section_to_dict(section: InferenceSection, section_num: int) -> dict:
     return doc_dict
 
 
-def _retrieve_adjacent_chunks(
+def _adjacent_chunk_windows(
     section: InferenceSection,
+    num_chunks_above: int,
+    num_chunks_below: int,
+) -> tuple[VespaChunkRequest | None, VespaChunkRequest | None]:
+    """Chunk ranges directly above and below a section (None if there is nothing
+    to fetch on that side)."""
+    document_id = replace_invalid_doc_id_characters(section.center_chunk.document_id)
+
+    # Find the min and max chunk_id in the section
+    chunk_ids = [chunk.chunk_id for chunk in section.chunks]
+    min_chunk_id = min(chunk_ids)
+    max_chunk_id = max(chunk_ids)
+
+    above_window = None
+    if num_chunks_above > 0 and min_chunk_id > 0:
+        above_window = VespaChunkRequest(
+            document_id=document_id,
+            min_chunk_ind=max(0, min_chunk_id - num_chunks_above),
+            max_chunk_ind=min_chunk_id - 1,
+        )
+
+    below_window = None
+    if num_chunks_below > 0:
+        below_window = VespaChunkRequest(
+            document_id=document_id,
+            min_chunk_ind=max_chunk_id + 1,
+            max_chunk_ind=max_chunk_id + num_chunks_below,
+        )
+
+    return above_window, below_window
+
+
+def retrieve_adjacent_chunks_batch(
+    sections: list[InferenceSection],
     document_index: DocumentIndex,
     num_chunks_above: int,
     num_chunks_below: int,
-) -> tuple[list[InferenceChunk], list[InferenceChunk]]:
-    """Retrieve adjacent chunks above and below a section.
+) -> list[tuple[list[InferenceChunk], list[InferenceChunk]]]:
+    """Retrieve the adjacent chunks above and below every section with a single
+    document index request.
 
     Args:
-        section: The InferenceSection to get adjacent chunks for
+        sections: The InferenceSections to get adjacent chunks for
         document_index: The document index to query
-        num_chunks_above: Number of chunks to retrieve above the section
-        num_chunks_below: Number of chunks to retrieve below the section
+        num_chunks_above: Number of chunks to retrieve above each section
+        num_chunks_below: Number of chunks to retrieve below each section
 
     Returns:
-        Tuple of (chunks_above, chunks_below)
+        (chunks_above, chunks_below) for each section, in the same order. Both are
+        empty for every section if the retrieval fails.
     """
-    # Get the document_id and chunk range from the section
-    document_id = section.center_chunk.document_id
-
     # The document fetching already enforced permissions
     # the expansion does not need to do this unless it's for performance reasons
     filters = IndexFilters(access_control_list=None)
 
-    # Find the min and max chunk_id in the section
-    chunk_ids = [chunk.chunk_id for chunk in section.chunks]
-    min_chunk_id = min(chunk_ids)
-    max_chunk_id = max(chunk_ids)
-
-    chunks_above: list[InferenceChunk] = []
-    chunks_below: list[InferenceChunk] = []
-
-    # Retrieve chunks above (if any)
-    if num_chunks_above > 0 and min_chunk_id > 0:
-        above_min = max(0, min_chunk_id - num_chunks_above)
-        above_max = min_chunk_id - 1
-
-        above_request = VespaChunkRequest(
-            document_id=replace_invalid_doc_id_characters(document_id),
-            min_chunk_ind=above_min,
-            max_chunk_ind=above_max,
+    windows: list[VespaChunkRequest] = []
+    # index into `windows` of the above / below window of each section
+    window_positions: list[tuple[int | None, int | None]] = []
+    for section in sections:
+        above_window, below_window = _adjacent_chunk_windows(
+            section, num_chunks_above, num_chunks_below
         )
+        positions: list[int | None] = []
+        for window in (above_window, below_window):
+            if window is None:
+                positions.append(None)
+                continue
+            positions.append(len(windows))
+            windows.append(window)
+        window_positions.append((positions[0], positions[1]))
+
+    results: list[tuple[list[InferenceChunk], list[InferenceChunk]]] = [
+        ([], []) for _ in sections
+    ]
+    if not windows:
+        return results
+
+    try:
+        window_chunks = document_index.chunk_window_retrieval(
+            chunk_windows=windows, filters=filters
+        )
+    except Exception as e:
+        logger.warning(f"Failed to retrieve chunks adjacent to sections: {e}")
+        return results
+
+    for section_idx, (above_pos, below_pos) in enumerate(window_positions):
+        results[section_idx] = (
+            window_chunks[above_pos] if above_pos is not None else [],
+            window_chunks[below_pos] if below_pos is not None else [],
+        )
+    return results
 
-        try:
-            chunks_above = document_index.id_based_retrieval(
-                chunk_requests=[above_request],
-                filters=filters,
-                batch_retrieval=True,
-            )
-            # Sort by chunk_id to ensure correct order
-            chunks_above.sort(key=lambda c: c.chunk_id)
-        except Exception as e:
-            logger.warning(f"Failed to retrieve chunks above section: {e}")
-
-    # Retrieve chunks below (if any)
-    if num_chunks_below > 0:
-        below_min = max_chunk_id + 1
-        below_max = max_chunk_id + num_chunks_below
 
-        below_request = VespaChunkRequest(
-            document_id=replace_invalid_doc_id_characters(document_id),
-            min_chunk_ind=below_min,
-            max_chunk_ind=below_max,
-        )
+def _retrieve_adjacent_chunks(
+    section: InferenceSection,
+    document_index: DocumentIndex,
+    num_chunks_above: int,
+    num_chunks_below: int,
+) -> tuple[list[InferenceChunk], list[InferenceChunk]]:
+    """Retrieve adjacent chunks above and below a section.
 
-        try:
-            chunks_below = document_index.id_based_retrieval(
-                chunk_requests=[below_request],
-                filters=filters,
-                batch_retrieval=True,
-            )
-            # Sort by chunk_id to ensure correct order
-            chunks_below.sort(key=lambda c: c.chunk_id)
-        except Exception as e:
-            logger.warning(f"Failed to retrieve chunks below section: {e}")
+    Args:
+        section: The InferenceSection to get adjacent chunks for
+        document_index: The document index to query
+        num_chunks_above: Number of chunks to retrieve above the section
+        num_chunks_below: Number of chunks to retrieve below the section
 
-    return chunks_above, chunks_below
+    Returns:
+        Tuple of (chunks_above, chunks_below)
+    """
+    return retrieve_adjacent_chunks_batch(
+        sections=[section],
+        document_index=document_index,
+        num_chunks_above=num_chunks_above,
+        num_chunks_below=num_chunks_below,
+    )[0]
 
 
 def merge_overlapping_sections(
@@ -357,6 +397,7 @@ def expand_section_with_context(
     llm: LLM,
     document_index: DocumentIndex,
     expand_override: bool = False,
+    adjacent_chunks: tuple[list[InferenceChunk], list[InferenceChunk]] | None = None,
 ) -> InferenceSection | None:
     """Use LLM to classify section relevance and return expanded section with appropriate context.
 
@@ -372,6 +413,9 @@ def expand_section_with_context(
         llm: LLM instance to use for classification
         document_index: Document index for retrieving adjacent chunks
         expand_override: If True, skip LLM classification and use FULL_DOCUMENT expansion
+        adjacent_chunks: Chunks above/below the section prefetched with
+            retrieve_adjacent_chunks_batch (FULL_DOC_NUM_CHUNKS_AROUND on each side).
+            If set, no document index requests are made.
 
     Returns:
         Expanded InferenceSection with appropriate context, or None if NOT_RELEVANT
@@ -385,12 +429,25 @@ def expand_section_with_context(
         # These are not used, but need to be defined to avoid type errors
     else:
         # Retrieve 2 chunks above and below for the LLM classification prompt
-        chunks_above_for_prompt, chunks_below_for_prompt = _retrieve_adjacent_chunks(
-            section=section,
-            document_index=document_index,
-            num_chunks_above=2,
-            num_chunks_below=2,
-        )
+        if adjacent_chunks is not None:
+            chunk_ids = [chunk.chunk_id for chunk in section.chunks]
+            min_chunk_id = min(chunk_ids)
+            max_chunk_id = max(chunk_ids)
+            chunks_above_for_prompt = [
+                c for c in adjacent_chunks[0] if c.chunk_id >= min_chunk_id - 2
+            ]
+            chunks_below_for_prompt = [
+                c for c in adjacent_chunks[1] if c.chunk_id <= max_chunk_id + 2
+            ]
+        else:
+            chunks_above_for_prompt, chunks_below_for_prompt = (
+                _retrieve_adjacent_chunks(
+                    section=section,
+                    document_index=document_index,
+                    num_chunks_above=2,
+                    num_chunks_below=2,
+                )
+            )
 
         # Format the section content for the prompt
         section_above_text = (
@@ -458,12 +515,15 @@ def expand_section_with_context(
                 f"LLM classified section as FULL_DOCUMENT: {section.center_chunk.semantic_identifier}"
             )
 
-        chunks_above_full, chunks_below_full = _retrieve_adjacent_chunks(
-            section=section,
-            document_index=document_index,
-            num_chunks_above=FULL_DOC_NUM_CHUNKS_AROUND,
-            num_chunks_below=FULL_DOC_NUM_CHUNKS_AROUND,
-        )
+        if adjacent_chunks is not None:
+            chunks_above_full, chunks_below_full = adjacent_chunks
+        else:
+            chunks_above_full, chunks_below_full = _retrieve_adjacent_chunks(
+                section=section,
+                document_index=document_index,
+                num_chunks_above=FULL_DOC_NUM_CHUNKS_AROUND,
+                num_chunks_below=FULL_DOC_NUM_CHUNKS_AROUND,
+            )
 
         # Combine all chunks: 5 above + section + 5 below
         all_chunks = chunks_above_full + section.chunks + chunks_below_full
@@ -7,24 +7,13 @@ from onyx.db.connector import check_connectors_exist
 from onyx.db.document import check_docs_exist
 from onyx.db.models import LLMProvider
 from onyx.llm.constants import LlmProviderNames
-from onyx.llm.utils import find_model_obj
-from onyx.llm.utils import get_model_map
+from onyx.llm.utils import get_model_capabilities
 from onyx.natural_language_processing.utils import BaseTokenizer
 from onyx.tools.interface import Tool
 
 
 def explicit_tool_calling_supported(model_provider: str, model_name: str) -> bool:
-    model_map = get_model_map()
-    model_obj = find_model_obj(
-        model_map=model_map,
-        provider=model_provider,
-        model_name=model_name,
-    )
-
-    model_supports = (
-        model_obj.get("supports_function_calling", False) if model_obj else False
-    )
-    return model_supports
+    return get_model_capabilities(model_provider, model_name).supports_function_calling
 
 
 def compute_tool_tokens(tool: Tool, llm_tokenizer: BaseTokenizer) -> int:
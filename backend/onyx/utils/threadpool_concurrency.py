@@ -5,6 +5,7 @@ import contextvars
 import copy
 import threading
 import uuid
+from collections.abc import AsyncIterator
 from collections.abc import Awaitable
 from collections.abc import Callable
 from collections.abc import Iterator
@@ -427,6 +428,59 @@ def wait_on_background(task: TimeoutThread[R]) -> R:
     return task.result
 
 
+async def iterate_in_background_thread(
+    gen_factory: Callable[[], Iterator[R]],
+) -> AsyncIterator[R]:
+    """
+    Runs a blocking generator in a dedicated background thread and hands its items
+    to the event loop through an asyncio queue. Unlike iterating it on the threadpool
+    (what Starlette does for sync StreamingResponse bodies), waiting for the next item
+    does not hold a threadpool worker, and the generator always runs on the same
+    thread. If the consumer goes away, the generator is closed after its next item.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue()
+    consumer_gone = threading.Event()
+
+    def put(done: bool, value: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, (done, value))
+        except RuntimeError:
+            # event loop already closed
+            consumer_gone.set()
+
+    def produce() -> None:
+        gen = gen_factory()
+        try:
+            for item in gen:
+                if consumer_gone.is_set():
+                    break
+                put(False, item)
+        except Exception as e:
+            put(True, e)
+            return
+        finally:
+            gen_close = getattr(gen, "close", None)
+            if gen_close is not None:
+                try:
+                    gen_close()
+                except Exception:
+                    logger.exception("Error closing background generator")
+        put(True, None)
+
+    run_in_background(produce)
+    try:
+        while True:
+            done, value = await queue.get()
+            if done:
+                if value is not None:
+                    raise value
+                return
+            yield value
+    finally:
+        consumer_gone.set()
+
+
 def _next_or_none(ind: int, gen: Iterator[R]) -> tuple[int, R | None]:
     return ind, next(gen, None)
 
@@ -147,6 +147,7 @@ def _make_ssrf_safe_request(
     url: str,
     headers: dict[str, str] | None = None,
     timeout: int = 15,
+    session: requests.Session | None = None,
     **kwargs: Any,
 ) -> requests.Response:
     """
@@ -192,7 +193,7 @@ def _make_ssrf_safe_request(
         )
 
     # Disable automatic redirects to prevent SSRF bypass via redirect
-    return requests.get(
+    return (session or requests).get(
         request_url,
         headers=request_headers,
         timeout=timeout,
@@ -206,6 +207,7 @@ def ssrf_safe_get(
     headers: dict[str, str] | None = None,
     timeout: int = 15,
     follow_redirects: bool = True,
+    session: requests.Session | None = None,
     **kwargs: Any,
 ) -> requests.Response:
     """
@@ -220,6 +222,7 @@ def ssrf_safe_get(
         headers: Optional headers to include in the request
         timeout: Request timeout in seconds
         follow_redirects: Whether to follow redirects (each redirect URL is validated)
+        session: Optional session to reuse pooled connections from
         **kwargs: Additional arguments passed to requests.get()
 
     Returns:
@@ -230,7 +233,7 @@ def ssrf_safe_get(
         ValueError: If the URL is malformed
         requests.RequestException: If the request fails
     """
-    response = _make_ssrf_safe_request(url, headers, timeout, **kwargs)
+    response = _make_ssrf_safe_request(url, headers, timeout, session, **kwargs)
 
     if not follow_redirects:
         return response
@@ -262,9 +265,14 @@ def ssrf_safe_get(
                     f"{base_path}/{redirect_url}"
                 )
 
+        # Release the connection of a streamed redirect before following it
+        response.close()
+
         # Validate and follow the redirect (this will raise SSRFException if invalid)
         current_url = redirect_url
-        response = _make_ssrf_safe_request(redirect_url, headers, timeout, **kwargs)
+        response = _make_ssrf_safe_request(
+            redirect_url, headers, timeout, session, **kwargs
+        )
 
     if response.is_redirect and redirect_count >= MAX_REDIRECTS:
         raise SSRFException(f"Too many redirects (max {MAX_REDIRECTS})")
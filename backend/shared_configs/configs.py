@@ -61,6 +61,14 @@ DISABLE_RERANK_FOR_STREAMING = (
 # model. If torch finds more threads on its own, this value is not used.
 MIN_THREADS_ML_MODELS = int(os.environ.get("MIN_THREADS_ML_MODELS") or 1)
 
+# How long (in ms) the model server waits to coalesce concurrent embedding requests
+# for the same model into a single forward pass. 0 disables the wait window, requests
+# that are already queued are still merged.
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.environ.get("EMBEDDING_BATCH_MAX_WAIT_MS") or 5)
+# Upper bound on the (estimated) number of tokens merged into a single coalesced batch.
+# A single request larger than this is never split, it just runs on its own.
+EMBEDDING_BATCH_MAX_TOKENS = int(os.environ.get("EMBEDDING_BATCH_MAX_TOKENS") or 32_768)
+
 # Model server that has indexing only set will throw exception if used for reranking
 # or intent classification
 INDEXING_ONLY = os.environ.get("INDEXING_ONLY", "").lower() == "true"
@@ -0,0 +1,124 @@
+"""
+Binary wire format for embedding responses from the model server.
+
+JSON-encoding thousands of floats per chunk (and parsing them back on the other end)
+dominates the wall time of small embedding batches, so clients can opt into a raw
+format instead by sending `EMBEDDING_BINARY_MEDIA_TYPE` in their Accept header.
+Servers that don't know about it just ignore the header and reply with JSON, and
+clients check the response Content-Type, so both sides interoperate with old versions.
+
+Layout (all little-endian):
+    4 bytes  magic (b"OXEM")
+    1 byte   format version
+    1 byte   dtype code (see _DTYPE_CODES)
+    2 bytes  reserved
+    4 bytes  number of embeddings (uint32)
+    4 bytes  embedding dimension (uint32)
+    ...      row-major vector data
+"""
+
+import struct
+from enum import Enum
+
+import numpy as np
+
+from shared_configs.model_server_models import Embedding
+
+EMBEDDING_BINARY_MEDIA_TYPE = "application/vnd.onyx.embeddings"
+
+_MAGIC = b"OXEM"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBHII")
+
+
+class EmbeddingWireDtype(str, Enum):
+    FLOAT32 = "float32"
+    # Halves the payload, at the cost of ~3 significant digits which is well below
+    # what matters for similarity search
+    FLOAT16 = "float16"
+
+
+_DTYPE_CODES: dict[EmbeddingWireDtype, int] = {
+    EmbeddingWireDtype.FLOAT32: 0,
+    EmbeddingWireDtype.FLOAT16: 1,
+}
+_NUMPY_DTYPES: dict[EmbeddingWireDtype, str] = {
+    EmbeddingWireDtype.FLOAT32: "<f4",
+    EmbeddingWireDtype.FLOAT16: "<f2",
+}
+
+
+def build_binary_accept_header(dtype: EmbeddingWireDtype) -> str:
+    # JSON stays acceptable so that older model servers keep working
+    return f"{EMBEDDING_BINARY_MEDIA_TYPE}; dtype={dtype.value}, application/json;q=0.5"
+
+
+def parse_binary_accept_header(accept: str | None) -> EmbeddingWireDtype | None:
+    """Returns the requested dtype if the client accepts the binary format."""
+    if not accept:
+        return None
+
+    for media_range in accept.split(","):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        if media_type.lower() != EMBEDDING_BINARY_MEDIA_TYPE:
+            continue
+
+        dtype = EmbeddingWireDtype.FLOAT32
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "dtype":
+                try:
+                    dtype = EmbeddingWireDtype(value.strip().lower())
+                except ValueError:
+                    pass
+        return dtype
+
+    return None
+
+
+def is_binary_embedding_response(content_type: str | None) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";")[0].strip().lower() == EMBEDDING_BINARY_MEDIA_TYPE
+
+
+def encode_embeddings(vectors: np.ndarray, dtype: EmbeddingWireDtype) -> bytes:
+    if vectors.ndim != 2:
+        raise ValueError(
+            f"Expected a 2D array of embeddings, got shape {vectors.shape}"
+        )
+
+    num_embeddings, dim = vectors.shape
+    header = _HEADER.pack(_MAGIC, _VERSION, _DTYPE_CODES[dtype], 0, num_embeddings, dim)
+    data = np.ascontiguousarray(vectors, dtype=_NUMPY_DTYPES[dtype])
+    return header + data.tobytes()
+
+
+def decode_embeddings(payload: bytes) -> np.ndarray:
+    """Returns a float32 array of shape (num_embeddings, dim)."""
+    if len(payload) < _HEADER.size:
+        raise ValueError("Embedding payload is too short to contain a header")
+
+    magic, version, dtype_code, _, num_embeddings, dim = _HEADER.unpack_from(payload)
+    if magic != _MAGIC:
+        raise ValueError("Embedding payload has an invalid magic number")
+    if version != _VERSION:
+        raise ValueError(f"Unsupported embedding payload version: {version}")
+
+    dtype = next(
+        (wire for wire, code in _DTYPE_CODES.items() if code == dtype_code), None
+    )
+    if dtype is None:
+        raise ValueError(f"Unsupported embedding payload dtype code: {dtype_code}")
+
+    vectors = np.frombuffer(
+        payload,
+        dtype=_NUMPY_DTYPES[dtype],
+        count=num_embeddings * dim,
+        offset=_HEADER.size,
+    )
+    return vectors.reshape(num_embeddings, dim).astype(np.float32, copy=False)
+
+
+def decode_embeddings_to_lists(payload: bytes) -> list[Embedding]:
+    return decode_embeddings(payload).tolist()
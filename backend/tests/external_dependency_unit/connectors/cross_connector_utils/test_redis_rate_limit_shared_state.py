@@ -0,0 +1,80 @@
+"""
+Runs the rate limiter scripts against a real Redis to check the shared state they keep:
+the GCRA burst / spacing and the Retry-After back off.
+"""
+
+import time
+from collections.abc import Generator
+from uuid import uuid4
+
+import pytest
+
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.cross_connector_utils.rate_limit_wrapper import (
+    RateLimitTriedTooManyTimesError,
+)
+from onyx.connectors.cross_connector_utils.redis_rate_limit import RedisRateLimiter
+from onyx.redis.redis_pool import get_redis_client
+from tests.external_dependency_unit.constants import TEST_TENANT_ID
+
+_MAX_CALLS = 3
+# one call per second, with bursts of up to 3 calls
+_PERIOD = 3
+
+
+@pytest.fixture
+def limiter() -> Generator[RedisRateLimiter, None, None]:
+    limiter = RedisRateLimiter(
+        source=DocumentSource.ZENDESK,
+        scope=f"test_{uuid4().hex}",
+        max_calls=_MAX_CALLS,
+        period=_PERIOD,
+        max_wait=1,
+        tenant_id=TEST_TENANT_ID,
+    )
+    yield limiter
+
+    redis_client = get_redis_client(tenant_id=TEST_TENANT_ID)
+    redis_client.delete(limiter._tat_key, limiter._block_key)
+
+
+def _try_acquire(limiter: RedisRateLimiter) -> int:
+    """A single attempt, returns how many ms to wait (0 if the call may go ahead)."""
+    return int(
+        limiter._acquire_script(
+            keys=[limiter._tat_key, limiter._block_key],
+            args=[limiter._interval_ms, limiter._tolerance_ms],
+        )
+    )
+
+
+def test_burst_then_one_call_per_interval(limiter: RedisRateLimiter) -> None:
+    interval_ms = _PERIOD * 1000 // _MAX_CALLS
+
+    assert [_try_acquire(limiter) for _ in range(_MAX_CALLS)] == [0] * _MAX_CALLS
+
+    wait_ms = _try_acquire(limiter)
+    assert 0 < wait_ms <= interval_ms
+
+    time.sleep(wait_ms / 1000)
+    assert _try_acquire(limiter) == 0
+    # the next call has to wait for another interval
+    assert _try_acquire(limiter) > 0
+
+
+def test_shorter_retry_after_does_not_cut_the_back_off_short(
+    limiter: RedisRateLimiter,
+) -> None:
+    redis_client = get_redis_client(tenant_id=TEST_TENANT_ID)
+
+    limiter.block(10)
+    limiter.block(1)
+
+    assert redis_client.pttl(limiter._block_key) > 5000
+    assert _try_acquire(limiter) > 5000
+    with pytest.raises(RateLimitTriedTooManyTimesError):
+        limiter.wait()
+
+    # a longer one does extend it
+    limiter.block(20)
+    assert redis_client.pttl(limiter._block_key) > 15000
@@ -0,0 +1,158 @@
+"""
+Runs the per cc pair document counts against Postgres: indexing and deleting
+documents keep the stored count up to date and reconciliation fixes a drifted one.
+"""
+
+from collections.abc import Generator
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.models import InputType
+from onyx.db.document import delete_documents_by_connector_credential_pair__no_commit
+from onyx.db.document import get_document_counts_for_cc_pairs
+from onyx.db.document import mark_document_as_indexed_for_cc_pair__no_commit
+from onyx.db.document import reconcile_document_count_for_cc_pair
+from onyx.db.models import Connector
+from onyx.db.models import Credential
+from onyx.db.models import Document
+from onyx.db.models import DocumentByConnectorCredentialPair
+from onyx.db.models import DocumentCountByConnectorCredentialPair
+from onyx.server.documents.models import ConnectorCredentialPairIdentifier
+
+
+@pytest.fixture
+def cc_pair_doc_ids(
+    db_session: Session, tenant_context: None
+) -> Generator[tuple[int, int, list[str]], None, None]:
+    """Connector / credential ids and 5 documents of theirs, none of them indexed
+    yet."""
+    prefix = f"test_doc_counts_{uuid4().hex[:8]}"
+    doc_ids = [f"{prefix}_{i}" for i in range(5)]
+
+    connector = Connector(
+        name=prefix,
+        source=DocumentSource.FILE,
+        input_type=InputType.LOAD_STATE,
+        connector_specific_config={},
+        refresh_freq=3600,
+    )
+    credential = Credential(
+        name=prefix,
+        source=DocumentSource.FILE,
+        credential_json={},
+        admin_public=True,
+    )
+    db_session.add_all([connector, credential])
+    db_session.commit()
+    connector_id, credential_id = connector.id, credential.id
+
+    db_session.add_all(
+        [
+            Document(id=doc_id, semantic_id=doc_id, from_ingestion_api=False)
+            for doc_id in doc_ids
+        ]
+    )
+    db_session.flush()
+    db_session.add_all(
+        [
+            DocumentByConnectorCredentialPair(
+                id=doc_id,
+                connector_id=connector_id,
+                credential_id=credential_id,
+                has_been_indexed=False,
+            )
+            for doc_id in doc_ids
+        ]
+    )
+    db_session.commit()
+
+    yield connector_id, credential_id, doc_ids
+
+    db_session.rollback()
+    db_session.execute(
+        delete(DocumentByConnectorCredentialPair).where(
+            DocumentByConnectorCredentialPair.id.in_(doc_ids)
+        )
+    )
+    db_session.execute(
+        delete(DocumentCountByConnectorCredentialPair).where(
+            DocumentCountByConnectorCredentialPair.connector_id == connector_id,
+            DocumentCountByConnectorCredentialPair.credential_id == credential_id,
+        )
+    )
+    db_session.execute(delete(Document).where(Document.id.in_(doc_ids)))
+    db_session.execute(delete(Connector).where(Connector.id == connector_id))
+    db_session.execute(delete(Credential).where(Credential.id == credential_id))
+    db_session.commit()
+
+
+def _stored_count(db_session: Session, connector_id: int, credential_id: int) -> int:
+    db_session.expire_all()
+    return (
+        db_session.scalar(
+            select(DocumentCountByConnectorCredentialPair.document_count).where(
+                DocumentCountByConnectorCredentialPair.connector_id == connector_id,
+                DocumentCountByConnectorCredentialPair.credential_id == credential_id,
+            )
+        )
+        or 0
+    )
+
+
+def test_index_delete_and_reconcile(
+    db_session: Session, cc_pair_doc_ids: tuple[int, int, list[str]]
+) -> None:
+    connector_id, credential_id, doc_ids = cc_pair_doc_ids
+    cc_pair = ConnectorCredentialPairIdentifier(
+        connector_id=connector_id, credential_id=credential_id
+    )
+
+    mark_document_as_indexed_for_cc_pair__no_commit(
+        db_session, connector_id, credential_id, doc_ids[:3]
+    )
+    db_session.commit()
+    assert _stored_count(db_session, connector_id, credential_id) == 3
+
+    # documents that were indexed before are not counted twice
+    mark_document_as_indexed_for_cc_pair__no_commit(
+        db_session, connector_id, credential_id, doc_ids[:4]
+    )
+    db_session.commit()
+    assert _stored_count(db_session, connector_id, credential_id) == 4
+
+    # the last document was never indexed, so it wasn't counted either
+    delete_documents_by_connector_credential_pair__no_commit(
+        db_session, [doc_ids[0], doc_ids[4]], cc_pair
+    )
+    db_session.commit()
+    assert _stored_count(db_session, connector_id, credential_id) == 3
+    assert get_document_counts_for_cc_pairs(db_session, [cc_pair]) == [
+        (connector_id, credential_id, 3)
+    ]
+
+    assert (
+        reconcile_document_count_for_cc_pair(db_session, connector_id, credential_id)
+        == 0
+    )
+
+    db_session.execute(
+        update(DocumentCountByConnectorCredentialPair)
+        .where(
+            DocumentCountByConnectorCredentialPair.connector_id == connector_id,
+            DocumentCountByConnectorCredentialPair.credential_id == credential_id,
+        )
+        .values(document_count=7)
+    )
+    db_session.commit()
+
+    assert (
+        reconcile_document_count_for_cc_pair(db_session, connector_id, credential_id)
+        == -4
+    )
+    assert _stored_count(db_session, connector_id, credential_id) == 3
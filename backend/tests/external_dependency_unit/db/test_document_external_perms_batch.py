@@ -0,0 +1,133 @@
+"""
+Tests that the batched document permission upsert only rewrites the documents whose
+permissions changed and creates the documents that don't exist yet.
+"""
+
+from collections.abc import Generator
+from datetime import datetime
+from datetime import timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ee.onyx.db.document import upsert_document_external_perms_batch
+from onyx.access.models import DocExternalAccess
+from onyx.access.models import ExternalAccess
+from onyx.configs.constants import DocumentSource
+from onyx.db.models import Document
+
+_SOURCE = DocumentSource.CONFLUENCE
+_LAST_MODIFIED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _doc_external_access(
+    doc_id: str, emails: set[str], group_ids: set[str], is_public: bool = False
+) -> DocExternalAccess:
+    return DocExternalAccess(
+        external_access=ExternalAccess(
+            external_user_emails=emails,
+            external_user_group_ids=group_ids,
+            is_public=is_public,
+        ),
+        doc_id=doc_id,
+    )
+
+
+@pytest.fixture
+def doc_ids(
+    db_session: Session, tenant_context: None
+) -> Generator[dict[str, str], None, None]:
+    suffix = uuid4().hex[:8]
+    doc_ids = {
+        name: f"test_perms_{name}_{suffix}" for name in ["unchanged", "changed", "new"]
+    }
+    for name in ["unchanged", "changed"]:
+        db_session.add(
+            Document(
+                id=doc_ids[name],
+                semantic_id=doc_ids[name],
+                boost=0,
+                hidden=False,
+                from_ingestion_api=False,
+                external_user_emails=["a@example.com", "b@example.com"],
+                external_user_group_ids=["confluence_group_1"],
+                is_public=False,
+                last_modified=_LAST_MODIFIED,
+            )
+        )
+    db_session.commit()
+
+    yield doc_ids
+
+    db_session.rollback()
+    db_session.execute(delete(Document).where(Document.id.in_(doc_ids.values())))
+    db_session.commit()
+
+
+def test_only_changed_and_new_documents_are_written(
+    db_session: Session, doc_ids: dict[str, str]
+) -> None:
+    result = upsert_document_external_perms_batch(
+        db_session=db_session,
+        doc_external_accesses=[
+            # same permissions, the group id is only prefixed and lowercased on write
+            _doc_external_access(
+                doc_ids["unchanged"], {"b@example.com", "a@example.com"}, {"Group_1"}
+            ),
+            _doc_external_access(doc_ids["changed"], {"a@example.com"}, {"Group_1"}),
+            _doc_external_access(
+                doc_ids["new"], {"c@example.com"}, {"Group_2"}, is_public=True
+            ),
+        ],
+        source_type=_SOURCE,
+    )
+
+    assert result.created_doc_ids == [doc_ids["new"]]
+    assert result.updated_doc_ids == [doc_ids["changed"]]
+
+    db_session.expire_all()
+    documents = {
+        document.id: document
+        for document in db_session.scalars(
+            select(Document).where(Document.id.in_(doc_ids.values()))
+        )
+    }
+
+    unchanged = documents[doc_ids["unchanged"]]
+    assert unchanged.last_modified == _LAST_MODIFIED
+    assert sorted(unchanged.external_user_emails or []) == [
+        "a@example.com",
+        "b@example.com",
+    ]
+
+    changed = documents[doc_ids["changed"]]
+    assert changed.last_modified is not None
+    assert changed.last_modified > _LAST_MODIFIED
+    assert changed.external_user_emails == ["a@example.com"]
+    assert changed.external_user_group_ids == ["confluence_group_1"]
+    assert changed.is_public is False
+
+    new = documents[doc_ids["new"]]
+    assert new.external_user_emails == ["c@example.com"]
+    assert new.external_user_group_ids == ["confluence_group_2"]
+    assert new.is_public is True
+
+
+def test_repeating_the_sync_writes_nothing(
+    db_session: Session, doc_ids: dict[str, str]
+) -> None:
+    doc_external_accesses = [
+        _doc_external_access(doc_ids["changed"], {"a@example.com"}, {"Group_1"}),
+        _doc_external_access(doc_ids["new"], {"c@example.com"}, {"Group_2"}),
+    ]
+    upsert_document_external_perms_batch(db_session, doc_external_accesses, _SOURCE)
+
+    result = upsert_document_external_perms_batch(
+        db_session, doc_external_accesses, _SOURCE
+    )
+
+    assert result.created_doc_ids == []
+    assert result.updated_doc_ids == []
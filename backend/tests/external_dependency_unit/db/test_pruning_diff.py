@@ -0,0 +1,162 @@
+"""
+Tests the Postgres side pruning diff: the source document ids go into a temp table
+and the documents to prune come back out of an anti-join against the cc pair's
+documents.
+"""
+
+from collections.abc import Generator
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.models import InputType
+from onyx.db.models import Connector
+from onyx.db.models import Credential
+from onyx.db.models import Document
+from onyx.db.models import DocumentByConnectorCredentialPair
+from onyx.db.pruning import get_session_with_source_doc_id_table
+from onyx.db.pruning import iter_doc_ids_missing_from_source
+from onyx.db.pruning import load_source_doc_ids
+from tests.external_dependency_unit.constants import TEST_TENANT_ID
+
+_TABLE = "pruning_source_document_id"
+
+
+def _create_connector_and_credential(db_session: Session) -> tuple[int, int]:
+    connector = Connector(
+        name=f"test_pruning_{uuid4().hex[:8]}",
+        source=DocumentSource.FILE,
+        input_type=InputType.LOAD_STATE,
+        connector_specific_config={},
+        refresh_freq=3600,
+    )
+    credential = Credential(
+        name=f"test_pruning_{uuid4().hex[:8]}",
+        source=DocumentSource.FILE,
+        credential_json={},
+        admin_public=True,
+    )
+    db_session.add_all([connector, credential])
+    db_session.commit()
+    return connector.id, credential.id
+
+
+@pytest.fixture
+def indexed_doc_ids(
+    db_session: Session, tenant_context: None
+) -> Generator[tuple[int, int, list[str]], None, None]:
+    """Connector / credential ids and the 5 documents indexed for them. A second cc
+    pair indexes a document of its own."""
+    prefix = f"test_pruning_{uuid4().hex[:8]}"
+    doc_ids = [f"{prefix}_{i}" for i in range(5)]
+    other_doc_id = f"{prefix}_other"
+
+    connector_id, credential_id = _create_connector_and_credential(db_session)
+    other_connector_id, other_credential_id = _create_connector_and_credential(
+        db_session
+    )
+    db_session.add_all(
+        [
+            Document(id=doc_id, semantic_id=doc_id, from_ingestion_api=False)
+            for doc_id in [*doc_ids, other_doc_id]
+        ]
+    )
+    db_session.flush()
+    db_session.add_all(
+        [
+            DocumentByConnectorCredentialPair(
+                id=doc_id,
+                connector_id=connector_id,
+                credential_id=credential_id,
+                has_been_indexed=True,
+            )
+            for doc_id in doc_ids
+        ]
+        + [
+            DocumentByConnectorCredentialPair(
+                id=other_doc_id,
+                connector_id=other_connector_id,
+                credential_id=other_credential_id,
+                has_been_indexed=True,
+            )
+        ]
+    )
+    db_session.commit()
+
+    yield connector_id, credential_id, doc_ids
+
+    db_session.rollback()
+    all_doc_ids = [*doc_ids, other_doc_id]
+    db_session.execute(
+        delete(DocumentByConnectorCredentialPair).where(
+            DocumentByConnectorCredentialPair.id.in_(all_doc_ids)
+        )
+    )
+    db_session.execute(delete(Document).where(Document.id.in_(all_doc_ids)))
+    db_session.execute(
+        delete(Connector).where(Connector.id.in_([connector_id, other_connector_id]))
+    )
+    db_session.execute(
+        delete(Credential).where(
+            Credential.id.in_([credential_id, other_credential_id])
+        )
+    )
+    db_session.commit()
+
+
+def test_documents_missing_from_the_source_are_returned(
+    indexed_doc_ids: tuple[int, int, list[str]],
+) -> None:
+    connector_id, credential_id, doc_ids = indexed_doc_ids
+    # split over several COPYs, with a duplicate and a document that isn't indexed yet
+    source_batches = [
+        [doc_ids[0]],
+        [doc_ids[2], doc_ids[0]],
+        [doc_ids[4], "not_indexed"],
+    ]
+
+    with get_session_with_source_doc_id_table(TEST_TENANT_ID) as db_session:
+        num_loaded = load_source_doc_ids(db_session, source_batches, batch_size=2)
+
+        assert num_loaded == 5
+        assert sorted(
+            db_session.scalars(text(f"SELECT id FROM pg_temp.{_TABLE}"))
+        ) == sorted([doc_ids[0], doc_ids[2], doc_ids[0], doc_ids[4], "not_indexed"])
+        # the table lives in the temp schema of the session, not the tenant schema
+        assert db_session.scalar(
+            text(
+                "SELECT relnamespace = pg_my_temp_schema() FROM pg_class "
+                f"WHERE relname = '{_TABLE}' AND relpersistence = 't' "
+                "AND pg_table_is_visible(oid)"
+            )
+        )
+
+        assert sorted(
+            iter_doc_ids_missing_from_source(
+                db_session, connector_id, credential_id, batch_size=1
+            )
+        ) == [doc_ids[1], doc_ids[3]]
+
+
+def test_every_session_starts_with_an_empty_table(
+    indexed_doc_ids: tuple[int, int, list[str]],
+) -> None:
+    connector_id, credential_id, doc_ids = indexed_doc_ids
+
+    with get_session_with_source_doc_id_table(TEST_TENANT_ID) as db_session:
+        load_source_doc_ids(db_session, [doc_ids])
+        missing = iter_doc_ids_missing_from_source(
+            db_session, connector_id, credential_id
+        )
+        assert list(missing) == []
+
+    # the connection may come back from the pool, the ids of the last run are gone
+    with get_session_with_source_doc_id_table(TEST_TENANT_ID) as db_session:
+        assert db_session.scalar(text(f"SELECT count(*) FROM pg_temp.{_TABLE}")) == 0
+        assert sorted(
+            iter_doc_ids_missing_from_source(db_session, connector_id, credential_id)
+        ) == sorted(doc_ids)
@@ -0,0 +1,113 @@
+"""
+Compares the batch KG clustering against clustering one entity at a time, over a
+seeded KG staging table. Both modes must produce the same KG entities.
+"""
+
+from collections.abc import Callable
+from collections.abc import Generator
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session
+
+from onyx.db.entities import upsert_staging_entity
+from onyx.db.models import KGEntity
+from onyx.db.models import KGEntityExtractionStaging
+from onyx.db.models import KGEntityType
+from onyx.kg.clustering.clustering import _cluster_grounded_entity_batch
+from onyx.kg.clustering.clustering import _cluster_one_grounded_entity
+from onyx.kg.clustering.clustering import _get_batch_untransferred_grounded_entities
+from onyx.kg.models import KGGroundingType
+
+_NUM_ACCOUNTS = 300
+_BATCH_SIZE = 100
+
+
+@pytest.fixture
+def entity_type(
+    db_session: Session, tenant_context: None
+) -> Generator[str, None, None]:
+    entity_type_id_name = f"CLUSTERTEST{uuid4().hex[:8].upper()}"
+    db_session.add(
+        KGEntityType(
+            id_name=entity_type_id_name,
+            description="batch vs sequential clustering comparison",
+            grounding=KGGroundingType.GROUNDED,
+            active=True,
+        )
+    )
+    db_session.commit()
+
+    yield entity_type_id_name
+
+    _clear(db_session, entity_type_id_name)
+    db_session.query(KGEntityType).filter(
+        KGEntityType.id_name == entity_type_id_name
+    ).delete()
+    db_session.commit()
+
+
+def _clear(db_session: Session, entity_type_id_name: str) -> None:
+    db_session.query(KGEntityExtractionStaging).filter(
+        KGEntityExtractionStaging.entity_type_id_name == entity_type_id_name
+    ).delete()
+    db_session.query(KGEntity).filter(
+        KGEntity.entity_type_id_name == entity_type_id_name
+    ).delete()
+    db_session.commit()
+
+
+def _account_name(i: int) -> str:
+    # letters only, names with digits are never clustered
+    letters = ""
+    while True:
+        i, remainder = divmod(i, 26)
+        letters += chr(ord("a") + remainder)
+        if i == 0:
+            return f"account {letters:a<3} company"
+
+
+def _seed(db_session: Session, entity_type_id_name: str) -> None:
+    # every account shows up under a few spellings which should be clustered together
+    for i in range(_NUM_ACCOUNTS):
+        base = _account_name(i)
+        for name in (base, base + ".", base.replace("company", "companyy")):
+            upsert_staging_entity(
+                db_session, name=name, entity_type=entity_type_id_name
+            )
+    db_session.commit()
+
+
+def _run(
+    db_session: Session,
+    entity_type_id_name: str,
+    cluster: Callable[[list[KGEntityExtractionStaging]], None],
+) -> dict[str, int]:
+    _seed(db_session, entity_type_id_name)
+
+    for batch in _get_batch_untransferred_grounded_entities(batch_size=_BATCH_SIZE):
+        cluster(batch)
+
+    db_session.expire_all()
+    occurrences = {
+        entity.name: entity.occurrences
+        for entity in db_session.query(KGEntity).filter(
+            KGEntity.entity_type_id_name == entity_type_id_name
+        )
+    }
+    _clear(db_session, entity_type_id_name)
+    return occurrences
+
+
+def test_batch_clustering_matches_sequential_clustering(
+    db_session: Session, entity_type: str
+) -> None:
+    def _one_at_a_time(batch: list[KGEntityExtractionStaging]) -> None:
+        for entity in batch:
+            _cluster_one_grounded_entity(entity)
+
+    sequential = _run(db_session, entity_type, _one_at_a_time)
+    batched = _run(db_session, entity_type, _cluster_grounded_entity_batch)
+
+    assert batched == sequential
+    assert sum(batched.values()) == _NUM_ACCOUNTS * 3
@@ -14,7 +14,6 @@ from onyx.context.search.models import SearchDoc
 from onyx.db.models import Persona
 from onyx.db.models import User
 from onyx.document_index.interfaces import DocumentIndex
-from onyx.llm.interfaces import LLM
 
 
 def run_functions_tuples_sequential(
@@ -126,22 +125,23 @@ def use_mock_search_pipeline(
     def mock_fetch_unique_document_sources(db_session: Session) -> list[DocumentSource]:
         return connectors
 
-    def override_search_pipeline(
-        chunk_search_request: ChunkSearchRequest,
+    def override_batch_search_pipeline(
+        chunk_search_requests: list[ChunkSearchRequest],
         document_index: DocumentIndex,
         user: User | None,
         persona: Persona | None,
         db_session: Session,
-        auto_detect_filters: bool = False,
-        llm: LLM | None = None,
         project_id: int | None = None,
-    ) -> list[InferenceChunk]:
-        return controller.get_search_results(chunk_search_request.query)
+    ) -> list[list[InferenceChunk]]:
+        return [
+            controller.get_search_results(chunk_search_request.query)
+            for chunk_search_request in chunk_search_requests
+        ]
 
     with (
         patch(
-            "onyx.tools.tool_implementations.search.search_tool.search_pipeline",
-            new=override_search_pipeline,
+            "onyx.tools.tool_implementations.search.search_tool.batch_search_pipeline",
+            new=override_batch_search_pipeline,
         ),
         patch(
             "onyx.tools.tool_implementations.search.search_tool.check_connectors_exist",
@@ -28,6 +28,7 @@ from onyx.document_index.opensearch.schema import CONTENT_FIELD_NAME
 from onyx.document_index.opensearch.schema import DocumentChunk
 from onyx.document_index.opensearch.schema import DocumentSchema
 from onyx.document_index.opensearch.schema import get_opensearch_doc_chunk_id
+from onyx.document_index.opensearch.search import CHUNK_COUNTS_AGGREGATION_NAME
 from onyx.document_index.opensearch.search import DocumentQuery
 from onyx.document_index.opensearch.search import (
     MIN_MAX_NORMALIZATION_PIPELINE_CONFIG,
@@ -511,6 +512,118 @@ class TestOpenSearchClient:
         keep_ids = test_client.search_for_document_ids(body=keep_query)
         assert len(keep_ids) == 1
 
+    def test_bulk_index_documents(
+        self, test_client: OpenSearchClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Tests bulk indexing documents over several requests."""
+        # Precondition.
+        _patch_global_tenant_state(monkeypatch, False)
+        tenant_state = TenantState(tenant_id=POSTGRES_DEFAULT_SCHEMA, multitenant=False)
+        mappings = DocumentSchema.get_document_schema(
+            vector_dimension=128, multitenant=tenant_state.multitenant
+        )
+        settings = DocumentSchema.get_index_settings()
+        test_client.create_index(mappings=mappings, settings=settings)
+
+        existing_doc = _create_test_document_chunk(
+            document_id="bulk-doc",
+            chunk_index=0,
+            content="Already indexed",
+            tenant_state=tenant_state,
+        )
+        test_client.index_document(document=existing_doc)
+        docs = [
+            _create_test_document_chunk(
+                document_id="bulk-doc",
+                chunk_index=i,
+                content=f"Bulk content {i}",
+                tenant_state=tenant_state,
+            )
+            for i in range(10)
+        ]
+
+        # Under test.
+        # A small max request size forces the documents to be split over
+        # multiple requests.
+        failures = test_client.bulk_index_documents(docs, max_request_bytes=4096)
+
+        # Postcondition.
+        # Only the chunk which already existed fails, the others are indexed.
+        existing_doc_chunk_id = get_opensearch_doc_chunk_id(
+            document_id="bulk-doc", chunk_index=0, max_chunk_size=DEFAULT_MAX_CHUNK_SIZE
+        )
+        assert list(failures) == [existing_doc_chunk_id]
+        assert "version_conflict_engine_exception" in failures[existing_doc_chunk_id]
+        for doc in docs[1:]:
+            retrieved_doc = test_client.get_document(
+                document_chunk_id=get_opensearch_doc_chunk_id(
+                    document_id=doc.document_id,
+                    chunk_index=doc.chunk_index,
+                    max_chunk_size=doc.max_chunk_size,
+                )
+            )
+            assert retrieved_doc == doc
+
+    def test_delete_by_document_ids_query(
+        self, test_client: OpenSearchClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Tests counting and deleting the chunks of multiple documents at once."""
+        # Precondition.
+        _patch_global_tenant_state(monkeypatch, False)
+        tenant_state = TenantState(tenant_id=POSTGRES_DEFAULT_SCHEMA, multitenant=False)
+        mappings = DocumentSchema.get_document_schema(
+            vector_dimension=128, multitenant=tenant_state.multitenant
+        )
+        settings = DocumentSchema.get_index_settings()
+        test_client.create_index(mappings=mappings, settings=settings)
+
+        docs = [
+            _create_test_document_chunk(
+                document_id=document_id,
+                chunk_index=i,
+                content=f"Content {i} of {document_id}",
+                tenant_state=tenant_state,
+                hidden=i == 0,
+            )
+            for document_id, num_chunks in [
+                ("delete-me-1", 3),
+                ("delete-me-2", 2),
+                ("keep-me", 1),
+            ]
+            for i in range(num_chunks)
+        ]
+        assert test_client.bulk_index_documents(docs) == {}
+        test_client.refresh_index()
+
+        # Under test.
+        chunk_counts = test_client.get_aggregation_bucket_counts(
+            body=DocumentQuery.get_chunk_counts_for_document_ids_query(
+                document_ids=["delete-me-1", "delete-me-2", "does-not-exist"],
+                tenant_state=tenant_state,
+            ),
+            aggregation_name=CHUNK_COUNTS_AGGREGATION_NAME,
+        )
+        num_deleted = test_client.delete_by_query(
+            query_body=DocumentQuery.delete_from_document_ids_query(
+                document_ids=["delete-me-1", "delete-me-2"],
+                tenant_state=tenant_state,
+            )
+        )
+
+        # Postcondition.
+        # Hidden chunks are counted and deleted too.
+        assert chunk_counts == {"delete-me-1": 3, "delete-me-2": 2}
+        assert num_deleted == 5
+        test_client.refresh_index()
+        remaining_counts = test_client.get_aggregation_bucket_counts(
+            body=DocumentQuery.get_chunk_counts_for_document_ids_query(
+                document_ids=["delete-me-1", "delete-me-2", "keep-me"],
+                tenant_state=tenant_state,
+            ),
+            aggregation_name=CHUNK_COUNTS_AGGREGATION_NAME,
+        )
+        assert remaining_counts == {"keep-me": 1}
+
     def test_update_document(
         self, test_client: OpenSearchClient, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -0,0 +1,53 @@
+from typing import Any
+
+import pytest
+
+from eleven.onyx.document_index.elasticsearch.chunk_retrieval import (
+    fuse_hits_with_weighted_rrf,
+)
+
+
+def _hits(*ids: str) -> list[dict[str, Any]]:
+    return [{"_id": hit_id, "_score": 1.0, "_source": {}} for hit_id in ids]
+
+
+def _ids(hits: list[dict[str, Any]]) -> list[str]:
+    return [hit["_id"] for hit in hits]
+
+
+def test_hits_found_by_both_searches_rank_first() -> None:
+    fused = fuse_hits_with_weighted_rrf(
+        _hits("a", "b", "c"), _hits("d", "c", "e"), hybrid_alpha=0.5, rank_constant=60
+    )
+
+    assert _ids(fused)[0] == "c"
+    assert sorted(_ids(fused)) == ["a", "b", "c", "d", "e"]
+    assert fused[0]["_score"] == pytest.approx(0.5 / 63 + 0.5 / 62)
+
+
+@pytest.mark.parametrize(
+    "hybrid_alpha,expected_first",
+    [(1.0, ["x", "y"]), (0.0, ["a", "b"])],
+)
+def test_hybrid_alpha_weights_the_vector_search(
+    hybrid_alpha: float, expected_first: list[str]
+) -> None:
+    fused = fuse_hits_with_weighted_rrf(
+        _hits("a", "b"),
+        _hits("x", "y"),
+        hybrid_alpha=hybrid_alpha,
+        rank_constant=60,
+    )
+
+    assert _ids(fused)[:2] == expected_first
+
+
+def test_input_hits_are_not_modified() -> None:
+    keyword_hits = _hits("a")
+
+    fused = fuse_hits_with_weighted_rrf(
+        keyword_hits, [], hybrid_alpha=0.5, rank_constant=20
+    )
+
+    assert keyword_hits[0]["_score"] == 1.0
+    assert fused[0]["_score"] == pytest.approx(0.5 / 21)
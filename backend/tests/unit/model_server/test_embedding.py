@@ -5,10 +5,15 @@ from typing import List
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
+import numpy as np
 import pytest
+from fastapi import Response
 
 from model_server.encoders import embed_text
 from model_server.encoders import process_embed_request
+from shared_configs.embedding_codec import decode_embeddings_to_lists
+from shared_configs.embedding_codec import EMBEDDING_BINARY_MEDIA_TYPE
+from shared_configs.embedding_codec import EmbeddingWireDtype
 from shared_configs.enums import EmbedTextType
 from shared_configs.model_server_models import EmbedRequest
 
@@ -50,9 +55,9 @@ async def test_embed_text_local_model() -> None:
 
 @pytest.mark.asyncio
 async def test_concurrent_embeddings() -> None:
-    def mock_encode(*args: Any, **kwargs: Any) -> List[List[float]]:
+    def mock_encode(texts: List[str], **kwargs: Any) -> List[List[float]]:
         time.sleep(5)
-        return [[0.1, 0.2, 0.3]]
+        return [[0.1, 0.2, 0.3] for _ in texts]
 
     test_req = EmbedRequest(
         texts=["test"],
@@ -85,3 +90,29 @@ async def test_concurrent_embeddings() -> None:
         # However, the developer may still introduce unnecessary blocking above the mock and this test will
         # still pass as long as it's less than (7 - 5) / 5 seconds
         assert end_time - start_time < 7
+
+
+@pytest.mark.asyncio
+async def test_embed_request_binary_response() -> None:
+    test_req = EmbedRequest(
+        texts=["test1", "test2"],
+        model_name="fake-local-model",
+        max_context_length=512,
+        normalize_embeddings=True,
+        text_type=EmbedTextType.PASSAGE,
+    )
+
+    with patch("model_server.encoders.get_embedding_model") as mock_get_model:
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.array(
+            [[0.5, 0.25], [1.0, -1.0]], dtype=np.float32
+        )
+        mock_get_model.return_value = mock_model
+
+        response = await process_embed_request(
+            test_req, wire_dtype=EmbeddingWireDtype.FLOAT16
+        )
+
+    assert isinstance(response, Response)
+    assert response.media_type == EMBEDDING_BINARY_MEDIA_TYPE
+    assert decode_embeddings_to_lists(response.body) == [[0.5, 0.25], [1.0, -1.0]]
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from model_server.embedding_scheduler import EmbeddingScheduler
+from shared_configs.enums import EmbedTextType
+
+
+def _make_scheduler(
+    encode_calls: list[list[str]],
+    max_wait_seconds: float = 0.05,
+    max_batch_tokens: int = 10_000,
+    encode_delay: float = 0.0,
+) -> EmbeddingScheduler:
+    def mock_encode(texts: list[str], **kwargs: Any) -> list[list[float]]:
+        encode_calls.append(list(texts))
+        time.sleep(encode_delay)
+        return [[float(len(text))] for text in texts]
+
+    mock_model = MagicMock()
+    mock_model.encode = mock_encode
+    return EmbeddingScheduler(
+        model_loader=lambda model_name, max_context_length: mock_model,
+        max_wait_seconds=max_wait_seconds,
+        max_batch_tokens=max_batch_tokens,
+    )
+
+
+async def _embed(
+    scheduler: EmbeddingScheduler,
+    texts: list[str],
+    text_type: EmbedTextType = EmbedTextType.PASSAGE,
+    prefix: str | None = None,
+) -> Any:
+    return await scheduler.embed(
+        texts=texts,
+        model_name="fake-model",
+        max_context_length=512,
+        normalize_embeddings=True,
+        prefix=prefix,
+        text_type=text_type,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_coalesced() -> None:
+    encode_calls: list[list[str]] = []
+    scheduler = _make_scheduler(encode_calls)
+
+    results = await asyncio.gather(
+        _embed(scheduler, ["a"]),
+        _embed(scheduler, ["bb", "ccc"]),
+        _embed(scheduler, ["d"]),
+    )
+
+    assert len(encode_calls) == 1
+    # results are sliced back to the request they came from
+    assert results == [[[1.0]], [[2.0], [3.0]], [[1.0]]]
+
+
+@pytest.mark.asyncio
+async def test_requests_are_bucketed_by_length() -> None:
+    encode_calls: list[list[str]] = []
+    scheduler = _make_scheduler(encode_calls)
+
+    await asyncio.gather(
+        _embed(scheduler, ["short"]),
+        _embed(scheduler, ["long " * 100]),
+        _embed(scheduler, ["tiny"]),
+    )
+
+    assert sorted(len(call) for call in encode_calls) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_different_settings_are_not_merged() -> None:
+    encode_calls: list[list[str]] = []
+    scheduler = _make_scheduler(encode_calls)
+
+    results = await asyncio.gather(
+        _embed(scheduler, ["a"], prefix="query: "),
+        _embed(scheduler, ["a"], prefix="passage: "),
+    )
+
+    assert sorted(encode_calls) == [["passage: a"], ["query: a"]]
+    assert results == [[[8.0]], [[10.0]]]
+
+
+@pytest.mark.asyncio
+async def test_token_budget_splits_batches() -> None:
+    encode_calls: list[list[str]] = []
+    # each text below is estimated at 3 tokens
+    scheduler = _make_scheduler(encode_calls, max_batch_tokens=6)
+
+    await asyncio.gather(*[_embed(scheduler, ["x" * 10]) for _ in range(4)])
+
+    assert [len(call) for call in encode_calls] == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_queries_jump_ahead_of_passages() -> None:
+    encode_calls: list[list[str]] = []
+    scheduler = _make_scheduler(encode_calls, max_wait_seconds=0, encode_delay=0.1)
+
+    # occupy the worker so that everything below is queued together
+    blocker = asyncio.ensure_future(_embed(scheduler, ["blocker"]))
+    await asyncio.sleep(0.02)
+
+    await asyncio.gather(
+        _embed(scheduler, ["passage"]),
+        _embed(scheduler, ["query"], text_type=EmbedTextType.QUERY),
+    )
+    await blocker
+
+    assert encode_calls == [["blocker"], ["query"], ["passage"]]
+
+
+@pytest.mark.asyncio
+async def test_encode_errors_are_propagated() -> None:
+    mock_model = MagicMock()
+    mock_model.encode.side_effect = RuntimeError("boom")
+    scheduler = EmbeddingScheduler(
+        model_loader=lambda model_name, max_context_length: mock_model,
+        max_wait_seconds=0,
+    )
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await _embed(scheduler, ["a"])
+
+    # the worker survives the failure
+    mock_model.encode.side_effect = None
+    mock_model.encode.return_value = [[1.0]]
+    assert await _embed(scheduler, ["a"]) == [[1.0]]
+
+
+@pytest.mark.asyncio
+async def test_model_only_used_from_one_thread() -> None:
+    encode_threads: set[int] = set()
+
+    def mock_encode(texts: list[str], **kwargs: Any) -> list[list[float]]:
+        encode_threads.add(threading.get_ident())
+        return [[0.0] for _ in texts]
+
+    mock_model = MagicMock()
+    mock_model.encode = mock_encode
+    scheduler = EmbeddingScheduler(
+        model_loader=lambda model_name, max_context_length: mock_model,
+        max_wait_seconds=0,
+    )
+
+    await asyncio.gather(
+        *[_embed(scheduler, ["x" * (10**i)]) for i in range(4)],
+        *[_embed(scheduler, ["q"], text_type=EmbedTextType.QUERY) for _ in range(4)],
+    )
+
+    assert len(encode_threads) == 1
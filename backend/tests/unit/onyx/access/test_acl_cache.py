@@ -0,0 +1,100 @@
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from onyx.access import acl_cache
+from onyx.access.acl_cache import get_user_acl_with_cache
+from onyx.access.acl_cache import invalidate_user_acl_cache
+from shared_configs.contextvars import get_current_tenant_id
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        return [self.store.get(key) for key in keys]
+
+    def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self.store[key] = value.encode()
+
+    def incr(self, key: str) -> int:
+        value = int(self.store.get(key, b"0")) + 1
+        self.store[key] = str(value).encode()
+        return value
+
+
+class _FailingRedis:
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        raise ConnectionError("redis is down")
+
+
+class _AclSource:
+    def __init__(self, acl: set[str]) -> None:
+        self.acl = acl
+        self.calls = 0
+
+    def __call__(self) -> set[str]:
+        self.calls += 1
+        return set(self.acl)
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache() -> Iterator[None]:
+    acl_cache._local_cache.clear()
+    yield
+    acl_cache._local_cache.clear()
+
+
+def _lookup(redis_client: Any, source: _AclSource) -> set[str]:
+    return get_user_acl_with_cache("user-1", source, redis_client)
+
+
+def test_acl_is_computed_once() -> None:
+    redis_client = _FakeRedis()
+    source = _AclSource({"user_email:a@b.com", "group:eng"})
+
+    for _ in range(3):
+        acl = _lookup(redis_client, source)
+        assert acl == {"user_email:a@b.com", "group:eng"}
+    assert source.calls == 1
+
+    # another process only has the Redis tier
+    acl_cache._local_cache.clear()
+    acl = _lookup(redis_client, source)
+    assert acl == {"user_email:a@b.com", "group:eng"}
+    assert source.calls == 1
+
+
+def test_invalidation_reaches_every_tier() -> None:
+    redis_client = _FakeRedis()
+    source = _AclSource({"group:eng"})
+    _lookup(redis_client, source)
+
+    source.acl = {"group:eng", "external_group:confluence_space"}
+    invalidate_user_acl_cache(redis_client)  # type: ignore[arg-type]
+    acl = _lookup(redis_client, source)
+    assert acl == {"group:eng", "external_group:confluence_space"}
+    assert source.calls == 2
+
+
+def test_invalidation_from_another_process() -> None:
+    redis_client = _FakeRedis()
+    source = _AclSource({"group:eng"})
+    _lookup(redis_client, source)
+
+    # the version bump is all another process leaves behind, the local entry must
+    # still be treated as stale
+    redis_client.incr(acl_cache._version_key(get_current_tenant_id()))
+    source.acl = set()
+    assert _lookup(redis_client, source) == set()
+    assert source.calls == 2
+
+
+def test_redis_failure_falls_back_to_db() -> None:
+    source = _AclSource({"group:eng"})
+    for _ in range(2):
+        acl = _lookup(_FailingRedis(), source)
+        assert acl == {"group:eng"}
+    assert source.calls == 2
@@ -0,0 +1,56 @@
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from onyx.background.celery.tasks.vespa import document_sync
+from onyx.background.celery.tasks.vespa.document_sync import DOCUMENT_SYNC_TASKSET_KEY
+from onyx.background.celery.tasks.vespa.document_sync import (
+    generate_document_sync_tasks,
+)
+from onyx.configs.constants import OnyxCeleryTask
+
+
+def _generate(doc_ids: list[str], max_tasks: int) -> tuple[Mock, Mock, tuple]:
+    r = Mock()
+    celery_app = Mock()
+    db_session = Mock()
+    db_session.scalars.return_value.yield_per.return_value = iter(doc_ids)
+
+    with (
+        patch.object(document_sync, "VESPA_SYNC_BATCH_SIZE", 2),
+        patch.object(document_sync, "construct_document_id_select_by_needs_sync"),
+    ):
+        result = generate_document_sync_tasks(
+            r, max_tasks, celery_app, db_session, Mock(), "tenant"
+        )
+    return r, celery_app, result
+
+
+def test_one_task_per_batch_of_documents() -> None:
+    r, celery_app, result = _generate(["a", "b", "c", "d", "e"], max_tasks=100)
+
+    assert result == (3, 5)
+    sent = [call.kwargs for call in celery_app.send_task.call_args_list]
+    assert [kwargs["kwargs"]["document_ids"] for kwargs in sent] == [
+        ["a", "b"],
+        ["c", "d"],
+        ["e"],
+    ]
+    assert all(
+        call.args[0] == OnyxCeleryTask.VESPA_METADATA_SYNC_BATCH_TASK
+        for call in celery_app.send_task.call_args_list
+    )
+
+    # the taskset tracks one entry per batch task
+    tracked = [
+        call.args[1]
+        for call in r.sadd.call_args_list
+        if call.args[0] == DOCUMENT_SYNC_TASKSET_KEY
+    ]
+    assert tracked == [kwargs["task_id"] for kwargs in sent]
+
+
+def test_max_tasks_limits_batches() -> None:
+    _, celery_app, result = _generate(["a", "b", "c", "d", "e"], max_tasks=2)
+
+    assert result == (2, 4)
+    assert celery_app.send_task.call_count == 2
@@ -0,0 +1,92 @@
+from collections.abc import Iterator
+from unittest.mock import MagicMock
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from onyx.background.celery.tasks.vespa import tasks
+from onyx.background.celery.tasks.vespa.tasks import vespa_metadata_sync_batch_task
+from onyx.document_index.interfaces import MinimalDocumentIndexingInfo
+from onyx.document_index.interfaces import UpdateRequest
+
+
+def _update_request(doc_id: str) -> UpdateRequest:
+    return UpdateRequest(
+        minimal_document_indexing_info=[
+            MinimalDocumentIndexingInfo(doc_id=doc_id, chunk_start_index=0)
+        ]
+    )
+
+
+def _bad_request() -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://index")
+    return httpx.HTTPStatusError(
+        "bad request", request=request, response=httpx.Response(400, request=request)
+    )
+
+
+@pytest.fixture
+def document_index() -> Iterator[Mock]:
+    document_index = Mock()
+    with (
+        patch.object(tasks, "get_session_with_current_tenant", MagicMock()),
+        patch.object(tasks, "get_active_search_settings"),
+        patch.object(tasks, "HttpxPool"),
+        patch.object(tasks, "get_all_document_indices", return_value=[document_index]),
+        patch.object(
+            tasks,
+            "_build_update_requests",
+            return_value=[_update_request(doc_id) for doc_id in ["a", "b", "c"]],
+        ),
+    ):
+        yield document_index
+
+
+def _updated_doc_ids(document_index: Mock) -> list[list[str]]:
+    return [
+        [
+            doc_info.doc_id
+            for update_request in call.args[0]
+            for doc_info in update_request.minimal_document_indexing_info
+        ]
+        for call in document_index.update.call_args_list
+    ]
+
+
+def test_documents_are_synced_with_one_update(document_index: Mock) -> None:
+    with patch.object(tasks, "mark_documents_as_synced") as mark_synced:
+        assert vespa_metadata_sync_batch_task(["a", "b", "c"], tenant_id="tenant")
+
+    assert _updated_doc_ids(document_index) == [["a", "b", "c"]]
+    assert mark_synced.call_args.args[0] == ["a", "b", "c"]
+
+
+def test_a_failing_document_does_not_block_the_others(document_index: Mock) -> None:
+    def _update(update_requests: list[UpdateRequest], *, tenant_id: str) -> None:
+        doc_ids = [
+            doc_info.doc_id
+            for update_request in update_requests
+            for doc_info in update_request.minimal_document_indexing_info
+        ]
+        if "b" in doc_ids:
+            raise _bad_request()
+
+    document_index.update.side_effect = _update
+
+    with patch.object(tasks, "mark_documents_as_synced") as mark_synced:
+        assert vespa_metadata_sync_batch_task(["a", "b", "c"], tenant_id="tenant")
+
+    # the batch failed, so every document was retried on its own
+    assert _updated_doc_ids(document_index) == [["a", "b", "c"], ["a"], ["b"], ["c"]]
+    assert mark_synced.call_args.args[0] == ["a", "c"]
+
+
+def test_nothing_is_synced_when_every_document_fails(document_index: Mock) -> None:
+    document_index.update.side_effect = _bad_request()
+
+    with patch.object(tasks, "mark_documents_as_synced") as mark_synced:
+        assert not vespa_metadata_sync_batch_task(["a", "b", "c"], tenant_id="tenant")
+
+    mark_synced.assert_not_called()
@@ -13,10 +13,14 @@ Key features tested:
 - Edge cases (unicode, code blocks, invalid citations, etc.)
 """
 
+import random
 from datetime import datetime
+from unittest.mock import patch
 
 import pytest
 
+from onyx.chat import citation_processor
+from onyx.chat.citation_processor import _CodeFenceTracker
 from onyx.chat.citation_processor import CitationMapping
 from onyx.chat.citation_processor import CitationMode
 from onyx.chat.citation_processor import DynamicCitationProcessor
@@ -2406,3 +2410,73 @@ class TestKeepMarkersEdgeCases:
         assert len(citations) == 0
         # Should not be in seen citations
         assert 99 not in processor.get_seen_citations()
+
+
+# ============================================================================
+# Incremental State Tests
+# ============================================================================
+
+
+def test_code_fence_tracker_matches_full_recount() -> None:
+    """The incremental fence count must match counting over the whole text."""
+    rng = random.Random(0)
+    for _ in range(500):
+        tracker = _CodeFenceTracker()
+        text = ""
+        for _ in range(rng.randint(1, 30)):
+            token = "".join(
+                rng.choice(["`", "`", "a", "\n", " "]) for _ in range(rng.randint(0, 5))
+            )
+            tracker.feed(token)
+            text += token
+            assert tracker.count == text.count("```")
+
+
+def test_llm_out_is_the_raw_output(mock_search_docs: CitationMapping) -> None:
+    processor = DynamicCitationProcessor()
+    processor.update_citation_mapping({1: mock_search_docs[1]})
+
+    tokens: list[str | None] = ["Text ", "[", "1", "]", " and\n", "```", "\ncode\n"]
+    process_tokens(processor, tokens)
+
+    assert processor.llm_out == "Text [1] and\n```\ncode\n"
+
+
+def test_long_stream_is_processed_in_linear_time(
+    mock_search_docs: CitationMapping,
+) -> None:
+    """A 50k token stream with citations and code blocks. Every token used to rescan
+    the whole accumulated answer for code fences, which is quadratic in the length of
+    the stream. Now every character is scanned for fences exactly once."""
+    rng = random.Random(0)
+    tokens: list[str | None] = []
+    for _ in range(50_000):
+        roll = rng.random()
+        if roll < 0.03:
+            tokens.append(f" [{rng.randint(1, 5)}]")
+        elif roll < 0.032:
+            tokens.append("\n```\n")
+        else:
+            tokens.append(rng.choice([" the", " data", " model", ",", " shows", "."]))
+
+    processor = DynamicCitationProcessor()
+    processor.update_citation_mapping(mock_search_docs)
+
+    num_chars_scanned = 0
+    feed = _CodeFenceTracker.feed
+
+    def _counting_feed(tracker: _CodeFenceTracker, text: str) -> None:
+        nonlocal num_chars_scanned
+        num_chars_scanned += len(text)
+        feed(tracker, text)
+
+    with (
+        patch.object(_CodeFenceTracker, "feed", _counting_feed),
+        patch.object(citation_processor, "in_code_block") as full_recount,
+    ):
+        output, citations = process_tokens(processor, tokens)
+
+    assert len(citations) == 5
+    assert "[[1]](https://example.com/doc1)" in output
+    assert num_chars_scanned == sum(len(token) for token in tokens if token)
+    full_recount.assert_not_called()
@@ -0,0 +1,154 @@
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+from uuid import uuid4
+
+from onyx.chat.stop_signal_checker import _get_fence_key
+from onyx.chat.stop_signal_checker import set_fence
+from onyx.chat.stop_signal_checker import STOP_CHANNEL
+from onyx.chat.stop_signal_checker import StopSignalListener
+
+
+class FakePubSub:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self._redis = redis
+        self._messages: queue.Queue[dict[str, Any] | None] = queue.Queue()
+
+    def subscribe(self, channel: str) -> None:
+        self._redis.subscribers.setdefault(channel, []).append(self)
+        self._redis.subscribed.set()
+
+    def listen(self) -> Iterator[dict[str, Any]]:
+        while True:
+            message = self._messages.get()
+            if message is None:
+                raise ConnectionError("connection lost")
+            yield message
+
+    def close(self) -> None:
+        for subscribers in self._redis.subscribers.values():
+            if self in subscribers:
+                subscribers.remove(self)
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, Any] = {}
+        self.subscribers: dict[str, list[FakePubSub]] = {}
+        self.subscribed = threading.Event()
+        self.num_exists_calls = 0
+
+    def set(self, key: str, value: Any, ex: int | None = None) -> None:
+        self.store[key] = value
+
+    def delete(self, key: str) -> None:
+        self.store.pop(key, None)
+
+    def exists(self, key: str) -> int:
+        self.num_exists_calls += 1
+        return int(key in self.store)
+
+    def publish(self, channel: str, message: str) -> None:
+        for pubsub in list(self.subscribers.get(channel, [])):
+            pubsub._messages.put({"type": "message", "data": message.encode()})
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> FakePubSub:
+        return FakePubSub(self)
+
+    def drop_connections(self) -> None:
+        for subscribers in self.subscribers.values():
+            for pubsub in subscribers:
+                pubsub._messages.put(None)
+
+
+def _wait_for(condition: Any, timeout: float = 2) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_stop_is_pushed_through_the_listener() -> None:
+    redis: Any = FakeRedis()
+    listener = StopSignalListener(redis_client_factory=lambda: redis)
+    stopped = threading.Event()
+
+    chat_session_id = uuid4()
+    subscription = listener.subscribe(chat_session_id, redis, on_stop=stopped.set)
+    assert _wait_for(lambda: listener.healthy)
+
+    num_exists_calls = redis.num_exists_calls
+    for _ in range(100):
+        assert subscription.is_connected()
+    # while the listener is up, checking the signal doesn't hit Redis
+    assert redis.num_exists_calls == num_exists_calls
+
+    # stops for other sessions are ignored
+    set_fence(uuid4(), redis, True)
+    set_fence(chat_session_id, redis, True)
+    assert stopped.wait(timeout=2)
+    assert not subscription.is_connected()
+
+    subscription.close()
+    assert listener._subscriptions == {}
+
+
+def test_stop_set_before_subscribing_is_seen() -> None:
+    redis: Any = FakeRedis()
+    listener = StopSignalListener(redis_client_factory=lambda: redis)
+    stopped = threading.Event()
+
+    chat_session_id = uuid4()
+    set_fence(chat_session_id, redis, True)
+    subscription = listener.subscribe(chat_session_id, redis, on_stop=stopped.set)
+
+    assert stopped.is_set()
+    assert not subscription.is_connected()
+    subscription.close()
+
+
+def test_falls_back_to_the_fence_while_disconnected(monkeypatch: Any) -> None:
+    monkeypatch.setattr("onyx.chat.stop_signal_checker.LISTENER_RECONNECT_DELAY", 0.05)
+    redis: Any = FakeRedis()
+    listener = StopSignalListener(redis_client_factory=lambda: redis)
+
+    chat_session_id = uuid4()
+    subscription = listener.subscribe(chat_session_id, redis)
+    assert _wait_for(lambda: listener.healthy)
+
+    redis.subscribed.clear()
+    redis.drop_connections()
+    assert _wait_for(lambda: not listener.healthy)
+
+    # the published message is lost, but the fence is checked instead
+    redis.store[_get_fence_key(chat_session_id)] = 0
+    assert not subscription.is_connected()
+
+    # and the listener resubscribes afterwards
+    assert redis.subscribed.wait(timeout=2)
+    assert _wait_for(lambda: listener.healthy)
+    assert STOP_CHANNEL in redis.subscribers
+    subscription.close()
+
+
+def test_reconnect_rechecks_every_subscription(monkeypatch: Any) -> None:
+    monkeypatch.setattr("onyx.chat.stop_signal_checker.LISTENER_RECONNECT_DELAY", 0.05)
+    redis: Any = FakeRedis()
+    listener = StopSignalListener(redis_client_factory=lambda: redis)
+    stopped = threading.Event()
+
+    chat_session_id = uuid4()
+    subscription = listener.subscribe(chat_session_id, redis, on_stop=stopped.set)
+    assert _wait_for(lambda: listener.healthy)
+
+    redis.drop_connections()
+    assert _wait_for(lambda: not listener.healthy)
+    redis.store[_get_fence_key(chat_session_id)] = 0
+
+    # nobody checks the subscription, the listener picks up the stop on reconnect
+    assert stopped.wait(timeout=2)
+    subscription.close()
@@ -0,0 +1,145 @@
+from collections.abc import Iterator
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from email.utils import format_datetime
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+import requests
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.cross_connector_utils import redis_rate_limit
+from onyx.connectors.cross_connector_utils.rate_limit_wrapper import (
+    RateLimitTriedTooManyTimesError,
+)
+from onyx.connectors.cross_connector_utils.redis_rate_limit import parse_retry_after
+from onyx.connectors.cross_connector_utils.redis_rate_limit import RedisRateLimiter
+
+
+class _Scripts:
+    def __init__(self) -> None:
+        self.acquire = Mock(return_value=0)
+        self.block = Mock(return_value=0)
+
+    def register_script(self, script: str) -> Mock:
+        return self.acquire if "TIME" in script else self.block
+
+
+@pytest.fixture
+def scripts() -> Iterator[_Scripts]:
+    scripts = _Scripts()
+    with patch.object(redis_rate_limit, "get_redis_client", return_value=scripts):
+        yield scripts
+
+
+@pytest.fixture
+def sleep() -> Iterator[Mock]:
+    with patch.object(redis_rate_limit.time, "sleep") as sleep:
+        yield sleep
+
+
+def _response(status_code: int, headers: dict[str, str] | None = None) -> Mock:
+    return Mock(spec=requests.Response, status_code=status_code, headers=headers or {})
+
+
+def _limiter(max_calls: int | None = 120, max_wait: float = 600) -> RedisRateLimiter:
+    return RedisRateLimiter(
+        source=DocumentSource.ZENDESK,
+        scope="https://acme.zendesk.com/api/v2",
+        max_calls=max_calls,
+        period=60,
+        max_wait=max_wait,
+        tenant_id="tenant_a",
+    )
+
+
+def test_limiters_share_state_by_source_and_scope(scripts: _Scripts) -> None:
+    _limiter().wait()
+    _limiter().wait()
+
+    first_keys, second_keys = [
+        call.kwargs["keys"] for call in scripts.acquire.call_args_list
+    ]
+    assert first_keys == second_keys
+    assert all(
+        key.startswith("tenant_a:connector_rate_limit:zendesk:") for key in first_keys
+    )
+    # the scope is hashed so credentials never end up in key names
+    assert not any("acme" in key for key in first_keys)
+    # 120 calls per minute -> one every 500ms, with bursts of up to 120 calls
+    assert scripts.acquire.call_args.kwargs["args"] == [500, 500 * 119]
+
+
+def test_wait_sleeps_until_the_script_lets_the_call_through(
+    scripts: _Scripts, sleep: Mock
+) -> None:
+    scripts.acquire.side_effect = [1500, 250, 0]
+
+    _limiter().wait()
+
+    assert [call.args[0] for call in sleep.call_args_list] == [1.5, 0.25]
+
+
+def test_wait_gives_up_after_max_wait(scripts: _Scripts, sleep: Mock) -> None:
+    scripts.acquire.return_value = 4000
+
+    with pytest.raises(RateLimitTriedTooManyTimesError):
+        _limiter(max_wait=10).wait()
+
+    assert sleep.call_count == 2
+
+
+def test_wait_lets_calls_through_without_redis(scripts: _Scripts, sleep: Mock) -> None:
+    scripts.acquire.side_effect = RedisConnectionError()
+
+    _limiter().wait()
+
+    sleep.assert_not_called()
+
+
+def test_retry_after_blocks_every_worker(scripts: _Scripts, sleep: Mock) -> None:
+    limiter = _limiter(max_calls=None)
+    responses = iter([_response(429, {"Retry-After": "7"}), _response(200)])
+
+    @limiter
+    def call_api() -> requests.Response:
+        return next(responses)
+
+    assert call_api().status_code == 429
+    scripts.block.assert_called_once_with(keys=[limiter._block_key], args=[7000])
+    # without max_calls only the back off is enforced
+    assert scripts.acquire.call_args.kwargs["args"] == [0, 0]
+
+    assert call_api().status_code == 200
+    scripts.block.assert_called_once()
+    sleep.assert_not_called()
+
+
+def test_rate_limit_errors_block_and_are_reraised(scripts: _Scripts) -> None:
+    limiter = _limiter()
+
+    @limiter
+    def call_api() -> None:
+        raise requests.HTTPError(response=_response(429))
+
+    with pytest.raises(requests.HTTPError):
+        call_api()
+
+    scripts.block.assert_called_once_with(
+        keys=[limiter._block_key], args=[limiter.default_retry_after * 1000]
+    )
+
+
+def test_parse_retry_after() -> None:
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=120)
+
+    assert parse_retry_after(_response(429, {"Retry-After": "3"})) == 3
+    assert parse_retry_after(_response(429)) is None
+    assert parse_retry_after(_response(429, {"Retry-After": "soon"})) is None
+    from_date = parse_retry_after(
+        _response(429, {"Retry-After": format_datetime(retry_at, usegmt=True)})
+    )
+    assert from_date is not None and 110 < from_date <= 120
@@ -0,0 +1,307 @@
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from io import BytesIO
+from typing import IO
+from unittest.mock import patch
+
+import pytest
+
+from onyx.connectors.web import connector as web_connector
+from onyx.connectors.web import validator_store
+from onyx.connectors.web.connector import _FetchedPage
+from onyx.connectors.web.connector import _HostThrottle
+from onyx.connectors.web.connector import WebConnector
+
+_FILLER = "This page documents a feature of the product in some detail. " * 10
+_TOKEN = "token"
+
+
+class _Site:
+    def __init__(self) -> None:
+        self.pages = {
+            "/docs/": _page("Home", '<a href="/docs/a">A</a><a href="/docs/b">B</a>'),
+            "/docs/a": _page("A", "Page A"),
+            "/docs/b": _page("B", "Page B"),
+        }
+        self.versions = {path: 1 for path in self.pages}
+        # pages that need the bearer token and pages that redirect to a login page
+        self.protected: set[str] = set()
+        self.redirects: dict[str, str] = {}
+        self.requests: list[tuple[str, int]] = []
+        self.lock = threading.Lock()
+
+    def change(self, path: str, body: str) -> None:
+        self.pages[path] = _page(path, body)
+        self.versions[path] += 1
+
+
+def _page(title: str, body: str) -> str:
+    return (
+        f"<html><head><title>{title}</title></head>"
+        f"<body><p>{body}</p><p>{_FILLER}</p></body></html>"
+    )
+
+
+class _InMemoryFileStore:
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+
+    def has_file(self, file_id: str, *args: object) -> bool:
+        return file_id in self.files
+
+    def read_file(self, file_id: str, mode: str | None = None) -> IO[bytes]:
+        return BytesIO(self.files[file_id])
+
+    def save_file(self, content: IO[bytes], file_id: str, **kwargs: object) -> str:
+        self.files[file_id] = content.read()
+        return file_id
+
+
+@pytest.fixture
+def site() -> Iterator[tuple[_Site, str]]:
+    site = _Site()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            path = self.path
+            if path in site.redirects:
+                with site.lock:
+                    site.requests.append((path, 302))
+                self.send_response(302)
+                self.send_header("Location", site.redirects[path])
+                self.end_headers()
+                return
+            if (
+                path in site.protected
+                and self.headers.get("Authorization") != f"Bearer {_TOKEN}"
+            ):
+                with site.lock:
+                    site.requests.append((path, 401))
+                self.send_response(401)
+                self.end_headers()
+                return
+            if path not in site.pages:
+                self.send_response(404)
+                self.end_headers()
+                return
+
+            etag = f'"{site.versions[path]}"'
+            if self.headers.get("If-None-Match") == etag:
+                status = 304
+            else:
+                status = 200
+            with site.lock:
+                site.requests.append((path, status))
+
+            self.send_response(status)
+            self.send_header("ETag", etag)
+            if status == 304:
+                self.end_headers()
+                return
+            body = site.pages[path].encode()
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield site, f"http://127.0.0.1:{server.server_address[1]}/docs/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def file_store() -> Iterator[_InMemoryFileStore]:
+    store = _InMemoryFileStore()
+    with patch.object(validator_store, "get_default_file_store", return_value=store):
+        yield store
+
+
+# poll windows start POLL_CONNECTOR_OFFSET (30 minutes) before the previous end
+_OFFSET = 30 * 60
+
+
+def _poll(connector: WebConnector, start: float, end: float) -> set[str]:
+    return {
+        doc.semantic_identifier
+        for batch in connector.poll_source(start, end)
+        for doc in batch
+    }
+
+
+def test_recrawl_only_indexes_changed_pages(site: tuple[_Site, str]) -> None:
+    test_site, base_url = site
+    connector = WebConnector(base_url)
+
+    assert _poll(connector, 0, 10_000) == {"Home", "A", "B"}
+    assert all(status == 200 for _, status in test_site.requests)
+
+    test_site.requests.clear()
+    assert _poll(connector, 10_000 - _OFFSET, 20_000) == set()
+    # only the connectivity check downloads a page
+    assert sorted(test_site.requests) == [
+        ("/docs/", 200),
+        ("/docs/", 304),
+        ("/docs/a", 304),
+        ("/docs/b", 304),
+    ]
+
+    test_site.change("/docs/b", "Page B, updated")
+    assert _poll(connector, 20_000 - _OFFSET, 30_000) == {"/docs/b"}
+
+
+def test_pages_of_an_unconfirmed_run_are_fetched_again(
+    site: tuple[_Site, str],
+) -> None:
+    _, base_url = site
+    connector = WebConnector(base_url)
+    _poll(connector, 0, 10_000)
+    # this run's documents never get indexed, so the next window starts at the same
+    # place again
+    _poll(connector, 10_000 - _OFFSET, 20_000)
+
+    assert _poll(connector, 10_000 - _OFFSET, 20_000) == {"Home", "A", "B"}
+    # indexing from the beginning doesn't use the validators either
+    assert _poll(connector, 0, 30_000) == {"Home", "A", "B"}
+
+
+def test_slim_docs_include_unchanged_pages(site: tuple[_Site, str]) -> None:
+    test_site, base_url = site
+    connector = WebConnector(base_url)
+    _poll(connector, 0, 10_000)
+    test_site.requests.clear()
+
+    slim_ids = {doc.id for batch in connector.retrieve_all_slim_docs() for doc in batch}
+
+    assert slim_ids == {base_url, base_url + "a", base_url + "b"}
+    assert [path for path, status in test_site.requests if status == 200] == ["/docs/"]
+
+
+@pytest.mark.parametrize("oauth_configured", [True, False])
+def test_protected_pages_are_not_indexed_from_the_login_page(
+    site: tuple[_Site, str], oauth_configured: bool
+) -> None:
+    test_site, base_url = site
+    test_site.pages["/docs/"] = _page(
+        "Home", '<a href="/docs/secret">Secret</a><a href="/docs/private">Private</a>'
+    )
+    test_site.pages["/docs/secret"] = _page("Secret", "Secret page")
+    test_site.pages["/login"] = _page("Login", "Please log in")
+    test_site.versions.update({"/docs/secret": 1, "/login": 1})
+    test_site.protected = {"/docs/", "/docs/secret"}
+    test_site.redirects = {"/docs/private": "/login"}
+    rendered: list[str] = []
+
+    def _render_page(context: object, url: str, **kwargs: object) -> _FetchedPage:
+        rendered.append(url)
+        # the browser sends the bearer token as well and follows the redirect
+        title = url.rsplit("/", 1)[-1].capitalize()
+        links = {base_url + "secret", base_url + "private"} if url == base_url else {}
+        return _FetchedPage(url=url, title=title, text=_FILLER, links=set(links))
+
+    authorization_header = (
+        {"Authorization": f"Bearer {_TOKEN}"} if oauth_configured else {}
+    )
+    with (
+        patch.object(
+            web_connector,
+            "_oauth_authorization_header",
+            return_value=authorization_header,
+        ),
+        patch.object(web_connector, "check_internet_connection"),
+        patch.object(web_connector, "_render_page", _render_page),
+        patch.object(web_connector, "start_playwright", return_value=(None, None)),
+    ):
+        ids = [doc_id for doc_id, _ in WebConnector(base_url)._crawl_concurrently()]
+
+    assert sorted(ids) == [base_url, base_url + "private", base_url + "secret"]
+    # the login page is never fetched without the browser
+    assert ("/login", 200) not in test_site.requests
+    if oauth_configured:
+        assert rendered == [base_url + "private"]
+    else:
+        assert sorted(rendered) == [base_url, base_url + "private", base_url + "secret"]
+
+
+def test_host_throttle_limits_concurrent_requests() -> None:
+    throttle = _HostThrottle(max_concurrency=2, delay_seconds=0)
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def _request(url: str) -> None:
+        nonlocal active, max_active
+        with throttle.slot(url):
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+
+    threads = [
+        threading.Thread(target=_request, args=(f"https://example.com/{i}",))
+        for i in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max_active == 2
+
+
+def test_closing_the_crawl_with_pending_renders_does_not_hang() -> None:
+    base_url = "https://example.com/docs/"
+    slow_pages = [f"{base_url}slow{i}" for i in range(3)]
+    render_started = threading.Event()
+    release_render = threading.Event()
+
+    def _fetch_static_page(
+        session: object, url: str, *args: object, **kwargs: object
+    ) -> _FetchedPage | None:
+        if url == base_url:
+            return _FetchedPage(
+                url=url, title="Home", links={base_url + "a", *slow_pages}
+            )
+        if url == base_url + "a":
+            return _FetchedPage(url=url, title="A")
+        # everything else needs a browser
+        return None
+
+    def _render_page(context: object, url: str, **kwargs: object) -> _FetchedPage:
+        render_started.set()
+        release_render.wait(timeout=10)
+        return _FetchedPage(url=url, title=url)
+
+    with (
+        patch.object(web_connector, "check_internet_connection"),
+        patch.object(web_connector, "protected_url_check"),
+        patch.object(web_connector, "_fetch_static_page", _fetch_static_page),
+        patch.object(web_connector, "_render_page", _render_page),
+        patch.object(web_connector, "start_playwright", return_value=(None, None)),
+        patch.object(web_connector, "WEB_CONNECTOR_PLAYWRIGHT_POOL_SIZE", 1),
+    ):
+        crawl = WebConnector(base_url)._crawl_concurrently()
+        assert next(crawl)[0] == base_url
+        assert next(crawl)[0] == base_url + "a"
+        # one slow page is being rendered, the others wait for the browser
+        assert render_started.wait(timeout=5)
+
+        closer = threading.Thread(target=crawl.close, daemon=True)
+        closer.start()
+        time.sleep(0.2)
+        release_render.set()
+        closer.join(timeout=5)
+
+    assert not closer.is_alive()
@@ -49,6 +49,9 @@ def test_zendesk_client_per_minute_rate_limiting(
 
     fake_time = _FakeTime()
 
+    # This covers the per-process rate limiter
+    monkeypatch.setattr(zendesk_mod, "CONNECTOR_DISTRIBUTED_RATE_LIMIT", False)
+
     # Patch time in both the rate limit wrapper and the zendesk connector module
     monkeypatch.setattr(rlw, "time", fake_time, raising=True)
     monkeypatch.setattr(zendesk_mod, "time", fake_time, raising=True)
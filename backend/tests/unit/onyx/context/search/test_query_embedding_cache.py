@@ -0,0 +1,116 @@
+import fnmatch
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from onyx.context.search import query_embedding_cache
+from onyx.context.search.query_embedding_cache import cache_query_embeddings
+from onyx.context.search.query_embedding_cache import get_cached_query_embeddings
+from onyx.context.search.query_embedding_cache import (
+    invalidate_query_embedding_cache,
+)
+from onyx.context.search.query_embedding_cache import normalize_query_for_cache
+
+
+class _FakePipeline:
+    def __init__(self, store: dict[str, bytes]) -> None:
+        self._store = store
+        self._pending: list[tuple[str, bytes]] = []
+
+    def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        self._pending.append((key, value))
+
+    def execute(self) -> None:
+        self._store.update(self._pending)
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self.store)
+
+    def scan_iter(self, match: str, count: int | None = None) -> Iterator[str]:
+        return iter([key for key in self.store if fnmatch.fnmatch(key, match)])
+
+    def delete(self, key: str) -> None:
+        self.store.pop(key, None)
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache() -> Iterator[None]:
+    query_embedding_cache._local_cache.clear()
+    yield
+    query_embedding_cache._local_cache.clear()
+
+
+def _lookup(redis_client: Any, queries: list[str], search_settings_id: int = 1) -> Any:
+    return get_cached_query_embeddings(
+        queries=queries,
+        search_settings_id=search_settings_id,
+        model_name="fake-model",
+        prefix="query: ",
+        redis_client=redis_client,
+    )
+
+
+def _store(redis_client: Any, queries: list[str], search_settings_id: int = 1) -> None:
+    cache_query_embeddings(
+        queries=queries,
+        embeddings=[[0.5, 0.25] for _ in queries],
+        search_settings_id=search_settings_id,
+        model_name="fake-model",
+        prefix="query: ",
+        redis_client=redis_client,
+    )
+
+
+def test_normalize_query_for_cache() -> None:
+    assert normalize_query_for_cache("  what  is\nonyx? ") == "what is onyx?"
+
+
+def test_local_and_redis_tiers() -> None:
+    redis_client = _FakeRedis()
+    assert _lookup(redis_client, ["what is onyx?"]) == [None]
+
+    _store(redis_client, ["what is onyx?"])
+    assert len(redis_client.store) == 1
+
+    # whitespace differences still hit
+    assert _lookup(redis_client, ["what  is onyx? ", "other"]) == [[0.5, 0.25], None]
+
+    # another process only has the Redis tier
+    query_embedding_cache._local_cache.clear()
+    assert _lookup(redis_client, ["what is onyx?"]) == [[0.5, 0.25]]
+
+
+def test_search_settings_are_part_of_the_key() -> None:
+    redis_client = _FakeRedis()
+    _store(redis_client, ["what is onyx?"], search_settings_id=1)
+
+    assert _lookup(redis_client, ["what is onyx?"], search_settings_id=2) == [None]
+
+
+def test_invalidate_drops_only_old_search_settings() -> None:
+    redis_client = _FakeRedis()
+    _store(redis_client, ["old"], search_settings_id=1)
+    _store(redis_client, ["new"], search_settings_id=2)
+
+    invalidate_query_embedding_cache(search_settings_id=1, redis_client=redis_client)
+
+    assert _lookup(redis_client, ["old"], search_settings_id=1) == [None]
+    assert _lookup(redis_client, ["new"], search_settings_id=2) == [[0.5, 0.25]]
+    assert len(redis_client.store) == 1
+
+
+def test_redis_errors_degrade_to_miss() -> None:
+    class _BrokenRedis:
+        def mget(self, keys: list[str]) -> None:
+            raise ConnectionError("redis down")
+
+    assert _lookup(_BrokenRedis(), ["what is onyx?"]) == [None]
@@ -0,0 +1,113 @@
+from typing import Any
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from onyx.configs.constants import DocumentSource
+from onyx.context.search.models import ChunkIndexRequest
+from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import InferenceChunk
+from onyx.context.search.retrieval.search_runner import search_chunks_batch
+
+_MODULE = "onyx.context.search.retrieval.search_runner"
+
+
+def _make_chunk(doc_id: str, chunk_id: int, score: float) -> InferenceChunk:
+    return InferenceChunk(
+        document_id=doc_id,
+        chunk_id=chunk_id,
+        blurb="",
+        content="",
+        source_links=None,
+        section_continuation=False,
+        source_type=DocumentSource.WEB,
+        semantic_identifier=doc_id,
+        title=doc_id,
+        boost=0,
+        score=score,
+        hidden=False,
+        metadata={},
+        match_highlights=[],
+        updated_at=None,
+        image_file_id=None,
+        doc_summary="",
+        chunk_context="",
+    )
+
+
+def _make_request(query: str) -> ChunkIndexRequest:
+    return ChunkIndexRequest(
+        query=query, filters=IndexFilters(access_control_list=["PUBLIC"])
+    )
+
+
+def test_queries_are_embedded_once_and_results_kept_per_query() -> None:
+    document_index = MagicMock()
+
+    def fake_hybrid_retrieval(query: str, **kwargs: Any) -> list[InferenceChunk]:
+        return [_make_chunk(f"{query}_doc", 0, kwargs["query_embedding"][0])]
+
+    document_index.hybrid_retrieval.side_effect = fake_hybrid_retrieval
+
+    with (
+        patch(f"{_MODULE}.get_federated_retrieval_functions", return_value=[]),
+        patch(
+            f"{_MODULE}.get_query_embeddings",
+            return_value=[[1.0], [2.0], [3.0]],
+        ) as mock_get_query_embeddings,
+    ):
+        results = search_chunks_batch(
+            query_requests=[_make_request(q) for q in ["a", "b", "c"]],
+            user_id=None,
+            document_index=document_index,
+            db_session=MagicMock(),
+        )
+
+    mock_get_query_embeddings.assert_called_once()
+    assert mock_get_query_embeddings.call_args.args[0] == ["a", "b", "c"]
+    assert [[(c.document_id, c.score) for c in chunks] for chunks in results] == [
+        [("a_doc", 1.0)],
+        [("b_doc", 2.0)],
+        [("c_doc", 3.0)],
+    ]
+
+
+def test_federated_results_are_merged_per_query() -> None:
+    document_index = MagicMock()
+    document_index.hybrid_retrieval.return_value = [_make_chunk("indexed", 0, 0.5)]
+
+    federated_info = MagicMock()
+    federated_info.source.to_non_federated_source.return_value = DocumentSource.SLACK
+    federated_info.retrieval_function.side_effect = lambda request: [
+        _make_chunk(f"slack_{request.query}", 0, 0.9)
+    ]
+
+    with (
+        patch(
+            f"{_MODULE}.get_federated_retrieval_functions",
+            return_value=[federated_info],
+        ),
+        patch(f"{_MODULE}.get_query_embeddings", return_value=[[1.0], [2.0]]),
+    ):
+        results = search_chunks_batch(
+            query_requests=[_make_request(q) for q in ["a", "b"]],
+            user_id=None,
+            document_index=document_index,
+            db_session=MagicMock(),
+        )
+
+    assert [[c.document_id for c in chunks] for chunks in results] == [
+        ["slack_a", "indexed"],
+        ["slack_b", "indexed"],
+    ]
+
+
+def test_empty_batch() -> None:
+    assert (
+        search_chunks_batch(
+            query_requests=[],
+            user_id=None,
+            document_index=MagicMock(),
+            db_session=MagicMock(),
+        )
+        == []
+    )
@@ -133,3 +133,30 @@ def test_delete_user_deletes_oauth_accounts(
 
     db_session.delete.assert_any_call(oauth1)
     db_session.delete.assert_any_call(oauth2)
+
+
+@patch("onyx.db.users.remove_user_from_invited_users")
+@patch(
+    "onyx.db.users.fetch_ee_implementation_or_noop",
+    return_value=lambda **_kwargs: None,
+)
+def test_delete_user_invalidates_cached_acls(
+    _mock_ee: Any, _mock_remove_invited: Any
+) -> None:
+    user = _mock_user()
+    db_session = MagicMock()
+    db_session.query.return_value = _make_query_chain()
+    calls = MagicMock()
+    calls.attach_mock(db_session.commit, "commit")
+
+    with patch(
+        "onyx.db.users.invalidate_user_acl_cache"
+    ) as mock_invalidate_user_acl_cache:
+        calls.attach_mock(mock_invalidate_user_acl_cache, "invalidate_user_acl_cache")
+        delete_user_from_db(user, db_session)
+
+    # the user's group memberships are gone once the deletion is committed
+    assert [name for name, _, _ in calls.mock_calls] == [
+        "commit",
+        "invalidate_user_acl_cache",
+    ]
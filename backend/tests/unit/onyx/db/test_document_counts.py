@@ -0,0 +1,108 @@
+from typing import Any
+from unittest.mock import Mock
+
+from sqlalchemy.dialects import postgresql
+
+from onyx.db.document import delete_documents_by_connector_credential_pair__no_commit
+from onyx.db.document import mark_document_as_indexed_for_cc_pair__no_commit
+from onyx.db.document import reconcile_document_count_for_cc_pair
+from onyx.db.models import DocumentCountByConnectorCredentialPair
+
+_COUNT_TABLE = DocumentCountByConnectorCredentialPair.__tablename__
+
+
+def _compile(stmt: Any) -> Any:
+    return stmt.compile(dialect=postgresql.dialect())  # type: ignore[no-untyped-call]
+
+
+def _sql(stmt: Any) -> str:
+    return str(_compile(stmt))
+
+
+def _count_upserts(db_session: Mock) -> list[dict[str, Any]]:
+    upserts = []
+    for call in db_session.execute.call_args_list:
+        stmt = call.args[0]
+        sql = _sql(stmt)
+        if sql.startswith(f"INSERT INTO {_COUNT_TABLE}") and "DO UPDATE" in sql:
+            upserts.append(_compile(stmt).params)
+    return upserts
+
+
+def test_only_newly_indexed_documents_are_counted() -> None:
+    db_session = Mock()
+    db_session.execute.return_value.all.return_value = [("doc-1",), ("doc-2",)]
+
+    mark_document_as_indexed_for_cc_pair__no_commit(
+        connector_id=1,
+        credential_id=2,
+        document_ids=["doc-1", "doc-2", "doc-3"],
+        db_session=db_session,
+    )
+
+    update_sql = _sql(db_session.execute.call_args_list[0].args[0])
+    assert "has_been_indexed IS NOT true" in update_sql
+    assert "RETURNING" in update_sql
+    [params] = _count_upserts(db_session)
+    assert params["connector_id"] == 1
+    assert params["credential_id"] == 2
+    assert params["document_count"] == 2
+
+
+def test_already_indexed_documents_leave_the_count_alone() -> None:
+    db_session = Mock()
+    db_session.execute.return_value.all.return_value = []
+
+    mark_document_as_indexed_for_cc_pair__no_commit(
+        connector_id=1,
+        credential_id=2,
+        document_ids=["doc-1"],
+        db_session=db_session,
+    )
+
+    assert _count_upserts(db_session) == []
+
+
+def test_deleting_documents_only_subtracts_indexed_ones() -> None:
+    db_session = Mock()
+    db_session.execute.return_value.all.return_value = [
+        (1, 2, True),
+        (1, 2, True),
+        (1, 2, False),
+        (3, 4, True),
+        (5, 6, False),
+    ]
+
+    delete_documents_by_connector_credential_pair__no_commit(
+        db_session, ["doc-1", "doc-2", "doc-3"]
+    )
+
+    assert [
+        (params["connector_id"], params["credential_id"], params["document_count"])
+        for params in _count_upserts(db_session)
+    ] == [(1, 2, -2), (3, 4, -1)]
+
+
+def test_reconciliation_fixes_a_drifted_count() -> None:
+    db_session = Mock()
+    db_session.scalar.side_effect = [10, 12]
+
+    assert reconcile_document_count_for_cc_pair(db_session, 1, 2) == 2
+
+    # the count row is locked before the documents are counted
+    assert "FOR UPDATE" in _sql(db_session.scalar.call_args_list[0].args[0])
+    update_stmt = db_session.execute.call_args_list[-1].args[0]
+    assert _sql(update_stmt).startswith(f"UPDATE {_COUNT_TABLE}")
+    assert update_stmt.compile().params["document_count"] == 12
+    db_session.commit.assert_called_once()
+
+
+def test_reconciliation_leaves_a_correct_count_alone() -> None:
+    db_session = Mock()
+    db_session.scalar.side_effect = [12, 12]
+
+    assert reconcile_document_count_for_cc_pair(db_session, 1, 2) == 0
+
+    # only the insert that makes sure the count row exists
+    assert db_session.execute.call_count == 1
+    db_session.commit.assert_called_once()
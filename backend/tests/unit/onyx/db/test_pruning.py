@@ -0,0 +1,47 @@
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from sqlalchemy.dialects import postgresql
+
+from onyx.db import pruning
+from onyx.db.pruning import iter_doc_ids_missing_from_source
+from onyx.db.pruning import load_source_doc_ids
+
+
+def test_connector_batches_are_regrouped_into_copies() -> None:
+    db_session = Mock()
+    with patch.object(pruning, "_copy_source_doc_ids") as copy_source_doc_ids:
+        num_loaded = load_source_doc_ids(
+            db_session, iter([["a", "b"], ["c"], ["d", "e", "f"], ["g"]]), batch_size=3
+        )
+
+    assert num_loaded == 7
+    assert [call.args[1] for call in copy_source_doc_ids.call_args_list] == [
+        ["a", "b", "c"],
+        ["d", "e", "f"],
+        ["g"],
+    ]
+    # the index is only built once everything has been loaded
+    statements = [str(call.args[0]) for call in db_session.execute.call_args_list]
+    assert statements[0].startswith("CREATE INDEX")
+    assert statements[1].startswith("ANALYZE")
+
+
+def test_missing_documents_are_an_anti_join_on_the_temp_table() -> None:
+    db_session = Mock()
+    db_session.scalars.return_value = iter(["stale"])
+
+    assert list(iter_doc_ids_missing_from_source(db_session, 1, 2)) == ["stale"]
+
+    stmt = db_session.scalars.call_args.args[0]
+    sql = str(
+        stmt.compile(
+            dialect=postgresql.dialect(),  # type: ignore[no-untyped-call]
+            schema_translate_map={None: "tenant_abc"},
+            compile_kwargs={"literal_binds": True},
+        )
+    )
+    assert "NOT (EXISTS" in sql
+    # the temp table must not be translated into the tenant schema
+    assert "pg_temp.pruning_source_document_id" in sql
+    assert stmt.get_execution_options()["yield_per"] > 0
@@ -0,0 +1,45 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from onyx.db import connector_credential_pair
+from onyx.db.connector_credential_pair import remove_credential_from_connector
+
+
+def test_removing_a_credential_invalidates_cached_acls() -> None:
+    db_session = MagicMock()
+    association = MagicMock(id=7)
+    delete_user__ext_group_for_cc_pair = MagicMock()
+    calls = MagicMock()
+    calls.attach_mock(delete_user__ext_group_for_cc_pair, "delete_ext_groups")
+    calls.attach_mock(db_session.commit, "commit")
+
+    with (
+        patch.object(connector_credential_pair, "fetch_connector_by_id"),
+        patch.object(connector_credential_pair, "fetch_credential_by_id_for_user"),
+        patch.object(
+            connector_credential_pair,
+            "get_connector_credential_pair_for_user",
+            return_value=association,
+        ),
+        patch.object(
+            connector_credential_pair,
+            "fetch_ee_implementation_or_noop",
+            return_value=delete_user__ext_group_for_cc_pair,
+        ),
+        patch.object(
+            connector_credential_pair, "invalidate_user_acl_cache"
+        ) as mock_invalidate_user_acl_cache,
+    ):
+        calls.attach_mock(mock_invalidate_user_acl_cache, "invalidate_user_acl_cache")
+        response = remove_credential_from_connector(1, 2, None, db_session)
+
+    assert response.success
+    # the external group memberships of the cc pair are gone once committed
+    assert [name for name, _, _ in calls.mock_calls] == [
+        "delete_ext_groups",
+        "commit",
+        "invalidate_user_acl_cache",
+    ]
+    delete_user__ext_group_for_cc_pair.assert_called_once_with(
+        db_session=db_session, cc_pair_id=7
+    )
@@ -0,0 +1,67 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from onyx.document_index.interfaces_new import MetadataUpdateRequest
+from onyx.document_index.vespa import vespa_document_index
+from onyx.document_index.vespa.vespa_document_index import TenantState
+from onyx.document_index.vespa.vespa_document_index import VespaDocumentIndex
+
+
+def test_client_outlives_chunk_updates_when_one_fails() -> None:
+    slow_update_started = threading.Event()
+    finished_updates: list[str] = []
+    finished_updates_when_closed: list[str] = []
+
+    def _update_single_chunk(doc_chunk_id: str, *args: Any) -> None:
+        if doc_chunk_id == "bad":
+            slow_update_started.wait(timeout=5)
+            raise httpx.ConnectError("boom")
+        slow_update_started.set()
+        time.sleep(0.1)
+        finished_updates.append(doc_chunk_id)
+
+    @contextmanager
+    def _client_context() -> Iterator[httpx.Client]:
+        try:
+            yield httpx.Client()
+        finally:
+            finished_updates_when_closed.extend(finished_updates)
+
+    document_index = VespaDocumentIndex(
+        index_name="index",
+        tenant_state=TenantState(tenant_id="tenant", multitenant=False),
+        large_chunks_enabled=False,
+        httpx_client=httpx.Client(),
+    )
+    document_index._httpx_client_context = _client_context()  # type: ignore[assignment]
+
+    with (
+        patch.object(vespa_document_index, "_enrich_basic_chunk_info"),
+        patch.object(
+            vespa_document_index,
+            "get_document_chunk_ids",
+            side_effect=[["bad"], ["slow"]],
+        ),
+        patch.object(
+            vespa_document_index, "_update_single_chunk", _update_single_chunk
+        ),
+        pytest.raises(httpx.ConnectError),
+    ):
+        document_index.update(
+            [
+                MetadataUpdateRequest(
+                    document_ids=["a", "b"],
+                    doc_id_to_chunk_cnt={"a": 1, "b": 1},
+                    hidden=True,
+                )
+            ]
+        )
+
+    assert finished_updates_when_closed == ["slow"]
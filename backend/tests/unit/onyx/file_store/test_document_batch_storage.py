@@ -0,0 +1,164 @@
+"""Tests for the document batch storage formats."""
+
+import random
+from datetime import datetime
+from datetime import timezone
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Any
+from typing import IO
+
+import pytest
+
+from onyx.configs.constants import DocumentSource
+from onyx.configs.constants import FileOrigin
+from onyx.connectors.models import BasicExpertInfo
+from onyx.connectors.models import Document
+from onyx.connectors.models import ImageSection
+from onyx.connectors.models import TextSection
+from onyx.file_store.document_batch_storage import BATCH_FILE_TYPE
+from onyx.file_store.document_batch_storage import FileStoreDocumentBatchStorage
+from onyx.file_store.document_batch_storage import LEGACY_BATCH_FILE_TYPE
+
+_MODULE = "onyx.file_store.document_batch_storage"
+
+_WORDS = (
+    "the index attempt fetches documents from the connector and hands them over "
+    "to docprocessing which chunks embeds and writes them into the document index"
+).split()
+
+
+class InMemoryFileStore:
+    def __init__(self) -> None:
+        self.files: dict[str, tuple[bytes, str]] = {}
+
+    def save_file(
+        self,
+        content: IO,
+        display_name: str | None,
+        file_origin: FileOrigin,
+        file_type: str,
+        file_metadata: dict[str, Any] | None = None,
+        file_id: str | None = None,
+    ) -> str:
+        assert file_id is not None
+        data = content.read()
+        self.files[file_id] = (
+            data.encode("utf-8") if isinstance(data, str) else data,
+            file_type,
+        )
+        return file_id
+
+    def has_file(self, file_id: str, file_origin: FileOrigin, file_type: str) -> bool:
+        return file_id in self.files and self.files[file_id][1] == file_type
+
+    def read_file(self, file_id: str) -> IO[bytes]:
+        return BytesIO(self.files[file_id][0])
+
+    def delete_file(self, file_id: str) -> None:
+        del self.files[file_id]
+
+    def change_file_id(self, old_file_id: str, new_file_id: str) -> None:
+        self.files[new_file_id] = self.files.pop(old_file_id)
+
+    def list_files_by_prefix(self, prefix: str) -> list[Any]:
+        return [
+            SimpleNamespace(file_id=file_id)
+            for file_id in self.files
+            if file_id.startswith(prefix)
+        ]
+
+
+def _make_document(i: int) -> Document:
+    rng = random.Random(i)
+    return Document(
+        id=f"https://example.com/docs/{i}",
+        sections=[
+            TextSection(
+                link=f"https://example.com/docs/{i}#section-{j}",
+                text=" ".join(rng.choice(_WORDS) for _ in range(300)),
+            )
+            for j in range(5)
+        ]
+        + [ImageSection(image_file_id=f"image_{i}", link=None)],
+        source=DocumentSource.CONFLUENCE,
+        semantic_identifier=f"Document {i}",
+        metadata={"space": "Engineering", "labels": ["design", f"label_{i % 7}"]},
+        doc_updated_at=datetime(2024, 1, 1, 12, i % 60, tzinfo=timezone.utc),
+        primary_owners=[BasicExpertInfo(display_name="Jane Doe", email="jane@x.com")],
+        title=f"Document {i} ✓",
+    )
+
+
+def _make_storage(
+    file_store: InMemoryFileStore, index_attempt_id: int = 2
+) -> FileStoreDocumentBatchStorage:
+    return FileStoreDocumentBatchStorage(
+        cc_pair_id=1, index_attempt_id=index_attempt_id, file_store=file_store  # type: ignore[arg-type]
+    )
+
+
+def test_round_trip() -> None:
+    file_store = InMemoryFileStore()
+    storage = _make_storage(file_store)
+    documents = [_make_document(i) for i in range(20)]
+
+    storage.store_batch(0, documents)
+    assert list(file_store.files) == ["iab/1/2/0.batch"]
+    assert file_store.files["iab/1/2/0.batch"][1] == BATCH_FILE_TYPE
+
+    assert storage.get_batch(0) == documents
+    assert storage.get_batch(1) is None
+
+    storage.store_batch(1, [])
+    assert storage.get_batch(1) == []
+
+
+def test_reads_legacy_json_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    file_store = InMemoryFileStore()
+    storage = _make_storage(file_store)
+    documents = [_make_document(i) for i in range(3)]
+
+    monkeypatch.setattr(f"{_MODULE}.DOCUMENT_BATCH_STORAGE_LEGACY_FORMAT", True)
+    storage.store_batch(0, documents)
+    monkeypatch.setattr(f"{_MODULE}.DOCUMENT_BATCH_STORAGE_LEGACY_FORMAT", False)
+    storage.store_batch(1, documents)
+
+    assert file_store.files["iab/1/2/0.json"][1] == LEGACY_BATCH_FILE_TYPE
+    assert file_store.files["iab/1/2/0.json"][0].startswith(b"[")
+    assert storage.get_batch(0) == documents
+    assert storage.get_batch(1) == documents
+
+    # re-issuing batches to a new attempt keeps the format of each batch
+    new_storage = _make_storage(file_store, index_attempt_id=3)
+    new_storage.update_old_batches_to_new_index_attempt(
+        new_storage.get_all_batches_for_cc_pair()
+    )
+    assert sorted(file_store.files) == ["iab/1/3/0.json", "iab/1/3/1.batch"]
+    assert new_storage.get_batch(0) == documents
+    assert new_storage.get_batch(1) == documents
+
+    new_storage.delete_batch_by_num(0)
+    new_storage.delete_batch_by_num(1)
+    assert file_store.files == {}
+
+
+def test_rejects_unknown_format_version() -> None:
+    storage = _make_storage(InMemoryFileStore())
+    data = bytearray(storage._serialize_documents([_make_document(0)]))
+    data[4] = 99
+
+    with pytest.raises(ValueError, match="version"):
+        storage._deserialize_documents(bytes(data))
+
+
+def test_compact_format_round_trips_and_is_smaller_than_legacy() -> None:
+    storage = _make_storage(InMemoryFileStore())
+    documents = [_make_document(i) for i in range(500)]
+
+    legacy_data = storage._serialize_documents_legacy(documents)
+    data = storage._serialize_documents(documents)
+
+    assert storage._deserialize_documents(legacy_data) == documents
+    assert storage._deserialize_documents(data) == documents
+    assert len(data) * 3 < len(legacy_data)
@@ -0,0 +1,92 @@
+import os
+from collections.abc import Generator
+
+import httpx
+import pytest
+
+from onyx.httpx.httpx_pool import HttpxPool
+from onyx.httpx.httpx_pool import HttpxPoolCollector
+
+
+@pytest.fixture(autouse=True)
+def clean_pool() -> Generator[None, None, None]:
+    HttpxPool.close_all()
+    yield
+    HttpxPool.close_all()
+
+
+def test_named_client_is_reused() -> None:
+    HttpxPool.init_client(name="test", http2=False, timeout=3)
+    client = HttpxPool.get("test")
+
+    # a second init must not replace the existing client
+    HttpxPool.init_client(name="test", http2=False, timeout=10)
+    assert HttpxPool.get("test") is client
+    assert client.timeout == httpx.Timeout(3)
+
+
+def test_reset_after_fork_drops_clients_without_closing() -> None:
+    HttpxPool.init_client(name="test", http2=False, timeout=3)
+    client = HttpxPool.get("test")
+
+    HttpxPool._reset_after_fork()
+
+    assert HttpxPool.client_names() == []
+    # the parent's client must stay usable
+    assert not client.is_closed
+    rebuilt_client = HttpxPool.get("test")
+    assert rebuilt_client is not client
+    # rebuilt with the params it was init'd with, not the defaults
+    assert rebuilt_client.timeout == httpx.Timeout(3)
+    client.close()
+
+
+def test_closed_client_is_not_rebuilt_with_its_params() -> None:
+    HttpxPool.init_client(name="test", http2=False, timeout=3)
+    HttpxPool.close_client("test")
+
+    assert HttpxPool.get("test").timeout == httpx.Timeout(5)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_gets_fresh_clients() -> None:
+    HttpxPool.init_client(name="test", http2=False, timeout=3)
+    parent_client = HttpxPool.get("test")
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        ok = HttpxPool.client_names() == [] and (
+            HttpxPool.get("test") is not parent_client
+            and HttpxPool.get("test").timeout == httpx.Timeout(3)
+        )
+        os.write(write_fd, b"1" if ok else b"0")
+        os._exit(0)
+
+    os.close(write_fd)
+    result = os.read(read_fd, 1)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+
+    assert result == b"1"
+    assert HttpxPool.get("test") is parent_client
+    assert not parent_client.is_closed
+
+
+def test_collector_reports_every_client() -> None:
+    HttpxPool.init_client(name="a", http2=False)
+    HttpxPool.init_client(name="b", http2=False)
+
+    families = list(HttpxPoolCollector().collect())
+    assert len(families) == 1
+    samples = {
+        (sample.labels["client"], sample.labels["state"]): sample.value
+        for sample in families[0].samples
+    }
+    assert samples == {
+        ("a", "idle"): 0,
+        ("a", "active"): 0,
+        ("b", "idle"): 0,
+        ("b", "active"): 0,
+    }
@@ -0,0 +1,219 @@
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.models import Document
+from onyx.connectors.models import TextSection
+from onyx.document_index.interfaces import StoredChunkEmbedding
+from onyx.document_index.interfaces import StoredEmbeddingRetrievalCapable
+from onyx.document_index.vespa.chunk_retrieval import (
+    _stored_embedding_from_vespa_fields,
+)
+from onyx.indexing.chunk_fingerprint import embed_chunks_with_reuse
+from onyx.indexing.embedder import DefaultIndexingEmbedder
+from onyx.indexing.models import DocAwareChunk
+from onyx.indexing.models import IndexChunk
+
+
+class FakeStoredEmbeddingIndex(StoredEmbeddingRetrievalCapable):
+    def __init__(self) -> None:
+        self.stored: dict[tuple[str, int], StoredChunkEmbedding] = {}
+
+    def store(self, chunks: list[IndexChunk]) -> None:
+        for chunk in chunks:
+            self.stored[(chunk.source_document.id, chunk.chunk_id)] = (
+                StoredChunkEmbedding(
+                    content_hash=chunk.content_hash,
+                    embeddings=chunk.embeddings,
+                    title_embedding=chunk.title_embedding,
+                )
+            )
+
+    def get_stored_chunk_embeddings(
+        self, chunks: list[DocAwareChunk], tenant_id: str
+    ) -> list[StoredChunkEmbedding | None]:
+        return [
+            self.stored.get((chunk.source_document.id, chunk.chunk_id))
+            for chunk in chunks
+        ]
+
+
+@pytest.fixture
+def embedded_texts() -> Generator[list[str], None, None]:
+    embedded: list[str] = []
+
+    def _encode(texts: list[str], **kwargs: Any) -> list[list[float]]:
+        embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    with patch("onyx.indexing.embedder.EmbeddingModel") as mock_model:
+        mock_model.return_value.encode.side_effect = _encode
+        yield embedded
+
+
+def _make_embedder(model_name: str = "test-model") -> DefaultIndexingEmbedder:
+    embedder = DefaultIndexingEmbedder(
+        model_name=model_name,
+        normalize=True,
+        query_prefix=None,
+        passage_prefix=None,
+    )
+    embedding_model: Mock = embedder.embedding_model  # type: ignore[assignment]
+    embedding_model.model_name = model_name
+    embedding_model.deployment_name = None
+    embedding_model.provider_type = None
+    embedding_model.passage_prefix = None
+    embedding_model.normalize = True
+    embedding_model.reduced_dimension = None
+    return embedder
+
+
+def _make_chunks(doc_id: str, contents: list[str]) -> list[DocAwareChunk]:
+    document = Document(
+        id=doc_id,
+        source=DocumentSource.WEB,
+        semantic_identifier=doc_id,
+        title=f"{doc_id} title",
+        metadata={},
+        sections=[TextSection(text=" ".join(contents), link="link")],
+    )
+    return [
+        DocAwareChunk(
+            chunk_id=chunk_id,
+            blurb=content,
+            content=content,
+            source_links={0: "link"},
+            section_continuation=False,
+            source_document=document,
+            title_prefix=f"{doc_id} title\n",
+            metadata_suffix_semantic="",
+            metadata_suffix_keyword="",
+            mini_chunk_texts=None,
+            large_chunk_id=None,
+            image_file_id=None,
+            chunk_context="",
+            doc_summary="",
+            contextual_rag_reserved_tokens=0,
+        )
+        for chunk_id, content in enumerate(contents)
+    ]
+
+
+def test_unchanged_chunks_reuse_stored_embeddings(embedded_texts: list[str]) -> None:
+    embedder = _make_embedder()
+    document_index: Any = FakeStoredEmbeddingIndex()
+
+    first_pass, failures, num_reused = embed_chunks_with_reuse(
+        chunks=_make_chunks("doc", ["one", "two", "three"]),
+        embedder=embedder,
+        document_index=document_index,
+        tenant_id="tenant",
+    )
+    assert failures == []
+    assert num_reused == 0
+    document_index.store(first_pass)
+    embedded_texts.clear()
+
+    second_pass, failures, num_reused = embed_chunks_with_reuse(
+        chunks=_make_chunks("doc", ["one", "edited two", "three"]),
+        embedder=embedder,
+        document_index=document_index,
+        tenant_id="tenant",
+    )
+    assert failures == []
+    assert num_reused == 2
+    # only the edited chunk (and the title) went to the embedding model
+    assert embedded_texts == ["doc title\nedited two", "doc title"]
+    assert [chunk.chunk_id for chunk in second_pass] == [0, 1, 2]
+    assert second_pass[0].embeddings == first_pass[0].embeddings
+    assert second_pass[2].embeddings == first_pass[2].embeddings
+    assert second_pass[1].content_hash != first_pass[1].content_hash
+
+
+def test_model_change_invalidates_fingerprints(embedded_texts: list[str]) -> None:
+    document_index: Any = FakeStoredEmbeddingIndex()
+    first_pass, _, _ = embed_chunks_with_reuse(
+        chunks=_make_chunks("doc", ["one", "two"]),
+        embedder=_make_embedder("model-a"),
+        document_index=document_index,
+        tenant_id="tenant",
+    )
+    document_index.store(first_pass)
+
+    _, _, num_reused = embed_chunks_with_reuse(
+        chunks=_make_chunks("doc", ["one", "two"]),
+        embedder=_make_embedder("model-b"),
+        document_index=document_index,
+        tenant_id="tenant",
+    )
+    assert num_reused == 0
+
+
+def test_reused_chunks_of_failed_documents_are_dropped(
+    embedded_texts: list[str],
+) -> None:
+    embedder = _make_embedder()
+    document_index: Any = FakeStoredEmbeddingIndex()
+    first_pass, _, _ = embed_chunks_with_reuse(
+        chunks=_make_chunks("a", ["one", "two"]) + _make_chunks("b", ["three"]),
+        embedder=embedder,
+        document_index=document_index,
+        tenant_id="tenant",
+    )
+    document_index.store(first_pass)
+
+    def _encode(texts: list[str], **kwargs: Any) -> list[list[float]]:
+        if any(text.startswith("a title") for text in texts):
+            raise RuntimeError("embedding failed")
+        return [[0.0, 1.0] for _ in texts]
+
+    embedding_model: Mock = embedder.embedding_model  # type: ignore[assignment]
+    embedding_model.encode.side_effect = _encode
+    with patch("onyx.indexing.embedder.time.sleep"):
+        chunks_with_embeddings, failures, num_reused = embed_chunks_with_reuse(
+            chunks=_make_chunks("a", ["one", "edited"]) + _make_chunks("b", ["edited"]),
+            embedder=embedder,
+            document_index=document_index,
+            tenant_id="tenant",
+        )
+
+    assert [
+        failure.failed_document.document_id
+        for failure in failures
+        if failure.failed_document
+    ] == ["a"]
+    assert num_reused == 0
+    assert [
+        (chunk.source_document.id, chunk.chunk_id) for chunk in chunks_with_embeddings
+    ] == [("b", 0)]
+
+
+def test_parse_stored_vespa_embeddings() -> None:
+    stored = _stored_embedding_from_vespa_fields(
+        {
+            "content_hash": "abc",
+            "embeddings": {
+                "full_chunk": [1.0, 2.0],
+                "mini_chunk_1": [5.0, 6.0],
+                "mini_chunk_0": [3.0, 4.0],
+            },
+            "title_embedding": [7.0, 8.0],
+        }
+    )
+    assert stored is not None
+    assert stored.content_hash == "abc"
+    assert stored.embeddings.full_embedding == [1.0, 2.0]
+    assert stored.embeddings.mini_chunk_embeddings == [[3.0, 4.0], [5.0, 6.0]]
+    assert stored.title_embedding == [7.0, 8.0]
+
+    assert _stored_embedding_from_vespa_fields({"content_hash": "abc"}) is None
+    assert (
+        _stored_embedding_from_vespa_fields(
+            {"embeddings": {"full_chunk": [1.0], "mini_chunk_1": [2.0]}}
+        )
+        is None
+    )
@@ -0,0 +1,169 @@
+import contextlib
+import io
+import threading
+import time
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.models import Document
+from onyx.connectors.models import ImageSection
+from onyx.connectors.models import TextSection
+from onyx.indexing.image_section_summarizer import _ProviderRateLimiter
+from onyx.indexing.image_section_summarizer import IMAGE_NOT_FOUND_TEXT
+from onyx.indexing.image_section_summarizer import IMAGE_NOT_SUMMARIZED_TEXT
+from onyx.indexing.image_section_summarizer import summarize_image_sections
+
+_MODULE = "onyx.indexing.image_section_summarizer"
+
+
+class FakeFileStore:
+    def __init__(self, images: dict[str, bytes]) -> None:
+        self.images = images
+
+    def read_file_record(self, file_id: str) -> Any:
+        if file_id not in self.images:
+            return None
+        record = Mock()
+        record.display_name = f"{file_id}.png"
+        return record
+
+    def read_file(self, file_id: str) -> io.BytesIO:
+        return io.BytesIO(self.images[file_id])
+
+
+class FakeVisionLLM:
+    def __init__(self, barrier: threading.Barrier | None = None) -> None:
+        # makes every call wait until `barrier.parties` calls are in flight
+        self.barrier = barrier
+        self.summarized: list[bytes] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.config = Mock(model_provider="openai", model_name="gpt-4o")
+
+    def summarize(self, llm: Any, image_data: bytes, context_name: str) -> str | None:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.barrier:
+                self.barrier.wait(timeout=5)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.summarized.append(image_data)
+        if image_data == b"unsupported":
+            return None
+        return f"summary of {image_data.decode()}"
+
+
+@pytest.fixture
+def summary_cache() -> Generator[dict[str, str], None, None]:
+    cache: dict[str, str] = {}
+
+    def _get(cache_keys: list[str], db_session: Any) -> dict[str, str]:
+        return {key: cache[key] for key in cache_keys if key in cache}
+
+    def _store(cache_key_to_summary: dict[str, str], db_session: Any) -> None:
+        for key, summary in cache_key_to_summary.items():
+            cache.setdefault(key, summary)
+
+    with (
+        patch(f"{_MODULE}.get_session_with_current_tenant", contextlib.nullcontext),
+        patch(f"{_MODULE}.get_image_summaries", side_effect=_get),
+        patch(f"{_MODULE}.store_image_summaries", side_effect=_store),
+    ):
+        yield cache
+
+
+def _make_document(doc_id: str, image_file_ids: list[str]) -> Document:
+    return Document(
+        id=doc_id,
+        source=DocumentSource.FILE,
+        semantic_identifier=doc_id,
+        metadata={},
+        sections=[TextSection(text="intro", link=None)]
+        + [
+            ImageSection(image_file_id=image_file_id, link=None)
+            for image_file_id in image_file_ids
+        ],
+    )
+
+
+def _summarize(
+    documents: list[Document], images: dict[str, bytes], llm: FakeVisionLLM
+) -> dict[str, str]:
+    with (
+        patch(f"{_MODULE}.get_default_file_store", return_value=FakeFileStore(images)),
+        patch(
+            f"{_MODULE}.summarize_image_with_error_handling", side_effect=llm.summarize
+        ),
+    ):
+        return summarize_image_sections(documents, llm)  # type: ignore[arg-type]
+
+
+def test_duplicate_images_are_summarized_once(summary_cache: dict[str, str]) -> None:
+    images = {"logo_a": b"logo", "logo_b": b"logo", "chart": b"chart"}
+    documents = [
+        _make_document("doc1", ["logo_a", "chart"]),
+        _make_document("doc2", ["logo_b", "logo_a"]),
+    ]
+    llm = FakeVisionLLM()
+
+    texts = _summarize(documents, images, llm)
+    assert texts == {
+        "logo_a": "summary of logo",
+        "logo_b": "summary of logo",
+        "chart": "summary of chart",
+    }
+    assert sorted(llm.summarized) == [b"chart", b"logo"]
+    assert len(summary_cache) == 2
+
+    # reindexing the same documents never calls the LLM again
+    rerun_llm = FakeVisionLLM()
+    assert _summarize(documents, images, rerun_llm) == texts
+    assert rerun_llm.summarized == []
+
+
+def test_missing_and_unsupported_images(summary_cache: dict[str, str]) -> None:
+    images = {"broken": b"unsupported"}
+    texts = _summarize(
+        [_make_document("doc", ["missing", "broken"])], images, FakeVisionLLM()
+    )
+    assert texts == {
+        "missing": IMAGE_NOT_FOUND_TEXT,
+        "broken": IMAGE_NOT_SUMMARIZED_TEXT,
+    }
+    # failed summaries are not cached
+    assert summary_cache == {}
+
+
+def test_images_are_summarized_concurrently(summary_cache: dict[str, str]) -> None:
+    num_threads = 4
+    images = {f"slide_{i}": f"slide {i}".encode() for i in range(16)}
+    documents = [_make_document("deck", list(images))]
+    # calls made one after another would never get past the barrier
+    llm = FakeVisionLLM(barrier=threading.Barrier(num_threads))
+
+    with patch(f"{_MODULE}.IMAGE_SUMMARIZATION_NUM_THREADS", num_threads):
+        texts = _summarize(documents, images, llm)
+
+    assert texts == {
+        image_file_id: f"summary of {image.decode()}"
+        for image_file_id, image in images.items()
+    }
+    assert llm.max_in_flight == num_threads
+
+
+def test_provider_rate_limiter_spaces_out_calls() -> None:
+    limiter = _ProviderRateLimiter(max_per_minute=600)  # one call per 100ms
+
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.wait()
+    assert time.monotonic() - start >= 0.2
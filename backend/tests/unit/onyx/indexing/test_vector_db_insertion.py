@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from onyx.document_index.interfaces import DocumentInsertionRecord
+from onyx.document_index.interfaces import IndexBatchParams
+from onyx.document_index.interfaces_new import (
+    DocumentInsertionRecord as NewDocumentInsertionRecord,
+)
+from onyx.document_index.interfaces_new import PartialIndexingError
+from onyx.indexing.vector_db_insertion import write_chunks_to_vector_db_with_backoff
+
+
+def _make_chunk(doc_id: str) -> Any:
+    return SimpleNamespace(
+        source_document=SimpleNamespace(id=doc_id),
+        get_link=lambda: f"https://example.com/{doc_id}",
+    )
+
+
+_INDEX_BATCH_PARAMS = IndexBatchParams(
+    doc_id_to_previous_chunk_cnt={},
+    doc_id_to_new_chunk_cnt={},
+    tenant_id="public",
+    large_chunks_enabled=False,
+)
+
+
+@patch("onyx.indexing.vector_db_insertion.time.sleep")
+def test_partial_failure_only_retries_failed_documents(mock_sleep: Mock) -> None:
+    chunks = [_make_chunk("a"), _make_chunk("a"), _make_chunk("b"), _make_chunk("c")]
+    index_calls: list[list[str]] = []
+
+    def index(chunks: list[Any], index_batch_params: IndexBatchParams) -> Any:
+        doc_ids = [chunk.source_document.id for chunk in chunks]
+        index_calls.append(doc_ids)
+        if len(index_calls) == 1:
+            raise PartialIndexingError(
+                insertion_records=[
+                    NewDocumentInsertionRecord(document_id="a", already_existed=True)
+                ],
+                failed_document_id_to_error={"b": "rejected", "c": "mapping error"},
+            )
+        if doc_ids == ["c"]:
+            raise RuntimeError("mapping error")
+        return [
+            DocumentInsertionRecord(document_id=doc_id, already_existed=False)
+            for doc_id in set(doc_ids)
+        ]
+
+    document_index = Mock()
+    document_index.index.side_effect = index
+
+    insertion_records, failures = write_chunks_to_vector_db_with_backoff(
+        document_index=document_index,
+        chunks=chunks,
+        index_batch_params=_INDEX_BATCH_PARAMS,
+    )
+
+    # the documents written by the batch are not written again
+    assert index_calls == [["a", "a", "b", "c"], ["b"], ["c"]]
+    assert insertion_records == [
+        DocumentInsertionRecord(document_id="a", already_existed=True),
+        DocumentInsertionRecord(document_id="b", already_existed=False),
+    ]
+    assert len(failures) == 1
+    assert failures[0].failed_document is not None
+    assert failures[0].failed_document.document_id == "c"
+    assert failures[0].failed_document.document_link == "https://example.com/c"
+    assert failures[0].failure_message == "mapping error"
@@ -0,0 +1,111 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from onyx.kg.clustering import clustering
+from onyx.kg.clustering.clustering import _cluster_grounded_entity_batch
+from onyx.kg.clustering.clustering import _score_similar_entities
+
+_TYPE = "ACCOUNT"
+
+
+def _staged(name: str, document_id: str | None = None) -> Any:
+    return SimpleNamespace(
+        id_name=f"staged::{name}",
+        name=name,
+        entity_type_id_name=_TYPE,
+        document_id=document_id,
+    )
+
+
+def _entity(name: str, document_id: str | None = None) -> Any:
+    return SimpleNamespace(
+        id_name=f"{_TYPE}::{name}",
+        name=name,
+        entity_type_id_name=_TYPE,
+        document_id=document_id,
+    )
+
+
+class _FakeWriter:
+    def __init__(self) -> None:
+        self.merged: list[tuple[str, str]] = []
+        self.transferred: list[str] = []
+
+    def merge(self, db_session: Any, parent: Any, child: Any) -> Any:
+        self.merged.append((child.name, parent.name))
+        return parent
+
+    def transfer(self, db_session: Any, entity: Any) -> Any:
+        self.transferred.append(entity.name)
+        return _entity(entity.name.lower(), entity.document_id)
+
+
+def _cluster(
+    staged: list[Any],
+    similar_entities: dict[int, list[Any]],
+    semantic_ids: dict[str, str] | None = None,
+) -> _FakeWriter:
+    writer = _FakeWriter()
+    db_session = MagicMock()
+    db_session.execute.return_value = list((semantic_ids or {}).items())
+
+    @contextmanager
+    def _session() -> Iterator[MagicMock]:
+        yield db_session
+
+    with (
+        patch.object(clustering, "get_session_with_current_tenant", _session),
+        patch.object(
+            clustering,
+            "_get_similar_entities_for_batch",
+            return_value=similar_entities,
+        ),
+        patch.object(clustering, "merge_entities", side_effect=writer.merge),
+        patch.object(clustering, "transfer_entity", side_effect=writer.transfer),
+    ):
+        _cluster_grounded_entity_batch(staged)
+
+    db_session.commit.assert_called_once()
+    return writer
+
+
+def test_entities_created_earlier_in_the_batch_are_clustered() -> None:
+    writer = _cluster([_staged("Acme Corporation"), _staged("Acme Corporation.")], {})
+
+    assert writer.transferred == ["Acme Corporation"]
+    assert writer.merged == [("Acme Corporation.", "acme corporation")]
+
+
+def test_best_similar_entity_is_merged_into() -> None:
+    similar = [_entity("acme corporations"), _entity("acme corporation")]
+
+    writer = _cluster([_staged("Acme Corporation")], {0: similar})
+
+    assert writer.merged == [("Acme Corporation", "acme corporation")]
+    assert writer.transferred == []
+
+
+def test_document_entities_are_not_merged_into_document_entities() -> None:
+    similar = [_entity("quarterly report", document_id="doc-1")]
+
+    writer = _cluster(
+        [_staged("Report", document_id="doc-2")],
+        {0: similar},
+        semantic_ids={"doc-2": "Quarterly Report"},
+    )
+
+    assert writer.merged == []
+    assert writer.transferred == ["Report"]
+
+
+def test_names_with_digits_are_not_scored() -> None:
+    scores = _score_similar_entities(
+        ["acme corporation"],
+        {0: [_entity("acme corporation"), _entity("acme corporation 2")]},
+    )
+
+    assert scores == {(0, f"{_TYPE}::acme corporation"): 100.0}
@@ -0,0 +1,75 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from sqlalchemy import Column
+from sqlalchemy import MetaData
+from sqlalchemy import String
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql
+
+# onyx.db.relationships can only be imported after onyx.db.document (circular import)
+from onyx.db import document  # noqa: F401
+from onyx.kg.clustering import normalizations
+from onyx.kg.clustering.normalizations import _normalize_entity_batch
+from onyx.kg.clustering.normalizations import normalize_entities
+
+
+def test_entities_are_normalized_with_a_single_batch() -> None:
+    normalize_batch = MagicMock(return_value=["ACCOUNT::acme_id", None])
+    entities = ["ACCOUNT::Acme", "ACCOUNT::Unknown"]
+
+    with patch.object(normalizations, "_normalize_entity_batch", normalize_batch):
+        result = normalize_entities(
+            entities, [f"{entity}--[]" for entity in entities], "allowed_docs"
+        )
+
+    normalize_batch.assert_called_once_with(entities, [{}, {}], "allowed_docs")
+    assert result.entities == ["ACCOUNT::acme_id"]
+    assert result.entity_normalization_map == {
+        "ACCOUNT::Acme": "ACCOUNT::acme_id",
+        "ACCOUNT::Unknown": "ACCOUNT::Unknown",
+    }
+
+
+def test_batch_retrieves_every_entity_in_one_query() -> None:
+    allowed_docs = Table("allowed_docs", MetaData(), Column("allowed_doc_id", String))
+    db_session = MagicMock()
+    db_session.execute.return_value = [
+        (0, "ACCOUNT::acme_id", "acme", 0.9),
+        (2, "ACCOUNT::initech_id", "initech", 0.9),
+    ]
+
+    @contextmanager
+    def _session() -> Iterator[MagicMock]:
+        yield db_session
+
+    with (
+        patch.object(normalizations, "get_session_with_current_tenant", _session),
+        patch.object(
+            normalizations,
+            "_reflect_allowed_docs_temp_view",
+            return_value=allowed_docs,
+        ) as reflect,
+    ):
+        normalized = _normalize_entity_batch(
+            ["ACCOUNT::Acme", "ACCOUNT::*", "ACCOUNT::Initech", "ACCOUNT::Hooli"],
+            [{}, {}, {"subtype": "customer"}, {}],
+            "allowed_docs",
+        )
+
+    assert normalized == [
+        "ACCOUNT::acme_id",
+        "ACCOUNT::*",
+        "ACCOUNT::initech_id",
+        None,
+    ]
+    reflect.assert_called_once()
+    db_session.execute.assert_called_once()
+    sql = str(
+        db_session.execute.call_args.args[0].compile(
+            dialect=postgresql.dialect()  # type: ignore[no-untyped-call]
+        )
+    )
+    assert "LATERAL" in sql
@@ -0,0 +1,91 @@
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+
+from onyx.llm import utils as llm_utils
+from onyx.llm.constants import LlmProviderNames
+from onyx.llm.models import UserMessage
+from onyx.llm.multi_llm import LitellmLLM
+from onyx.llm.utils import clear_model_capabilities_cache
+from onyx.llm.utils import get_max_input_tokens
+from onyx.llm.utils import get_model_capabilities
+from onyx.llm.utils import get_model_map
+from onyx.llm.utils import is_true_openai_model
+from onyx.llm.utils import model_is_reasoning_model
+
+_MODELS = [
+    (LlmProviderNames.OPENAI, "gpt-4o"),
+    (LlmProviderNames.OPENAI, "o3-mini"),
+    (LlmProviderNames.ANTHROPIC, "claude-sonnet-4-20250514"),
+    (LlmProviderNames.LITELLM_PROXY, "azure/gpt-4"),
+    (LlmProviderNames.OLLAMA_CHAT, "my-custom-model:latest"),
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_capabilities() -> Generator[None, None, None]:
+    clear_model_capabilities_cache()
+    yield
+    clear_model_capabilities_cache()
+
+
+@pytest.mark.parametrize("model_provider,model_name", _MODELS)
+def test_capabilities_match_the_model_map(model_provider: str, model_name: str) -> None:
+    model_map = get_model_map()
+
+    capabilities = get_model_capabilities(model_provider, model_name)
+
+    assert capabilities.supports_reasoning == bool(
+        llm_utils._model_is_reasoning_model(model_map, model_name, model_provider)
+    )
+    assert capabilities.uses_responses_api == llm_utils._is_true_openai_model(
+        model_map, model_provider, model_name
+    )
+    assert capabilities.max_input_tokens == llm_utils.llm_max_input_tokens(
+        model_map, model_name, model_provider
+    )
+
+
+def test_model_is_resolved_once() -> None:
+    with patch.object(
+        llm_utils, "find_model_obj", side_effect=llm_utils.find_model_obj
+    ) as find_model_obj:
+        for _ in range(3):
+            model_is_reasoning_model("gpt-4o", LlmProviderNames.OPENAI)
+            is_true_openai_model(LlmProviderNames.OPENAI, "gpt-4o")
+            get_max_input_tokens("gpt-4o", LlmProviderNames.OPENAI)
+        lookups = find_model_obj.call_count
+
+        clear_model_capabilities_cache()
+        model_is_reasoning_model("gpt-4o", LlmProviderNames.OPENAI)
+
+    assert lookups > 0
+    assert find_model_obj.call_count == 2 * lookups
+
+
+def test_completion_arguments_resolve_the_model_once() -> None:
+    """Before the capability index, every `LitellmLLM._completion` call resolved the
+    model against the model map again."""
+    llm = LitellmLLM(
+        api_key="test_key",
+        timeout=30,
+        model_provider=LlmProviderNames.OLLAMA_CHAT,
+        model_name="my-custom-model:latest",
+        max_input_tokens=4096,
+    )
+    prompt = [UserMessage(content="Hi")]
+
+    with (
+        patch("litellm.completion"),
+        patch.object(
+            llm_utils, "find_model_obj", side_effect=llm_utils.find_model_obj
+        ) as find_model_obj,
+    ):
+        llm._completion(prompt, None, None, False, False)
+        lookups = find_model_obj.call_count
+        for _ in range(10):
+            llm._completion(prompt, None, None, False, False)
+
+    assert lookups > 0
+    assert find_model_obj.call_count == lookups
@@ -1,17 +1,30 @@
+import threading
+import time
 from collections.abc import AsyncGenerator
+from typing import Any
 from typing import List
 from unittest.mock import AsyncMock
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 from httpx import AsyncClient
 from litellm.exceptions import RateLimitError
 
 from onyx.llm.constants import LlmProviderNames
 from onyx.natural_language_processing.search_nlp_models import CloudEmbedding
+from onyx.natural_language_processing.search_nlp_models import EmbeddingModel
+from shared_configs.embedding_codec import build_binary_accept_header
+from shared_configs.embedding_codec import decode_embeddings_to_lists
+from shared_configs.embedding_codec import EMBEDDING_BINARY_MEDIA_TYPE
+from shared_configs.embedding_codec import EmbeddingWireDtype
+from shared_configs.embedding_codec import encode_embeddings
+from shared_configs.embedding_codec import parse_binary_accept_header
 from shared_configs.enums import EmbeddingProvider
 from shared_configs.enums import EmbedTextType
+from shared_configs.model_server_models import EmbedRequest
+from shared_configs.model_server_models import EmbedResponse
 
 
 @pytest.fixture
@@ -84,3 +97,123 @@ async def test_rate_limit_handling() -> None:
                 model_name="fake-model",
                 text_type=EmbedTextType.QUERY,
             )
+
+
+def _make_local_embedding_model(binary_transport: bool) -> EmbeddingModel:
+    with patch("onyx.natural_language_processing.search_nlp_models.get_tokenizer"):
+        return EmbeddingModel(
+            server_host="localhost",
+            server_port=9000,
+            model_name="fake-local-model",
+            normalize=True,
+            query_prefix=None,
+            passage_prefix=None,
+            api_key=None,
+            api_url=None,
+            provider_type=None,
+            binary_transport=binary_transport,
+        )
+
+
+def _make_embed_request() -> EmbedRequest:
+    return EmbedRequest(
+        texts=["a", "b"],
+        model_name="fake-local-model",
+        max_context_length=512,
+        normalize_embeddings=True,
+        text_type=EmbedTextType.QUERY,
+    )
+
+
+@pytest.mark.parametrize(
+    "wire_dtype", [EmbeddingWireDtype.FLOAT32, EmbeddingWireDtype.FLOAT16]
+)
+def test_embedding_codec_round_trip(wire_dtype: EmbeddingWireDtype) -> None:
+    vectors = np.array([[0.5, -0.25, 1.0], [0.125, 0.0, -2.0]], dtype=np.float32)
+
+    payload = encode_embeddings(vectors, wire_dtype)
+
+    assert decode_embeddings_to_lists(payload) == vectors.tolist()
+
+
+def test_parse_binary_accept_header() -> None:
+    assert (
+        parse_binary_accept_header(
+            build_binary_accept_header(EmbeddingWireDtype.FLOAT16)
+        )
+        == EmbeddingWireDtype.FLOAT16
+    )
+    assert parse_binary_accept_header("application/json") is None
+    assert parse_binary_accept_header(None) is None
+
+
+def test_model_server_request_decodes_binary_response() -> None:
+    model = _make_local_embedding_model(binary_transport=True)
+    vectors = np.array([[0.5, 0.25], [1.0, -1.0]], dtype=np.float32)
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.headers = {"Content-Type": EMBEDDING_BINARY_MEDIA_TYPE}
+    mock_response.content = encode_embeddings(vectors, EmbeddingWireDtype.FLOAT32)
+
+    with patch(
+        "onyx.natural_language_processing.search_nlp_models.get_model_server_session"
+    ) as mock_session:
+        mock_post = mock_session.return_value.post
+        mock_post.return_value = mock_response
+        response = model._make_model_server_request(_make_embed_request())
+
+    assert response.embeddings == vectors.tolist()
+    assert (
+        EMBEDDING_BINARY_MEDIA_TYPE in mock_post.call_args.kwargs["headers"]["Accept"]
+    )
+
+
+def test_model_server_request_falls_back_to_json() -> None:
+    # an older model server ignores the Accept header and replies with JSON
+    model = _make_local_embedding_model(binary_transport=True)
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.headers = {"Content-Type": "application/json"}
+    mock_response.json.return_value = {"embeddings": [[0.1, 0.2], [0.3, 0.4]]}
+
+    with patch(
+        "onyx.natural_language_processing.search_nlp_models.get_model_server_session"
+    ) as mock_session:
+        mock_session.return_value.post.return_value = mock_response
+        response = model._make_model_server_request(_make_embed_request())
+
+    assert response.embeddings == [[0.1, 0.2], [0.3, 0.4]]
+
+
+def test_local_batches_are_pipelined() -> None:
+    model = _make_local_embedding_model(binary_transport=False)
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def fake_request(embed_request: EmbedRequest, **kwargs: Any) -> EmbedResponse:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return EmbedResponse(
+            embeddings=[[float(len(text))] for text in embed_request.texts]
+        )
+
+    texts = ["x" * i for i in range(1, 9)]
+    with patch.object(model, "_make_model_server_request", side_effect=fake_request):
+        embeddings = model._batch_encode_texts(
+            texts=texts,
+            text_type=EmbedTextType.PASSAGE,
+            batch_size=2,
+            max_seq_length=512,
+        )
+
+    # order is preserved even though batches complete out of order
+    assert embeddings == [[float(i)] for i in range(1, 9)]
+    assert max_in_flight == 2
@@ -0,0 +1,84 @@
+from typing import Any
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from onyx.access.models import DocExternalAccess
+from onyx.access.models import ExternalAccess
+from onyx.redis.redis_connector_doc_perm_sync import PermissionSyncResult
+from onyx.redis.redis_connector_doc_perm_sync import RedisConnectorPermissionSync
+
+_MODULE = "onyx.redis.redis_connector_doc_perm_sync"
+
+
+class _FakePermissionWriter:
+    def __init__(self, failing_doc_ids: set[str] | None = None) -> None:
+        self.failing_doc_ids = failing_doc_ids or set()
+        self.batches: list[list[str]] = []
+        self.single_docs: list[str] = []
+
+    def update_batch(self, tenant_id: str, permissions: list[Any], *args: Any) -> int:
+        doc_ids = [permission.doc_id for permission in permissions]
+        self.batches.append(doc_ids)
+        if self.failing_doc_ids.intersection(doc_ids):
+            raise RuntimeError("batch failed")
+        # pretend every other document was unchanged
+        return len(doc_ids) // 2
+
+    def update_single(self, tenant_id: str, permission: Any, *args: Any) -> bool:
+        if permission.doc_id in self.failing_doc_ids:
+            raise RuntimeError("doc failed")
+        self.single_docs.append(permission.doc_id)
+        return True
+
+    def fetch(self, module: str, attribute: str) -> Any:
+        if attribute == "document_update_permissions_batch":
+            return self.update_batch
+        return self.update_single
+
+
+def _doc_access(doc_id: str, num_emails: int = 1) -> DocExternalAccess:
+    return DocExternalAccess(
+        external_access=ExternalAccess(
+            external_user_emails={f"user{i}@example.com" for i in range(num_emails)},
+            external_user_group_ids=set(),
+            is_public=False,
+        ),
+        doc_id=doc_id,
+    )
+
+
+def _update_db(
+    writer: _FakePermissionWriter, permissions: list[DocExternalAccess]
+) -> PermissionSyncResult:
+    perm_sync = RedisConnectorPermissionSync("tenant", 1, Mock())
+    with patch(f"{_MODULE}.fetch_versioned_implementation", side_effect=writer.fetch):
+        return perm_sync.update_db(
+            lock=Mock(),
+            new_permissions=permissions,
+            source_string="google_drive",
+            connector_id=1,
+            credential_id=1,
+        )
+
+
+def test_documents_are_written_in_one_batch() -> None:
+    writer = _FakePermissionWriter()
+    too_large = _doc_access("huge", num_emails=ExternalAccess.MAX_NUM_ENTRIES + 1)
+
+    result = _update_db(writer, [_doc_access("a"), too_large, _doc_access("b")])
+
+    assert writer.batches == [["a", "b"]]
+    assert writer.single_docs == []
+    assert result.num_updated == 2
+    assert result.num_errors == 0
+    assert result.num_changed == 1
+
+
+def test_failed_batch_is_retried_one_document_at_a_time() -> None:
+    writer = _FakePermissionWriter(failing_doc_ids={"b"})
+
+    result = _update_db(writer, [_doc_access("a"), _doc_access("b"), _doc_access("c")])
+
+    assert writer.single_docs == ["a", "c"]
+    assert result.num_updated == 2
+    assert result.num_errors == 1
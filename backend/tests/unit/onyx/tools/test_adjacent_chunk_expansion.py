@@ -0,0 +1,211 @@
+"""Tests for the batched adjacent-chunk expansion."""
+
+from typing import Any
+from unittest.mock import patch
+
+from onyx.configs.constants import DocumentSource
+from onyx.context.search.models import ContextExpansionType
+from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import InferenceChunk
+from onyx.context.search.models import InferenceSection
+from onyx.document_index.interfaces import IdRetrievalCapable
+from onyx.document_index.interfaces import VespaChunkRequest
+from onyx.tools.tool_implementations.search.constants import (
+    FULL_DOC_NUM_CHUNKS_AROUND,
+)
+from onyx.tools.tool_implementations.search.search_utils import (
+    _retrieve_adjacent_chunks,
+)
+from onyx.tools.tool_implementations.search.search_utils import (
+    expand_section_with_context,
+)
+from onyx.tools.tool_implementations.search.search_utils import (
+    retrieve_adjacent_chunks_batch,
+)
+
+_MODULE = "onyx.tools.tool_implementations.search.search_utils"
+
+
+def _make_chunk(doc_id: str, chunk_id: int) -> InferenceChunk:
+    return InferenceChunk(
+        document_id=doc_id,
+        chunk_id=chunk_id,
+        blurb="",
+        content=f"{doc_id}-{chunk_id}",
+        source_links=None,
+        section_continuation=False,
+        source_type=DocumentSource.WEB,
+        semantic_identifier=doc_id,
+        title=doc_id,
+        boost=0,
+        score=None,
+        hidden=False,
+        metadata={},
+        match_highlights=[],
+        updated_at=None,
+        image_file_id=None,
+        doc_summary="",
+        chunk_context="",
+    )
+
+
+def _make_section(doc_id: str, chunk_ids: list[int]) -> InferenceSection:
+    chunks = [_make_chunk(doc_id, chunk_id) for chunk_id in chunk_ids]
+    return InferenceSection(
+        center_chunk=chunks[0],
+        chunks=chunks,
+        combined_content="\n".join(chunk.content for chunk in chunks),
+    )
+
+
+class FakeChunkIndex:
+    """In-memory index that counts requests."""
+
+    chunk_window_retrieval = IdRetrievalCapable.chunk_window_retrieval
+    _chunk_window_document_id = IdRetrievalCapable._chunk_window_document_id
+
+    def __init__(self, num_chunks_per_doc: dict[str, int]) -> None:
+        self.chunks = {
+            doc_id: [_make_chunk(doc_id, i) for i in range(num_chunks)]
+            for doc_id, num_chunks in num_chunks_per_doc.items()
+        }
+        self.num_requests = 0
+
+    def id_based_retrieval(
+        self,
+        chunk_requests: list[VespaChunkRequest],
+        filters: IndexFilters,
+        batch_retrieval: bool = False,
+    ) -> list[InferenceChunk]:
+        self.num_requests += 1
+
+        # like Vespa's OR query, every matching chunk is only returned once
+        matched: dict[tuple[str, int], InferenceChunk] = {}
+        for request in chunk_requests:
+            for chunk in self.chunks.get(request.document_id, []):
+                if (request.min_chunk_ind or 0) <= chunk.chunk_id and (
+                    request.max_chunk_ind is None
+                    or chunk.chunk_id <= request.max_chunk_ind
+                ):
+                    matched[(chunk.document_id, chunk.chunk_id)] = chunk
+        return list(matched.values())
+
+
+def _chunk_ids(chunks: list[InferenceChunk]) -> list[int]:
+    return [chunk.chunk_id for chunk in chunks]
+
+
+def test_batch_matches_per_section_retrieval() -> None:
+    document_index: Any = FakeChunkIndex({"a": 20, "b": 3, "c": 8})
+    sections = [
+        _make_section("a", [10, 11]),
+        _make_section("b", [0]),
+        _make_section("a", [12]),  # overlaps the first section's window
+        _make_section("c", [7]),
+    ]
+
+    batched = retrieve_adjacent_chunks_batch(
+        sections, document_index, num_chunks_above=3, num_chunks_below=3
+    )
+    assert document_index.num_requests == 1
+
+    expected = [
+        _retrieve_adjacent_chunks(section, document_index, 3, 3) for section in sections
+    ]
+    assert [(_chunk_ids(above), _chunk_ids(below)) for above, below in batched] == [
+        (_chunk_ids(above), _chunk_ids(below)) for above, below in expected
+    ]
+    assert [(_chunk_ids(above), _chunk_ids(below)) for above, below in batched] == [
+        ([7, 8, 9], [12, 13, 14]),
+        ([], [1, 2]),
+        ([9, 10, 11], [13, 14, 15]),
+        ([4, 5, 6], []),
+    ]
+
+
+def test_batch_returns_empty_context_on_failure() -> None:
+    document_index: Any = FakeChunkIndex({"a": 5})
+
+    def _raise(*args: Any, **kwargs: Any) -> list[InferenceChunk]:
+        raise RuntimeError("index unavailable")
+
+    document_index.id_based_retrieval = _raise
+    sections = [_make_section("a", [2]), _make_section("a", [4])]
+
+    assert retrieve_adjacent_chunks_batch(sections, document_index, 2, 2) == [
+        ([], []),
+        ([], []),
+    ]
+
+
+def test_expansion_with_prefetched_chunks_skips_the_index() -> None:
+    document_index: Any = FakeChunkIndex({"a": 20})
+    section = _make_section("a", [10])
+    [adjacent_chunks] = retrieve_adjacent_chunks_batch(
+        [section],
+        document_index,
+        num_chunks_above=FULL_DOC_NUM_CHUNKS_AROUND,
+        num_chunks_below=FULL_DOC_NUM_CHUNKS_AROUND,
+    )
+    document_index.num_requests = 0
+
+    captured: dict[str, Any] = {}
+
+    def fake_classify(**kwargs: Any) -> ContextExpansionType:
+        captured.update(kwargs)
+        return ContextExpansionType.INCLUDE_ADJACENT_SECTIONS
+
+    with patch(f"{_MODULE}.classify_section_relevance", side_effect=fake_classify):
+        expanded = expand_section_with_context(
+            section=section,
+            user_query="query",
+            llm=None,  # type: ignore[arg-type]
+            document_index=document_index,
+            adjacent_chunks=adjacent_chunks,
+        )
+
+    assert document_index.num_requests == 0
+    # the prompt still only sees the 2 closest chunks on each side
+    assert captured["section_above_text"] == "a-8 a-9"
+    assert captured["section_below_text"] == "a-11 a-12"
+    assert expanded is not None
+    assert _chunk_ids(expanded.chunks) == [8, 9, 10, 11, 12]
+
+    expanded_full = expand_section_with_context(
+        section=section,
+        user_query="query",
+        llm=None,  # type: ignore[arg-type]
+        document_index=document_index,
+        expand_override=True,
+        adjacent_chunks=adjacent_chunks,
+    )
+    assert document_index.num_requests == 0
+    assert expanded_full is not None
+    assert _chunk_ids(expanded_full.chunks) == list(range(5, 16))
+
+
+def test_batched_expansion_makes_a_single_index_request() -> None:
+    """Expanding 10 sections used to cost an index round trip per side per section
+    (twice when the section ends up needing full document context)."""
+    sections = [_make_section(f"doc_{i}", [10]) for i in range(10)]
+
+    per_section_index: Any = FakeChunkIndex({f"doc_{i}": 30 for i in range(10)})
+    for section in sections:
+        _retrieve_adjacent_chunks(section, per_section_index, 2, 2)
+        _retrieve_adjacent_chunks(
+            section,
+            per_section_index,
+            FULL_DOC_NUM_CHUNKS_AROUND,
+            FULL_DOC_NUM_CHUNKS_AROUND,
+        )
+
+    batched_index: Any = FakeChunkIndex({f"doc_{i}": 30 for i in range(10)})
+    retrieve_adjacent_chunks_batch(
+        sections,
+        batched_index,
+        num_chunks_above=FULL_DOC_NUM_CHUNKS_AROUND,
+        num_chunks_below=FULL_DOC_NUM_CHUNKS_AROUND,
+    )
+
+    assert per_section_index.num_requests == 20
+    assert batched_index.num_requests == 1
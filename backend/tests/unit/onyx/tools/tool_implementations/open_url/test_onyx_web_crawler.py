@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections.abc import Generator
+from collections.abc import Iterator
+from typing import Any
+
 import pytest
 from pydantic import BaseModel
 
@@ -14,6 +20,22 @@ class FakeResponse(BaseModel):
     text: str = ""
     apparent_encoding: str | None = None
     encoding: str | None = None
+    chunks_read: int = 0
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            self.chunks_read += 1
+            yield self.content[start : start + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def clear_page_cache() -> Generator[None, None, None]:
+    crawler_module._page_cache.clear()
+    yield
+    crawler_module._page_cache.clear()
 
 
 def test_fetch_url_pdf_with_content_type(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -181,3 +203,120 @@ def test_fetch_url_html_within_size_limit(monkeypatch: pytest.MonkeyPatch) -> No
 
     assert "hello world" in result.full_content
     assert result.scrape_successful is True
+
+
+def test_fetch_url_stops_reading_at_size_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A body over the limit is not downloaded past the limit."""
+    crawler = OnyxWebCrawler(max_html_size_bytes=100 * 1024)
+    response = FakeResponse(
+        status_code=200,
+        headers={"Content-Type": "text/html"},
+        content=b"<html><body>" + b"x" * (10 * 1024 * 1024) + b"</body></html>",
+    )
+
+    monkeypatch.setattr(
+        crawler_module,
+        "ssrf_safe_get",
+        lambda *args, **kwargs: response,
+    )
+
+    result = crawler._fetch_url("https://example.com/huge.html")
+
+    assert result.scrape_successful is False
+    assert response.chunks_read * crawler_module._STREAM_CHUNK_SIZE < 1024 * 1024
+
+
+def test_fetch_url_rejects_declared_size_over_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    crawler = OnyxWebCrawler(max_pdf_size_bytes=10 * 1024)
+    response = FakeResponse(
+        status_code=200,
+        headers={
+            "Content-Type": "application/pdf",
+            "Content-Length": str(50 * 1024 * 1024),
+        },
+        content=b"%PDF-1.4 " + b"x" * (1024 * 1024),
+    )
+
+    monkeypatch.setattr(
+        crawler_module,
+        "ssrf_safe_get",
+        lambda *args, **kwargs: response,
+    )
+
+    result = crawler._fetch_url("https://example.com/huge.pdf")
+
+    assert result.scrape_successful is False
+    assert response.chunks_read == 1
+
+
+def test_repeated_fetches_are_served_from_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    crawler = OnyxWebCrawler()
+    requests_headers: list[dict[str, str]] = []
+
+    def _get(url: str, headers: dict[str, str], **kwargs: Any) -> FakeResponse:
+        requests_headers.append(headers)
+        if "If-None-Match" in headers:
+            return FakeResponse(status_code=304, headers={}, content=b"")
+        return FakeResponse(
+            status_code=200,
+            headers={"Content-Type": "text/html", "ETag": '"v1"'},
+            content=b"<html><body>hello world</body></html>",
+        )
+
+    monkeypatch.setattr(crawler_module, "ssrf_safe_get", _get)
+
+    first = crawler._fetch_url("https://Example.com/page#intro")
+    second = crawler._fetch_url("https://example.com/page")
+    assert len(requests_headers) == 1
+    assert second.full_content == first.full_content
+
+    # once expired, the page is revalidated with its ETag instead of refetched
+    expired = time.monotonic() + 3600
+    monkeypatch.setattr(crawler_module.time, "monotonic", lambda: expired)
+    third = crawler._fetch_url("https://example.com/page")
+
+    assert len(requests_headers) == 2
+    assert requests_headers[1]["If-None-Match"] == '"v1"'
+    assert third.full_content == first.full_content
+    assert third.scrape_successful is True
+
+
+def test_contents_fetches_concurrently_with_a_per_host_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    crawler = OnyxWebCrawler()
+    lock = threading.Lock()
+    in_flight: dict[str, int] = {}
+    max_in_flight: dict[str, int] = {}
+
+    def _get(url: str, **kwargs: Any) -> FakeResponse:
+        host = url.split("/")[2]
+        with lock:
+            in_flight[host] = in_flight.get(host, 0) + 1
+            max_in_flight[host] = max(max_in_flight.get(host, 0), in_flight[host])
+        time.sleep(0.05)
+        with lock:
+            in_flight[host] -= 1
+        return FakeResponse(
+            status_code=200,
+            headers={"Content-Type": "text/html"},
+            content=f"<html><body>{url}</body></html>".encode(),
+        )
+
+    monkeypatch.setattr(crawler_module, "ssrf_safe_get", _get)
+    monkeypatch.setattr(crawler_module, "ONYX_WEB_CRAWLER_MAX_CONCURRENCY_PER_HOST", 2)
+    urls = [f"https://a.example.com/{i}" for i in range(6)] + [
+        f"https://b.example.com/{i}" for i in range(2)
+    ]
+
+    results = crawler.contents(urls)
+
+    assert [result.link for result in results] == urls
+    assert all(result.scrape_successful for result in results)
+    assert max_in_flight == {"a.example.com": 2, "b.example.com": 2}
@@ -1,3 +1,4 @@
+import asyncio
 import contextvars
 import threading
 import time
@@ -7,6 +8,7 @@ from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
+from onyx.utils.threadpool_concurrency import iterate_in_background_thread
 from onyx.utils.threadpool_concurrency import parallel_yield
 from onyx.utils.threadpool_concurrency import run_in_background
 from onyx.utils.threadpool_concurrency import run_with_timeout
@@ -389,3 +391,60 @@ def test_parallel_yield_non_blocking() -> None:
     # Verify no values are missing
     assert len(results) == 300  # Should have all values from 0 to 299
     assert sorted(results) == list(range(300))
+
+
+def test_iterate_in_background_thread_yields_all_items() -> None:
+    test_context_var.set("streaming")
+    threads: set[int] = set()
+
+    def gen() -> Iterator[str]:
+        for i in range(5):
+            threads.add(threading.get_ident())
+            yield f"{test_context_var.get()}-{i}"
+
+    async def consume() -> list[str]:
+        return [item async for item in iterate_in_background_thread(gen)]
+
+    assert asyncio.run(consume()) == [f"streaming-{i}" for i in range(5)]
+    # the whole generator ran on a single thread other than the event loop's
+    assert len(threads) == 1
+    assert threading.get_ident() not in threads
+
+
+def test_iterate_in_background_thread_propagates_exceptions() -> None:
+    def gen() -> Iterator[int]:
+        yield 1
+        raise ValueError("boom")
+
+    async def consume() -> list[int]:
+        items = []
+        async for item in iterate_in_background_thread(gen):
+            items.append(item)
+        return items
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(consume())
+
+
+def test_iterate_in_background_thread_closes_abandoned_generator() -> None:
+    closed = threading.Event()
+
+    def gen() -> Generator[int, None, None]:
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+                time.sleep(0.01)
+        finally:
+            closed.set()
+
+    async def consume() -> None:
+        stream = iterate_in_background_thread(gen)
+        async for item in stream:
+            if item == 2:
+                break
+        await stream.aclose()  # type: ignore[attr-defined]
+
+    asyncio.run(consume())
+    assert closed.wait(timeout=2)